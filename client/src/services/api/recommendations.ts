@@ -5,11 +5,18 @@ import {
 } from '../../generated/api/models';
 import { recommendationsApi, handleApiError } from './generated-client';
 
+// GET /recommendations/ returns a keyset page; regenerate the API client to pick up the schema
+interface RecommendationPage {
+  items: RecommendationResponse[];
+  next_cursor: string | null;
+  limit: number;
+}
+
 export class RecommendationService {
   static async getRecommendations(): Promise<RecommendationResponse[]> {
     try {
       const response = await recommendationsApi.getRecommendationsApiV1RecommendationsGet();
-      return response.data;
+      return (response.data as unknown as RecommendationPage).items;
     } catch (error) {
       return handleApiError(error);
     }
@@ -147,6 +147,7 @@ CREATE TABLE trade_recommendations (
     approved_at DATETIME2 NULL,
     approval_notes TEXT NULL,
     is_draft BIT DEFAULT 1,
+    version INT NOT NULL DEFAULT 1, -- Bumped by every write; updates are conditional on it (optimistic concurrency)
     created_at DATETIME2 DEFAULT GETDATE(),
     updated_at DATETIME2 DEFAULT GETDATE(),
     FOREIGN KEY (analyst_id) REFERENCES users(id),
@@ -231,6 +232,26 @@ CREATE TABLE file_attachments (
     FOREIGN KEY (uploaded_by) REFERENCES users(id)
 );
 
+-- CRD submission outbox (written with the ticket's move to Submitted_to_CRD, sent by the dispatcher)
+CREATE TABLE crd_outbox (
+    id INT IDENTITY(1,1) PRIMARY KEY,
+    trade_ticket_id INT NOT NULL UNIQUE,
+    submission INT NOT NULL DEFAULT 1,
+    idempotency_key NVARCHAR(100) NOT NULL UNIQUE, -- Sent to CRD; repeats of a key are ignored
+    payload NVARCHAR(MAX) NOT NULL, -- JSON order as of submission
+    status NVARCHAR(20) NOT NULL DEFAULT 'Pending',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at DATETIME2 NOT NULL,
+    claimed_until DATETIME2 NULL,
+    claim_token NVARCHAR(36) NULL,
+    last_error TEXT NULL,
+    sent_at DATETIME2 NULL,
+    created_at DATETIME2 DEFAULT GETDATE(),
+    updated_at DATETIME2 DEFAULT GETDATE(),
+    FOREIGN KEY (trade_ticket_id) REFERENCES trade_tickets(id),
+    CHECK (status IN ('Pending', 'Sent', 'Failed'))
+);
+
 -- =============================================
 -- 6. AUDIT & HISTORY TABLES
 -- =============================================
@@ -305,12 +326,14 @@ CREATE INDEX IX_securities_resolved ON securities(is_resolved, resolved_at) WHER
 CREATE INDEX IX_trade_recommendations_analyst_status ON trade_recommendations(analyst_id, status, created_at);
 CREATE INDEX IX_trade_recommendations_security ON trade_recommendations(security_id);
 CREATE INDEX IX_trade_recommendations_status_date ON trade_recommendations(status, created_at);
+CREATE INDEX IX_trade_recommendations_created ON trade_recommendations(created_at, id);
 CREATE INDEX IX_trade_recommendations_approval ON trade_recommendations(approved_by, approved_at);
 
 CREATE INDEX IX_trade_tickets_recommendation ON trade_tickets(recommendation_id);
 CREATE INDEX IX_trade_tickets_creator_status ON trade_tickets(created_by, status);
 CREATE INDEX IX_trade_tickets_status_date ON trade_tickets(status, created_at);
 CREATE INDEX IX_trade_tickets_fund ON trade_tickets(fund_id);
+CREATE INDEX IX_crd_outbox_due ON crd_outbox(status, next_attempt_at);
 
 -- Junction table indexes
 CREATE INDEX IX_recommendation_strategies_rec ON recommendation_strategies(recommendation_id);
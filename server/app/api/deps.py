@@ -0,0 +1,92 @@
+# app/api/deps.py
+"""
+Shared FastAPI dependencies for API routes
+"""
+
+import time
+from typing import AsyncGenerator, Generator
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import SessionLocal, get_async_db
+from app.core.replicas import READ_PRIMARY_COOKIE, must_read_primary, replica_router
+from app.services.permission_service import permission_resolver
+
+# For now, every request acts as user 1 (replace with the authenticated user from Okta)
+TEMP_USER_ID = 1
+
+def get_current_user_id() -> int:
+    """ID of the user making the request"""
+    return TEMP_USER_ID
+
+def get_audited_db(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_current_user_id)
+) -> Generator[Session, None, None]:
+    """Database session for write endpoints, tagged with who is making the changes
+
+    The audit trail (app/services/audit_service.py) reads session.info["audit"].
+    With read replicas, the client's reads go to the primary for
+    READ_YOUR_WRITES_SECONDS afterwards (see get_async_read_db).
+    """
+    if replica_router.replicas and settings.READ_YOUR_WRITES_SECONDS > 0:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            f"{time.time() + settings.READ_YOUR_WRITES_SECONDS:.3f}",
+            max_age=int(settings.READ_YOUR_WRITES_SECONDS) + 1,
+            httponly=True,
+            samesite="lax",
+        )
+    db = SessionLocal()
+    db.info["audit"] = {
+        "user_id": user_id,
+        "session_id": request.headers.get("x-session-id"),
+        "ip_address": request.client.host if request.client else None,
+        "user_agent": (request.headers.get("user-agent") or "")[:500] or None,
+    }
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Async session for read endpoints: on a read replica (app/core/replicas.py),
+    or the primary while the client's own recent writes may not have replicated
+    """
+    use_primary = must_read_primary(request.cookies.get(READ_PRIMARY_COOKIE))
+    async with replica_router.async_session(use_primary) as db:
+        yield db
+
+def require_permission(permission_key: str):
+    """Dependency that rejects the request with 403 unless the user holds permission_key
+
+    Usage: dependencies=[Depends(require_permission("trade.create_recommendation"))]
+    Resolved permissions are cached (app/services/permission_service.py), so
+    the check only reaches the database on a cache miss.
+    """
+    async def check_permission(
+        user_id: int = Depends(get_current_user_id),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> int:
+        if not await permission_resolver.has_permission_async(db, user_id, permission_key):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing permission: {permission_key}"
+            )
+        return user_id
+    return check_permission
+
+def check_permission(db: Session, user_id: int, permission_key: str):
+    """require_permission() for when the key depends on the request body
+
+    Raises 403 unless the user holds permission_key.
+    """
+    if not permission_resolver.has_permission(db, user_id, permission_key):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Missing permission: {permission_key}"
+        )
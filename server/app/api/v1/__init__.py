@@ -1,10 +1,13 @@
 # app/api/v1/__init__.py
 from fastapi import APIRouter
-from app.api.v1 import strategies, securities, recommendations, funds
+from app.api.v1 import strategies, securities, recommendations, funds, events, prices, trade_tickets
 
 api_router = APIRouter()
 
 api_router.include_router(strategies.router, prefix="/strategies", tags=["strategies"])
 api_router.include_router(securities.router, prefix="/securities", tags=["securities"])
 api_router.include_router(funds.router, prefix="/funds", tags=["funds"])
-api_router.include_router(recommendations.router, prefix="/recommendations", tags=["recommendations"])
\ No newline at end of file
+api_router.include_router(recommendations.router, prefix="/recommendations", tags=["recommendations"])
+api_router.include_router(trade_tickets.router, prefix="/trade_tickets", tags=["trade_tickets"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(prices.router, prefix="/prices", tags=["prices"])
@@ -0,0 +1,33 @@
+# app/api/v1/events.py
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.api.deps import get_current_user_id
+from app.core.database import get_async_db
+from app.services.event_hub import event_hub, parse_event_id, visible_streams
+
+router = APIRouter()
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_status_events(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """Server-Sent Events: recommendation and trade ticket status changes
+    
+    Events: recommendation.status, ticket.status and resync (refetch lists).
+    Users see every event of a stream they hold the permission for, otherwise
+    only their own recommendations and tickets. Reconnecting with
+    Last-Event-ID replays the events missed in between.
+    """
+    if not event_hub.running:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Event stream is not running")
+    streams = await visible_streams(db, user_id)
+    return StreamingResponse(
+        event_hub.stream(user_id, streams, parse_event_id(last_event_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
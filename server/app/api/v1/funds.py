@@ -1,31 +1,36 @@
 # app/api/v1/funds.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.database import get_db
+from app.api.deps import get_async_read_db
+from app.core.http_cache import conditional_response
 from app.schemas.funds import FundResponse
-from app.services.fund_service import FundService
+from app.services.reference_cache import fund_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=List[FundResponse])
-def get_funds(db: Session = Depends(get_db)):
-    """Get all active funds"""
-    return FundService.get_active_funds(db)
+async def get_funds(request: Request, response: Response, db: AsyncSession = Depends(get_async_read_db)):
+    """Get all active funds (cached; supports If-None-Match)"""
+    funds = await fund_cache.get_async(db)
+    not_modified = conditional_response(request, response, funds.etag)
+    if not_modified:
+        return not_modified
+    return funds.items
 
 @router.get("/{fund_id}", response_model=FundResponse)
-def get_fund(fund_id: int, db: Session = Depends(get_db)):
+async def get_fund(fund_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get a specific fund by ID"""
-    fund = FundService.get_fund_by_id(db, fund_id)
+    fund = (await fund_cache.get_async(db)).by_id.get(fund_id)
     if not fund:
         raise HTTPException(status_code=404, detail="Fund not found")
     return fund
 
 @router.get("/code/{code}", response_model=FundResponse)
-def get_fund_by_code(code: str, db: Session = Depends(get_db)):
+async def get_fund_by_code(code: str, db: AsyncSession = Depends(get_async_read_db)):
     """Get a fund by its code (e.g., 'OPM', 'GEN')"""
-    fund = FundService.get_fund_by_code(db, code)
+    fund = (await fund_cache.get_async(db)).get_by_key(code)
     if not fund:
         raise HTTPException(status_code=404, detail=f"Fund with code '{code}' not found")
     return fund
\ No newline at end of file
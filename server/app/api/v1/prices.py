@@ -0,0 +1,50 @@
+# app/api/v1/prices.py
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import Dict, List
+
+from app.integrations.bloomberg import PriceProviderError
+from app.schemas.prices import PriceResponse
+from app.services.price_service import CachedPrice, normalize_ticker, price_service
+
+router = APIRouter()
+
+MAX_TICKERS_PER_REQUEST = 200
+
+def price_response(entry: CachedPrice) -> PriceResponse:
+    quote = entry.quote
+    return PriceResponse(
+        ticker=quote.ticker,
+        price=quote.price,
+        currency=quote.currency,
+        as_of=quote.as_of,
+        age_seconds=round(price_service.age_seconds(entry), 3),
+        stale=not price_service.is_fresh(entry),
+        source=price_service.provider.name,
+    )
+
+async def fetch_prices(tickers: List[str]) -> Dict[str, CachedPrice]:
+    if not price_service.enabled:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="No price provider is configured")
+    try:
+        return await price_service.get_prices(tickers)
+    except PriceProviderError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Prices unavailable: {e}")
+
+@router.get("/", response_model=List[PriceResponse])
+async def get_prices(tickers: str = Query(..., description="Comma-separated tickers, e.g. AAPL,MSFT")):
+    """Latest prices for several tickers, in request order (unknown tickers are left out)"""
+    requested = list(dict.fromkeys(normalize_ticker(ticker) for ticker in tickers.split(",") if ticker.strip()))
+    if not requested:
+        raise HTTPException(status_code=400, detail="No tickers given")
+    if len(requested) > MAX_TICKERS_PER_REQUEST:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_TICKERS_PER_REQUEST} tickers per request")
+    prices = await fetch_prices(requested)
+    return [price_response(prices[ticker]) for ticker in requested if ticker in prices]
+
+@router.get("/{ticker}", response_model=PriceResponse)
+async def get_price(ticker: str):
+    """Latest price for one ticker (cached for PRICE_CACHE_TTL_SECONDS)"""
+    entry = (await fetch_prices([ticker])).get(normalize_ticker(ticker))
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"No price for '{ticker}'")
+    return price_response(entry)
@@ -1,45 +1,144 @@
 
 # app/api/v1/recommendations.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from datetime import datetime
 
-from app.core.database import get_db
+from app.api.deps import check_permission, get_async_read_db, get_audited_db, get_current_user_id
+from app.core.http_cache import conditional_response, weak_etag
+from app.core.replicas import READ_PRIMARY_COOKIE, must_read_primary
+from app.core.responses import serialized_response
 from app.schemas.recommendations import (
     RecommendationCreate, 
+    RecommendationBulkCreate,
+    RecommendationBulkResult,
+    RecommendationTransitionRequest,
+    RecommendationTransitionResult,
     RecommendationUpdate, 
-    RecommendationResponse
+    RecommendationResponse,
+    RecommendationFilters,
+    RecommendationPage
 )
-from app.services.recommendation_service import RecommendationService
+from app.services.recommendation_service import RecommendationService, AsyncRecommendationService
+from app.services.recommendation_workflow import get_transition
+from app.services.export_service import ExportService, EXPORT_FORMATS
 
 router = APIRouter()
 
-@router.get("/", response_model=List[RecommendationResponse])
-def get_recommendations(
+def row_validators(kind: str, rows) -> Tuple[str, Optional[datetime]]:
+    """Weak ETag and Last-Modified for a response built from these validator rows
+    
+    rows come from RecommendationService.validators_select(); Last-Modified
+    is the latest change to a recommendation or its security or strategies.
+    """
+    last_modified = max(
+        (timestamp for row in rows
+         for timestamp in (row.updated_at, row.security_updated_at, row.strategies_updated_at) if timestamp),
+        default=None
+    )
+    return weak_etag(kind, *rows), last_modified
+
+def get_recommendation_filters(
     analyst_id: Optional[int] = Query(None, description="Filter by analyst ID"),
     security_id: Optional[int] = Query(None, description="Filter by security ID"),
-    db: Session = Depends(get_db)
+    status: Optional[str] = Query(
+        None, pattern="^(Draft|Proposed|Approved|Rejected)$", description="Filter by status"
+    ),
+    fund_id: Optional[int] = Query(None, description="Filter by fund ID"),
+    strategy_id: Optional[int] = Query(None, description="Filter by strategy ID"),
+    created_from: Optional[datetime] = Query(None, description="Created at or after (inclusive)"),
+    created_to: Optional[datetime] = Query(None, description="Created before (exclusive)")
+) -> RecommendationFilters:
+    """Collect recommendation list filters from query parameters"""
+    return RecommendationFilters(
+        analyst_id=analyst_id,
+        security_id=security_id,
+        status=status,
+        fund_id=fund_id,
+        strategy_id=strategy_id,
+        created_from=created_from,
+        created_to=created_to
+    )
+
+@router.get("/", response_model=RecommendationPage)
+async def get_recommendations(
+    request: Request,
+    response: Response,
+    filters: RecommendationFilters = Depends(get_recommendation_filters),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of results per page"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get all recommendations with optional filters"""
-    if analyst_id:
-        return RecommendationService.get_recommendations_by_analyst(db, analyst_id)
-    elif security_id:
-        return RecommendationService.get_recommendations_by_security(db, security_id)
-    else:
-        return RecommendationService.get_all_recommendations(db)
+    """Get a page of recommendations, newest first, with optional filters (supports If-None-Match / If-Modified-Since)"""
+    rows = await AsyncRecommendationService.get_page_validators(db, filters, cursor, limit)
+    not_modified = conditional_response(request, response, *row_validators("page", rows))
+    if not_modified:
+        return not_modified
+    
+    items, next_cursor = await AsyncRecommendationService.list_recommendations(db, filters, cursor, limit)
+    return serialized_response(
+        RecommendationPage, {"items": items, "next_cursor": next_cursor, "limit": limit}, response
+    )
 
 @router.get("/drafts", response_model=List[RecommendationResponse])
-def get_draft_recommendations(
+async def get_draft_recommendations(
+    request: Request,
+    response: Response,
     analyst_id: Optional[int] = Query(None, description="Filter by analyst ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get all draft recommendations"""
-    return RecommendationService.get_draft_recommendations(db, analyst_id)
+    """Get all draft recommendations (supports If-None-Match / If-Modified-Since)"""
+    rows = await AsyncRecommendationService.get_drafts_validators(db, analyst_id)
+    not_modified = conditional_response(request, response, *row_validators("drafts", rows))
+    if not_modified:
+        return not_modified
+    
+    drafts = await AsyncRecommendationService.get_draft_recommendations(db, analyst_id)
+    return serialized_response(List[RecommendationResponse], drafts, response)
+
+@router.get("/export", response_class=StreamingResponse)
+def export_recommendations(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    filters: RecommendationFilters = Depends(get_recommendation_filters)
+):
+    """Stream every recommendation matching the filters, newest first
+    
+    Rows are fetched and written in batches, so memory use does not grow
+    with the size of the export.
+    """
+    filename = f"recommendations-{datetime.now():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        ExportService.stream_recommendations(
+            filters, format, use_primary=must_read_primary(request.cookies.get(READ_PRIMARY_COOKIE))
+        ),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @router.get("/{recommendation_id}", response_model=RecommendationResponse)
-def get_recommendation(recommendation_id: int, db: Session = Depends(get_db)):
-    """Get a specific recommendation"""
-    recommendation = RecommendationService.get_recommendation_by_id(db, recommendation_id)
+async def get_recommendation(
+    recommendation_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get a specific recommendation (supports If-None-Match / If-Modified-Since)
+    
+    The validators come from a single-row lookup, so an unchanged
+    recommendation is answered with 304 without loading its related data.
+    """
+    row = await AsyncRecommendationService.get_recommendation_validators(db, recommendation_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Recommendation not found")
+    not_modified = conditional_response(request, response, *row_validators("recommendation", [row]))
+    if not_modified:
+        return not_modified
+    
+    recommendation = await AsyncRecommendationService.get_recommendation_by_id(db, recommendation_id)
     if not recommendation:
         raise HTTPException(status_code=404, detail="Recommendation not found")
     return recommendation
@@ -47,7 +146,7 @@ def get_recommendation(recommendation_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=RecommendationResponse, status_code=status.HTTP_201_CREATED)
 def create_recommendation(
     recommendation_data: RecommendationCreate, 
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_audited_db)
 ):
     """Create a new trade recommendation"""
     
@@ -58,13 +157,61 @@ def create_recommendation(
         db, recommendation_data, TEMP_ANALYST_ID
     )
 
+@router.post("/bulk", response_model=RecommendationBulkResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_recommendations(
+    bulk_data: RecommendationBulkCreate,
+    response: Response,
+    db: Session = Depends(get_audited_db)
+):
+    """Create a basket of recommendations in one transaction
+    
+    Returns a result per item in request order. Responds 201 when every item
+    was created and 207 (Multi-Status) when some or all were rejected.
+    """
+    
+    # For now, we'll use analyst_id = 1 (you'll replace this with actual user from auth)
+    TEMP_ANALYST_ID = 1
+    
+    result = RecommendationService.bulk_create_recommendations(
+        db, bulk_data.recommendations, TEMP_ANALYST_ID, bulk_data.atomic
+    )
+    if result.failed:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return result
+
+@router.post("/transitions", response_model=RecommendationTransitionResult)
+def transition_recommendations(
+    transition: RecommendationTransitionRequest,
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_audited_db)
+):
+    """Submit, approve or reject many recommendations at once
+    
+    submit moves the caller's own Drafts to Proposed; approve and reject
+    decide Proposed recommendations and need trade.approve_recommendations.
+    Returns a result per recommendation id in request order. Responds 200
+    when every recommendation moved and 207 (Multi-Status) when some or all
+    were in another status (conflict) or not found.
+    """
+    check_permission(db, user_id, get_transition(transition.action).permission)
+    result = RecommendationService.apply_transition(db, transition, user_id)
+    if result.failed:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return result
+
 @router.put("/{recommendation_id}", response_model=RecommendationResponse)
 def update_recommendation(
     recommendation_id: int,
     recommendation_data: RecommendationUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_audited_db)
 ):
-    """Update a recommendation (only drafts can be updated)"""
+    """Update a recommendation (only drafts can be updated)
+    
+    Send the version from the recommendation you edited: if someone has
+    saved it since, nothing is written and the response is 409 (reload and
+    retry). The response carries the new version.
+    """
     
     # For now, we'll use analyst_id = 1 (you'll replace this with actual user from auth)
     TEMP_ANALYST_ID = 1
@@ -74,7 +221,7 @@ def update_recommendation(
     )
 
 @router.delete("/{recommendation_id}")
-def delete_recommendation(recommendation_id: int, db: Session = Depends(get_db)):
+def delete_recommendation(recommendation_id: int, db: Session = Depends(get_audited_db)):
     """Delete a recommendation (only drafts can be deleted)"""
     
     # For now, we'll use analyst_id = 1 (you'll replace this with actual user from auth)
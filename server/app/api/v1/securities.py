@@ -1,32 +1,34 @@
 # app/api/v1/securities.py
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.core.database import get_db
+from app.api.deps import get_async_read_db
+from app.core.responses import serialized_response
 from app.schemas.securities import SecurityResponse
-from app.services.security_service import SecurityService
+from app.services.security_service import AsyncSecurityService
 
 router = APIRouter()
 
 @router.get("/", response_model=List[SecurityResponse])
-def get_securities(db: Session = Depends(get_db)):
+async def get_securities(db: AsyncSession = Depends(get_async_read_db)):
     """Get all active securities"""
-    return SecurityService.get_all_securities(db)
+    securities = await AsyncSecurityService.get_all_securities(db)
+    return serialized_response(List[SecurityResponse], securities)
 
 @router.get("/search", response_model=List[SecurityResponse])
-def search_securities(
+async def search_securities(
     q: str = Query(..., min_length=1, description="Search query (ticker or name)"),
     limit: int = Query(10, ge=1, le=50, description="Maximum number of results"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Search securities by ticker or name"""
-    return SecurityService.search_securities(db, q, limit)
+    return await AsyncSecurityService.search_securities(db, q, limit)
 
 @router.get("/{security_id}", response_model=SecurityResponse)
-def get_security(security_id: int, db: Session = Depends(get_db)):
+async def get_security(security_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get a specific security by ID"""
-    security = SecurityService.get_security_by_id(db, security_id)
+    security = await AsyncSecurityService.get_security_by_id(db, security_id)
     if not security:
         raise HTTPException(status_code=404, detail="Security not found")
     return security
\ No newline at end of file
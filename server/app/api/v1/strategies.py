@@ -1,23 +1,28 @@
 # app/api/v1/strategies.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.database import get_db
+from app.api.deps import get_async_read_db
+from app.core.http_cache import conditional_response
 from app.schemas.strategies import StrategyResponse
-from app.services.strategy_service import StrategyService
+from app.services.reference_cache import strategy_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=List[StrategyResponse])
-def get_strategies(db: Session = Depends(get_db)):
-    """Get all active strategies"""
-    return StrategyService.get_active_strategies(db)
+async def get_strategies(request: Request, response: Response, db: AsyncSession = Depends(get_async_read_db)):
+    """Get all active strategies (cached; supports If-None-Match)"""
+    strategies = await strategy_cache.get_async(db)
+    not_modified = conditional_response(request, response, strategies.etag)
+    if not_modified:
+        return not_modified
+    return strategies.items
 
 @router.get("/{strategy_id}", response_model=StrategyResponse)
-def get_strategy(strategy_id: int, db: Session = Depends(get_db)):
+async def get_strategy(strategy_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get a specific strategy by ID"""
-    strategy = StrategyService.get_strategy_by_id(db, strategy_id)
+    strategy = (await strategy_cache.get_async(db)).by_id.get(strategy_id)
     if not strategy:
         raise HTTPException(status_code=404, detail="Strategy not found")
     return strategy
@@ -0,0 +1,47 @@
+# app/api/v1/trade_tickets.py
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_audited_db, require_permission
+from app.schemas.trade_tickets import TicketAllocationRequest, TicketAllocationResult, TradeTicketSubmission
+from app.services.trade_ticket_service import TradeTicketService
+
+router = APIRouter()
+
+@router.post("/allocate", response_model=TicketAllocationResult, status_code=status.HTTP_201_CREATED)
+def allocate_trade_tickets(
+    allocation: TicketAllocationRequest,
+    response: Response,
+    user_id: int = Depends(require_permission("trade.create_tickets")),
+    db: Session = Depends(get_audited_db)
+):
+    """Create Draft trade tickets for approved recommendations across their funds
+    
+    Each fund's new position and allocation percentage come from the chosen
+    method (pro_rata, benchmark_relative or capped); funds that would not
+    trade get no ticket. Returns a result per recommendation in request
+    order. Responds 201 when every recommendation was allocated and 207
+    (Multi-Status) when some or all were rejected. With dry_run, nothing is
+    created and the allocations are returned (200).
+    """
+    result = TradeTicketService.allocate_tickets(db, allocation, user_id)
+    if result.failed:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    elif allocation.dry_run:
+        response.status_code = status.HTTP_200_OK
+    return result
+
+@router.post("/{ticket_id}/submit", response_model=TradeTicketSubmission, status_code=status.HTTP_202_ACCEPTED)
+def submit_trade_ticket(
+    ticket_id: int,
+    user_id: int = Depends(require_permission("trade.submit_to_crd")),
+    db: Session = Depends(get_audited_db)
+):
+    """Queue a trade ticket for CRD
+    
+    Returns as soon as the ticket is Submitted_to_CRD and its order is in the
+    outbox; the order is sent to CRD in the background. The outcome shows up
+    as crd_status / CRD_Error on the ticket and as ticket.status events on
+    GET /api/v1/events/stream. Submitting again while queued is a no-op.
+    """
+    return TradeTicketService.submit_to_crd(db, ticket_id, user_id)
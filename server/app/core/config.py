@@ -5,6 +5,21 @@ import os
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with its async driver
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    READ_REPLICA_URLS: str = ""  # Comma-separated replica DATABASE_URLs for read endpoints; empty = primary only
+    READ_REPLICA_STRATEGY: str = "round_robin"  # round_robin | least_latency
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # Reads stay on the primary this long after a client's write
+    
+    # SQLite (file databases only)
+    SQLITE_TUNED: bool = True  # WAL + pragmas, one writer connection, pooled read-only connections
+    SQLITE_READ_POOL_SIZE: int = 8  # Read-only connections (sync readers; async reads use DB_POOL_SIZE)
+    SQLITE_WRITER_TIMEOUT_SECONDS: int = 30  # Wait for the single writer connection before failing
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # NORMAL is durable across app crashes in WAL mode; FULL for power loss
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait on another process's lock instead of failing at once
+    SQLITE_CACHE_SIZE_KB: int = 65536  # Page cache per connection
+    SQLITE_MMAP_SIZE_MB: int = 256  # Memory-mapped I/O for reads; 0 disables
     
     # Redis  
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -24,6 +39,21 @@ class Settings(BaseSettings):
     CRD_API_URL: Optional[str] = None
     CRD_API_KEY: Optional[str] = None
     CRD_ENABLED: bool = False
+    CRD_USE_FAKE: bool = False  # Without CRD_ENABLED, send orders to the in-process fake CRD (local development only)
+    CRD_TIMEOUT_SECONDS: float = 10.0  # Per bulk order request
+    CRD_MAX_ORDERS_PER_REQUEST: int = 50  # Orders per bulk request
+    CRD_DISPATCH_CONCURRENCY: int = 4  # Bulk requests in flight at once
+    CRD_DISPATCH_POLL_SECONDS: float = 5.0  # Outbox poll (other workers' submissions, due retries)
+    CRD_CLAIM_SECONDS: float = 60.0  # Orders being sent are hidden from other dispatchers this long
+    CRD_MAX_ATTEMPTS: int = 8  # Failed deliveries before the ticket moves to CRD_Error
+    CRD_RETRY_BASE_SECONDS: float = 2.0  # Wait before the first retry; doubles per attempt, jittered
+    CRD_RETRY_MAX_SECONDS: float = 300.0  # Longest wait between retries
+    CRD_RECONCILE_ENABLED: bool = True  # Poll CRD for fills / status of open tickets
+    CRD_RECONCILE_MIN_SECONDS: float = 2.0  # Poll interval with few open orders
+    CRD_RECONCILE_MAX_SECONDS: float = 60.0  # Longest interval, however many orders are open
+    CRD_RECONCILE_IDLE_SECONDS: float = 300.0  # With no open orders (an order accepted by CRD wakes it sooner)
+    CRD_RECONCILE_REQUESTS_PER_SECOND: float = 5.0  # Average status request rate the poller stays under
+    CRD_RECONCILE_CONCURRENCY: int = 4  # Status requests in flight at once
     
     # IVP Integration
     IVP_API_URL: Optional[str] = None
@@ -34,6 +64,9 @@ class Settings(BaseSettings):
     BLOOMBERG_API_URL: Optional[str] = None
     BLOOMBERG_API_KEY: Optional[str] = None
     BLOOMBERG_ENABLED: bool = False
+    PRICE_USE_MOCK: bool = False  # Without BLOOMBERG_ENABLED, serve made-up mock prices (local development only)
+    BLOOMBERG_TIMEOUT_SECONDS: float = 5.0  # Per upstream price request
+    BLOOMBERG_MAX_TICKERS_PER_REQUEST: int = 100  # Larger batches are split
     
     # Environment
     ENVIRONMENT: str = "development"
@@ -50,6 +83,56 @@ class Settings(BaseSettings):
     # API Configuration
     API_V1_STR: str = "/api/v1"
     
+    # Health Checks
+    HEALTH_CHECK_CACHE_SECONDS: float = 5.0  # Readiness probes reuse a result this fresh
+    HEALTH_INTEGRITY_CHECK_ENABLED: bool = False  # Opt-in deep integrity endpoint
+    HEALTH_INTEGRITY_CHECK_INTERVAL_SECONDS: int = 3600  # Minimum time between deep checks
+    
+    # Securities Search
+    SECURITY_SEARCH_INDEX_ENABLED: bool = True  # Serve /securities/search from the in-memory index
+    SECURITY_SEARCH_INDEX_REFRESH_SECONDS: int = 300  # Full rebuild interval; 0 disables
+    
+    # Reference Data Cache (funds, strategies)
+    REFERENCE_CACHE_TTL_SECONDS: int = 300  # Reload after this long (other workers' writes); 0 = until invalidated
+    
+    # Audit Trail
+    AUDIT_ENABLED: bool = True
+    AUDIT_QUEUE_MAX_SIZE: int = 10000  # Committed transactions buffered before back-pressure
+    AUDIT_BATCH_SIZE: int = 500  # Rows per executemany
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0  # Max time rows wait in the queue
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = 0.05  # Wait for queue space before writing synchronously
+    AUDIT_SYSTEM_USER_ID: int = 1  # changed_by for writes outside a request (scripts, jobs)
+    
+    # Metrics (multi-worker: export PROMETHEUS_MULTIPROC_DIR, see app/core/metrics.py)
+    METRICS_ENABLED: bool = True  # GET /metrics, request latency, pool and cache metrics
+    
+    # SQL Instrumentation
+    SQL_INSTRUMENTATION_ENABLED: bool = True  # Per-request statement count / DB time log line
+    SQL_SERVER_TIMING_HEADER: bool = True  # Also report them in a Server-Timing response header
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10  # Warn when one statement shape repeats this often in a request
+    
+    # JSON Responses
+    FAST_JSON_ENABLED: bool = True  # Render responses with orjson (when installed) instead of json.dumps
+    
+    # Exports
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched, enriched and flushed to the client at a time
+    
+    # Permission Cache
+    PERMISSION_CACHE_TTL_SECONDS: int = 300  # Re-resolve after this long (other workers' grants); 0 = until invalidated
+    
+    # Status Event Stream (SSE)
+    EVENT_STREAM_ENABLED: bool = True  # GET /api/v1/events/stream
+    EVENT_STREAM_POLL_SECONDS: float = 2.0  # Status history poll interval (other workers' and external writes)
+    EVENT_STREAM_KEEPALIVE_SECONDS: float = 15.0  # Comment line sent on idle streams to keep proxies from timing out
+    EVENT_STREAM_QUEUE_SIZE: int = 256  # Events buffered per client; one that falls behind gets a resync event
+    EVENT_STREAM_REPLAY_LIMIT: int = 500  # Missed events replayed on Last-Event-ID; more sends a resync event
+    
+    # Market Data Prices (Bloomberg when enabled; otherwise 503 unless PRICE_USE_MOCK=true serves mock prices)
+    PRICE_CACHE_TTL_SECONDS: float = 30.0  # A cached price older than this is fetched again
+    PRICE_BATCH_WINDOW_MS: float = 10.0  # Cache misses this close together share one upstream request
+    PRICE_REFRESH_INTERVAL_SECONDS: float = 30.0  # Background bulk refresh of tickers in use; 0 disables
+    PRICE_IDLE_SECONDS: float = 600.0  # Tickers nobody asked for this long are no longer refreshed, and dropped
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -61,6 +144,11 @@ class Settings(BaseSettings):
         """Convert comma-separated string to list"""
         return [ext.strip() for ext in self.ALLOWED_FILE_EXTENSIONS.split(",")]
     
+    @property
+    def read_replica_urls_list(self) -> List[str]:
+        """Convert comma-separated replica URLs to a list"""
+        return [url.strip() for url in self.READ_REPLICA_URLS.split(",") if url.strip()]
+    
     @property
     def is_development(self) -> bool:
         """Check if running in development mode"""
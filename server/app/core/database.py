@@ -1,36 +1,161 @@
 # ---------------------------------------------
 # app/core/database.py - SQLAlchemy setup
 # ---------------------------------------------
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 from app.core.config import settings
+from app.core.metrics import instrument_engine, instrumented_pool
 import logging
 
 logger = logging.getLogger(__name__)
 
+IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and ":memory:" in settings.DATABASE_URL
+# File-backed SQLite with the tuned profile: WAL, one writer, pooled readers
+SQLITE_TUNED = IS_SQLITE and not IS_SQLITE_MEMORY and settings.SQLITE_TUNED
+
+def sqlite_pragmas() -> list:
+    """Per-connection PRAGMA statements of the tuned SQLite profile"""
+    return [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024}",
+    ]
+
+def tune_sqlite_connection(dbapi_connection, connection_record):
+    """connect event: apply the tuned profile's pragmas to a new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    for pragma in sqlite_pragmas():
+        cursor.execute(pragma)
+    cursor.close()
+
+def make_read_only(dbapi_connection, connection_record):
+    """connect event: reject writes on a reader connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
 # Database engine configuration
-if settings.DATABASE_URL.startswith("sqlite"):
-    # SQLite configuration for development
+if SQLITE_TUNED:
+    # WAL lets readers run alongside the writer, but SQLite still allows one
+    # writer at a time: sync sessions (writes) queue for a single connection
+    # instead of failing on the database lock, and readers get their own pool
     engine = create_engine(
         settings.DATABASE_URL,
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
+        poolclass=instrumented_pool(QueuePool, "sync"),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_WRITER_TIMEOUT_SECONDS,
+        echo=settings.DEBUG
+    )
+    read_engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=instrumented_pool(QueuePool, "read"),
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
         echo=settings.DEBUG
     )
+    event.listen(engine, "connect", tune_sqlite_connection)
+    event.listen(read_engine, "connect", tune_sqlite_connection)
+    event.listen(read_engine, "connect", make_read_only)
+elif IS_SQLITE:
+    # SQLite configuration for development (in-memory, or SQLITE_TUNED=false):
+    # every thread shares one connection
+    engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=instrumented_pool(StaticPool, "sync"),
+        echo=settings.DEBUG
+    )
+    read_engine = engine
 else:
     # SQL Server configuration for production
     engine = create_engine(
         settings.DATABASE_URL,
+        poolclass=instrumented_pool(QueuePool, "sync"),
         pool_pre_ping=True,
         pool_recycle=300,
         echo=settings.DEBUG
     )
+    read_engine = engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sync sessions that only read (exports, index rebuilds); on the tuned SQLite
+# profile they stay off the single writer connection
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
+# Async drivers for each sync DATABASE_URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mssql+pyodbc": "mssql+aioodbc",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """A sync database URL with its driver replaced by the matching async driver"""
+    scheme, rest = url.split("://", 1)
+    if scheme not in ASYNC_DRIVERS:
+        raise ValueError(
+            f"No async driver known for '{scheme}'; set ASYNC_DATABASE_URL explicitly"
+        )
+    return f"{ASYNC_DRIVERS[scheme]}://{rest}"
+
+def get_async_database_url() -> str:
+    """Async database URL: ASYNC_DATABASE_URL, or DATABASE_URL mapped to its async driver"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return to_async_url(settings.DATABASE_URL)
+
+# Async engine for non-blocking request handlers
+if IS_SQLITE_MEMORY:
+    # An in-memory database only exists on its single connection
+    async_engine = create_async_engine(
+        get_async_database_url(),
+        poolclass=instrumented_pool(StaticPool, "async"),
+        echo=settings.DEBUG
+    )
+elif IS_SQLITE:
+    async_engine = create_async_engine(
+        get_async_database_url(),
+        poolclass=instrumented_pool(AsyncAdaptedQueuePool, "async"),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        echo=settings.DEBUG
+    )
+else:
+    async_engine = create_async_engine(
+        get_async_database_url(),
+        poolclass=instrumented_pool(AsyncAdaptedQueuePool, "async"),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        echo=settings.DEBUG
+    )
+
+if SQLITE_TUNED:
+    event.listen(async_engine.sync_engine, "connect", tune_sqlite_connection)
+
+# Pool checkouts, occupancy and wait time for GET /metrics
+instrument_engine(engine, "sync")
+if read_engine is not engine:
+    instrument_engine(read_engine, "read")
+instrument_engine(async_engine, "async")
+
+# expire_on_commit=False: async code cannot lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
+
 def get_db():
     """Database dependency for FastAPI"""
     db = SessionLocal()
@@ -39,17 +164,49 @@ def get_db():
     finally:
         db.close()
 
+def get_read_db():
+    """Read-only database dependency for sync handlers"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    """Async database dependency for FastAPI (use from async def handlers)"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def test_connection():
-    """Test database connection"""
+    """Test database connection with a cheap round trip
+    
+    Uses read_engine: with the tuned SQLite profile the writer engine has a
+    single connection, and a probe queued behind a long write would report
+    the database as down.
+    """
     try:
-        with engine.connect() as connection:
-            if settings.DATABASE_URL.startswith("sqlite"):
-                # Bypass SQLAlchemy Core parsing entirely
-                connection.exec_driver_sql("PRAGMA integrity_check;")
-            else:
-                connection.exec_driver_sql("SELECT 1")
+        with read_engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1")
         logger.info("Database connection successful")
         return True
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
         return False
+
+def run_integrity_check():
+    """Run a deep database integrity check
+    
+    On SQLite this is PRAGMA integrity_check, a full scan of the database file,
+    so it must never run on a request path. Returns (ok, detail).
+    """
+    if not settings.DATABASE_URL.startswith("sqlite"):
+        return True, f"Integrity check not supported for {engine.dialect.name}"
+    
+    with read_engine.connect() as connection:
+        # Bypass SQLAlchemy Core parsing entirely
+        results = [row[0] for row in connection.exec_driver_sql("PRAGMA integrity_check;")]
+    
+    ok = results == ["ok"]
+    if not ok:
+        logger.error(f"Database integrity check failed: {results[:10]}")
+    return ok, "; ".join(results[:10])
@@ -0,0 +1,99 @@
+# ---------------------------------------------
+# app/core/health.py - Cached, rate-limited health checks
+# ---------------------------------------------
+import threading
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import test_connection, run_integrity_check
+
+logger = logging.getLogger(__name__)
+
+class CheckResult:
+    """Outcome of one health check run"""
+
+    def __init__(self, ok: bool, detail: Optional[str], checked_at: datetime, duration_ms: float):
+        self.ok = ok
+        self.detail = detail
+        self.checked_at = checked_at
+        self.duration_ms = duration_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "detail": self.detail,
+            "checked_at": self.checked_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 2)
+        }
+
+class CachedCheck:
+    """Runs a check at most once per interval and caches its timestamped result
+
+    Concurrent callers never pile up behind a slow check: while one thread is
+    running it, the others get the previous result (or wait for the first one).
+    """
+
+    def __init__(self, name: str, check: Callable[[], Tuple[bool, Optional[str]]], interval_seconds: float):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self._check = check
+        self._lock = threading.Lock()
+        self._result: Optional[CheckResult] = None
+        self._last_run = 0.0  # time.monotonic() of the last run
+
+    @property
+    def result(self) -> Optional[CheckResult]:
+        """Last cached result without running the check"""
+        return self._result
+
+    def is_stale(self) -> bool:
+        return self._result is None or time.monotonic() - self._last_run >= self.interval_seconds
+
+    def get(self) -> CheckResult:
+        """Return the cached result, re-running the check if it is stale"""
+        if not self.is_stale():
+            return self._result
+
+        # Another thread is already refreshing: serve the previous result
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._result
+
+        try:
+            if self.is_stale():
+                self._run()
+            return self._result
+        finally:
+            self._lock.release()
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            ok, detail = self._check()
+        except Exception as e:
+            logger.error(f"Health check '{self.name}' failed: {e}")
+            ok, detail = False, str(e)
+
+        self._result = CheckResult(
+            ok=ok,
+            detail=detail,
+            checked_at=datetime.now(timezone.utc),
+            duration_ms=(time.perf_counter() - started) * 1000
+        )
+        self._last_run = time.monotonic()
+
+def _connectivity_check() -> Tuple[bool, Optional[str]]:
+    ok = test_connection()
+    return ok, None if ok else "Database connection failed"
+
+# Readiness: SELECT 1, shared by /health and /health/ready
+readiness_check = CachedCheck(
+    "database", _connectivity_check, settings.HEALTH_CHECK_CACHE_SECONDS
+)
+
+# Deep integrity: full scan on SQLite, opt-in and run at most once per interval
+integrity_check = CachedCheck(
+    "integrity", run_integrity_check, settings.HEALTH_INTEGRITY_CHECK_INTERVAL_SECONDS
+)
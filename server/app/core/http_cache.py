@@ -0,0 +1,86 @@
+# ---------------------------------------------
+# app/core/http_cache.py - Conditional GET helpers (ETag / If-None-Match)
+# ---------------------------------------------
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+# Clients may keep the representation but must revalidate it before reuse
+REVALIDATE = "private, no-cache"
+
+def _opaque(tag: str) -> str:
+    """Strip the weak prefix: If-None-Match uses weak comparison (RFC 9110 13.1.2)"""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def weak_etag(*validators) -> str:
+    """Weak ETag over cheap validators (ids, counts, updated_at) instead of the body
+
+    Weak: it identifies the data, not the exact bytes of its serialization.
+    """
+    digest = hashlib.sha1("|".join(map(str, validators)).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+def http_date(value: datetime) -> str:
+    """IMF-fixdate for Last-Modified; naive database timestamps are taken as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    """Whether an If-Modified-Since header value is at or after last_modified (1s resolution)"""
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """Return a 304 response if the client already has etag, else tag the outgoing response
+
+    If-Modified-Since is only consulted when the request has no If-None-Match
+    (RFC 9110 13.2.2).
+
+    Usage in a handler:
+        not_modified = conditional_response(request, response, snapshot.etag)
+        if not_modified:
+            return not_modified
+    """
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        unchanged = etag_matches(if_none_match, etag)
+    else:
+        unchanged = last_modified is not None and not_modified_since(
+            request.headers.get("if-modified-since"), last_modified
+        )
+    if unchanged:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,203 @@
+# ---------------------------------------------
+# app/core/metrics.py - Prometheus metrics
+# ---------------------------------------------
+"""
+Request latency, connection pool and cache metrics for GET /metrics.
+
+With several uvicorn workers each process only sees its own requests, so
+run them with prometheus_client's multiprocess mode: export
+PROMETHEUS_MULTIPROC_DIR (an empty directory, cleared before the server
+starts) in the environment of the server process. Every worker then writes
+its samples to files there and /metrics, served by whichever worker gets the
+scrape, aggregates all of them. Without the variable, /metrics reports the
+serving process only, which is correct for a single worker.
+
+Gauges are written by the process they describe (on pool checkout/checkin)
+and summed across live workers; a scrape never samples another worker's
+state. Overflow is reported as connections in use beyond pool_size.
+"""
+
+import os
+import time
+import logging
+import threading
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event, exc
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool", ["engine"]
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection (including opening a new one)",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total", "Checkouts that gave up after pool_timeout", ["engine"]
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ["engine"],
+    multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size", ["engine"],
+    multiprocess_mode="livesum"
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "In-process cache lookups", ["cache", "result"]
+)
+
+PRICE_FETCHES = Counter(
+    "price_provider_requests_total", "Upstream price requests (one per batch of tickers)", ["provider", "result"]
+)
+PRICE_FETCH_TICKERS = Histogram(
+    "price_provider_batch_tickers", "Tickers per upstream price request", ["provider"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+)
+PRICE_FETCH_LATENCY = Histogram(
+    "price_provider_request_seconds", "Upstream price request latency", ["provider"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+CRD_REQUESTS = Counter(
+    "crd_requests_total", "Bulk requests to CRD (operation: submit, status)", ["gateway", "operation", "result"]
+)
+CRD_REQUEST_ORDERS = Histogram(
+    "crd_request_orders", "Orders per bulk CRD request", ["gateway", "operation"],
+    buckets=(1, 2, 5, 10, 25, 50, 100),
+)
+CRD_REQUEST_LATENCY = Histogram(
+    "crd_request_seconds", "Bulk CRD request latency", ["gateway", "operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+CRD_ORDERS = Counter(
+    "crd_orders_total", "Outbox orders by delivery outcome (accepted, rejected, retried, failed)", ["outcome"]
+)
+CRD_OPEN_ORDERS = Gauge(
+    "crd_open_orders", "Tickets with an order working at CRD, as of the last reconciliation poll",
+    multiprocess_mode="livemax"
+)
+CRD_RECONCILED_TICKETS = Counter(
+    "crd_reconciled_tickets_total", "Tickets updated from CRD execution state"
+)
+
+def record_cache(cache: str, hit: bool):
+    """Count one lookup of an in-process cache"""
+    if settings.METRICS_ENABLED:
+        CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+def record_price_fetch(provider: str, tickers: int, seconds: float, ok: bool):
+    """Count one upstream price request (one batch of tickers)"""
+    if settings.METRICS_ENABLED:
+        PRICE_FETCHES.labels(provider, "ok" if ok else "error").inc()
+        PRICE_FETCH_TICKERS.labels(provider).observe(tickers)
+        PRICE_FETCH_LATENCY.labels(provider).observe(seconds)
+
+def record_crd_request(gateway: str, operation: str, orders: int, seconds: float, ok: bool):
+    """Count one bulk CRD request"""
+    if settings.METRICS_ENABLED:
+        CRD_REQUESTS.labels(gateway, operation, "ok" if ok else "error").inc()
+        CRD_REQUEST_ORDERS.labels(gateway, operation).observe(orders)
+        CRD_REQUEST_LATENCY.labels(gateway, operation).observe(seconds)
+
+def record_crd_orders(outcome: str, count: int):
+    """Count outbox orders that reached an outcome"""
+    if settings.METRICS_ENABLED and count:
+        CRD_ORDERS.labels(outcome).inc(count)
+
+def record_crd_reconciliation(open_orders: int, changed: int):
+    """Open orders seen and tickets updated by one reconciliation poll"""
+    if settings.METRICS_ENABLED:
+        CRD_OPEN_ORDERS.set(open_orders)
+        if changed:
+            CRD_RECONCILED_TICKETS.inc(changed)
+
+def instrumented_pool(pool_class, label: str):
+    """pool_class, timing how long connect() waits for a connection (when metrics are on)
+
+    SQLAlchemy has no event before a checkout starts, so the wait is timed
+    around the pool's public connect().
+    """
+    if not settings.METRICS_ENABLED:
+        return pool_class
+
+    class InstrumentedPool(pool_class):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                POOL_TIMEOUTS.labels(label).inc()
+                raise
+            finally:
+                POOL_CHECKOUT_WAIT.labels(label).observe(time.perf_counter() - started)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+def instrument_engine(engine, label: str):
+    """Export checkout counts and pool occupancy for a (sync or async) engine"""
+    if not settings.METRICS_ENABLED:
+        return
+    pool = getattr(engine, "sync_engine", engine).pool
+    # StaticPool / NullPool have no pool_size, hence no overflow
+    pool_size = pool.size() if hasattr(pool, "size") else None
+    lock = threading.Lock()
+    in_use = 0
+
+    def record_occupancy(delta: int):
+        # Counted here rather than read from the pool: the checkin event fires
+        # before the pool takes the connection back
+        nonlocal in_use
+        with lock:
+            in_use += delta
+            POOL_CHECKED_OUT.labels(label).set(in_use)
+            if pool_size is not None:
+                POOL_OVERFLOW.labels(label).set(max(in_use - pool_size, 0))
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKOUTS.labels(label).inc()
+        record_occupancy(1)
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        record_occupancy(-1)
+
+def render_metrics() -> bytes:
+    """Exposition text for every worker (multiprocess mode) or this process"""
+    if MULTIPROCESS_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the multiprocess aggregate on shutdown"""
+    if MULTIPROCESS_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,77 @@
+# ---------------------------------------------
+# app/core/model_events.py - Post-commit hooks for ORM changes
+# ---------------------------------------------
+"""
+Lets in-process caches and indexes follow ORM writes without polling.
+
+A tracker registers a model class with two callbacks:
+
+- snapshot(instance, action) runs at flush time, while the instance is still
+  bound to its session and transaction (attribute history is available), and
+  returns a plain value to keep (or None to skip it). action is "insert",
+  "update" or "delete"; deleted rows may be expired, so for deletes use only
+  inspect(instance).identity or already-loaded attributes
+- apply(changes) runs once after the transaction commits, with a list of
+  (action, value) tuples
+
+Changes from a rolled-back transaction are discarded. Hooks are registered on
+the Session class, so they see sync sessions and the sessions behind
+AsyncSession alike. Bulk Core statements (update()/delete() executed without
+ORM instances) bypass the ORM and are not seen.
+"""
+
+import logging
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+Change = Tuple[str, Any]
+
+_PENDING_KEY = "_model_events_pending"
+_trackers: List[Tuple[type, Callable[[Any, str], Any], Callable[[List[Change]], None]]] = []
+
+def track_commits(model: type, snapshot: Callable[[Any, str], Any], apply: Callable[[List[Change]], None]):
+    """Call apply(changes) after every commit that inserted, updated or deleted model rows"""
+    _trackers.append((model, snapshot, apply))
+
+def _pending(session: Session) -> dict:
+    return session.info.setdefault(_PENDING_KEY, {})
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    if not _trackers:
+        return
+
+    for action, instances in (
+        ("insert", session.new), ("update", session.dirty), ("delete", session.deleted)
+    ):
+        for instance in instances:
+            for index, (model, snapshot, _) in enumerate(_trackers):
+                if not isinstance(instance, model):
+                    continue
+                if action == "update" and not session.is_modified(instance, include_collections=False):
+                    continue
+                value = snapshot(instance, action)
+                if value is not None:
+                    _pending(session).setdefault(index, []).append((action, value))
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    for index, changes in pending.items():
+        _, _, apply = _trackers[index]
+        try:
+            apply(changes)
+        except Exception as e:
+            # The commit already succeeded; a failing listener must not surface as a request error
+            logger.error(f"Post-commit listener {apply!r} failed: {e}")
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,27 @@
+# ---------------------------------------------
+# app/core/pagination.py - Keyset (cursor) pagination helpers
+# ---------------------------------------------
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+def encode_cursor(created_at: datetime, record_id: int) -> str:
+    """Encode a (created_at, id) keyset position as an opaque URL-safe cursor"""
+    payload = json.dumps(
+        {"c": created_at.isoformat(), "i": record_id},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode an opaque cursor back into its (created_at, id) keyset position
+
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
@@ -0,0 +1,167 @@
+# ---------------------------------------------
+# app/core/replicas.py - Read-replica routing
+# ---------------------------------------------
+"""
+Sessions for read-only work, routed to read replicas (READ_REPLICA_URLS).
+
+GET endpoints take their AsyncSession from get_async_read_db
+(app/api/deps.py), which asks replica_router for one. Each session goes to
+one replica, picked round-robin or at random weighted by the inverse of
+its recent statement latency (READ_REPLICA_STRATEGY). Replicas lag the primary, so a client that has
+just written reads from the primary for READ_YOUR_WRITES_SECONDS: write
+sessions (get_audited_db) set a cookie carrying that deadline, which every
+worker process honours. Without replicas every session comes from the
+primary.
+"""
+
+import time
+import random
+import itertools
+import logging
+from typing import List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, ReadSessionLocal, to_async_url
+from app.core.metrics import instrument_engine, instrumented_pool
+
+logger = logging.getLogger(__name__)
+
+REPLICA_STRATEGIES = ("round_robin", "least_latency")
+READ_PRIMARY_COOKIE = "read_primary_until"
+LATENCY_SMOOTHING = 0.2  # Weight of the newest statement in a replica's moving average
+MIN_LATENCY_MS = 0.01  # Floor for least_latency weights, so a near-zero average cannot take every session
+
+_STARTED_KEY = "_replica_statement_started"
+
+class Replica:
+    """One read replica: its sync and async engines and a moving average of statement latency"""
+
+    def __init__(self, name: str, engine, async_engine):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.session_factory = sessionmaker(bind=engine, autoflush=False)
+        self.async_session_factory = async_sessionmaker(
+            bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+        )
+        self.latency_ms: Optional[float] = None  # None until the first statement
+        for sync_engine in (engine, async_engine.sync_engine):
+            event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get(_STARTED_KEY)
+        if started:
+            self.record_latency((time.perf_counter() - started.pop()) * 1000)
+
+    def record_latency(self, elapsed_ms: float):
+        if self.latency_ms is None:
+            self.latency_ms = elapsed_ms
+        else:
+            self.latency_ms += LATENCY_SMOOTHING * (elapsed_ms - self.latency_ms)
+
+    @classmethod
+    def from_url(cls, url: str, name: str) -> "Replica":
+        """Pooled sync and async engines for a replica's (sync driver) DATABASE_URL"""
+        if url.startswith("sqlite"):
+            connect_args, pool_options = {"check_same_thread": False}, {}
+        else:
+            connect_args, pool_options = {}, {"pool_pre_ping": True, "pool_recycle": 300}
+        engine = create_engine(
+            url, connect_args=connect_args, poolclass=instrumented_pool(QueuePool, name),
+            echo=settings.DEBUG, **pool_options
+        )
+        async_engine = create_async_engine(
+            to_async_url(url),
+            poolclass=instrumented_pool(AsyncAdaptedQueuePool, f"{name}-async"),
+            pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW,
+            echo=settings.DEBUG, **pool_options
+        )
+        instrument_engine(engine, name)
+        instrument_engine(async_engine, f"{name}-async")
+        return cls(name, engine, async_engine)
+
+class ReplicaRouter:
+    """Hands out read sessions on a replica, or on the primary when there is none or it must"""
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        strategy: str = "round_robin",
+        primary_session_factory=ReadSessionLocal,
+        primary_async_session_factory=AsyncSessionLocal,
+        rng: Optional[random.Random] = None,
+    ):
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Unknown replica strategy '{strategy}' (choose from {', '.join(REPLICA_STRATEGIES)})")
+        self.replicas = replicas
+        self.strategy = strategy
+        self.primary_session_factory = primary_session_factory
+        self.primary_async_session_factory = primary_async_session_factory
+        self._turns = itertools.count()
+        self._rng = rng or random.Random()
+
+    def pick(self) -> Optional[Replica]:
+        """Replica for the next session (None: use the primary)"""
+        if not self.replicas:
+            return None
+        if self.strategy == "least_latency":
+            # Unmeasured replicas first, so every replica gets an estimate
+            for replica in self.replicas:
+                if replica.latency_ms is None:
+                    return replica
+            # Weighted rather than always the fastest: a replica that was slow still
+            # gets some sessions, so its average follows it when it recovers
+            weights = [1.0 / max(replica.latency_ms, MIN_LATENCY_MS) for replica in self.replicas]
+            return self._rng.choices(self.replicas, weights)[0]
+        return self.replicas[next(self._turns) % len(self.replicas)]
+
+    def session_factory(self, use_primary: bool = False):
+        """Sync session factory on one replica (or the primary), for several sessions that must agree"""
+        replica = None if use_primary else self.pick()
+        return replica.session_factory if replica else self.primary_session_factory
+
+    def session(self, use_primary: bool = False):
+        """New sync read session (caller closes it)"""
+        replica = None if use_primary else self.pick()
+        db = (replica.session_factory if replica else self.primary_session_factory)()
+        db.info["replica"] = replica.name if replica else None
+        return db
+
+    def async_session(self, use_primary: bool = False) -> AsyncSession:
+        """New async read session (use as an async context manager)"""
+        replica = None if use_primary else self.pick()
+        db = (replica.async_session_factory if replica else self.primary_async_session_factory)()
+        db.info["replica"] = replica.name if replica else None
+        return db
+
+    async def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+            await replica.async_engine.dispose()
+
+def read_primary_until(cookie: Optional[str]) -> float:
+    """Deadline (epoch seconds) from a READ_PRIMARY_COOKIE value; 0 if absent or malformed"""
+    try:
+        return float(cookie) if cookie else 0.0
+    except ValueError:
+        return 0.0
+
+def must_read_primary(cookie: Optional[str], now: Optional[float] = None) -> bool:
+    """Whether a client with this READ_PRIMARY_COOKIE still has to read its own writes"""
+    return read_primary_until(cookie) > (time.time() if now is None else now)
+
+replica_router = ReplicaRouter(
+    [Replica.from_url(url, f"replica{index}") for index, url in enumerate(settings.read_replica_urls_list, 1)],
+    settings.READ_REPLICA_STRATEGY,
+)
+if replica_router.replicas:
+    logger.info(f"Read replicas: {len(replica_router.replicas)} ({settings.READ_REPLICA_STRATEGY})")
@@ -0,0 +1,74 @@
+# ---------------------------------------------
+# app/core/responses.py - Fast JSON responses
+# ---------------------------------------------
+"""
+Faster JSON response paths.
+
+FastJSONResponse is the app's default response class (FAST_JSON_ENABLED):
+JSONResponse rendered with orjson when it is installed, stdlib json
+otherwise. What FastAPI hands it has already been through the response
+model's JSON-mode serialization, so Decimal and date values arrive as
+strings; _default() covers content built by hand the same way Pydantic
+would (Decimal -> str, date/datetime -> ISO 8601).
+
+serialized_response() is for large lists: the ORM objects are validated by
+a cached TypeAdapter and dumped straight to JSON bytes by pydantic-core,
+skipping FastAPI's validate -> dump to Python -> json.dumps round trip. The
+route keeps its response_model for the OpenAPI schema.
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # Optional dependency; fall back to the stdlib encoder
+    orjson = None
+
+def _default(value: Any):
+    """Types orjson / json cannot encode themselves, encoded as Pydantic's JSON mode does"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson (stdlib json when orjson is not installed)"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+@lru_cache(maxsize=None)
+def type_adapter(response_type) -> TypeAdapter:
+    """TypeAdapter for a response type, built once (building one compiles its schema)"""
+    return TypeAdapter(response_type)
+
+def serialized_response(response_type, content: Any, response: Optional[Response] = None) -> Response:
+    """JSON response for content (ORM objects, dicts) validated as response_type
+
+    response: the handler's injected Response, whose status code and
+    headers (ETag, cookies, ...) are carried over; FastAPI ignores it once
+    the handler returns a Response of its own.
+    """
+    adapter = type_adapter(response_type)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    fast = Response(
+        content=body,
+        status_code=(response.status_code if response is not None and response.status_code else 200),
+        media_type="application/json",
+    )
+    if response is not None:
+        fast.raw_headers.extend(response.raw_headers)
+    return fast
@@ -0,0 +1,7 @@
+# app/integrations/__init__.py
+"""
+Clients for external systems (Bloomberg, CRD, IVP, Okta)
+
+Each integration lives in its own package and is only imported by the
+services that use it; nothing here talks to the network at import time.
+"""
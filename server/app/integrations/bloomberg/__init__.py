@@ -0,0 +1,22 @@
+# app/integrations/bloomberg/__init__.py
+"""
+Bloomberg market data: the price provider interface, the HTTP client and a
+mock provider for development and tests
+"""
+
+from .client import PriceQuote, PriceProvider, BloombergClient
+from .mock import MockPriceProvider
+from .exceptions import (
+    PriceProviderError, BloombergError, BloombergUnavailableError, BloombergResponseError
+)
+
+__all__ = [
+    "PriceQuote",
+    "PriceProvider",
+    "BloombergClient",
+    "MockPriceProvider",
+    "PriceProviderError",
+    "BloombergError",
+    "BloombergUnavailableError",
+    "BloombergResponseError",
+]
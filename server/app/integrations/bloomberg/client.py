@@ -0,0 +1,115 @@
+# app/integrations/bloomberg/client.py
+"""
+Price provider interface and the Bloomberg HTTP client
+
+A provider answers one question: the latest prices for a batch of tickers.
+Caching, request coalescing and batching live in the price service
+(app/services/price_service.py), so providers stay stateless.
+
+BloombergClient talks to the Bloomberg price gateway at BLOOMBERG_API_URL:
+
+    GET {BLOOMBERG_API_URL}/prices?tickers=AAPL,MSFT
+    Authorization: Bearer {BLOOMBERG_API_KEY}
+
+    {"prices": [{"ticker": "AAPL", "price": "187.4400",
+                 "currency": "USD", "as_of": "2025-03-14T15:09:26Z"}, ...]}
+
+Tickers the gateway does not know are left out of "prices".
+"""
+
+import logging
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.integrations.bloomberg.exceptions import (
+    BloombergResponseError, BloombergUnavailableError
+)
+
+logger = logging.getLogger(__name__)
+
+class PriceQuote:
+    """Latest price of one ticker as reported by a provider"""
+
+    __slots__ = ("ticker", "price", "currency", "as_of")
+
+    def __init__(self, ticker: str, price: Decimal, currency: Optional[str] = None, as_of: Optional[datetime] = None):
+        self.ticker = ticker
+        self.price = price
+        self.currency = currency
+        self.as_of = as_of  # Provider's timestamp for the price, if it sends one
+
+    def __repr__(self):
+        return f"PriceQuote({self.ticker!r}, {self.price!r})"
+
+class PriceProvider:
+    """Source of prices; subclasses implement get_prices()"""
+
+    name = "provider"
+    max_batch_size = 100  # Most tickers get_prices() accepts at once
+
+    async def get_prices(self, tickers: List[str]) -> Dict[str, PriceQuote]:
+        """Quotes for the tickers it knows, keyed by ticker
+
+        Raises PriceProviderError when no answer could be obtained.
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """Release connections (called on shutdown)"""
+
+class BloombergClient(PriceProvider):
+    """Bloomberg price gateway over HTTP, one pooled connection set per process"""
+
+    name = "bloomberg"
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout_seconds: float = 5.0,
+                 max_batch_size: int = 100, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout_seconds = timeout_seconds
+        self.max_batch_size = max_batch_size
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        # Created on first use, on the event loop that serves requests
+        if self._client is None:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, headers=headers, timeout=self.timeout_seconds,
+                transport=self._transport
+            )
+        return self._client
+
+    async def get_prices(self, tickers: List[str]) -> Dict[str, PriceQuote]:
+        try:
+            response = await self._http().get("/prices", params={"tickers": ",".join(tickers)})
+        except httpx.HTTPError as e:
+            raise BloombergUnavailableError(f"Bloomberg request failed: {e!r}") from e
+
+        if response.status_code >= 500:
+            raise BloombergUnavailableError(f"Bloomberg returned {response.status_code}")
+        if response.status_code != 200:
+            raise BloombergResponseError(f"Bloomberg returned {response.status_code}: {response.text[:200]}")
+
+        try:
+            quotes = {}
+            for item in response.json()["prices"]:
+                as_of = item.get("as_of")
+                quotes[item["ticker"].upper()] = PriceQuote(
+                    ticker=item["ticker"].upper(),
+                    price=Decimal(str(item["price"])),
+                    currency=item.get("currency"),
+                    as_of=datetime.fromisoformat(as_of.replace("Z", "+00:00")) if as_of else None,
+                )
+            return quotes
+        except (KeyError, TypeError, ValueError, InvalidOperation) as e:
+            raise BloombergResponseError(f"Unreadable Bloomberg price payload: {e!r}") from e
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
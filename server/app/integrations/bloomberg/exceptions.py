@@ -0,0 +1,16 @@
+# app/integrations/bloomberg/exceptions.py
+"""
+Bloomberg-specific exceptions
+"""
+
+class PriceProviderError(Exception):
+    """A price provider could not return prices (any provider, not only Bloomberg)"""
+
+class BloombergError(PriceProviderError):
+    """Base exception for Bloomberg API failures"""
+
+class BloombergUnavailableError(BloombergError):
+    """Bloomberg did not answer: connection error, timeout or 5xx"""
+
+class BloombergResponseError(BloombergError):
+    """Bloomberg answered, but with an error status or a payload we cannot read"""
@@ -0,0 +1,62 @@
+# app/integrations/bloomberg/mock.py
+"""
+Mock price provider for development and tests
+
+Prices are deterministic per ticker (derived from a hash of the ticker), so
+the same ticker shows the same price across restarts and workers. Tests can
+pin prices, mark tickers unknown, add latency, make requests fail and
+inspect every batch that was requested.
+"""
+
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List
+
+from app.integrations.bloomberg.client import PriceProvider, PriceQuote
+from app.integrations.bloomberg.exceptions import BloombergUnavailableError
+
+class MockPriceProvider(PriceProvider):
+    """Deterministic fake prices with hooks for tests"""
+
+    name = "mock"
+
+    def __init__(self, latency_seconds: float = 0.0, unknown: Iterable[str] = (), max_batch_size: int = 100):
+        self.latency_seconds = latency_seconds
+        self.unknown = {ticker.upper() for ticker in unknown}
+        self.max_batch_size = max_batch_size
+        self.prices: Dict[str, Decimal] = {}
+        self.failures = 0  # Fail this many upcoming requests
+        self.calls: List[List[str]] = []  # Tickers of every request, in order
+
+    @staticmethod
+    def default_price(ticker: str) -> Decimal:
+        """A stable price between 5 and 505 for any ticker"""
+        digest = int(hashlib.sha1(ticker.encode()).hexdigest()[:8], 16)
+        return Decimal(500 * digest // 0xFFFFFFFF + 5) + Decimal(digest % 10000) / 10000
+
+    def set_price(self, ticker: str, price):
+        self.prices[ticker.upper()] = Decimal(str(price))
+
+    def fail_next(self, count: int = 1):
+        self.failures += count
+
+    async def get_prices(self, tickers: List[str]) -> Dict[str, PriceQuote]:
+        self.calls.append(list(tickers))
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        if self.failures:
+            self.failures -= 1
+            raise BloombergUnavailableError("Mock provider failure")
+
+        as_of = datetime.now(timezone.utc)
+        return {
+            ticker: PriceQuote(ticker, self.prices.get(ticker) or self.default_price(ticker), "USD", as_of)
+            for ticker in tickers
+            if ticker not in self.unknown
+        }
+
+    @property
+    def tickers_requested(self) -> int:
+        return sum(len(batch) for batch in self.calls)
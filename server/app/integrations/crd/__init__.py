@@ -0,0 +1,20 @@
+# app/integrations/crd/__init__.py
+"""
+Charles River (CRD) order management: the order gateway interface, the
+HTTP client and a local fake CRD server for development and tests
+"""
+
+from .client import CrdOrderResult, CrdOrderStatus, CrdGateway, CrdClient
+from .fake import FakeCrdServer
+from .exceptions import CrdError, CrdUnavailableError, CrdResponseError
+
+__all__ = [
+    "CrdOrderResult",
+    "CrdOrderStatus",
+    "CrdGateway",
+    "CrdClient",
+    "FakeCrdServer",
+    "CrdError",
+    "CrdUnavailableError",
+    "CrdResponseError",
+]
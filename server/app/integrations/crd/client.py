@@ -0,0 +1,190 @@
+# app/integrations/crd/client.py
+"""
+Order gateway interface and the CRD HTTP client
+
+A gateway answers two questions: did CRD take these orders, and how far
+have these orders executed? Queuing, batching, retries and polling live in
+the dispatcher and reconciler (app/services/crd_dispatcher.py,
+app/services/crd_reconciler.py), so gateways stay stateless.
+
+CrdClient talks to the CRD order API at CRD_API_URL:
+
+    POST {CRD_API_URL}/orders/bulk
+    Authorization: Bearer {CRD_API_KEY}
+
+    {"orders": [{"idempotency_key": "ticket-42-1", "order_id": 42, ...}, ...]}
+
+    {"results": [{"idempotency_key": "ticket-42-1", "status": "accepted",
+                  "crd_status": "Booked"},
+                 {"idempotency_key": "ticket-43-1", "status": "rejected",
+                  "error": "Unknown account"}, ...]}
+
+CRD remembers idempotency keys: an order sent again with a key it has seen
+is not booked twice, and its original result is returned with
+"duplicate": true. Resending a batch after a timeout is therefore safe.
+
+Execution state is read in bulk too (order ids are trade ticket ids):
+
+    GET {CRD_API_URL}/orders/status?order_ids=42,43
+
+    {"orders": [{"order_id": 42, "status": "Partially_Filled",
+                 "fill_price": "187.1000", "fill_quantity": "500",
+                 "filled_at": null}, ...]}
+
+Orders CRD does not know are left out of "orders".
+"""
+
+import logging
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.integrations.crd.exceptions import CrdResponseError, CrdUnavailableError
+
+logger = logging.getLogger(__name__)
+
+class CrdOrderResult:
+    """CRD's answer for one order of a bulk request"""
+
+    __slots__ = ("idempotency_key", "accepted", "crd_status", "error", "duplicate")
+
+    def __init__(self, idempotency_key: str, accepted: bool, crd_status: Optional[str] = None,
+                 error: Optional[str] = None, duplicate: bool = False):
+        self.idempotency_key = idempotency_key
+        self.accepted = accepted
+        self.crd_status = crd_status  # CRD's order status when accepted (e.g. "Booked")
+        self.error = error  # Rejection reason
+        self.duplicate = duplicate  # CRD had already seen the key
+
+    def __repr__(self):
+        return f"CrdOrderResult({self.idempotency_key!r}, accepted={self.accepted})"
+
+class CrdOrderStatus:
+    """Execution state of one order as reported by CRD"""
+
+    __slots__ = ("order_id", "status", "fill_price", "fill_quantity", "filled_at")
+
+    def __init__(self, order_id: int, status: str, fill_price: Optional[Decimal] = None,
+                 fill_quantity: Optional[Decimal] = None, filled_at: Optional[datetime] = None):
+        self.order_id = order_id
+        self.status = status  # CRD order status, e.g. "Working", "Partially_Filled", "Filled"
+        self.fill_price = fill_price  # Average execution price so far
+        self.fill_quantity = fill_quantity  # Quantity executed so far
+        self.filled_at = filled_at  # When the order completed
+
+    def __repr__(self):
+        return f"CrdOrderStatus({self.order_id!r}, {self.status!r})"
+
+def _parse_decimal(value) -> Optional[Decimal]:
+    return Decimal(str(value)) if value is not None else None
+
+def _parse_datetime(value) -> Optional[datetime]:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+class CrdGateway:
+    """Destination for trade ticket orders; subclasses implement submit_orders() and get_order_statuses()"""
+
+    name = "gateway"
+    max_batch_size = 50  # Most orders one request accepts
+
+    async def submit_orders(self, orders: List[dict]) -> Dict[str, CrdOrderResult]:
+        """Results for the orders CRD answered, keyed by idempotency key
+
+        Orders missing from the result were not processed and may be sent
+        again. Raises CrdError when no answer could be obtained.
+        """
+        raise NotImplementedError
+
+    async def get_order_statuses(self, order_ids: List[int]) -> Dict[int, CrdOrderStatus]:
+        """Execution state of the orders CRD knows, keyed by order id
+
+        Raises CrdError when no answer could be obtained.
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """Release connections (called on shutdown)"""
+
+class CrdClient(CrdGateway):
+    """CRD order API over HTTP, one pooled connection set per process"""
+
+    name = "crd"
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout_seconds: float = 10.0,
+                 max_batch_size: int = 50, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout_seconds = timeout_seconds
+        self.max_batch_size = max_batch_size
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        # Created on first use, on the event loop that runs the dispatcher
+        if self._client is None:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, headers=headers, timeout=self.timeout_seconds,
+                transport=self._transport
+            )
+        return self._client
+
+    async def submit_orders(self, orders: List[dict]) -> Dict[str, CrdOrderResult]:
+        try:
+            response = await self._http().post("/orders/bulk", json={"orders": orders})
+        except httpx.HTTPError as e:
+            raise CrdUnavailableError(f"CRD request failed: {e!r}") from e
+
+        self._check(response)
+        try:
+            results = {}
+            for item in response.json()["results"]:
+                key = item["idempotency_key"]
+                results[key] = CrdOrderResult(
+                    idempotency_key=key,
+                    accepted=item["status"] == "accepted",
+                    crd_status=item.get("crd_status"),
+                    error=item.get("error") or (None if item["status"] == "accepted" else item["status"]),
+                    duplicate=bool(item.get("duplicate")),
+                )
+            return results
+        except (KeyError, TypeError, ValueError) as e:
+            raise CrdResponseError(f"Unreadable CRD order payload: {e!r}") from e
+
+    async def get_order_statuses(self, order_ids: List[int]) -> Dict[int, CrdOrderStatus]:
+        try:
+            response = await self._http().get(
+                "/orders/status", params={"order_ids": ",".join(map(str, order_ids))}
+            )
+        except httpx.HTTPError as e:
+            raise CrdUnavailableError(f"CRD request failed: {e!r}") from e
+
+        self._check(response)
+        try:
+            statuses = {}
+            for item in response.json()["orders"]:
+                order_id = int(item["order_id"])
+                statuses[order_id] = CrdOrderStatus(
+                    order_id=order_id,
+                    status=item["status"],
+                    fill_price=_parse_decimal(item.get("fill_price")),
+                    fill_quantity=_parse_decimal(item.get("fill_quantity")),
+                    filled_at=_parse_datetime(item.get("filled_at")),
+                )
+            return statuses
+        except (KeyError, TypeError, ValueError, InvalidOperation) as e:
+            raise CrdResponseError(f"Unreadable CRD status payload: {e!r}") from e
+
+    @staticmethod
+    def _check(response: httpx.Response):
+        if response.status_code >= 500 or response.status_code == 429:
+            raise CrdUnavailableError(f"CRD returned {response.status_code}")
+        if response.status_code != 200:
+            raise CrdResponseError(f"CRD returned {response.status_code}: {response.text[:200]}")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
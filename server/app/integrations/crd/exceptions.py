@@ -0,0 +1,13 @@
+# app/integrations/crd/exceptions.py
+"""
+CRD-specific exceptions
+"""
+
+class CrdError(Exception):
+    """Base exception for CRD API failures"""
+
+class CrdUnavailableError(CrdError):
+    """CRD did not answer: connection error, timeout, 429 or 5xx"""
+
+class CrdResponseError(CrdError):
+    """CRD answered, but with an error status or a payload we cannot read"""
@@ -0,0 +1,156 @@
+# app/integrations/crd/fake.py
+"""
+Local fake CRD order API for development and tests
+
+Implements POST /orders/bulk and GET /orders/status as described in
+client.py, including idempotency keys: an order whose key was seen before
+is not booked again and gets its original result back with
+"duplicate": true. Booked orders report "Booked" until a test moves them
+on with set_status().
+
+In-process, point a CrdClient at it without a network hop:
+
+    server = FakeCrdServer()
+    gateway = server.client()  # CrdClient over httpx.ASGITransport
+
+Or run it as a server and set CRD_API_URL=http://localhost:8100 and
+CRD_ENABLED=true:
+
+    python -m app.integrations.crd.fake [--port 8100] [--latency-ms 50]
+
+Tests can reject orders, fill them, add latency, make requests fail and
+inspect every request and booked order.
+"""
+
+import asyncio
+import argparse
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.integrations.crd.client import CrdClient
+
+class FakeCrdServer:
+    """In-memory CRD order book behind a FastAPI app"""
+
+    def __init__(self, latency_seconds: float = 0.0, max_batch_size: int = 50, api_key: Optional[str] = None):
+        self.latency_seconds = latency_seconds
+        self.max_batch_size = max_batch_size
+        self.api_key = api_key
+        self.rejections: Dict[int, str] = {}  # order_id -> reason
+        self.results: Dict[str, dict] = {}  # idempotency_key -> result sent the first time
+        self.booked: Dict[int, dict] = {}  # order_id -> order, for accepted orders
+        self.executions: Dict[int, dict] = {}  # order_id -> reported status and fills
+        self.requests: List[List[str]] = []  # Idempotency keys of every request, in order
+        self.status_requests: List[List[int]] = []  # Order ids of every status request, in order
+        self.failures: List[int] = []  # Status codes for upcoming requests
+        self.in_flight = 0
+        self.max_in_flight = 0  # Most requests handled at once
+        self.app = self._build_app()
+
+    def reject(self, order_ids: Iterable[int], reason: str = "Rejected by CRD"):
+        for order_id in order_ids:
+            self.rejections[order_id] = reason
+
+    def set_status(self, order_id: int, status: str, fill_price=None, fill_quantity=None,
+                   filled_at: Optional[datetime] = None):
+        """Report new execution state for a booked order"""
+        self.executions[order_id] = {
+            "order_id": order_id,
+            "status": status,
+            "fill_price": str(fill_price) if fill_price is not None else None,
+            "fill_quantity": str(fill_quantity) if fill_quantity is not None else None,
+            "filled_at": filled_at.isoformat() if filled_at is not None else None,
+        }
+
+    def fail_next(self, count: int = 1, status_code: int = 503):
+        self.failures.extend([status_code] * count)
+
+    def transport(self) -> httpx.ASGITransport:
+        return httpx.ASGITransport(app=self.app)
+
+    def client(self, **options) -> CrdClient:
+        """CrdClient talking to this server in-process"""
+        options.setdefault("max_batch_size", self.max_batch_size)
+        return CrdClient("http://fake-crd", transport=self.transport(), **options)
+
+    def _result(self, order: dict) -> dict:
+        order_id = order["order_id"]
+        if order_id in self.rejections:
+            return {"idempotency_key": order["idempotency_key"], "status": "rejected",
+                    "error": self.rejections[order_id]}
+        self.booked[order_id] = order
+        self.executions.setdefault(order_id, {"order_id": order_id, "status": "Booked"})
+        return {"idempotency_key": order["idempotency_key"], "status": "accepted", "crd_status": "Booked"}
+
+    async def submit(self, request: Request):
+        if self.api_key and request.headers.get("authorization") != f"Bearer {self.api_key}":
+            return JSONResponse({"detail": "Invalid API key"}, status_code=401)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency_seconds:
+                await asyncio.sleep(self.latency_seconds)
+            try:
+                orders = (await request.json())["orders"]
+                keys = [order["idempotency_key"] for order in orders]
+            except (KeyError, TypeError, ValueError):
+                return JSONResponse({"detail": "Expected {\"orders\": [...]}"}, status_code=400)
+            self.requests.append(keys)
+            if self.failures:
+                return JSONResponse({"detail": "CRD unavailable"}, status_code=self.failures.pop(0))
+            if len(orders) > self.max_batch_size:
+                return JSONResponse({"detail": f"At most {self.max_batch_size} orders per request"}, status_code=413)
+
+            results = []
+            for order in orders:
+                key = order["idempotency_key"]
+                if key in self.results:
+                    results.append({**self.results[key], "duplicate": True})
+                else:
+                    self.results[key] = self._result(order)
+                    results.append(self.results[key])
+            return {"results": results}
+        finally:
+            self.in_flight -= 1
+
+    async def statuses(self, request: Request):
+        if self.api_key and request.headers.get("authorization") != f"Bearer {self.api_key}":
+            return JSONResponse({"detail": "Invalid API key"}, status_code=401)
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        try:
+            order_ids = [int(value) for value in request.query_params.get("order_ids", "").split(",") if value]
+        except ValueError:
+            return JSONResponse({"detail": "order_ids must be comma-separated integers"}, status_code=400)
+        self.status_requests.append(order_ids)
+        if self.failures:
+            return JSONResponse({"detail": "CRD unavailable"}, status_code=self.failures.pop(0))
+        if len(order_ids) > self.max_batch_size:
+            return JSONResponse({"detail": f"At most {self.max_batch_size} orders per request"}, status_code=413)
+        return {"orders": [self.executions[order_id] for order_id in order_ids if order_id in self.executions]}
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="Fake CRD", docs_url=None, redoc_url=None)
+        app.add_api_route("/orders/bulk", self.submit, methods=["POST"])
+        app.add_api_route("/orders/status", self.statuses, methods=["GET"])
+        return app
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake CRD order API")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay before answering each request")
+    parser.add_argument("--api-key", default=None, help="Require this bearer token")
+    args = parser.parse_args()
+
+    server = FakeCrdServer(latency_seconds=args.latency_ms / 1000, api_key=args.api_key)
+    uvicorn.run(server.app, host="127.0.0.1", port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
 # ---------------------------------------------
 # app/main.py - FastAPI app entry point
 # ---------------------------------------------
-from fastapi import FastAPI
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 from app.core.config import settings
-from app.core.database import engine, test_connection
+from app.core.database import engine, async_engine, test_connection
+from app.core.replicas import replica_router
+from app.core.health import readiness_check, integrity_check
+from app.core.metrics import CONTENT_TYPE_LATEST, mark_process_dead, render_metrics
+from app.core.responses import FastJSONResponse
+from app.middleware.metrics import RequestMetricsMiddleware
+from app.middleware.sql_instrumentation import SqlInstrumentationMiddleware
+from app.services.audit_service import audit_writer
+from app.services.crd_dispatcher import crd_dispatcher
+from app.services.crd_reconciler import crd_reconciler
+from app.services.event_hub import event_hub
+from app.services.price_service import price_service
+from app.services.search_index import load_security_search_index, refresh_security_search_index
 from app.api.v1 import api_router
 
 # Configure logging
@@ -32,6 +47,11 @@ def print_startup_info():
     print(f"\n🌐 Server URLs:")
     print(f"   • Main API: http://localhost:8000")
     print(f"   • Health Check: http://localhost:8000/health")
+    print(f"   • Liveness / Readiness: http://localhost:8000/health/live, /health/ready")
+    if settings.METRICS_ENABLED:
+        print(f"   • Metrics: http://localhost:8000/metrics")
+    if settings.HEALTH_INTEGRITY_CHECK_ENABLED:
+        print(f"   • Integrity Check: http://localhost:8000/health/integrity")
     
     if settings.ENVIRONMENT == "development":
         print(f"   • Swagger UI: http://localhost:8000/docs")
@@ -42,16 +62,29 @@ def print_startup_info():
     print(f"   • GET  /api/v1/securities/           - List all securities")
     print(f"   • GET  /api/v1/securities/search     - Search securities")
     print(f"   • GET  /api/v1/funds/                - List all funds")
-    print(f"   • GET  /api/v1/recommendations/      - List all recommendations")
+    print(f"   • GET  /api/v1/recommendations/      - List recommendations (cursor-paginated)")
     print(f"   • GET  /api/v1/recommendations/drafts - List draft recommendations")
+    print(f"   • GET  /api/v1/recommendations/export - Stream recommendations (NDJSON/CSV)")
     print(f"   • POST /api/v1/recommendations/      - Create recommendation")
+    print(f"   • POST /api/v1/recommendations/bulk  - Create recommendations in bulk")
+    print(f"   • POST /api/v1/recommendations/transitions - Submit/approve/reject in bulk")
     print(f"   • PUT  /api/v1/recommendations/{{id}} - Update recommendation")
     print(f"   • DELETE /api/v1/recommendations/{{id}} - Delete recommendation")
+    if settings.EVENT_STREAM_ENABLED:
+        print(f"   • GET  /api/v1/events/stream         - Status change events (SSE)")
+    print(f"   • GET  /api/v1/prices/?tickers=...   - Latest prices (cached)")
+    print(f"   • POST /api/v1/trade_tickets/allocate - Create tickets from approved recommendations")
+    print(f"   • POST /api/v1/trade_tickets/{{id}}/submit - Queue trade ticket for CRD")
     
     print(f"\n🔧 Configuration:")
     print(f"   • File uploads: {settings.MAX_FILE_SIZE_MB}MB max")
     print(f"   • Upload directory: {settings.UPLOAD_DIR}")
     print(f"   • Redis: {settings.REDIS_URL}")
+    replicas = len(settings.read_replica_urls_list)
+    print(f"   • Prices: {price_service.provider.name if price_service.enabled else 'unavailable (no provider)'}")
+    print(f"   • CRD orders: {crd_dispatcher.gateway.name if crd_dispatcher.enabled else 'queued only (no gateway)'}")
+    print(f"   • CRD fills: {'polled' if crd_reconciler.enabled and settings.CRD_RECONCILE_ENABLED else 'not reconciled'}")
+    print(f"   • Read replicas: {f'{replicas} ({settings.READ_REPLICA_STRATEGY})' if replicas else 'none (primary only)'}")
     
     # Integration status
     print(f"\n🔌 Integrations:")
@@ -82,10 +115,47 @@ async def lifespan(app: FastAPI):
     logger.info("Starting OrbiMed Portal API...")
     print_startup_info()
     
+    if settings.AUDIT_ENABLED:
+        audit_writer.start()
+    
+    if settings.EVENT_STREAM_ENABLED:
+        event_hub.start()
+    
+    crd_dispatcher.start()
+    if settings.CRD_RECONCILE_ENABLED:
+        crd_reconciler.start()
+    
+    background_tasks = []
+    if settings.SECURITY_SEARCH_INDEX_ENABLED:
+        try:
+            await run_in_threadpool(load_security_search_index)
+        except Exception as e:
+            # Search falls back to SQL until the periodic refresh succeeds
+            logger.error(f"Could not build security search index: {e}")
+        if settings.SECURITY_SEARCH_INDEX_REFRESH_SECONDS > 0:
+            background_tasks.append(asyncio.create_task(
+                refresh_security_search_index(settings.SECURITY_SEARCH_INDEX_REFRESH_SECONDS)
+            ))
+    
+    if price_service.enabled and settings.PRICE_REFRESH_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(
+            price_service.run_refresh_loop(settings.PRICE_REFRESH_INTERVAL_SECONDS)
+        ))
+    
     yield
     
     # Shutdown
     logger.info("Shutting down OrbiMed Portal API...")
+    for task in background_tasks:
+        task.cancel()
+    await event_hub.stop()
+    await crd_reconciler.stop()
+    await crd_dispatcher.stop()  # Closes the gateway both use
+    await price_service.close()
+    await run_in_threadpool(audit_writer.stop)
+    await async_engine.dispose()
+    await replica_router.dispose()
+    mark_process_dead()
     print("\n👋 OrbiMed Portal API shutting down...")
 
 app = FastAPI(
@@ -94,6 +164,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
+    default_response_class=FastJSONResponse if settings.FAST_JSON_ENABLED else JSONResponse,
     lifespan=lifespan
 )
 
@@ -106,6 +177,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL statement count / DB time (Server-Timing header, log line, N+1 warnings)
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    app.add_middleware(
+        SqlInstrumentationMiddleware,
+        n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+        server_timing=settings.SQL_SERVER_TIMING_HEADER,
+    )
+
+# Request latency per route template for GET /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -119,6 +202,9 @@ async def root():
         "docs_url": "/docs" if settings.ENVIRONMENT == "development" else None,
         "endpoints": {
             "health": "/health",
+            "liveness": "/health/live",
+            "readiness": "/health/ready",
+            "metrics": "/metrics" if settings.METRICS_ENABLED else None,
             "docs": "/docs" if settings.ENVIRONMENT == "development" else None,
             "api": "/api/v1"
         }
@@ -126,8 +212,8 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint with detailed status"""
-    db_connected = test_connection()
+    """Health check endpoint with detailed status (uses the cached readiness check)"""
+    db_connected = (await run_in_threadpool(readiness_check.get)).ok
     
     return {
         "status": "healthy" if db_connected else "unhealthy",
@@ -140,4 +226,54 @@ async def health_check():
             "ivp": settings.IVP_ENABLED,
             "bloomberg": settings.BLOOMBERG_ENABLED
         }
-    }
\ No newline at end of file
+    }
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe - the process is up and serving requests; never touches the database"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness_probe(response: Response):
+    """Readiness probe - cached SELECT 1, re-run at most every HEALTH_CHECK_CACHE_SECONDS"""
+    result = await run_in_threadpool(readiness_check.get)
+    if not result.ok:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    
+    return {
+        "status": "ready" if result.ok else "not_ready",
+        "database": result.to_dict()
+    }
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics: request latency, connection pools, cache hit/miss (all workers)"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/health/integrity")
+async def integrity_status(background_tasks: BackgroundTasks):
+    """Deep integrity check (opt-in)
+    
+    Returns the last cached result immediately. When it is older than
+    HEALTH_INTEGRITY_CHECK_INTERVAL_SECONDS a refresh is scheduled in the
+    background, so the full scan never runs on the request path.
+    """
+    if not settings.HEALTH_INTEGRITY_CHECK_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Integrity check is disabled (set HEALTH_INTEGRITY_CHECK_ENABLED=true)"
+        )
+    
+    refresh_scheduled = integrity_check.is_stale()
+    if refresh_scheduled:
+        background_tasks.add_task(integrity_check.get)
+    
+    result = integrity_check.result
+    return {
+        "status": "pending" if result is None else ("ok" if result.ok else "failed"),
+        "refresh_scheduled": refresh_scheduled,
+        "interval_seconds": settings.HEALTH_INTEGRITY_CHECK_INTERVAL_SECONDS,
+        "result": result.to_dict() if result else None
+    }
@@ -0,0 +1,8 @@
+# app/middleware/__init__.py
+"""
+ASGI middleware
+
+Pure ASGI (not BaseHTTPMiddleware) so context variables set by a middleware
+are visible to the endpoint and its threadpool work, and streaming
+responses are passed through untouched.
+"""
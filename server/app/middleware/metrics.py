@@ -0,0 +1,44 @@
+# app/middleware/metrics.py
+"""
+Request latency histogram (app/core/metrics.py) per route template
+
+Routes are labelled by their template (/api/v1/recommendations/{recommendation_id}),
+not the raw path, so ids and query strings do not create new series;
+requests that match no route share the "unmatched" label.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import REQUEST_LATENCY
+
+class RequestMetricsMiddleware:
+    """Observe every HTTP request's latency by method, route template and status"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code)
+            ).observe(time.perf_counter() - started)
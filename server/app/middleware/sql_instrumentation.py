@@ -0,0 +1,145 @@
+# app/middleware/sql_instrumentation.py
+"""
+Per-request SQL instrumentation
+
+SqlInstrumentationMiddleware puts a RequestSqlStats in a context variable
+for the duration of each HTTP request. Cursor-execute hooks registered on
+the Engine class (so they see the sync engine, the async engine's
+underlying sync engine, and any other engine) add each statement's count,
+duration and shape to it. Work outside a request - background tasks, the
+audit writer thread - finds no stats object and is not recorded.
+
+Each response gets a Server-Timing header (db, app, total) and one log
+line with method, path, status, statement count, DB time and total time.
+Statement shapes - the SQL text with whitespace and IN-list placeholders
+collapsed - that repeat SQL_N_PLUS_ONE_THRESHOLD or more times in one
+request are logged as a likely N+1 at WARNING.
+
+Timings for a StreamingResponse body are logged but not in the header,
+which is sent before the body.
+"""
+
+import re
+import time
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = r"(?:\?|:\w+|%\(\w+\)s|%s)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """Statement text with whitespace normalized and placeholder lists collapsed
+
+    Expanded IN lists and multi-row VALUES differ only in their number of
+    placeholders, so they share a shape.
+    """
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+class RequestSqlStats:
+    """Statements executed while handling one request"""
+
+    __slots__ = ("started", "statements", "db_seconds", "shapes")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.statements += 1
+        self.db_seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Shapes executed at least threshold times, most frequent first"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        total_ms = (time.perf_counter() - self.started) * 1000
+        db_ms = self.db_seconds * 1000
+        plural = "" if self.statements == 1 else "s"
+        return (
+            f'db;dur={db_ms:.1f};desc="{self.statements} statement{plural}", '
+            f"app;dur={max(total_ms - db_ms, 0):.1f}, total;dur={total_ms:.1f}"
+        )
+
+_request_stats: ContextVar[Optional[RequestSqlStats]] = ContextVar("request_sql_stats", default=None)
+
+def current_sql_stats() -> Optional[RequestSqlStats]:
+    """Stats for the request being handled, or None outside a request"""
+    return _request_stats.get()
+
+_STARTED_KEY = "_sql_instrumentation_started"
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    started = conn.info.get(_STARTED_KEY)
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop())
+
+class SqlInstrumentationMiddleware:
+    """Record statement count and DB time per request; Server-Timing header and log line"""
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 10, server_timing: bool = True):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSqlStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            self._log(scope, status_code, stats)
+
+    def _log(self, scope: Scope, status_code: int, stats: RequestSqlStats):
+        total_ms = (time.perf_counter() - stats.started) * 1000
+        fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "statements": stats.statements,
+            "db_ms": round(stats.db_seconds * 1000, 1),
+            "total_ms": round(total_ms, 1),
+        }
+        logger.info(" ".join(f"{key}={value}" for key, value in fields.items()), extra={"sql": fields})
+
+        for shape, count in stats.repeated_shapes(self.n_plus_one_threshold):
+            logger.warning(
+                f"Possible N+1: {scope['method']} {scope['path']} ran {count}x: {shape[:300]}",
+                extra={"sql": {**fields, "repeated": count, "shape": shape}}
+            )
@@ -8,7 +8,7 @@ from app.models.securities import Security
 from app.models.strategies import Strategy
 from app.models.funds import Fund
 from app.models.recommendations import TradeRecommendation
-from app.models.trade_tickets import TradeTicket
+from app.models.trade_tickets import TradeTicket, CrdOutbox
 from app.models.files import FileAttachment
 from app.models.audit import AuditTrail, RecommendationStatusHistory, TradeTicketStatusHistory
 from app.models.relationships import RecommendationStrategy, RecommendationFund
@@ -20,7 +20,7 @@ __all__ = [
     "Strategy",
     "Fund", 
     "TradeRecommendation",
-    "TradeTicket",
+    "TradeTicket", "CrdOutbox",
     "FileAttachment",
     "AuditTrail", "RecommendationStatusHistory", "TradeTicketStatusHistory",
     "RecommendationStrategy", "RecommendationFund"
@@ -9,7 +9,8 @@ from app.models.base import BaseModel
 class AuditTrail(BaseModel):
     __tablename__ = "audit_trail"
     
-    id = Column(BigInteger, primary_key=True, index=True)  # Use BigInteger for audit
+    # BigInteger for audit; SQLite only autoincrements an INTEGER PRIMARY KEY
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     table_name = Column(String(100), nullable=False, index=True)
     record_id = Column(Integer, nullable=False, index=True)
     action_type = Column(String(20), nullable=False, index=True)  # INSERT, UPDATE, DELETE
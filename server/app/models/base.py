@@ -2,17 +2,22 @@
 # app/models/base.py - Base model with common fields
 # ---------------------------------------------
 from sqlalchemy import Column, Integer, DateTime, String
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
 from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declared_attr
 from app.core.database import Base
 
+# SQLite stores func.now() defaults as 'YYYY-MM-DD HH:MM:SS'; bind parameters in the
+# same format so equality/range comparisons (e.g. keyset cursors) match stored values
+Timestamp = DateTime().with_variant(SQLITE_DATETIME(truncate_microseconds=True), "sqlite")
+
 class BaseModel(Base):
     """Base model with common fields for all tables"""
     __abstract__ = True
     
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(Timestamp, default=func.now(), nullable=False)
+    updated_at = Column(Timestamp, default=func.now(), onupdate=func.now(), nullable=False)
     
     @declared_attr
     def __tablename__(cls):
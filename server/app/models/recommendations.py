@@ -1,7 +1,7 @@
 # ---------------------------------------------
 # app/models/recommendations.py - Trade recommendation models
 # ---------------------------------------------
-from sqlalchemy import Column, String, Integer, ForeignKey, Text, Boolean, DateTime, DECIMAL, Date, CheckConstraint
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, Boolean, DateTime, DECIMAL, Date, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.base import BaseModel
@@ -23,6 +23,8 @@ class TradeRecommendation(BaseModel):
     approved_at = Column(DateTime)
     approval_notes = Column(Text)
     is_draft = Column(Boolean, default=True, nullable=False)
+    # Bumped by every write; updates are conditional on the version the client read
+    version = Column(Integer, default=1, nullable=False)
     
     # Relationships
     analyst = relationship("User", back_populates="recommendations", foreign_keys=[analyst_id])
@@ -40,5 +42,12 @@ class TradeRecommendation(BaseModel):
         CheckConstraint("analyst_score BETWEEN 1 AND 10", name='check_analyst_score'),
         CheckConstraint("time_horizon IN ('Trade', 'Short Term', 'Long Term', 'Custom Date')", name='check_time_horizon'),
         CheckConstraint("status IN ('Draft', 'Proposed', 'Approved', 'Rejected')", name='check_trade_recommendation_status'),
+        # Keyset pagination indexes (see schema.sql)
+        Index('IX_trade_recommendations_analyst_status', 'analyst_id', 'status', 'created_at'),
+        Index('IX_trade_recommendations_status_date', 'status', 'created_at'),
+        Index('IX_trade_recommendations_created', 'created_at', 'id'),
         {'schema': None},
     )
+    
+    # ORM flushes check and bump version too; Core updates must set version + 1 themselves
+    __mapper_args__ = {"version_id_col": version}
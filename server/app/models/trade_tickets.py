@@ -1,9 +1,9 @@
 # ---------------------------------------------
 # app/models/trade_tickets.py - Trade ticket models
 # ---------------------------------------------
-from sqlalchemy import Column, String, Integer, ForeignKey, Text, Boolean, DateTime, DECIMAL, CheckConstraint
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, Boolean, DateTime, DECIMAL, CheckConstraint, Index
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, Timestamp
 
 class TradeTicket(BaseModel):
     __tablename__ = "trade_tickets"
@@ -39,6 +39,7 @@ class TradeTicket(BaseModel):
     security = relationship("Security", back_populates="trade_tickets")
     fund = relationship("Fund", back_populates="trade_tickets")
     status_history = relationship("TradeTicketStatusHistory", back_populates="trade_ticket")
+    crd_outbox = relationship("CrdOutbox", back_populates="trade_ticket", uselist=False)
     
     # Constraints
     __table_args__ = (
@@ -46,4 +47,36 @@ class TradeTicket(BaseModel):
         CheckConstraint("status IN ('Draft', 'Submitted_to_CRD', 'Booked', 'Working', 'Partially_Filled', 'Filled', 'Cancelled', 'CRD_Error')", name='check_trade_ticket_status'),
         CheckConstraint("allocation_percentage IS NULL OR allocation_percentage BETWEEN 0 AND 100", name='check_allocation_percentage'),
         {'schema': None},
-    )
\ No newline at end of file
+    )
+
+class CrdOutbox(BaseModel):
+    """CRD submission of a trade ticket waiting to be (or already) delivered
+    
+    Written in the same transaction as the ticket's move to Submitted_to_CRD
+    (transactional outbox) and sent by app/services/crd_dispatcher.py. One
+    row per ticket; resubmitting after CRD_Error reuses it with the next
+    submission number, and so a new idempotency key.
+    """
+    __tablename__ = "crd_outbox"
+    
+    trade_ticket_id = Column(Integer, ForeignKey("trade_tickets.id"), nullable=False, unique=True)
+    submission = Column(Integer, nullable=False, default=1)  # Times the ticket was submitted
+    idempotency_key = Column(String(100), nullable=False, unique=True)  # CRD ignores repeats of a key
+    payload = Column(Text, nullable=False)  # JSON order as of submission
+    status = Column(String(20), nullable=False, default='Pending')
+    attempts = Column(Integer, nullable=False, default=0)  # Failed deliveries so far
+    next_attempt_at = Column(Timestamp, nullable=False)
+    claimed_until = Column(Timestamp)  # A dispatcher is sending it; others skip it until then
+    claim_token = Column(String(36))  # Which dispatcher claimed it
+    last_error = Column(Text)
+    sent_at = Column(Timestamp)
+    
+    # Relationships
+    trade_ticket = relationship("TradeTicket", back_populates="crd_outbox")
+    
+    # Constraints
+    __table_args__ = (
+        CheckConstraint("status IN ('Pending', 'Sent', 'Failed')", name='check_crd_outbox_status'),
+        Index("ix_crd_outbox_due", "status", "next_attempt_at"),
+        {'schema': None},
+    )
@@ -0,0 +1,14 @@
+# app/schemas/prices.py
+from pydantic import BaseModel
+from typing import Optional
+from decimal import Decimal
+from datetime import datetime
+
+class PriceResponse(BaseModel):
+    ticker: str
+    price: Decimal
+    currency: Optional[str] = None
+    as_of: Optional[datetime] = None  # Provider's timestamp
+    age_seconds: float  # Time since this server fetched the price
+    stale: bool  # Older than PRICE_CACHE_TTL_SECONDS (the provider could not be reached)
+    source: str  # Provider that quoted it: bloomberg, or mock for made-up development prices
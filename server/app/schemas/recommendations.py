@@ -1,6 +1,6 @@
 
 # app/schemas/recommendations.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime, date
 from decimal import Decimal
@@ -20,6 +20,50 @@ class RecommendationCreate(BaseModel):
     strategy_ids: List[int] = []
     fund_ids: List[int] = []
 
+# Largest basket accepted by POST /recommendations/bulk
+MAX_BULK_RECOMMENDATIONS = 500
+
+class RecommendationBulkCreate(BaseModel):
+    """A basket of recommendations created in one transaction"""
+    recommendations: List[RecommendationCreate] = Field(..., min_length=1, max_length=MAX_BULK_RECOMMENDATIONS)
+    atomic: bool = False  # Create nothing if any item is invalid
+
+class RecommendationBulkItemResult(BaseModel):
+    """Outcome for one item of a bulk create, in request order"""
+    index: int
+    status: str  # created | invalid | skipped (valid, but not created because the basket was atomic)
+    id: Optional[int] = None
+    errors: List[str] = []
+
+class RecommendationBulkResult(BaseModel):
+    created: int
+    failed: int
+    results: List[RecommendationBulkItemResult]
+
+# Largest set of recommendations moved by one POST /recommendations/transitions
+# (one IN list; SQL Server allows 2100 parameters per statement)
+MAX_TRANSITION_RECOMMENDATIONS = 1000
+
+class RecommendationTransitionRequest(BaseModel):
+    """One workflow transition (app/services/recommendation_workflow.py) applied to many recommendations"""
+    action: str = Field(..., pattern="^(submit|approve|reject)$")
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_TRANSITION_RECOMMENDATIONS)
+    notes: Optional[str] = None  # History notes; approval notes for approve/reject
+    atomic: bool = False  # Apply nothing if any recommendation conflicts
+
+class RecommendationTransitionItemResult(BaseModel):
+    """Outcome for one recommendation of a transition, in request order"""
+    id: int
+    status: str  # applied | conflict | not_found | skipped (could move, but the request was atomic)
+    current_status: Optional[str] = None  # Recommendation status after the request
+    errors: List[str] = []
+
+class RecommendationTransitionResult(BaseModel):
+    action: str
+    applied: int
+    failed: int
+    results: List[RecommendationTransitionItemResult]
+
 class RecommendationUpdate(BaseModel):
     trade_direction: Optional[str] = Field(None, pattern="^(Buy|Sell|Sell Short|Cover Short)$")
     current_price: Optional[Decimal] = None
@@ -28,6 +72,7 @@ class RecommendationUpdate(BaseModel):
     expected_exit_date: Optional[date] = None
     analyst_score: Optional[int] = Field(None, ge=1, le=10)
     notes: Optional[str] = None
+    version: Optional[int] = None  # The version the client read; 409 if someone has saved since
 
 class RecommendationResponse(BaseModel):
     id: int
@@ -42,6 +87,7 @@ class RecommendationResponse(BaseModel):
     notes: Optional[str]
     status: str
     is_draft: bool
+    version: int
     created_at: datetime
     updated_at: datetime
     
@@ -50,4 +96,29 @@ class RecommendationResponse(BaseModel):
     strategies: List[StrategyResponse] = []
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+    
+    @field_validator("strategies", mode="before")
+    @classmethod
+    def unwrap_strategy_links(cls, value):
+        """Serialize RecommendationStrategy junction rows as their linked strategy"""
+        if value is None:
+            return []
+        strategies = [getattr(link, "strategy", link) for link in value]
+        return [strategy for strategy in strategies if strategy is not None]
+
+class RecommendationFilters(BaseModel):
+    """Combinable filters for listing recommendations"""
+    analyst_id: Optional[int] = None
+    security_id: Optional[int] = None
+    status: Optional[str] = Field(None, pattern="^(Draft|Proposed|Approved|Rejected)$")
+    fund_id: Optional[int] = None
+    strategy_id: Optional[int] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+class RecommendationPage(BaseModel):
+    """One page of recommendations plus the cursor for the next page"""
+    items: List[RecommendationResponse]
+    next_cursor: Optional[str] = None
+    limit: int
\ No newline at end of file
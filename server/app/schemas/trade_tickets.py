@@ -0,0 +1,72 @@
+# app/schemas/trade_tickets.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from decimal import Decimal
+
+class TradeTicketSubmission(BaseModel):
+    id: int
+    status: str  # Submitted_to_CRD once queued
+    crd_status: Optional[str] = None  # Pending until the dispatcher hears back from CRD
+    crd_error_message: Optional[str] = None
+    submitted_to_crd_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+# Largest basket accepted by POST /trade_tickets/allocate
+MAX_ALLOCATION_RECOMMENDATIONS = 500
+
+# Largest DECIMAL(18,4): positions and quantities beyond it cannot be stored
+MAX_POSITION = Decimal("99999999999999.9999")
+
+class FundPositionInput(BaseModel):
+    """A fund's position in the recommended security, and how it shares the trade"""
+    fund_id: int
+    current_position: Decimal = Field(Decimal(0), ge=-MAX_POSITION, le=MAX_POSITION, max_digits=18, decimal_places=4)
+    benchmark_position: Decimal = Field(Decimal(0), ge=-MAX_POSITION, le=MAX_POSITION, max_digits=18, decimal_places=4)
+    weight: Optional[Decimal] = Field(None, ge=0)  # pro_rata / capped share (e.g. fund NAV); equal when omitted
+    # capped: largest position in the trade's direction
+    cap: Optional[Decimal] = Field(None, ge=0, le=MAX_POSITION, max_digits=18, decimal_places=4)
+
+class RecommendationAllocationInput(BaseModel):
+    recommendation_id: int
+    # pro_rata / capped: total quantity to trade
+    quantity: Optional[Decimal] = Field(None, gt=0, le=MAX_POSITION, max_digits=18, decimal_places=4)
+    # benchmark_relative; 1 when omitted
+    benchmark_multiple: Optional[Decimal] = Field(None, ge=0, le=MAX_POSITION, max_digits=18, decimal_places=4)
+    positions: List[FundPositionInput] = []  # Recommendation funds left out hold nothing
+    timing_notes: Optional[str] = None
+    account_code: Optional[str] = Field(None, max_length=50)
+
+class TicketAllocationRequest(BaseModel):
+    """Trade tickets for approved recommendations, one per fund that trades"""
+    method: str = Field("pro_rata", pattern="^(pro_rata|benchmark_relative|capped)$")
+    recommendations: List[RecommendationAllocationInput] = Field(
+        ..., min_length=1, max_length=MAX_ALLOCATION_RECOMMENDATIONS
+    )
+    atomic: bool = False  # Create nothing if any recommendation is invalid
+    dry_run: bool = False  # Compute allocations without creating tickets
+
+class AllocatedTicket(BaseModel):
+    id: Optional[int] = None  # None on a dry run
+    fund_id: int
+    current_position: Decimal
+    benchmark_position: Decimal
+    new_position: Decimal
+    trade_quantity: Decimal  # new_position - current_position
+    allocation_percentage: Decimal  # Share of the recommendation's total trade
+
+class TicketAllocationItemResult(BaseModel):
+    """Outcome for one recommendation, in request order"""
+    index: int
+    recommendation_id: int
+    status: str  # created | allocated (dry run) | invalid | skipped (valid, but the basket was atomic)
+    errors: List[str] = []
+    unallocated_quantity: Decimal = Decimal(0)  # capped: quantity no fund had room for
+    tickets: List[AllocatedTicket] = []
+
+class TicketAllocationResult(BaseModel):
+    created: int  # Tickets created
+    failed: int  # Recommendations rejected
+    results: List[TicketAllocationItemResult]
@@ -9,14 +9,18 @@ Services handle:
 - Data transformations
 """
 
-from .strategy_service import StrategyService
-from .security_service import SecurityService
-from .recommendation_service import RecommendationService
-from .fund_service import FundService
+from .strategy_service import StrategyService, AsyncStrategyService
+from .security_service import SecurityService, AsyncSecurityService
+from .recommendation_service import RecommendationService, AsyncRecommendationService
+from .fund_service import FundService, AsyncFundService
 
 __all__ = [
     "StrategyService",
     "SecurityService", 
     "RecommendationService",
-    "FundService"
+    "FundService",
+    "AsyncStrategyService",
+    "AsyncSecurityService",
+    "AsyncRecommendationService",
+    "AsyncFundService"
 ]
\ No newline at end of file
@@ -0,0 +1,266 @@
+# app/services/allocation.py
+"""
+Allocation of recommendations across funds
+
+Given recommendations and, per fund, the current and benchmark position in
+the recommended security, computes every fund's new position, trade
+quantity and allocation percentage with NumPy. A whole basket is one set
+of (recommendations × funds) arrays, padded to the widest recommendation
+and masked, so the cost is a handful of array operations rather than a
+Python loop per fund.
+
+Methods:
+
+- pro_rata            the recommendation's quantity is split across its
+                      funds in proportion to their weights (equal by
+                      default)
+- benchmark_relative  each fund moves to benchmark_position × multiple; a
+                      fund already past its target in the recommendation's
+                      direction does not trade against it
+- capped              pro_rata, but no fund's position may pass its cap in
+                      the trade's direction; what a capped fund cannot take
+                      is re-split among the others, and what no fund can
+                      take is reported as unallocated
+
+Arithmetic is in integer ticks of 0.0001 (positions are DECIMAL(18,4)) and
+hundredths of a percent (allocation_percentage is DECIMAL(5,2)). Pro-rata
+shares are rounded by largest remainder, so a recommendation's trades add
+up to exactly its quantity and its percentages to exactly 100.00; values
+convert back to Decimal without going through float. Benchmark targets too
+large for int64 are computed with Python integers and come out of range
+rather than wrapping.
+"""
+
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+ALLOCATION_METHODS = ("pro_rata", "benchmark_relative", "capped")
+
+# Trade direction -> sign of the position change
+DIRECTION_SIGNS = {"Buy": 1, "Cover Short": 1, "Sell": -1, "Sell Short": -1}
+
+POSITION_TICKS = 10 ** 4  # Ticks per share: DECIMAL(18,4)
+PERCENT_TICKS = 100 * 100  # 100.00% in hundredths: DECIMAL(5,2)
+MAX_POSITION_TICKS = 10 ** 18 - 1  # Largest DECIMAL(18,4), in ticks
+
+_NO_CAP = np.iinfo(np.int64).max // 4  # Headroom of uncapped funds; room to add without overflow
+
+# Below this many ticks a value with at most 4 decimals survives float64 (error < 1/4 tick)
+_FLOAT_EXACT_TICKS = 2 ** 49
+
+# Products of ticks from this magnitude are computed with Python ints: int64 would wrap silently
+_INT64_PRODUCT_LIMIT = 2.0 ** 62
+
+_POSITION_TICK = Decimal("0.0001")
+_PERCENT_TICK = Decimal("0.01")
+
+def to_ticks(value: Optional[Decimal]) -> int:
+    """Decimal as a whole number of 0.0001 ticks, rounded half-even"""
+    if value is None:
+        return 0
+    return int((Decimal(value) * POSITION_TICKS).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+def from_ticks(value: int) -> Decimal:
+    """Exact Decimal(18,4) for a whole number of ticks"""
+    return Decimal(value) * _POSITION_TICK
+
+def ticks_array(values: List) -> np.ndarray:
+    """Decimals (None is 0) as int64 ticks
+
+    Through float64 when every value is small enough to come back exact,
+    which is many times cheaper than Decimal arithmetic per value. Raises
+    ValueError for a value too large for DECIMAL(18,4).
+    """
+    floats = np.fromiter((value if value is not None else 0 for value in values), np.float64, len(values))
+    scaled = floats * POSITION_TICKS
+    if np.abs(scaled).max(initial=0) < _FLOAT_EXACT_TICKS:
+        return np.rint(scaled).astype(np.int64)
+    ticks = [to_ticks(value) for value in values]
+    if any(abs(tick) > MAX_POSITION_TICKS for tick in ticks):
+        raise ValueError("Value too large for DECIMAL(18,4)")
+    return np.array(ticks, dtype=np.int64)
+
+def _round_scaled(quotient, remainder):
+    """quotient, rounded half-even by remainder (the product's last POSITION_TICKS digits)"""
+    return quotient + ((2 * remainder > POSITION_TICKS) | ((2 * remainder == POSITION_TICKS) & (quotient % 2 == 1)))
+
+def scaled_ticks(ticks: np.ndarray, multiple: np.ndarray) -> np.ndarray:
+    """ticks × multiple (both in ticks, multiple broadcast per row) in ticks, rounded half-even
+
+    Products that could wrap int64 are computed exactly with Python ints
+    and clamped just past DECIMAL(18,4): positions that large come out of
+    range instead of as a wrapped, plausible value.
+    """
+    multiple = np.broadcast_to(multiple[:, None], ticks.shape)
+    wide = np.abs(ticks.astype(np.float64) * multiple) >= _INT64_PRODUCT_LIMIT
+    quotient, remainder = np.divmod(np.where(wide, 0, ticks) * multiple, POSITION_TICKS)
+    scaled = _round_scaled(quotient, remainder)
+    if wide.any():
+        limit = MAX_POSITION_TICKS + 1
+        exact = (_round_scaled(*divmod(int(tick) * int(factor), POSITION_TICKS))
+                 for tick, factor in zip(ticks[wide].tolist(), multiple[wide].tolist()))
+        scaled[wide] = [min(max(value, -limit), limit) for value in exact]
+    return scaled
+
+def apportion(totals: np.ndarray, shares: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Round each row of shares to integers that sum to its total (largest remainder)
+
+    shares are the exact (float) parts of totals; entries outside mask get
+    nothing. Float error in shares only moves a tick between entries.
+    """
+    base = np.where(mask, np.floor(shares), 0).astype(np.int64)
+    short = totals - base.sum(axis=1)  # May be slightly negative from float error
+    fraction = np.where(mask, shares - base, -np.inf)
+
+    columns = np.arange(shares.shape[1])
+    # Largest fractions first get the missing ticks...
+    rank = np.empty_like(base)
+    np.put_along_axis(rank, np.argsort(-fraction, axis=1, kind="stable"), columns[None, :], axis=1)
+    base += (rank < short[:, None]) & mask
+    # ...smallest fractions give back any excess
+    excess = np.where(mask & (base > 0), fraction, np.inf)
+    np.put_along_axis(rank, np.argsort(excess, axis=1, kind="stable"), columns[None, :], axis=1)
+    base -= (rank < -short[:, None]) & mask & (base > 0)
+    return base
+
+class AllocationBatch:
+    """Recommendations and their funds, gathered into padded arrays for allocate()"""
+
+    def __init__(self):
+        self._signs: List[int] = []
+        self._quantities: List[Optional[Decimal]] = []
+        self._multiples: List[Decimal] = []
+        self._fund_counts: List[int] = []
+        self._current: List[Optional[Decimal]] = []
+        self._benchmark: List[Optional[Decimal]] = []
+        self._weight: List[Optional[Decimal]] = []
+        self._cap: List[Optional[Decimal]] = []
+
+    def __len__(self):
+        return len(self._signs)
+
+    def add(self, trade_direction: str, funds: List[tuple], quantity: Optional[Decimal] = None,
+            multiple: Optional[Decimal] = None) -> int:
+        """Add a recommendation; returns its row
+
+        funds holds (current_position, benchmark_position, weight, cap)
+        per fund, in the order results come back; positions None are 0,
+        weight None is 1, cap None is no cap.
+        """
+        self._signs.append(DIRECTION_SIGNS[trade_direction])
+        self._quantities.append(quantity)
+        self._multiples.append(multiple if multiple is not None else Decimal(1))
+        self._fund_counts.append(len(funds))
+        for current, benchmark, weight, cap in funds:
+            self._current.append(current)
+            self._benchmark.append(benchmark)
+            self._weight.append(weight)
+            self._cap.append(cap)
+        return len(self._signs) - 1
+
+    def arrays(self) -> dict:
+        counts = np.array(self._fund_counts, dtype=np.int64)
+        shape = (len(counts), int(counts.max(initial=0)))
+        # Scatter the flat fund list into its padded (row, column) slots
+        rows = np.repeat(np.arange(len(counts)), counts)
+        columns = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        def padded(values: np.ndarray, fill=0):
+            array = np.full(shape, fill, dtype=values.dtype)
+            array[rows, columns] = values
+            return array
+
+        weight = np.fromiter(
+            (weight if weight is not None else 1 for weight in self._weight), np.float64, len(self._weight)
+        )
+        capped = np.fromiter((cap is not None for cap in self._cap), bool, len(self._cap))
+        return {
+            "mask": padded(np.ones(len(rows), dtype=bool), False),
+            "sign": np.array(self._signs, dtype=np.int64),
+            "quantity": ticks_array(self._quantities),
+            "multiple": ticks_array(self._multiples),
+            "current": padded(ticks_array(self._current)),
+            "benchmark": padded(ticks_array(self._benchmark)),
+            "weight": padded(weight),
+            "cap": padded(np.where(capped, ticks_array(self._cap), _NO_CAP)),
+        }
+
+class Allocation:
+    """allocate() output, in ticks, shaped (recommendations × funds)"""
+
+    __slots__ = ("mask", "current", "benchmark", "new_position", "trade", "percentage", "unallocated")
+
+    def __init__(self, mask, current, benchmark, new_position, trade, percentage, unallocated):
+        self.mask = mask
+        self.current = current
+        self.benchmark = benchmark
+        self.new_position = new_position
+        self.trade = trade  # Signed change in position
+        self.percentage = percentage  # Hundredths of a percent of the recommendation's total trade
+        self.unallocated = unallocated  # Per recommendation: quantity no fund could take (capped)
+
+    def out_of_range(self) -> np.ndarray:
+        """Recommendations with a new position too large for DECIMAL(18,4)"""
+        return (np.abs(self.new_position) > MAX_POSITION_TICKS).any(axis=1)
+
+    def rows(self, row: int) -> Iterator[Tuple[int, Decimal, Decimal, Decimal]]:
+        """(fund column, new position, trade, percentage) of the funds that trade"""
+        columns = np.flatnonzero(self.mask[row] & (self.trade[row] != 0))
+        values = zip(
+            columns.tolist(),
+            self.new_position[row, columns].tolist(),
+            self.trade[row, columns].tolist(),
+            self.percentage[row, columns].tolist(),
+        )
+        for column, new_position, trade, percentage in values:
+            yield column, Decimal(new_position) * _POSITION_TICK, Decimal(trade) * _POSITION_TICK, \
+                Decimal(percentage) * _PERCENT_TICK
+
+def _pro_rata(quantity, weight, mask) -> np.ndarray:
+    weight = np.where(mask, weight, 0.0)
+    total = weight.sum(axis=1)
+    safe_total = np.where(total > 0, total, 1.0)
+    shares = quantity[:, None] * (weight / safe_total[:, None])
+    return apportion(np.where(total > 0, quantity, 0), shares, mask & (weight > 0))
+
+def _capped(quantity, weight, mask, headroom) -> Tuple[np.ndarray, np.ndarray]:
+    """Water-filling: pro-rata among funds with headroom left, until filled or all capped"""
+    allocated = np.zeros(mask.shape, dtype=np.int64)
+    remaining = quantity.copy()
+    for _ in range(mask.shape[1]):  # Each pass fills the quantity or caps at least one fund
+        active = mask & (allocated < headroom) & (remaining > 0)[:, None]
+        if not active.any():
+            break
+        give = np.minimum(_pro_rata(remaining, weight, active), headroom - allocated)
+        allocated += give
+        remaining -= give.sum(axis=1)
+    return allocated, remaining
+
+def allocate(method: str, batch: AllocationBatch) -> Allocation:
+    """New positions, trades and allocation percentages for every recommendation in batch"""
+    if method not in ALLOCATION_METHODS:
+        raise ValueError(f"Unknown allocation method: {method}")
+    a = batch.arrays()
+    mask, sign, current = a["mask"], a["sign"], a["current"]
+    unallocated = np.zeros(len(sign), dtype=np.int64)
+
+    if method == "benchmark_relative":
+        target = scaled_ticks(a["benchmark"], a["multiple"])
+        # Never trade against the recommendation's direction
+        size = np.maximum((target - current) * sign[:, None], 0)
+    elif method == "capped":
+        headroom = np.maximum(a["cap"] - current * sign[:, None], 0)
+        size, unallocated = _capped(a["quantity"], a["weight"], mask, headroom)
+    else:
+        size = _pro_rata(a["quantity"], a["weight"], mask)
+
+    size = np.where(mask, size, 0)
+    trade = size * sign[:, None]
+    total = size.sum(axis=1, dtype=np.float64)  # Only scales percentages; many large trades would wrap int64
+    safe_total = np.where(total > 0, total, 1)
+    percentage = apportion(
+        np.where(total > 0, PERCENT_TICKS, 0), size * (PERCENT_TICKS / safe_total[:, None]), mask & (size > 0)
+    )
+    return Allocation(mask, current, a["benchmark"], current + trade, trade, percentage, unallocated)
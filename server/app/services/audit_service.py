@@ -0,0 +1,276 @@
+# app/services/audit_service.py
+"""
+Audit trail capture and asynchronous, batched writing
+
+Field-level diffs of audited models are captured from the session at flush
+time (app/core/model_events.py) and handed to the AuditWriter once the
+transaction commits, so rolled-back changes are never audited and the
+request's own transaction never waits on audit inserts.
+
+The writer buffers rows in a bounded in-process queue and a background
+thread inserts them in batches (one executemany per batch, on its own
+connection). When the queue stays full for AUDIT_ENQUEUE_TIMEOUT_SECONDS
+(back-pressure) or the worker is not running - not started, crashed, or
+shut down - rows are written synchronously by the caller instead of being
+dropped.
+
+Who made a change is read from session.info["audit"] (see
+app/api/deps.get_audited_db); sessions without it are attributed to
+AUDIT_SYSTEM_USER_ID.
+"""
+
+import json
+import queue
+import threading
+import time
+import logging
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event, insert, inspect
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.database import (
+    IS_SQLITE, IS_SQLITE_MEMORY, SQLITE_TUNED, engine, tune_sqlite_connection
+)
+from app.core.model_events import track_commits
+from app.models.audit import AuditTrail
+from app.models.funds import Fund
+from app.models.recommendations import TradeRecommendation
+from app.models.securities import Security
+from app.models.strategies import Strategy
+from app.models.trade_tickets import TradeTicket
+
+logger = logging.getLogger(__name__)
+
+AUDITED_MODELS = (TradeRecommendation, TradeTicket, Security, Fund, Strategy)
+
+# Bookkeeping columns maintained by the database, not by users
+IGNORED_FIELDS = {"created_at", "updated_at", "last_updated", "version"}
+
+def _format(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+def _context(session: Optional[Session]) -> dict:
+    audit = session.info.get("audit", {}) if session is not None else {}
+    return {
+        "changed_by": audit.get("user_id") or settings.AUDIT_SYSTEM_USER_ID,
+        "changed_at": datetime.now(timezone.utc).replace(tzinfo=None),
+        "session_id": audit.get("session_id"),
+        "ip_address": audit.get("ip_address"),
+        "user_agent": audit.get("user_agent"),
+    }
+
+def capture_changes(instance, action: str) -> Optional[List[dict]]:
+    """Audit rows for one flushed instance: one row per changed field on update,
+    a single row on insert and delete"""
+    if not settings.AUDIT_ENABLED:
+        return None
+
+    state = inspect(instance)
+    # New instances have their primary key but no identity key until the flush completes
+    if action == "delete":
+        record_id = state.identity[0]
+    else:
+        record_id = state.mapper.primary_key_from_instance(instance)[0]
+    base = {
+        "table_name": state.mapper.local_table.name,
+        "record_id": record_id,
+        "action_type": action.upper(),
+        **_context(object_session(instance)),
+    }
+
+    if action != "update":
+        return [{**base, "field_name": None, "old_value": None, "new_value": None}]
+
+    rows = []
+    for attribute in state.mapper.column_attrs:
+        if attribute.key in IGNORED_FIELDS:
+            continue
+        history = state.attrs[attribute.key].history
+        if not history.added and not history.deleted:
+            continue
+        rows.append({
+            **base,
+            "field_name": attribute.key,
+            "old_value": _format(history.deleted[0]) if history.deleted else None,
+            "new_value": _format(history.added[0]) if history.added else None,
+        })
+    return rows or None
+
+def audit_bulk_insert(session: Session, model, record_ids: Iterable[int]):
+    """Audit rows inserted with Core executemany (invisible to ORM flush events)
+
+    Call after the transaction has committed.
+    """
+    if not settings.AUDIT_ENABLED:
+        return
+    context = _context(session)
+    audit_writer.submit([
+        {"table_name": model.__tablename__, "record_id": record_id, "action_type": "INSERT",
+         "field_name": None, "old_value": None, "new_value": None, **context}
+        for record_id in record_ids
+    ])
+
+def audit_bulk_update(session: Session, model, changes: Iterable[Tuple[int, Dict[str, Tuple]]]):
+    """Audit rows updated with Core executemany: (record_id, {field: (old, new)}) pairs
+
+    Call after the transaction has committed.
+    """
+    if not settings.AUDIT_ENABLED:
+        return
+    context = _context(session)
+    audit_writer.submit([
+        {"table_name": model.__tablename__, "record_id": record_id, "action_type": "UPDATE",
+         "field_name": field, "old_value": _format(old), "new_value": _format(new), **context}
+        for record_id, fields in changes
+        for field, (old, new) in fields.items()
+    ])
+
+_writer_engine = None
+
+def write_audit_rows(rows: List[dict]):
+    """Insert audit rows with a single executemany in their own transaction"""
+    global _writer_engine
+    if _writer_engine is None:
+        if IS_SQLITE and not IS_SQLITE_MEMORY:
+            # The app's SQLite engine holds a single connection (shared by every
+            # thread, or the tuned profile's writer lane); the writer thread must
+            # neither interleave its transactions with requests nor queue behind them
+            _writer_engine = create_engine(
+                settings.DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=NullPool
+            )
+            if SQLITE_TUNED:
+                event.listen(_writer_engine, "connect", tune_sqlite_connection)
+        else:
+            _writer_engine = engine
+
+    with _writer_engine.begin() as connection:
+        connection.execute(insert(AuditTrail), rows)
+
+class AuditWriter:
+    """Bounded queue of audit rows drained in batches by a background thread"""
+
+    def __init__(
+        self,
+        write_rows: Callable[[List[dict]], None],
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        enqueue_timeout_seconds: float = 0.05,
+        max_retries: int = 3
+    ):
+        self._write_rows = write_rows
+        self._queue: "queue.Queue[List[dict]]" = queue.Queue(maxsize=max_queue_size)
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+        self.max_retries = max_retries
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self.stats = {"queued": 0, "written": 0, "written_sync": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stopping.is_set()
+
+    def start(self):
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the worker after it drains the queue; anything left is written synchronously"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        while True:
+            leftover = self._drain(block=False)
+            if not leftover:
+                break
+            self._write(leftover, synchronous=True)
+
+    def submit(self, rows: List[dict]):
+        """Queue audit rows; falls back to writing them now if the queue is unavailable"""
+        if not rows:
+            return
+        if self.running:
+            try:
+                self._queue.put(rows, timeout=self.enqueue_timeout_seconds)
+                self.stats["queued"] += len(rows)
+                return
+            except queue.Full:
+                logger.warning("Audit queue full, writing audit rows synchronously")
+        self._write(rows, synchronous=True)
+
+    def submit_changes(self, changes):
+        """model_events apply callback: flatten (action, rows) pairs from one commit"""
+        self.submit([row for _, rows in changes for row in rows])
+
+    def _drain(self, block: bool) -> List[dict]:
+        """Collect up to batch_size rows, waiting up to flush_interval_seconds when block"""
+        batch: List[dict] = []
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while len(batch) < self.batch_size:
+            try:
+                if block:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    batch.extend(self._queue.get(timeout=remaining))
+                else:
+                    batch.extend(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        try:
+            while not (self._stopping.is_set() and self._queue.empty()):
+                batch = self._drain(block=True)
+                if batch:
+                    self._write(batch, synchronous=False)
+        except Exception as e:
+            # submit() sees running == False and falls back to synchronous writes
+            logger.error(f"Audit writer crashed: {e}")
+
+    def _write(self, rows: List[dict], synchronous: bool):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                self._write_rows(rows)
+                self.stats["written_sync" if synchronous else "written"] += len(rows)
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.stats["failed"] += len(rows)
+                    # Last resort: keep the rows recoverable from the logs
+                    logger.error(
+                        f"Failed to write {len(rows)} audit rows: {e}; rows: "
+                        f"{json.dumps(rows, default=str)}"
+                    )
+                    return
+                time.sleep(0.1 * 2 ** (attempt - 1))
+
+audit_writer = AuditWriter(
+    write_audit_rows,
+    max_queue_size=settings.AUDIT_QUEUE_MAX_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval_seconds=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    enqueue_timeout_seconds=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS
+)
+
+for audited_model in AUDITED_MODELS:
+    track_commits(audited_model, capture_changes, audit_writer.submit_changes)
@@ -0,0 +1,73 @@
+# app/services/bulk.py
+"""
+Set-based insert and update helpers
+
+SQLAlchemy's "insertmanyvalues" turns an executemany INSERT ... RETURNING
+into batched multi-row statements. Asking for rows back in parameter order
+(sort_by_parameter_order=True) needs a sentinel the dialect can sort on;
+SQL Server and PostgreSQL use the autoincrement primary key, but SQLite has
+no implicit sentinel and SQLAlchemy falls back to one statement per row.
+SQLite assigns rowids in ascending VALUES order, so there the ids are
+sorted client-side instead.
+"""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import Column, bindparam, insert, inspect, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
+
+def _sorts_by_autoincrement(db: Session) -> bool:
+    sentinel = db.get_bind().dialect.insertmanyvalues_implicit_sentinel
+    return bool(sentinel & InsertmanyvaluesSentinelOpts.AUTOINCREMENT)
+
+def insert_rows(db: Session, model, rows: List[dict]):
+    """INSERT rows with one executemany
+
+    Goes through the table rather than the ORM bulk path, which leaves out
+    None values and starts a new statement whenever consecutive rows differ
+    in which columns are None.
+    """
+    if rows:
+        db.execute(insert(inspect(model).local_table), rows)
+
+def insert_returning_ids(db: Session, model, rows: List[dict]) -> List[int]:
+    """INSERT rows with executemany and return their new primary keys in row order"""
+    if not rows:
+        return []
+
+    # Against the table, as in insert_rows(); with RETURNING the ORM bulk path also
+    # splices every per-group result together
+    table = inspect(model).local_table
+    primary_key = table.primary_key.columns[0]
+    if _sorts_by_autoincrement(db):
+        statement = insert(table).returning(primary_key, sort_by_parameter_order=True)
+        return list(db.scalars(statement, rows))
+
+    return sorted(db.scalars(insert(table).returning(primary_key), rows))
+
+def update_rows(db: Session, model, rows: List[dict], where: Optional[Dict[str, Column]] = None) -> Optional[int]:
+    """UPDATE rows by primary key with one executemany
+
+    Each row holds the primary key and the columns to set; every row sets
+    the same columns. where maps extra row keys to columns they must equal,
+    e.g. {"read_status": Model.status} to only update rows still in the
+    status they were read in; those keys are matched, not set. Returns how
+    many rows matched, or None where the driver cannot count the rows of an
+    executemany. Like insert_rows(), this goes through the table: ORM flush
+    events (and so the audit trail) do not see it.
+    """
+    if not rows:
+        return 0
+
+    where = where or {}
+    table = inspect(model).local_table
+    primary_key = table.primary_key.columns[0]
+    columns = [name for name in rows[0] if name != primary_key.name and name not in where]
+    # Bound names must differ from column names in the SET clause
+    statement = update(table).where(
+        primary_key == bindparam("b_" + primary_key.name),
+        *(column == bindparam("b_" + name) for name, column in where.items())
+    ).values({name: bindparam("b_" + name) for name in columns})
+    result = db.execute(statement, [{"b_" + name: value for name, value in row.items()} for row in rows])
+    return result.rowcount if db.get_bind().dialect.supports_sane_multi_rowcount else None
@@ -0,0 +1,343 @@
+# app/services/crd_dispatcher.py
+"""
+Background delivery of the CRD outbox
+
+Trade ticket submission only writes a crd_outbox row
+(app/services/trade_ticket_service.py). One dispatcher per worker process
+sends those rows to CRD:
+
+- claiming: due rows are leased for CRD_CLAIM_SECONDS (claimed_until plus
+  a per-claim token), so dispatchers in other workers skip them; rows of a
+  dispatcher that died become due again when the lease runs out
+- batching: up to CRD_MAX_ORDERS_PER_REQUEST orders per bulk request, and
+  CRD_DISPATCH_CONCURRENCY requests in flight at once
+- outcomes are recorded in one transaction per request: accepted orders
+  are marked Sent (the ticket's crd_status takes CRD's status), rejected
+  ones move the ticket to CRD_Error with CRD's reason
+- a request that fails (timeout, 5xx, unreadable answer) is retried with
+  exponential backoff and jitter; after CRD_MAX_ATTEMPTS the ticket moves
+  to CRD_Error
+- every order carries its outbox idempotency key, so a resend after a lost
+  answer or an expired lease is not booked twice by CRD
+
+Commits that queue a submission in this process wake the dispatcher at
+once (app/core/model_events.py); other workers' submissions and due
+retries are picked up every CRD_DISPATCH_POLL_SECONDS.
+"""
+
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import record_crd_orders, record_crd_request
+from app.core.model_events import track_commits
+from app.integrations.crd import CrdClient, CrdError, CrdGateway, CrdOrderResult, FakeCrdServer
+from app.models.audit import TradeTicketStatusHistory
+from app.models.trade_tickets import CrdOutbox, TradeTicket
+from app.services.trade_ticket_service import utcnow
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ("accepted", "rejected", "retried", "failed")
+
+def backoff_seconds(attempt: int, base_seconds: float, max_seconds: float, rng: random.Random) -> float:
+    """Wait before retrying after the attempt-th failure
+
+    Doubles per attempt up to max_seconds; half of it is random ("equal
+    jitter") so batches that failed together do not retry in lockstep.
+    """
+    ceiling = min(max_seconds, base_seconds * 2 ** (attempt - 1))
+    return ceiling / 2 + rng.uniform(0, ceiling / 2)
+
+def due_outbox(now: datetime):
+    """Outbox rows waiting to be sent and not leased by a dispatcher"""
+    return and_(
+        CrdOutbox.status == 'Pending',
+        CrdOutbox.next_attempt_at <= now,
+        or_(CrdOutbox.claimed_until.is_(None), CrdOutbox.claimed_until < now),
+    )
+
+class ClaimedOrder:
+    """An outbox row leased for one delivery attempt"""
+
+    __slots__ = ("outbox_id", "idempotency_key", "order")
+
+    def __init__(self, outbox_id: int, idempotency_key: str, order: dict):
+        self.outbox_id = outbox_id
+        self.idempotency_key = idempotency_key
+        self.order = order
+
+class CrdDispatcher:
+    """Sends due outbox rows to a CRD gateway in bulk, with retries"""
+
+    def __init__(
+        self,
+        gateway: Optional[CrdGateway],
+        session_factory: Callable[[], Session] = SessionLocal,
+        concurrency: int = 4,
+        poll_seconds: float = 5.0,
+        claim_seconds: float = 60.0,
+        max_attempts: int = 8,
+        retry_base_seconds: float = 2.0,
+        retry_max_seconds: float = 300.0,
+        clock: Callable[[], datetime] = utcnow,
+        rng: Optional[random.Random] = None,
+    ):
+        self.gateway = gateway
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.claim_seconds = claim_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.stats = {"requests": 0, **dict.fromkeys(OUTCOMES, 0)}
+        self._next_retry: Optional[float] = None  # Loop time of the soonest scheduled retry
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.gateway is not None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def claim_limit(self) -> int:
+        """Orders claimed per round: one full batch per request slot"""
+        return self.gateway.max_batch_size * self.concurrency
+
+    def start(self):
+        """Start the dispatch loop on the running event loop"""
+        if self.running or not self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+        if self.gateway is not None:
+            await self.gateway.close()
+
+    def notify(self):
+        """Dispatch now (a submission was committed); safe to call from any thread"""
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            pass  # Loop closed during shutdown
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                claimed = await self.dispatch_once()
+            except Exception as e:
+                # Claimed rows become due again when their lease runs out
+                logger.error(f"CRD dispatch failed: {e}")
+                claimed = 0
+            if claimed >= self.claim_limit:
+                continue  # More may be due right away
+
+            timeout = self.poll_seconds
+            if self._next_retry is not None:
+                timeout = min(timeout, max(self._next_retry - self._loop.time(), 0.0))
+                self._next_retry = None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def dispatch_once(self) -> int:
+        """Claim due orders, send them and record the outcomes; returns orders claimed"""
+        token, orders = await run_in_threadpool(self.claim, self.claim_limit)
+        if not orders:
+            return 0
+        size = self.gateway.max_batch_size
+        await asyncio.gather(*(
+            self._deliver(token, orders[start:start + size]) for start in range(0, len(orders), size)
+        ))
+        return len(orders)
+
+    async def _deliver(self, token: str, batch: List[ClaimedOrder]):
+        started = time.perf_counter()
+        results, error = None, None
+        try:
+            results = await self.gateway.submit_orders([claimed.order for claimed in batch])
+        except Exception as e:
+            if not isinstance(e, CrdError):
+                logger.exception(f"CRD gateway {self.gateway.name} failed unexpectedly")
+            error = str(e) or repr(e)
+            logger.warning(f"CRD request for {len(batch)} orders failed: {error}")
+        record_crd_request(self.gateway.name, "submit", len(batch), time.perf_counter() - started, ok=error is None)
+        self.stats["requests"] += 1
+
+        counts, retry_in = await run_in_threadpool(self.record, token, batch, results, error)
+        for outcome, count in counts.items():
+            self.stats[outcome] += count
+            record_crd_orders(outcome, count)
+        if retry_in is not None and self._loop is not None:
+            retry_at = self._loop.time() + retry_in
+            self._next_retry = retry_at if self._next_retry is None else min(self._next_retry, retry_at)
+
+    def claim(self, limit: int) -> Tuple[str, List[ClaimedOrder]]:
+        """Lease up to limit due outbox rows, oldest first"""
+        now = self.clock()
+        token = uuid.uuid4().hex
+        with self.session_factory() as db:
+            ids = db.scalars(
+                select(CrdOutbox.id).where(due_outbox(now))
+                .order_by(CrdOutbox.next_attempt_at, CrdOutbox.id).limit(limit)
+            ).all()
+            if not ids:
+                return token, []
+            # Re-checked in the UPDATE: another dispatcher may have claimed some in between
+            db.execute(
+                update(CrdOutbox)
+                .where(CrdOutbox.id.in_(ids), due_outbox(now))
+                .values(claimed_until=now + timedelta(seconds=self.claim_seconds), claim_token=token)
+                .execution_options(synchronize_session=False)
+            )
+            rows = db.execute(
+                select(CrdOutbox.id, CrdOutbox.idempotency_key, CrdOutbox.payload)
+                .where(CrdOutbox.id.in_(ids), CrdOutbox.claim_token == token)
+                .order_by(CrdOutbox.next_attempt_at, CrdOutbox.id)
+            ).all()
+            db.commit()
+        return token, [ClaimedOrder(row.id, row.idempotency_key, json.loads(row.payload)) for row in rows]
+
+    def record(
+        self,
+        token: str,
+        batch: List[ClaimedOrder],
+        results: Optional[Dict[str, CrdOrderResult]],
+        error: Optional[str],
+    ) -> Tuple[Dict[str, int], Optional[float]]:
+        """Apply one request's outcome in one transaction
+
+        Returns counts per outcome and the soonest retry delay (seconds), if
+        any order was rescheduled. Rows whose lease was taken over by another
+        dispatcher are left to it.
+        """
+        now = self.clock()
+        counts = dict.fromkeys(OUTCOMES, 0)
+        retry_in = None
+        with self.session_factory() as db:
+            outboxes = db.scalars(
+                select(CrdOutbox).options(joinedload(CrdOutbox.trade_ticket))
+                .where(
+                    CrdOutbox.id.in_([claimed.outbox_id for claimed in batch]),
+                    CrdOutbox.claim_token == token,
+                    CrdOutbox.status == 'Pending',
+                )
+            ).all()
+            for outbox in outboxes:
+                result = (results or {}).get(outbox.idempotency_key)
+                ticket = outbox.trade_ticket
+                outbox.claimed_until = None
+                outbox.claim_token = None
+                if result is not None and result.accepted:
+                    outbox.status = 'Sent'
+                    outbox.sent_at = now
+                    outbox.last_error = None
+                    ticket.crd_status = result.crd_status or 'Accepted'
+                    counts["accepted"] += 1
+                elif result is not None:
+                    outbox.status = 'Failed'
+                    outbox.last_error = result.error
+                    self._mark_error(db, ticket, f"Rejected by CRD: {result.error}")
+                    counts["rejected"] += 1
+                else:
+                    outbox.attempts += 1
+                    outbox.last_error = error or "CRD did not answer for this order"
+                    if outbox.attempts >= self.max_attempts:
+                        outbox.status = 'Failed'
+                        self._mark_error(
+                            db, ticket, f"Not delivered to CRD after {outbox.attempts} attempts: {outbox.last_error}"
+                        )
+                        counts["failed"] += 1
+                    else:
+                        delay = backoff_seconds(
+                            outbox.attempts, self.retry_base_seconds, self.retry_max_seconds, self.rng
+                        )
+                        outbox.next_attempt_at = now + timedelta(seconds=delay)
+                        retry_in = delay if retry_in is None else min(retry_in, delay)
+                        counts["retried"] += 1
+            db.commit()
+        return counts, retry_in
+
+    @staticmethod
+    def _mark_error(db: Session, ticket: TradeTicket, message: str):
+        ticket.crd_status = 'Error'
+        ticket.crd_error_message = message
+        if ticket.status != 'Submitted_to_CRD':
+            return  # Moved on (e.g. cancelled) while the order was in flight
+        db.add(TradeTicketStatusHistory(
+            trade_ticket_id=ticket.id,
+            old_status=ticket.status,
+            new_status='CRD_Error',
+            changed_by=settings.AUDIT_SYSTEM_USER_ID,
+            notes=message[:1000],
+            changed_at=utcnow()
+        ))
+        ticket.status = 'CRD_Error'
+
+def build_crd_gateway() -> Optional[CrdGateway]:
+    """CRD when enabled; the in-process fake CRD only if CRD_USE_FAKE opts in;
+    otherwise none (submissions wait in the outbox until CRD is enabled)"""
+    if settings.CRD_ENABLED and settings.CRD_API_URL:
+        return CrdClient(
+            settings.CRD_API_URL,
+            settings.CRD_API_KEY,
+            timeout_seconds=settings.CRD_TIMEOUT_SECONDS,
+            max_batch_size=settings.CRD_MAX_ORDERS_PER_REQUEST,
+        )
+    if settings.CRD_USE_FAKE:
+        gateway = FakeCrdServer(max_batch_size=settings.CRD_MAX_ORDERS_PER_REQUEST).client()
+        gateway.name = "fake"
+        return gateway
+    return None
+
+crd_dispatcher = CrdDispatcher(
+    build_crd_gateway(),
+    concurrency=settings.CRD_DISPATCH_CONCURRENCY,
+    poll_seconds=settings.CRD_DISPATCH_POLL_SECONDS,
+    claim_seconds=settings.CRD_CLAIM_SECONDS,
+    max_attempts=settings.CRD_MAX_ATTEMPTS,
+    retry_base_seconds=settings.CRD_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.CRD_RETRY_MAX_SECONDS,
+)
+
+def _queued(outbox: CrdOutbox, action: str):
+    # New submissions only; the dispatcher's own retry bookkeeping has attempts > 0
+    if action != "delete" and outbox.status == 'Pending' and not outbox.attempts:
+        return outbox.id
+    return None
+
+track_commits(CrdOutbox, _queued, lambda changes: crd_dispatcher.notify())
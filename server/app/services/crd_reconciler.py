@@ -0,0 +1,316 @@
+# app/services/crd_reconciler.py
+"""
+Reconciliation of trade tickets with CRD execution state
+
+Once CRD has accepted an order (app/services/crd_dispatcher.py) the ticket
+follows CRD: Booked, Working, Partially_Filled, Filled or Cancelled, with
+fill_price, fill_quantity and filled_at. One poller per worker process
+keeps them in step:
+
+- one indexed query lists every open ticket (a status in OPEN_STATUSES
+  whose order CRD accepted)
+- CRD is asked for their state in bulk, CRD_MAX_ORDERS_PER_REQUEST orders
+  per request and CRD_RECONCILE_CONCURRENCY requests in flight
+- the answers are diffed in memory against the tickets' current values,
+  re-read in the writing transaction, and only tickets that changed are
+  written: one executemany UPDATE (of tickets still in the status read), one
+  executemany INSERT of status history rows (status changes only), then
+  audit rows after the commit
+- the interval adapts to the number of open orders: every
+  CRD_RECONCILE_MIN_SECONDS while few are open, stretched so a poll costs
+  at most CRD_RECONCILE_REQUESTS_PER_SECOND on average (capped at
+  CRD_RECONCILE_MAX_SECONDS), and CRD_RECONCILE_IDLE_SECONDS with none
+  open; an order accepted by CRD in this process wakes it early
+
+A batch CRD fails to answer is skipped and asked again next poll.
+"""
+
+import math
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import ReadSessionLocal, SessionLocal
+from app.core.metrics import record_crd_reconciliation, record_crd_request
+from app.core.model_events import track_commits
+from app.integrations.crd import CrdError, CrdGateway, CrdOrderStatus
+from app.models.audit import TradeTicketStatusHistory
+from app.models.trade_tickets import CrdOutbox, TradeTicket
+from app.services.audit_service import audit_bulk_update
+from app.services.bulk import insert_rows, update_rows
+from app.services.crd_dispatcher import crd_dispatcher
+from app.services.event_hub import event_hub
+from app.services.trade_ticket_service import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Tickets whose order may still change at CRD
+OPEN_STATUSES = ("Submitted_to_CRD", "Booked", "Working", "Partially_Filled")
+
+# CRD order statuses the ticket status follows; any other only sets crd_status
+TICKET_STATUSES_FROM_CRD = ("Booked", "Working", "Partially_Filled", "Filled", "Cancelled")
+
+RECONCILED_FIELDS = ("status", "crd_status", "fill_price", "fill_quantity", "filled_at")
+
+# Tickets re-read per statement while applying (well under SQL Server's 2100 parameters)
+APPLY_CHUNK_SIZE = 1000
+
+# Tries to write a poll's changes while the same tickets are being changed elsewhere
+APPLY_ATTEMPTS = 3
+
+def poll_interval(open_orders: int, batch_size: int, min_seconds: float, max_seconds: float,
+                  idle_seconds: float, requests_per_second: float) -> float:
+    """Seconds until the next poll, given how many orders are open"""
+    if not open_orders:
+        return idle_seconds
+    requests = math.ceil(open_orders / batch_size)
+    return min(max(requests / requests_per_second, min_seconds), max_seconds)
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def reconciled_values(row, crd: CrdOrderStatus) -> dict:
+    """The ticket's RECONCILED_FIELDS after taking CRD's state; fills CRD leaves out are kept"""
+    return {
+        "status": crd.status if crd.status in TICKET_STATUSES_FROM_CRD else row.status,
+        "crd_status": crd.status,
+        "fill_price": crd.fill_price if crd.fill_price is not None else row.fill_price,
+        "fill_quantity": crd.fill_quantity if crd.fill_quantity is not None else row.fill_quantity,
+        "filled_at": _naive_utc(crd.filled_at) or row.filled_at,
+    }
+
+def diff_ticket(row, values: dict) -> Dict[str, Tuple]:
+    """{field: (old, new)} for the fields whose value changes"""
+    return {
+        field: (getattr(row, field), value)
+        for field, value in values.items()
+        if getattr(row, field) != value
+    }
+
+def history_note(crd: CrdOrderStatus) -> str:
+    note = f"CRD: {crd.status}"
+    if crd.fill_quantity is not None:
+        note += f", {crd.fill_quantity} filled"
+        if crd.fill_price is not None:
+            note += f" @ {crd.fill_price}"
+    return note
+
+class CrdReconciler:
+    """Polls CRD for open tickets' execution state and applies what changed"""
+
+    def __init__(
+        self,
+        gateway: Optional[CrdGateway],
+        session_factory: Callable[[], Session] = SessionLocal,
+        read_session_factory: Callable[[], Session] = ReadSessionLocal,
+        concurrency: int = 4,
+        min_seconds: float = 2.0,
+        max_seconds: float = 60.0,
+        idle_seconds: float = 300.0,
+        requests_per_second: float = 5.0,
+        clock: Callable[[], datetime] = utcnow,
+    ):
+        self.gateway = gateway
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self.concurrency = concurrency
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.idle_seconds = idle_seconds
+        self.requests_per_second = requests_per_second
+        self.clock = clock
+        self.open_orders = 0  # As of the last poll
+        self.stats = {"polls": 0, "requests": 0, "failed_requests": 0, "changed": 0, "history": 0}
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.gateway is not None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def next_interval(self) -> float:
+        return poll_interval(
+            self.open_orders, self.gateway.max_batch_size, self.min_seconds, self.max_seconds,
+            self.idle_seconds, self.requests_per_second
+        )
+
+    def start(self):
+        """Start the poll loop on the running event loop"""
+        if self.running or not self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop polling (the gateway is the dispatcher's, which closes it)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+
+    def notify(self):
+        """Poll soon (CRD accepted an order); safe to call from any thread"""
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            pass  # Loop closed during shutdown
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            started = self._loop.time()
+            try:
+                await self.reconcile_once()
+            except Exception as e:
+                logger.error(f"CRD reconciliation failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.next_interval())
+            except asyncio.TimeoutError:
+                pass
+            # Woken early: still at most one poll per CRD_RECONCILE_MIN_SECONDS
+            await asyncio.sleep(max(started + self.min_seconds - self._loop.time(), 0.0))
+
+    async def reconcile_once(self) -> Tuple[int, int]:
+        """One poll: returns (open orders, tickets changed)"""
+        order_ids = await run_in_threadpool(self.open_order_ids)
+        self.open_orders = len(order_ids)
+        self.stats["polls"] += 1
+        changed = 0
+        if order_ids:
+            statuses = await self.fetch_statuses(order_ids)
+            if statuses:
+                changed = await run_in_threadpool(self.apply, statuses)
+        record_crd_reconciliation(self.open_orders, changed)
+        return self.open_orders, changed
+
+    def open_order_ids(self) -> List[int]:
+        with self.read_session_factory() as db:
+            return list(db.scalars(
+                select(TradeTicket.id)
+                .join(CrdOutbox, CrdOutbox.trade_ticket_id == TradeTicket.id)
+                .where(TradeTicket.status.in_(OPEN_STATUSES), CrdOutbox.status == 'Sent')
+                .order_by(TradeTicket.id)
+            ))
+
+    async def fetch_statuses(self, order_ids: List[int]) -> Dict[int, CrdOrderStatus]:
+        """CRD state of the orders, in concurrent bulk requests; failed batches are left out"""
+        size = self.gateway.max_batch_size
+        limit = asyncio.Semaphore(self.concurrency)
+        statuses: Dict[int, CrdOrderStatus] = {}
+
+        async def fetch(batch: List[int]):
+            async with limit:
+                started = time.perf_counter()
+                try:
+                    statuses.update(await self.gateway.get_order_statuses(batch))
+                    ok = True
+                except Exception as e:
+                    if not isinstance(e, CrdError):
+                        logger.exception(f"CRD gateway {self.gateway.name} failed unexpectedly")
+                    logger.warning(f"CRD status request for {len(batch)} orders failed: {e}")
+                    self.stats["failed_requests"] += 1
+                    ok = False
+                record_crd_request(self.gateway.name, "status", len(batch), time.perf_counter() - started, ok)
+                self.stats["requests"] += 1
+
+        await asyncio.gather(*(fetch(order_ids[start:start + size]) for start in range(0, len(order_ids), size)))
+        return statuses
+
+    def apply(self, statuses: Dict[int, CrdOrderStatus]) -> int:
+        """Write the tickets whose state differs from CRD's; returns how many changed
+
+        The UPDATE only matches tickets still in the status they were read in,
+        so a ticket cancelled locally (or moved by another worker's poll)
+        after it was read keeps its status. Its history and audit rows would
+        then be wrong, so the transaction is rolled back and the tickets read
+        again (APPLY_ATTEMPTS times, then left to the next poll).
+        """
+        now = self.clock()
+        with self.session_factory() as db:
+            for _ in range(APPLY_ATTEMPTS):
+                updates, history, audit = self._changes(db, statuses, now)
+                if not updates:
+                    return 0
+                written = update_rows(db, TradeTicket, updates, where={"read_status": TradeTicket.status})
+                if written is None or written == len(updates):
+                    break
+                db.rollback()
+            else:
+                logger.warning(f"CRD reconciliation skipped: tickets kept changing while {len(updates)} were written")
+                return 0
+            insert_rows(db, TradeTicketStatusHistory, history)
+            db.commit()
+            audit_bulk_update(db, TradeTicket, audit)
+
+        if history:
+            event_hub.notify()  # Core inserts are invisible to the hub's commit hook
+        self.stats["changed"] += len(updates)
+        self.stats["history"] += len(history)
+        return len(updates)
+
+    def _changes(self, db: Session, statuses: Dict[int, CrdOrderStatus], now: datetime) -> Tuple[list, list, list]:
+        """Rows to update, status history rows and audit changes for the open tickets CRD reported on"""
+        updates, history, audit = [], [], []
+        order_ids = list(statuses)
+        for start in range(0, len(order_ids), APPLY_CHUNK_SIZE):
+            rows = db.execute(
+                select(TradeTicket.id, *(getattr(TradeTicket, field) for field in RECONCILED_FIELDS))
+                .where(
+                    TradeTicket.id.in_(order_ids[start:start + APPLY_CHUNK_SIZE]),
+                    TradeTicket.status.in_(OPEN_STATUSES),  # Not cancelled locally meanwhile
+                )
+            ).all()
+            for row in rows:
+                crd = statuses[row.id]
+                values = reconciled_values(row, crd)
+                changes = diff_ticket(row, values)
+                if not changes:
+                    continue
+                updates.append({"id": row.id, "read_status": row.status, **values, "updated_at": now})
+                audit.append((row.id, changes))
+                if "status" in changes:
+                    history.append({
+                        "trade_ticket_id": row.id,
+                        "old_status": row.status,
+                        "new_status": values["status"],
+                        "changed_by": settings.AUDIT_SYSTEM_USER_ID,
+                        "notes": history_note(crd),
+                        "changed_at": now,
+                    })
+        return updates, history, audit
+
+crd_reconciler = CrdReconciler(
+    crd_dispatcher.gateway,
+    concurrency=settings.CRD_RECONCILE_CONCURRENCY,
+    min_seconds=settings.CRD_RECONCILE_MIN_SECONDS,
+    max_seconds=settings.CRD_RECONCILE_MAX_SECONDS,
+    idle_seconds=settings.CRD_RECONCILE_IDLE_SECONDS,
+    requests_per_second=settings.CRD_RECONCILE_REQUESTS_PER_SECOND,
+)
+
+def _accepted(outbox: CrdOutbox, action: str):
+    return outbox.id if action == "update" and outbox.status == 'Sent' else None
+
+track_commits(CrdOutbox, _accepted, lambda changes: crd_reconciler.notify())
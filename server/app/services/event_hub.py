@@ -0,0 +1,413 @@
+# app/services/event_hub.py
+"""
+Status-change events for the SSE stream (GET /api/v1/events/stream)
+
+The status history tables are the source of truth: every
+RecommendationStatusHistory / TradeTicketStatusHistory row is one event.
+One hub per worker process reads new rows (one query for all clients) and
+fans them out to per-client asyncio queues:
+
+- commits in this process that insert history rows wake the hub at once
+  (app/core/model_events.py); rows written by other workers or outside the
+  app are picked up by a poll every EVENT_STREAM_POLL_SECONDS
+- the hub only queries while someone is subscribed
+- events are routed by index, not by testing every client: a client sees a
+  whole stream ("recommendation", "ticket") when it holds one of
+  STREAM_PERMISSIONS, otherwise only events for its own recommendations
+  and tickets
+- a client that falls behind by EVENT_STREAM_QUEUE_SIZE events has its
+  backlog dropped and gets a "resync" event (refetch lists, carry on)
+
+An idle client costs one suspended coroutine and an empty queue; nothing
+holds a database connection between polls.
+
+Event ids are resume cursors ("<recommendation history id>-<ticket history
+id>"): a client reconnecting with Last-Event-ID is replayed what it missed,
+up to EVENT_STREAM_REPLAY_LIMIT events, or sent "resync" when it missed
+more. The stream is a notification channel; clients still read state from
+the list endpoints.
+"""
+
+import json
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.model_events import track_commits
+from app.models.audit import RecommendationStatusHistory, TradeTicketStatusHistory
+from app.models.recommendations import TradeRecommendation
+from app.models.trade_tickets import TradeTicket
+from app.services.permission_service import permission_resolver
+
+logger = logging.getLogger(__name__)
+
+STREAMS = ("recommendation", "ticket")
+
+# Holding any of these shows a user every event of the stream, not just their own
+STREAM_PERMISSIONS = {
+    "recommendation": ("trade.view_all_recommendations", "trade.approve_recommendations"),
+    "ticket": ("trade.create_tickets", "trade.submit_to_crd"),
+}
+
+# Identity values are handed out at insert, rows become visible at commit:
+# re-read this many ids below the high-water mark so a row that committed
+# late is not skipped
+LOOKBACK_ROWS = 100
+POLL_BATCH_SIZE = 1000
+
+Cursor = Dict[str, int]
+
+class StatusEvent:
+    """One status history row, ready to route and send"""
+
+    __slots__ = ("kind", "history_id", "owner_ids", "payload")
+
+    def __init__(self, kind: str, history_id: int, owner_ids: FrozenSet[int], payload: dict):
+        self.kind = kind
+        self.history_id = history_id
+        self.owner_ids = owner_ids  # Users who see the event without the stream-wide permission
+        self.payload = payload
+
+RESYNC = object()  # Queue marker: the client's backlog was dropped
+
+def format_event_id(cursor: Cursor) -> str:
+    return "-".join(str(cursor[kind]) for kind in STREAMS)
+
+def parse_event_id(value: Optional[str]) -> Optional[Cursor]:
+    """Cursor from a Last-Event-ID header; None if absent or malformed"""
+    if not value:
+        return None
+    parts = value.split("-")
+    if len(parts) != len(STREAMS) or not all(part.isdigit() for part in parts):
+        return None
+    return dict(zip(STREAMS, map(int, parts)))
+
+def format_sse(event_id: str, event: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+def recommendation_events_statement(after_id: int, limit: int):
+    return (
+        select(
+            RecommendationStatusHistory.id,
+            RecommendationStatusHistory.recommendation_id,
+            RecommendationStatusHistory.old_status,
+            RecommendationStatusHistory.new_status,
+            RecommendationStatusHistory.changed_by,
+            RecommendationStatusHistory.changed_at,
+            TradeRecommendation.analyst_id,
+        )
+        .join(TradeRecommendation, TradeRecommendation.id == RecommendationStatusHistory.recommendation_id)
+        .where(RecommendationStatusHistory.id > after_id)
+        .order_by(RecommendationStatusHistory.id)
+        .limit(limit)
+    )
+
+def ticket_events_statement(after_id: int, limit: int):
+    return (
+        select(
+            TradeTicketStatusHistory.id,
+            TradeTicketStatusHistory.trade_ticket_id,
+            TradeTicketStatusHistory.old_status,
+            TradeTicketStatusHistory.new_status,
+            TradeTicketStatusHistory.changed_by,
+            TradeTicketStatusHistory.changed_at,
+            TradeTicket.recommendation_id,
+            TradeTicket.created_by,
+            TradeRecommendation.analyst_id,
+        )
+        .join(TradeTicket, TradeTicket.id == TradeTicketStatusHistory.trade_ticket_id)
+        .outerjoin(TradeRecommendation, TradeRecommendation.id == TradeTicket.recommendation_id)
+        .where(TradeTicketStatusHistory.id > after_id)
+        .order_by(TradeTicketStatusHistory.id)
+        .limit(limit)
+    )
+
+def recommendation_event(row) -> StatusEvent:
+    return StatusEvent("recommendation", row.id, frozenset((row.analyst_id,)), {
+        "history_id": row.id,
+        "recommendation_id": row.recommendation_id,
+        "old_status": row.old_status,
+        "new_status": row.new_status,
+        "changed_by": row.changed_by,
+        "changed_at": _isoformat(row.changed_at),
+    })
+
+def ticket_event(row) -> StatusEvent:
+    owners = frozenset(owner for owner in (row.created_by, row.analyst_id) if owner is not None)
+    return StatusEvent("ticket", row.id, owners, {
+        "history_id": row.id,
+        "trade_ticket_id": row.trade_ticket_id,
+        "recommendation_id": row.recommendation_id,
+        "old_status": row.old_status,
+        "new_status": row.new_status,
+        "changed_by": row.changed_by,
+        "changed_at": _isoformat(row.changed_at),
+    })
+
+async def load_events(db: AsyncSession, after: Cursor, limit: int) -> Dict[str, List[StatusEvent]]:
+    """Up to limit events per stream with history ids above the cursor, oldest first"""
+    recommendation_rows = (await db.execute(recommendation_events_statement(after["recommendation"], limit))).all()
+    ticket_rows = (await db.execute(ticket_events_statement(after["ticket"], limit))).all()
+    return {
+        "recommendation": [recommendation_event(row) for row in recommendation_rows],
+        "ticket": [ticket_event(row) for row in ticket_rows],
+    }
+
+async def latest_cursor(db: AsyncSession) -> Cursor:
+    """Cursor just past the newest history row of each stream"""
+    return {
+        "recommendation": (await db.scalar(select(func.max(RecommendationStatusHistory.id)))) or 0,
+        "ticket": (await db.scalar(select(func.max(TradeTicketStatusHistory.id)))) or 0,
+    }
+
+async def ids_in_lookback(db: AsyncSession, cursor: Cursor) -> Dict[str, Set[int]]:
+    """History ids the lookback window of a fresh cursor already covers (not news to anyone)"""
+    ids = {}
+    for kind, model in (("recommendation", RecommendationStatusHistory), ("ticket", TradeTicketStatusHistory)):
+        ids[kind] = set((await db.scalars(
+            select(model.id).where(model.id > cursor[kind] - LOOKBACK_ROWS)
+        )).all())
+    return ids
+
+async def visible_streams(db: AsyncSession, user_id: int) -> FrozenSet[str]:
+    """Streams the user sees in full (STREAM_PERMISSIONS)"""
+    streams = set()
+    for kind, permission_keys in STREAM_PERMISSIONS.items():
+        for permission_key in permission_keys:
+            if await permission_resolver.has_permission_async(db, user_id, permission_key):
+                streams.add(kind)
+                break
+    return frozenset(streams)
+
+class Subscriber:
+    """One connected client: who it is, what it sees in full, and its bounded queue"""
+
+    __slots__ = ("user_id", "streams", "queue", "dropped")
+
+    def __init__(self, user_id: int, streams: FrozenSet[str], queue_size: int):
+        self.user_id = user_id
+        self.streams = streams
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0  # Events discarded because the client fell behind
+
+    def can_see(self, event: StatusEvent) -> bool:
+        return event.kind in self.streams or self.user_id in event.owner_ids
+
+    def offer(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Drop the backlog (and this item) instead of blocking the hub or growing without bound
+            self.dropped += 1
+            while not self.queue.empty():
+                if self.queue.get_nowait() is not RESYNC:
+                    self.dropped += 1
+            self.queue.put_nowait(RESYNC)
+
+class EventHub:
+    """Per-process fan-out of status history rows to SSE clients"""
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        poll_seconds: float = 2.0,
+        queue_size: int = 256,
+        replay_limit: int = 500,
+        keepalive_seconds: float = 15.0,
+    ):
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.queue_size = queue_size
+        self.replay_limit = replay_limit
+        self.keepalive_seconds = keepalive_seconds
+        self._full: Dict[str, Set[Subscriber]] = {kind: set() for kind in STREAMS}
+        self._by_user: Dict[int, Set[Subscriber]] = {}
+        self._count = 0
+        self._cursor: Optional[Cursor] = None  # High-water marks; None while nobody listens
+        self._recent: Dict[str, Set[int]] = {kind: set() for kind in STREAMS}  # Seen ids in the lookback window
+        self._lock: Optional[asyncio.Lock] = None  # Created on the event loop that uses it
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._count
+
+    def start(self):
+        """Start the poll loop on the running event loop"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+
+    def notify(self):
+        """Poll now (history rows were committed); safe to call from any thread"""
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None or not self._count:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            pass  # Loop closed during shutdown
+
+    async def subscribe(self, user_id: int, streams: Iterable[str] = ()) -> Subscriber:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._cursor is None:
+                async with self.session_factory() as db:
+                    cursor = await latest_cursor(db)
+                    self._recent = await ids_in_lookback(db, cursor)
+                self._cursor = cursor
+            subscriber = Subscriber(user_id, frozenset(streams), self.queue_size)
+            for kind in subscriber.streams:
+                self._full[kind].add(subscriber)
+            self._by_user.setdefault(user_id, set()).add(subscriber)
+            self._count += 1
+            return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        for kind in subscriber.streams:
+            self._full[kind].discard(subscriber)
+        owned = self._by_user.get(subscriber.user_id)
+        if owned is not None:
+            owned.discard(subscriber)
+            if not owned:
+                del self._by_user[subscriber.user_id]
+        self._count -= 1
+        if not self._count:
+            self._cursor = None  # Re-read from the latest row when someone subscribes again
+
+    def publish(self, event: StatusEvent):
+        """Queue the event for every subscriber allowed to see it"""
+        targets = self._full[event.kind]
+        owners = [self._by_user[owner] for owner in event.owner_ids if owner in self._by_user]
+        if owners:
+            targets = targets.union(*owners)
+        for subscriber in targets:
+            subscriber.offer(event)
+
+    def cursor(self) -> Cursor:
+        return dict(self._cursor) if self._cursor is not None else {kind: 0 for kind in STREAMS}
+
+    async def poll(self):
+        """Publish history rows committed since the last poll"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # The last client leaving resets self._cursor; finish on the old one
+            cursor, recent = self._cursor, self._recent
+            if cursor is None:
+                return
+            async with self.session_factory() as db:
+                while True:
+                    after = {kind: max(cursor[kind] - LOOKBACK_ROWS, 0) for kind in STREAMS}
+                    batches = await load_events(db, after, POLL_BATCH_SIZE)
+                    for kind, events in batches.items():
+                        for event in events:
+                            if event.history_id in recent[kind]:
+                                continue
+                            recent[kind].add(event.history_id)
+                            cursor[kind] = max(cursor[kind], event.history_id)
+                            self.publish(event)
+                        floor = cursor[kind] - LOOKBACK_ROWS
+                        recent[kind] = {history_id for history_id in recent[kind] if history_id > floor}
+                    if all(len(events) < POLL_BATCH_SIZE for events in batches.values()):
+                        break
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not self._count:
+                continue
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"Status event poll failed: {e}")
+
+    async def stream(
+        self, user_id: int, streams: Iterable[str] = (), resume: Optional[Cursor] = None
+    ) -> AsyncIterator[str]:
+        """SSE text for one client, subscribed for as long as the client reads it"""
+        subscriber = await self.subscribe(user_id, streams)
+        try:
+            yield f"retry: {int(self.poll_seconds * 1000) + 1000}\n\n"
+            cursor = self.cursor()
+            replayed: Set[Tuple[str, int]] = set()
+            if resume is not None:
+                # Subscribed first, so nothing committed meanwhile is lost; the
+                # queue may repeat what is replayed here
+                async with self.session_factory() as db:
+                    missed = await load_events(db, resume, self.replay_limit + 1)
+                if any(len(events) > self.replay_limit for events in missed.values()):
+                    yield format_sse(format_event_id(cursor), "resync", {"reason": "too_many_missed_events"})
+                else:
+                    cursor = dict(resume)
+                    events = sorted(
+                        (event for events in missed.values() for event in events),
+                        key=lambda event: (event.payload["changed_at"] or "", event.kind, event.history_id)
+                    )
+                    for event in events:
+                        replayed.add((event.kind, event.history_id))
+                        cursor[event.kind] = max(cursor[event.kind], event.history_id)
+                        if subscriber.can_see(event):
+                            yield format_sse(format_event_id(cursor), f"{event.kind}.status", event.payload)
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(subscriber.queue.get(), timeout=self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if item is RESYNC:
+                    cursor = self.cursor()
+                    yield format_sse(format_event_id(cursor), "resync", {"reason": "client_too_slow"})
+                    continue
+                if (item.kind, item.history_id) in replayed:
+                    continue
+                cursor[item.kind] = max(cursor[item.kind], item.history_id)
+                yield format_sse(format_event_id(cursor), f"{item.kind}.status", item.payload)
+        finally:
+            self.unsubscribe(subscriber)
+
+def _inserted(instance, action: str):
+    return instance.id if action == "insert" else None
+
+event_hub = EventHub(
+    poll_seconds=settings.EVENT_STREAM_POLL_SECONDS,
+    queue_size=settings.EVENT_STREAM_QUEUE_SIZE,
+    replay_limit=settings.EVENT_STREAM_REPLAY_LIMIT,
+    keepalive_seconds=settings.EVENT_STREAM_KEEPALIVE_SECONDS,
+)
+
+# History rows committed in this process wake the hub instead of waiting for the next poll
+track_commits(RecommendationStatusHistory, _inserted, lambda changes: event_hub.notify())
+track_commits(TradeTicketStatusHistory, _inserted, lambda changes: event_hub.notify())
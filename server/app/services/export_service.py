@@ -0,0 +1,180 @@
+# app/services/export_service.py
+"""
+Streaming export of recommendations (NDJSON / CSV)
+
+Rows are read with yield_per, so the driver fetches EXPORT_BATCH_SIZE rows
+at a time (server-side cursor where the dialect supports one) and nothing
+is held across batches: each batch is enriched with its strategies and
+funds (one IN query each), serialized, and handed to the response before
+the next batch is fetched. Plain column rows are selected instead of ORM
+objects, so the session's identity map does not grow with the export.
+
+A StreamingResponse body runs after the request's dependencies have been
+torn down, so the export opens its own sessions: one holds the streaming
+cursor and a second runs the per-batch lookups, since SQL Server (without
+MARS) cannot run another statement on a connection with pending results.
+"""
+
+import io
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterator, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.replicas import replica_router
+from app.models.funds import Fund
+from app.models.recommendations import TradeRecommendation
+from app.models.relationships import RecommendationStrategy, RecommendationFund
+from app.models.securities import Security
+from app.models.strategies import Strategy
+from app.schemas.recommendations import RecommendationFilters
+from app.services.recommendation_service import RecommendationService
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+EXPORT_COLUMNS = [
+    "id", "analyst_id", "security_id", "ticker", "security_name", "trade_direction",
+    "current_price", "target_price", "time_horizon", "expected_exit_date", "analyst_score",
+    "status", "is_draft", "approved_by", "approved_at", "notes", "strategies", "funds",
+    "created_at", "updated_at",
+]
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+class ExportService:
+
+    @staticmethod
+    def build_export_statement(filters: RecommendationFilters):
+        """Flat recommendation rows (newest first) with the list endpoint's filters"""
+        statement = select(
+            TradeRecommendation.id,
+            TradeRecommendation.analyst_id,
+            TradeRecommendation.security_id,
+            Security.ticker,
+            Security.name.label("security_name"),
+            TradeRecommendation.trade_direction,
+            TradeRecommendation.current_price,
+            TradeRecommendation.target_price,
+            TradeRecommendation.time_horizon,
+            TradeRecommendation.expected_exit_date,
+            TradeRecommendation.analyst_score,
+            TradeRecommendation.status,
+            TradeRecommendation.is_draft,
+            TradeRecommendation.approved_by,
+            TradeRecommendation.approved_at,
+            TradeRecommendation.notes,
+            TradeRecommendation.created_at,
+            TradeRecommendation.updated_at
+        ).join(Security, Security.id == TradeRecommendation.security_id)
+
+        statement = RecommendationService.apply_filters(statement, filters)
+        return statement.order_by(
+            TradeRecommendation.created_at.desc(),
+            TradeRecommendation.id.desc()
+        )
+
+    @staticmethod
+    def _links_by_recommendation(db: Session, statement) -> Dict[int, List[str]]:
+        links: Dict[int, List[str]] = {}
+        for recommendation_id, label in db.execute(statement):
+            if label is not None:
+                links.setdefault(recommendation_id, []).append(label)
+        return links
+
+    @staticmethod
+    def iter_export_batches(
+        db: Session,
+        lookup_db: Session,
+        filters: RecommendationFilters,
+        batch_size: int
+    ) -> Iterator[List[dict]]:
+        """Yield lists of export rows, batch_size at a time
+
+        db streams the recommendation rows; lookup_db (a different connection)
+        loads each batch's strategies and funds.
+        """
+        result = db.execute(
+            ExportService.build_export_statement(filters).execution_options(yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            ids = [row.id for row in partition]
+            strategies = ExportService._links_by_recommendation(lookup_db, (
+                select(
+                    RecommendationStrategy.recommendation_id,
+                    # "Other" links carry free text instead of a strategy
+                    func.coalesce(Strategy.name, RecommendationStrategy.custom_strategy_text)
+                )
+                .outerjoin(Strategy, Strategy.id == RecommendationStrategy.strategy_id)
+                .where(RecommendationStrategy.recommendation_id.in_(ids))
+                .order_by(RecommendationStrategy.recommendation_id, RecommendationStrategy.id)
+            ))
+            funds = ExportService._links_by_recommendation(lookup_db, (
+                select(RecommendationFund.recommendation_id, Fund.code)
+                .join(Fund, Fund.id == RecommendationFund.fund_id)
+                .where(RecommendationFund.recommendation_id.in_(ids))
+                .order_by(RecommendationFund.recommendation_id, Fund.code)
+            ))
+
+            yield [
+                {
+                    **row._asdict(),
+                    "strategies": strategies.get(row.id, []),
+                    "funds": funds.get(row.id, []),
+                }
+                for row in partition
+            ]
+
+    @staticmethod
+    def ndjson_chunks(batches: Iterator[List[dict]]) -> Iterator[str]:
+        """One JSON object per line, one chunk per batch"""
+        for batch in batches:
+            yield "".join(
+                json.dumps({column: row[column] for column in EXPORT_COLUMNS}, default=_json_default) + "\n"
+                for row in batch
+            )
+
+    @staticmethod
+    def csv_chunks(batches: Iterator[List[dict]]) -> Iterator[str]:
+        """Header row, then one chunk per batch; list columns are ';'-separated"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+
+        for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            for row in batch:
+                writer.writerow([
+                    ";".join(value) if isinstance(value, list) else
+                    value.isoformat() if isinstance(value, (datetime, date)) else
+                    value
+                    for value in (row[column] for column in EXPORT_COLUMNS)
+                ])
+            yield buffer.getvalue()
+
+    @staticmethod
+    def stream_recommendations(
+        filters: RecommendationFilters, export_format: str, use_primary: bool = False
+    ) -> Iterator[str]:
+        """Response body generator; owns its sessions (on one read replica) for the life of the stream"""
+        session_factory = replica_router.session_factory(use_primary)
+        with session_factory() as db, session_factory() as lookup_db:
+            batches = ExportService.iter_export_batches(db, lookup_db, filters, settings.EXPORT_BATCH_SIZE)
+            if export_format == "csv":
+                yield from ExportService.csv_chunks(batches)
+            else:
+                yield from ExportService.ndjson_chunks(batches)
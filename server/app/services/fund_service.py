@@ -1,5 +1,7 @@
 # app/services/fund_service.py
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from app.models.funds import Fund
 
@@ -34,4 +36,39 @@ class FundService:
         return db.query(Fund).filter(
             Fund.id.in_(fund_ids),
             Fund.is_active == True
-        ).all()
\ No newline at end of file
+        ).all()
+
+class AsyncFundService:
+    """Async variant of FundService for async request handlers"""
+    
+    @staticmethod
+    async def get_active_funds(db: AsyncSession) -> List[Fund]:
+        """Get all active funds ordered by code"""
+        result = await db.scalars(
+            select(Fund).where(Fund.is_active == True).order_by(Fund.code)
+        )
+        return result.all()
+    
+    @staticmethod
+    async def get_fund_by_id(db: AsyncSession, fund_id: int) -> Optional[Fund]:
+        """Get a specific fund by ID"""
+        result = await db.scalars(
+            select(Fund).where(Fund.id == fund_id, Fund.is_active == True)
+        )
+        return result.first()
+    
+    @staticmethod
+    async def get_fund_by_code(db: AsyncSession, code: str) -> Optional[Fund]:
+        """Get fund by code (e.g., 'OPM', 'GEN')"""
+        result = await db.scalars(
+            select(Fund).where(Fund.code.ilike(code.strip()), Fund.is_active == True)
+        )
+        return result.first()
+    
+    @staticmethod
+    async def get_funds_by_ids(db: AsyncSession, fund_ids: List[int]) -> List[Fund]:
+        """Get multiple funds by their IDs"""
+        result = await db.scalars(
+            select(Fund).where(Fund.id.in_(fund_ids), Fund.is_active == True)
+        )
+        return result.all()
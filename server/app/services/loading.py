@@ -0,0 +1,100 @@
+# app/services/loading.py
+"""
+Eager-load plans derived from response schemas
+
+Instead of hand-written joinedload chains, services ask for the minimum
+set of loader options needed to serialize a Pydantic response model:
+
+- many-to-one relationships are joined (no row multiplication)
+- collections are loaded with selectinload (one extra IN query per level,
+  no cartesian product between sibling collections)
+- relationships the schema never serializes are not loaded at all
+- only the columns the schema (and the loaders) need are selected
+
+Association objects are handled transparently: if a schema field such as
+``strategies: List[StrategyResponse]`` maps to a collection of junction rows
+(RecommendationStrategy) that lack the schema's required fields, the plan
+hops through the junction's many-to-one relationship (``.strategy``).
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple, Type, get_args
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import Mapper, RelationshipProperty, joinedload, selectinload, load_only
+
+def _nested_schema(annotation) -> Optional[Type[BaseModel]]:
+    """Return the Pydantic model inside Optional[...] / List[...] annotations"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        nested = _nested_schema(arg)
+        if nested is not None:
+            return nested
+    return None
+
+def _required_fields(schema: Type[BaseModel]) -> set:
+    return {name for name, field in schema.model_fields.items() if field.is_required()}
+
+def _provides(mapper: Mapper, schema: Type[BaseModel]) -> bool:
+    """Whether instances of mapper expose every required field of schema"""
+    return all(hasattr(mapper.class_, name) for name in _required_fields(schema))
+
+def _association_hop(mapper: Mapper, schema: Type[BaseModel]) -> Optional[RelationshipProperty]:
+    """Find the many-to-one relationship on a junction mapper that provides schema"""
+    for rel in mapper.relationships:
+        if not rel.uselist and _provides(rel.mapper, schema):
+            return rel
+    return None
+
+def _column_attributes(mapper: Mapper, schema: Optional[Type[BaseModel]], relationships) -> list:
+    """Columns needed to serialize schema and to join/match the given relationships"""
+    names = {column.key for column in mapper.primary_key}
+    if schema is not None:
+        names.update(name for name in schema.model_fields if name in mapper.column_attrs)
+    for rel in relationships:
+        for pair in rel.local_remote_pairs:
+            for column in pair:
+                if column.table is mapper.local_table:
+                    names.add(mapper.get_property_by_column(column).key)
+    return [mapper.column_attrs[name].class_attribute for name in sorted(names)]
+
+def _plan(mapper: Mapper, schema: Type[BaseModel], incoming: Optional[RelationshipProperty] = None) -> list:
+    """Build loader options (relative to mapper) for serializing it as schema"""
+    options = []
+    relationships = [incoming] if incoming is not None else []
+
+    for name, field in schema.model_fields.items():
+        rel = mapper.relationships.get(name)
+        nested = _nested_schema(field.annotation)
+        if rel is None or nested is None:
+            continue
+        relationships.append(rel)
+        strategy = selectinload if rel.uselist else joinedload
+
+        if _provides(rel.mapper, nested):
+            options.append(strategy(rel.class_attribute).options(*_plan(rel.mapper, nested, rel)))
+            continue
+
+        hop = _association_hop(rel.mapper, nested)
+        if hop is None:
+            options.append(strategy(rel.class_attribute))
+            continue
+
+        # Junction rows only need their keys; the hop target carries the data
+        options.append(strategy(rel.class_attribute).options(
+            load_only(*_column_attributes(rel.mapper, None, [rel, hop])),
+            joinedload(hop.class_attribute).options(*_plan(hop.mapper, nested, hop))
+        ))
+
+    options.insert(0, load_only(*_column_attributes(mapper, schema, relationships)))
+    return options
+
+@lru_cache(maxsize=None)
+def load_options_for(model, schema: Type[BaseModel]) -> Tuple:
+    """Return the loader options needed to serialize model instances as schema
+
+    The plan is computed once per (model, schema) pair and cached.
+    """
+    return tuple(_plan(inspect(model), schema))
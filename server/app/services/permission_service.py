@@ -0,0 +1,239 @@
+# app/services/permission_service.py
+"""
+Resolved-permission cache
+
+A user's effective permissions follow dbo.GetEffectiveUserPermissions:
+grants from the user's (active) role, then active, unexpired user_permissions
+overrides, which grant or revoke regardless of the role. Inactive users,
+roles and permissions grant nothing.
+
+Instead of joining role_permissions, user_permissions and permissions on
+every authorized request, each user's result is resolved once (one
+round-trip) and kept as an int bitset where bit N is permissions.id N, so
+has_permission() is two dict lookups and a bit test.
+
+Cached sets are dropped:
+
+- for one user, when their user_permissions rows or their role/is_active
+  change, and for everyone when roles, role_permissions or permissions
+  change (ORM commits in this process, app/core/model_events.py)
+- at the earliest expires_at among the overrides it applied, so a temporary
+  grant stops working on time without waiting for an invalidation
+- after PERMISSION_CACHE_TTL_SECONDS, to pick up other processes' changes
+"""
+
+import time
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import inspect, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.core.model_events import track_commits
+from app.models.users import Permission, Role, RolePermission, User, UserPermission
+
+logger = logging.getLogger(__name__)
+
+# (permission_id, is_granted, expires_at, is_override)
+PermissionRow = Tuple[int, bool, Optional[datetime], bool]
+
+class PermissionSet:
+    """One user's effective permissions at a point in time"""
+
+    __slots__ = ("user_id", "bits", "refresh_at", "loaded_at")
+
+    def __init__(self, user_id: int, bits: int, refresh_at: Optional[datetime]):
+        self.user_id = user_id
+        self.bits = bits
+        self.refresh_at = refresh_at  # Earliest expires_at among applied overrides
+        self.loaded_at = time.monotonic()
+
+    def has(self, permission_id: int) -> bool:
+        return bool(self.bits >> permission_id & 1)
+
+    def permission_ids(self) -> list:
+        return [index for index in range(self.bits.bit_length()) if self.bits >> index & 1]
+
+def fold_permissions(rows: Iterable[PermissionRow], now: datetime) -> Tuple[int, Optional[datetime]]:
+    """Bitset and next refresh time from role rows and user override rows
+
+    Role grants are applied first; each active, unexpired override then sets
+    or clears its bit. user_permissions is unique per (user, permission), so
+    at most one override applies to a bit.
+    """
+    bits = 0
+    overrides = []
+    for row in rows:
+        if row[3]:
+            overrides.append(row)
+        elif row[1]:
+            bits |= 1 << row[0]
+
+    refresh_at = None
+    for permission_id, is_granted, expires_at, _ in overrides:
+        if expires_at is not None:
+            if expires_at <= now:
+                continue
+            refresh_at = expires_at if refresh_at is None else min(refresh_at, expires_at)
+        if is_granted:
+            bits |= 1 << permission_id
+        else:
+            bits &= ~(1 << permission_id)
+    return bits, refresh_at
+
+def permission_rows_statement(user_id: int, now: datetime):
+    """Role grants and live user overrides for one user, in a single query"""
+    role_rows = (
+        select(
+            RolePermission.permission_id,
+            RolePermission.is_granted,
+            literal(None, UserPermission.expires_at.type).label("expires_at"),
+            literal(False).label("is_override")
+        )
+        .join(User, User.role_id == RolePermission.role_id)
+        .join(Role, Role.id == RolePermission.role_id)
+        .join(Permission, Permission.id == RolePermission.permission_id)
+        .where(User.id == user_id, User.is_active == True, Role.is_active == True,
+               Permission.is_active == True)
+    )
+    override_rows = (
+        select(
+            UserPermission.permission_id,
+            UserPermission.is_granted,
+            UserPermission.expires_at,
+            literal(True).label("is_override")
+        )
+        .join(User, User.id == UserPermission.user_id)
+        .join(Permission, Permission.id == UserPermission.permission_id)
+        .where(UserPermission.user_id == user_id, UserPermission.is_active == True,
+               User.is_active == True, Permission.is_active == True,
+               or_(UserPermission.expires_at.is_(None), UserPermission.expires_at > now))
+    )
+    return union_all(role_rows, override_rows)
+
+def permission_keys_statement():
+    return select(Permission.permission_key, Permission.id).where(Permission.is_active == True)
+
+class PermissionResolver:
+    """Per-user bitsets of effective permissions, plus the permission key -> id map"""
+
+    def __init__(self, ttl_seconds: float = 0, clock: Callable[[], datetime] = datetime.now):
+        self.ttl_seconds = ttl_seconds
+        # expires_at is compared the way the database does (GETDATE(): server local time)
+        self._clock = clock
+        self._entries: Dict[int, PermissionSet] = {}
+        self._permission_ids: Optional[Dict[str, int]] = None
+        self._generation = 0  # Bumped on every invalidation; loads that straddle one are not kept
+
+    def resolve(self, db: Session, user_id: int) -> PermissionSet:
+        """The user's permission set, resolving it with the sync session if needed"""
+        entry = self._current(user_id)
+        record_cache("permissions", hit=entry is not None)
+        if entry is None:
+            generation, now = self._generation, self._clock()
+            rows = db.execute(permission_rows_statement(user_id, now)).all()
+            entry = self._store(user_id, rows, now, generation)
+        return entry
+
+    async def resolve_async(self, db: AsyncSession, user_id: int) -> PermissionSet:
+        """The user's permission set, resolving it with the async session if needed"""
+        entry = self._current(user_id)
+        record_cache("permissions", hit=entry is not None)
+        if entry is None:
+            generation, now = self._generation, self._clock()
+            rows = (await db.execute(permission_rows_statement(user_id, now))).all()
+            entry = self._store(user_id, rows, now, generation)
+        return entry
+
+    def permission_ids(self, db: Session) -> Dict[str, int]:
+        permission_ids = self._permission_ids
+        if permission_ids is None:
+            generation = self._generation
+            permission_ids = dict(db.execute(permission_keys_statement()).all())
+            if generation == self._generation:
+                self._permission_ids = permission_ids
+        return permission_ids
+
+    async def permission_ids_async(self, db: AsyncSession) -> Dict[str, int]:
+        permission_ids = self._permission_ids
+        if permission_ids is None:
+            generation = self._generation
+            permission_ids = dict((await db.execute(permission_keys_statement())).all())
+            if generation == self._generation:
+                self._permission_ids = permission_ids
+        return permission_ids
+
+    def has_permission(self, db: Session, user_id: int, permission_key: str) -> bool:
+        """Whether the user effectively holds the permission (unknown/inactive keys: no)"""
+        permission_id = self.permission_ids(db).get(permission_key)
+        if permission_id is None:
+            return False
+        return self.resolve(db, user_id).has(permission_id)
+
+    async def has_permission_async(self, db: AsyncSession, user_id: int, permission_key: str) -> bool:
+        permission_id = (await self.permission_ids_async(db)).get(permission_key)
+        if permission_id is None:
+            return False
+        return (await self.resolve_async(db, user_id)).has(permission_id)
+
+    def invalidate_user(self, user_id: int):
+        self._generation += 1
+        self._entries.pop(user_id, None)
+
+    def invalidate(self):
+        """Drop every cached set and the key map"""
+        self._generation += 1
+        self._entries = {}
+        self._permission_ids = None
+        logger.debug("Permission cache invalidated")
+
+    def _current(self, user_id: int) -> Optional[PermissionSet]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry.refresh_at is not None and self._clock() >= entry.refresh_at:
+            return None
+        if self.ttl_seconds and time.monotonic() - entry.loaded_at >= self.ttl_seconds:
+            return None
+        return entry
+
+    def _store(self, user_id: int, rows, now: datetime, generation: int) -> PermissionSet:
+        bits, refresh_at = fold_permissions(rows, now)
+        entry = PermissionSet(user_id, bits, refresh_at)
+        # Rows read before an invalidation may already be stale: use them once, don't keep them
+        if generation == self._generation:
+            self._entries[user_id] = entry
+        return entry
+
+permission_resolver = PermissionResolver(ttl_seconds=settings.PERMISSION_CACHE_TTL_SECONDS)
+
+def _changed_user(user_permission: UserPermission, action: str):
+    # Deleted rows may be expired; fall back to dropping everyone
+    return inspect(user_permission).dict.get("user_id", "*")
+
+def _invalidate_users(changes):
+    user_ids = {user_id for _, user_id in changes}
+    if "*" in user_ids:
+        permission_resolver.invalidate()
+        return
+    for user_id in user_ids:
+        permission_resolver.invalidate_user(user_id)
+
+def _changed_account(user: User, action: str):
+    state = inspect(user)
+    if action == "delete":
+        return state.identity[0]
+    if action == "update" and (
+        state.attrs.role_id.history.has_changes() or state.attrs.is_active.history.has_changes()
+    ):
+        return user.id
+    return None
+
+track_commits(UserPermission, _changed_user, _invalidate_users)
+track_commits(User, _changed_account, _invalidate_users)
+for shared_model in (Role, RolePermission, Permission):
+    track_commits(shared_model, lambda instance, action: True, lambda changes: permission_resolver.invalidate())
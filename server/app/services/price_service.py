@@ -0,0 +1,227 @@
+# app/services/price_service.py
+"""
+Last-price cache in front of the market data provider
+
+Prices are kept per ticker for PRICE_CACHE_TTL_SECONDS. Cache misses do
+not go upstream one by one:
+
+- coalescing: while a ticker is being fetched, further requests for it
+  wait on the same fetch instead of starting another
+- batching: misses arriving within PRICE_BATCH_WINDOW_MS of each other are
+  sent as one multi-ticker request (split at the provider's
+  max_batch_size); a full batch is sent at once
+- a background loop re-fetches, in bulk, every ticker requested within
+  PRICE_IDLE_SECONDS, every PRICE_REFRESH_INTERVAL_SECONDS, so tickers on
+  screen stay warm; tickers idle for longer are dropped
+
+When the provider fails, callers get the last known price marked stale
+rather than an error; only a ticker never fetched before raises
+PriceProviderError.
+
+The cache is per worker process and lives on the event loop; it is not
+thread-safe and is only used from async endpoints.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.metrics import record_cache, record_price_fetch
+from app.integrations.bloomberg import (
+    BloombergClient, MockPriceProvider, PriceProvider, PriceProviderError, PriceQuote
+)
+
+logger = logging.getLogger(__name__)
+
+class CachedPrice:
+    """A provider quote and when this process fetched it"""
+
+    __slots__ = ("quote", "fetched_at", "last_used")
+
+    def __init__(self, quote: PriceQuote, fetched_at: float, last_used: float):
+        self.quote = quote
+        self.fetched_at = fetched_at
+        self.last_used = last_used  # Last time a caller asked for it (drives background refresh)
+
+def normalize_ticker(ticker: str) -> str:
+    return ticker.strip().upper()
+
+class PriceService:
+    """Per-ticker price cache with coalesced, batched upstream fetches"""
+
+    def __init__(
+        self,
+        provider: Optional[PriceProvider],
+        ttl_seconds: float = 30.0,
+        batch_window_seconds: float = 0.01,
+        idle_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.provider = provider
+        self.ttl_seconds = ttl_seconds
+        self.batch_window_seconds = batch_window_seconds
+        self.idle_seconds = idle_seconds
+        self.clock = clock
+        self._entries: Dict[str, CachedPrice] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}  # Ticker -> fetch in progress
+        self._pending: Dict[str, asyncio.Future] = {}  # Misses waiting for the batch window
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()  # Running fetches (the loop only keeps weak references)
+
+    @property
+    def enabled(self) -> bool:
+        return self.provider is not None
+
+    def is_fresh(self, entry: CachedPrice) -> bool:
+        return self.clock() - entry.fetched_at < self.ttl_seconds
+
+    def age_seconds(self, entry: CachedPrice) -> float:
+        return max(self.clock() - entry.fetched_at, 0.0)
+
+    async def get_price(self, ticker: str) -> Optional[CachedPrice]:
+        return (await self.get_prices([ticker])).get(normalize_ticker(ticker))
+
+    async def get_prices(self, tickers: Iterable[str]) -> Dict[str, CachedPrice]:
+        """Prices by ticker, from the cache or the provider; unknown tickers are left out"""
+        now = self.clock()
+        found: Dict[str, CachedPrice] = {}
+        waits: Dict[str, asyncio.Future] = {}
+        for ticker in dict.fromkeys(filter(None, (normalize_ticker(ticker) for ticker in tickers))):
+            entry = self._entries.get(ticker)
+            if entry is not None:
+                entry.last_used = now
+                if self.is_fresh(entry):
+                    found[ticker] = entry
+                    record_cache("prices", hit=True)
+                    continue
+            record_cache("prices", hit=False)
+            waits[ticker] = self._request(ticker)
+
+        if waits:
+            outcomes = await asyncio.gather(*waits.values(), return_exceptions=True)
+            for ticker, outcome in zip(waits, outcomes):
+                if isinstance(outcome, BaseException):
+                    stale = self._entries.get(ticker)
+                    if stale is None:
+                        raise outcome
+                    found[ticker] = stale  # Last known price; callers see its age
+                elif outcome is not None:
+                    found[ticker] = outcome
+        return found
+
+    def _request(self, ticker: str) -> asyncio.Future:
+        """Awaitable for the ticker's next fetch, joining one in progress or pending"""
+        future = self._inflight.get(ticker)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[ticker] = future
+            self._pending[ticker] = future
+            if len(self._pending) >= self.provider.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window_seconds, self._flush)
+        # Shielded: a caller that gives up must not cancel the fetch for the others
+        return asyncio.shield(future)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            task = asyncio.ensure_future(self._fetch(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, futures: Dict[str, asyncio.Future]):
+        """Fetch the tickers in provider-sized batches, concurrently, and settle their futures"""
+        tickers = list(futures)
+        size = self.provider.max_batch_size
+        await asyncio.gather(*(
+            self._fetch_batch({ticker: futures[ticker] for ticker in tickers[start:start + size]})
+            for start in range(0, len(tickers), size)
+        ))
+
+    async def _fetch_batch(self, futures: Dict[str, asyncio.Future]):
+        started = time.perf_counter()
+        try:
+            quotes = await self.provider.get_prices(list(futures))
+        except Exception as e:
+            if not isinstance(e, PriceProviderError):
+                logger.exception(f"Price provider {self.provider.name} failed unexpectedly")
+                e = PriceProviderError(f"Price provider {self.provider.name} failed: {e!r}")
+            logger.warning(f"Price fetch for {len(futures)} tickers failed: {e}")
+            record_price_fetch(self.provider.name, len(futures), time.perf_counter() - started, ok=False)
+            for ticker, future in futures.items():
+                self._inflight.pop(ticker, None)
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # Retrieved here: every waiter may have given up
+            return
+
+        record_price_fetch(self.provider.name, len(futures), time.perf_counter() - started, ok=True)
+        now = self.clock()
+        for ticker, future in futures.items():
+            self._inflight.pop(ticker, None)
+            quote = quotes.get(ticker)
+            previous = self._entries.get(ticker)
+            if quote is None:
+                self._entries.pop(ticker, None)  # No longer priced upstream
+                entry = None
+            else:
+                entry = CachedPrice(quote, now, previous.last_used if previous else now)
+                self._entries[ticker] = entry
+            if not future.done():
+                future.set_result(entry)
+
+    async def refresh(self):
+        """Re-fetch every recently used ticker in bulk and drop idle ones"""
+        now = self.clock()
+        for ticker in [ticker for ticker, entry in self._entries.items() if now - entry.last_used >= self.idle_seconds]:
+            del self._entries[ticker]
+
+        futures = {}
+        loop = asyncio.get_running_loop()
+        for ticker in self._entries:
+            if ticker not in self._inflight:  # Already being fetched
+                futures[ticker] = self._inflight[ticker] = loop.create_future()
+        if futures:
+            await self._fetch(futures)
+
+    async def run_refresh_loop(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Price refresh failed: {e}")
+
+    def cached_tickers(self) -> List[str]:
+        return list(self._entries)
+
+    async def close(self):
+        if self.provider is not None:
+            await self.provider.close()
+
+def build_price_provider() -> Optional[PriceProvider]:
+    """Bloomberg when enabled; mock prices only if PRICE_USE_MOCK opts in; otherwise
+    none (prices unavailable)"""
+    if settings.BLOOMBERG_ENABLED and settings.BLOOMBERG_API_URL:
+        return BloombergClient(
+            settings.BLOOMBERG_API_URL,
+            settings.BLOOMBERG_API_KEY,
+            timeout_seconds=settings.BLOOMBERG_TIMEOUT_SECONDS,
+            max_batch_size=settings.BLOOMBERG_MAX_TICKERS_PER_REQUEST,
+        )
+    if settings.PRICE_USE_MOCK:
+        return MockPriceProvider()
+    return None
+
+price_service = PriceService(
+    build_price_provider(),
+    ttl_seconds=settings.PRICE_CACHE_TTL_SECONDS,
+    batch_window_seconds=settings.PRICE_BATCH_WINDOW_MS / 1000,
+    idle_seconds=settings.PRICE_IDLE_SECONDS,
+)
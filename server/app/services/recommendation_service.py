@@ -1,36 +1,216 @@
 # app/services/recommendation_service.py
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
+from sqlalchemy import and_, or_, func, select, insert, update, Row, Select
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
 
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.models.audit import RecommendationStatusHistory
+from app.models.funds import Fund
 from app.models.recommendations import TradeRecommendation
 from app.models.relationships import RecommendationStrategy, RecommendationFund
-from app.schemas.recommendations import RecommendationCreate, RecommendationUpdate
+from app.models.securities import Security
+from app.models.strategies import Strategy
+from app.schemas.recommendations import (
+    RecommendationCreate,
+    RecommendationBulkItemResult,
+    RecommendationBulkResult,
+    RecommendationTransitionItemResult,
+    RecommendationTransitionRequest,
+    RecommendationTransitionResult,
+    RecommendationUpdate,
+    RecommendationFilters,
+    RecommendationResponse
+)
+from app.services.audit_service import audit_bulk_insert, audit_bulk_update
+from app.services.bulk import insert_returning_ids, insert_rows
+from app.services.event_hub import event_hub
+from app.services.loading import load_options_for
+from app.services.recommendation_workflow import conflict_reason, get_transition
+from app.services.reference_cache import strategy_cache
 from app.services.security_service import SecurityService
-from app.services.strategy_service import StrategyService
+from app.services.trade_ticket_service import utcnow
+
+# Tries of an audited update without a client version before it writes without pinning one
+UPDATE_ATTEMPTS = 3
 
 class RecommendationService:
     
+    @staticmethod
+    def _response_query(db: Session) -> Query:
+        """Query loading exactly what RecommendationResponse serializes"""
+        return db.query(TradeRecommendation).options(
+            *load_options_for(TradeRecommendation, RecommendationResponse)
+        )
+    
+    @staticmethod
+    def apply_filters(query, filters: RecommendationFilters):
+        """Apply list filters to a TradeRecommendation Query or select()"""
+        if filters.analyst_id is not None:
+            query = query.filter(TradeRecommendation.analyst_id == filters.analyst_id)
+        if filters.security_id is not None:
+            query = query.filter(TradeRecommendation.security_id == filters.security_id)
+        if filters.status is not None:
+            query = query.filter(TradeRecommendation.status == filters.status)
+        if filters.created_from is not None:
+            query = query.filter(TradeRecommendation.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            query = query.filter(TradeRecommendation.created_at < filters.created_to)
+        
+        # Junction filters use EXISTS so a recommendation is never duplicated
+        if filters.fund_id is not None:
+            query = query.filter(TradeRecommendation.funds.any(
+                RecommendationFund.fund_id == filters.fund_id
+            ))
+        if filters.strategy_id is not None:
+            query = query.filter(TradeRecommendation.strategies.any(
+                RecommendationStrategy.strategy_id == filters.strategy_id
+            ))
+        
+        return query
+    
+    @staticmethod
+    def _response_select() -> Select:
+        """select() loading exactly what RecommendationResponse serializes"""
+        return select(TradeRecommendation).options(
+            *load_options_for(TradeRecommendation, RecommendationResponse)
+        )
+    
+    @staticmethod
+    def build_page_statement(
+        filters: RecommendationFilters,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        base: Optional[Select] = None
+    ) -> Select:
+        """Keyset page statement: (created_at, id) descending, limit + 1 rows
+        
+        Ordering on (created_at, id) keeps a cursor stable while new
+        recommendations are inserted ahead of it. The extra row tells
+        split_page whether another page exists. base replaces the default
+        RecommendationResponse select (e.g. to select a few columns).
+        """
+        statement = RecommendationService.apply_filters(
+            RecommendationService._response_select() if base is None else base, filters
+        )
+        
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+            statement = statement.filter(or_(
+                TradeRecommendation.created_at < cursor_created_at,
+                and_(
+                    TradeRecommendation.created_at == cursor_created_at,
+                    TradeRecommendation.id < cursor_id
+                )
+            ))
+        
+        return statement.order_by(
+            TradeRecommendation.created_at.desc(),
+            TradeRecommendation.id.desc()
+        ).limit(limit + 1)
+    
+    @staticmethod
+    def validators_select() -> Select:
+        """select() of what conditional GET validators are computed from
+        
+        Per recommendation: id, version (bumped by every write, so changes
+        within the resolution of updated_at are noticed) and updated_at, plus
+        the updated_at of the related rows RecommendationResponse serializes:
+        the security, and the latest of the linked strategies. The strategy
+        links themselves are only written together with the recommendation.
+        No ORM objects and a handful of columns, so it is far cheaper than the
+        response query.
+        """
+        strategies_updated_at = (
+            select(func.max(Strategy.updated_at))
+            .join_from(RecommendationStrategy, Strategy, RecommendationStrategy.strategy_id == Strategy.id)
+            .where(RecommendationStrategy.recommendation_id == TradeRecommendation.id)
+            .correlate(TradeRecommendation)
+            .scalar_subquery()
+        )
+        return select(
+            TradeRecommendation.id,
+            TradeRecommendation.version,
+            TradeRecommendation.updated_at,
+            Security.updated_at.label("security_updated_at"),
+            strategies_updated_at.label("strategies_updated_at")
+        ).outerjoin(Security, Security.id == TradeRecommendation.security_id)
+    
+    @staticmethod
+    def page_validators_statement(
+        filters: RecommendationFilters,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Select:
+        """Validator rows for the keyset window one page covers"""
+        return RecommendationService.build_page_statement(
+            filters, cursor, limit, base=RecommendationService.validators_select()
+        )
+    
+    @staticmethod
+    def filter_drafts(statement: Select, analyst_id: Optional[int] = None) -> Select:
+        """Restrict a TradeRecommendation select to drafts, optionally one analyst's"""
+        statement = statement.where(
+            TradeRecommendation.is_draft == True,
+            TradeRecommendation.status == 'Draft'
+        )
+        if analyst_id:
+            statement = statement.where(TradeRecommendation.analyst_id == analyst_id)
+        return statement
+    
+    @staticmethod
+    def drafts_validators_statement(analyst_id: Optional[int] = None) -> Select:
+        """Validator rows for the drafts get_draft_recommendations returns"""
+        return RecommendationService.filter_drafts(
+            RecommendationService.validators_select(), analyst_id
+        ).order_by(TradeRecommendation.created_at.desc(), TradeRecommendation.id.desc())
+    
+    @staticmethod
+    def split_page(
+        rows: List[TradeRecommendation], limit: int
+    ) -> Tuple[List[TradeRecommendation], Optional[str]]:
+        """Trim the look-ahead row and build the next cursor from the last item"""
+        if len(rows) <= limit:
+            return list(rows), None
+        
+        page = list(rows[:limit])
+        last = page[-1]
+        return page, encode_cursor(last.created_at, last.id)
+    
+    @staticmethod
+    def list_recommendations(
+        db: Session,
+        filters: RecommendationFilters,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[TradeRecommendation], Optional[str]]:
+        """Get one keyset page of recommendations, newest first
+        
+        Returns the page and the cursor for the next page (None on the last page).
+        """
+        statement = RecommendationService.build_page_statement(filters, cursor, limit)
+        return RecommendationService.split_page(db.scalars(statement).all(), limit)
+    
     @staticmethod
     def get_all_recommendations(db: Session) -> List[TradeRecommendation]:
         """Get all recommendations with related data"""
-        return db.query(TradeRecommendation).options(
-            joinedload(TradeRecommendation.security),
-            joinedload(TradeRecommendation.strategies).joinedload(RecommendationStrategy.strategy),
-            joinedload(TradeRecommendation.funds).joinedload(RecommendationFund.fund),
-            joinedload(TradeRecommendation.analyst)
-        ).order_by(TradeRecommendation.created_at.desc()).all()
+        return RecommendationService._response_query(db).order_by(
+            TradeRecommendation.created_at.desc()
+        ).all()
     
     @staticmethod
     def get_draft_recommendations(db: Session, analyst_id: Optional[int] = None) -> List[TradeRecommendation]:
         """Get draft recommendations, optionally filtered by analyst"""
-        query = db.query(TradeRecommendation).options(
-            joinedload(TradeRecommendation.security),
-            joinedload(TradeRecommendation.strategies).joinedload(RecommendationStrategy.strategy),
-            joinedload(TradeRecommendation.funds).joinedload(RecommendationFund.fund),
-            joinedload(TradeRecommendation.analyst)
-        ).filter(
+        query = RecommendationService._response_query(db).filter(
             TradeRecommendation.is_draft == True,
             TradeRecommendation.status == 'Draft'
         )
@@ -43,12 +223,9 @@ class RecommendationService:
     @staticmethod
     def get_recommendation_by_id(db: Session, recommendation_id: int) -> Optional[TradeRecommendation]:
         """Get a specific recommendation with all related data"""
-        return db.query(TradeRecommendation).options(
-            joinedload(TradeRecommendation.security),
-            joinedload(TradeRecommendation.strategies).joinedload(RecommendationStrategy.strategy),
-            joinedload(TradeRecommendation.funds).joinedload(RecommendationFund.fund),
-            joinedload(TradeRecommendation.analyst)
-        ).filter(TradeRecommendation.id == recommendation_id).first()
+        return RecommendationService._response_query(db).filter(
+            TradeRecommendation.id == recommendation_id
+        ).first()
     
     @staticmethod
     def create_recommendation(
@@ -66,10 +243,10 @@ class RecommendationService:
                 detail=f"Security with ID {recommendation_data.security_id} not found"
             )
         
-        # Validate strategies exist
+        # Validate strategies exist (against the cached active strategies)
         if recommendation_data.strategy_ids:
-            strategies = StrategyService.get_strategies_by_ids(db, recommendation_data.strategy_ids)
-            if len(strategies) != len(recommendation_data.strategy_ids):
+            active_strategies = strategy_cache.get(db).by_id
+            if any(strategy_id not in active_strategies for strategy_id in recommendation_data.strategy_ids):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="One or more strategy IDs are invalid"
@@ -129,53 +306,376 @@ class RecommendationService:
             )
     
     @staticmethod
-    def update_recommendation(
+    def bulk_create_recommendations(
         db: Session,
-        recommendation_id: int,
-        recommendation_data: RecommendationUpdate,
-        analyst_id: Optional[int] = None
-    ) -> TradeRecommendation:
-        """Update a recommendation (only drafts can be updated)"""
+        items: List[RecommendationCreate],
+        analyst_id: int,
+        atomic: bool = False
+    ) -> RecommendationBulkResult:
+        """Create a basket of recommendations in one transaction
         
-        # Get the recommendation
-        recommendation = RecommendationService.get_recommendation_by_id(db, recommendation_id)
-        if not recommendation:
+        Security, strategy and fund ids are validated with one IN query per
+        table, against the rows active now. Valid items are inserted with one
+        executemany per table (recommendations with RETURNING id, see
+        app/services/bulk.py, then both junction tables); invalid items are reported per index. With atomic,
+        nothing is inserted if any item is invalid.
+        """
+        security_ids = {item.security_id for item in items}
+        active_securities = set(db.scalars(
+            select(Security.id).where(Security.id.in_(security_ids), Security.is_active == True)
+        ))
+        strategy_ids = {i for item in items for i in item.strategy_ids}
+        active_strategies = set(db.scalars(
+            select(Strategy.id).where(Strategy.id.in_(strategy_ids), Strategy.is_active == True)
+        )) if strategy_ids else set()
+        fund_ids = {i for item in items for i in item.fund_ids}
+        active_funds = set(db.scalars(
+            select(Fund.id).where(Fund.id.in_(fund_ids), Fund.is_active == True)
+        )) if fund_ids else set()
+        
+        results = []
+        valid = []
+        for index, item in enumerate(items):
+            errors = []
+            if item.security_id not in active_securities:
+                errors.append(f"Security with ID {item.security_id} not found")
+            missing_strategies = [i for i in item.strategy_ids if i not in active_strategies]
+            if missing_strategies:
+                errors.append(f"Invalid strategy IDs: {missing_strategies}")
+            missing_funds = [i for i in item.fund_ids if i not in active_funds]
+            if missing_funds:
+                errors.append(f"Invalid fund IDs: {missing_funds}")
+            
+            results.append(RecommendationBulkItemResult(
+                index=index, status="invalid" if errors else "created", errors=errors
+            ))
+            if not errors:
+                valid.append(index)
+        
+        failed = len(items) - len(valid)
+        if not valid or (atomic and failed):
+            for index in valid:
+                results[index].status = "skipped"
+            return RecommendationBulkResult(created=0, failed=failed, results=results)
+        
+        try:
+            created_ids = insert_returning_ids(
+                db,
+                TradeRecommendation,
+                [
+                    {
+                        **items[index].model_dump(exclude={"strategy_ids", "fund_ids"}),
+                        "analyst_id": analyst_id,
+                        "status": "Draft",
+                        "is_draft": True
+                    }
+                    for index in valid
+                ]
+            )
+            
+            strategy_links = []
+            fund_links = []
+            for index, recommendation_id in zip(valid, created_ids):
+                results[index].id = recommendation_id
+                # dict.fromkeys drops duplicate ids while keeping request order
+                strategy_links.extend(
+                    {"recommendation_id": recommendation_id, "strategy_id": strategy_id}
+                    for strategy_id in dict.fromkeys(items[index].strategy_ids)
+                )
+                fund_links.extend(
+                    {"recommendation_id": recommendation_id, "fund_id": fund_id}
+                    for fund_id in dict.fromkeys(items[index].fund_ids)
+                )
+            
+            if strategy_links:
+                db.execute(insert(RecommendationStrategy), strategy_links)
+            if fund_links:
+                db.execute(insert(RecommendationFund), fund_links)
+            
+            db.commit()
+            
+        except IntegrityError as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Database constraint violation: {str(e)}"
+            )
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error creating recommendations: {str(e)}"
+            )
+        
+        audit_bulk_insert(db, TradeRecommendation, created_ids)
+        return RecommendationBulkResult(created=len(valid), failed=failed, results=results)
+    
+    @staticmethod
+    def apply_transition(
+        db: Session,
+        request: RecommendationTransitionRequest,
+        user_id: int
+    ) -> RecommendationTransitionResult:
+        """Move many recommendations through one workflow transition
+        
+        A single conditional UPDATE (WHERE status = the transition's
+        from_status) moves every recommendation that is still in that status,
+        so two PMs deciding the same recommendation cannot both win; the
+        RETURNING ids say which ones moved. Only the ones that did not are
+        looked up again (one IN query) to tell conflicts from unknown ids.
+        Status history rows go in with one executemany.
+        """
+        transition = get_transition(request.action)
+        ids = list(dict.fromkeys(request.ids))  # Drop duplicates, keep request order
+        now = utcnow()
+        values = transition.values(user_id, now, request.notes)
+        
+        # Through the table, like app/services/bulk.py: ORM flush events (and so the
+        # audit trail and the event hub) do not see it; both are told after the commit
+        table = TradeRecommendation.__table__
+        conditions = [table.c.id.in_(ids), table.c.status == transition.from_status]
+        if transition.own_only:
+            conditions.append(table.c.analyst_id == user_id)
+        written = {**values, "updated_at": now, "version": table.c.version + 1}
+        statement = update(table).where(*conditions).values(written)
+        
+        try:
+            if db.get_bind().dialect.update_returning:
+                applied = set(db.scalars(statement.returning(table.c.id)))
+            else:
+                applied = set(db.scalars(select(table.c.id).where(*conditions).with_for_update()))
+                if applied:
+                    db.execute(update(table).where(table.c.id.in_(applied)).values(written))
+            
+            missing = [recommendation_id for recommendation_id in ids if recommendation_id not in applied]
+            current = {}
+            if missing:
+                current = {
+                    row.id: row for row in db.execute(
+                        select(table.c.id, table.c.status, table.c.analyst_id).where(table.c.id.in_(missing))
+                    )
+                }
+            
+            results = []
+            for recommendation_id in ids:
+                if recommendation_id in applied:
+                    results.append(RecommendationTransitionItemResult(
+                        id=recommendation_id, status="applied", current_status=transition.to_status
+                    ))
+                    continue
+                row = current.get(recommendation_id)
+                if row is None:
+                    results.append(RecommendationTransitionItemResult(
+                        id=recommendation_id, status="not_found", errors=["Recommendation not found"]
+                    ))
+                elif row.status != transition.from_status:
+                    results.append(RecommendationTransitionItemResult(
+                        id=recommendation_id, status="conflict", current_status=row.status,
+                        errors=[conflict_reason(transition, row.status)]
+                    ))
+                else:
+                    results.append(RecommendationTransitionItemResult(
+                        id=recommendation_id, status="conflict", current_status=row.status,
+                        errors=[f"You can only {transition.action} your own recommendations"]
+                    ))
+            
+            failed = len(ids) - len(applied)
+            if not applied or (request.atomic and failed):
+                db.rollback()
+                for result in results:
+                    if result.status == "applied":
+                        result.status = "skipped"
+                        result.current_status = transition.from_status
+                return RecommendationTransitionResult(
+                    action=transition.action, applied=0, failed=failed, results=results
+                )
+            
+            moved = [recommendation_id for recommendation_id in ids if recommendation_id in applied]
+            insert_rows(db, RecommendationStatusHistory, [
+                {
+                    "recommendation_id": recommendation_id,
+                    "old_status": transition.from_status,
+                    "new_status": transition.to_status,
+                    "changed_by": user_id,
+                    "notes": request.notes,
+                    "changed_at": now,
+                }
+                for recommendation_id in moved
+            ])
+            db.commit()
+            
+        except IntegrityError as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Database constraint violation: {str(e)}"
+            )
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error applying {transition.action}: {str(e)}"
+            )
+        
+        changes = transition.changes(values)
+        audit_bulk_update(db, TradeRecommendation, [(recommendation_id, changes) for recommendation_id in moved])
+        event_hub.notify()  # Core inserts are invisible to the hub's commit hook
+        return RecommendationTransitionResult(
+            action=transition.action, applied=len(moved), failed=failed, results=results
+        )
+    
+    @staticmethod
+    def _check_updatable(
+        row: Optional[Row],
+        analyst_id: Optional[int] = None,
+        version: Optional[int] = None
+    ):
+        """Raise the HTTP error for a recommendation update_recommendation() may not write"""
+        if row is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Recommendation not found"
             )
         
         # Check if it's a draft
-        if not recommendation.is_draft:
+        if not row.is_draft:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Only draft recommendations can be updated"
             )
         
         # Check ownership (if analyst_id provided)
-        if analyst_id and recommendation.analyst_id != analyst_id:
+        if analyst_id and row.analyst_id != analyst_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You can only update your own recommendations"
             )
         
+        if version is not None and row.version != version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Recommendation was changed by someone else (now version {row.version}); reload it and retry"
+            )
+    
+    @staticmethod
+    def _update_snapshot(
+        db: Session,
+        recommendation_id: int,
+        fields=()
+    ) -> Tuple[Optional[Row], Optional[Security], List[Strategy]]:
+        """A recommendation's is_draft, analyst_id, version and fields, with its
+        security and strategies, in one statement (one row per strategy link)"""
+        table = TradeRecommendation.__table__
+        rows = db.execute(
+            select(
+                table.c.is_draft, table.c.analyst_id, table.c.version,
+                *(table.c[field] for field in fields), Security, Strategy
+            )
+            .join_from(table, Security, Security.id == table.c.security_id)
+            .outerjoin(RecommendationStrategy, RecommendationStrategy.recommendation_id == table.c.id)
+            .outerjoin(Strategy, Strategy.id == RecommendationStrategy.strategy_id)
+            .where(table.c.id == recommendation_id)
+            .order_by(RecommendationStrategy.id)
+        ).all()
+        if not rows:
+            return None, None, []
+        # Custom strategy text links have no Strategy
+        return rows[0], rows[0].Security, [row.Strategy for row in rows if row.Strategy is not None]
+    
+    @staticmethod
+    def update_recommendation(
+        db: Session,
+        recommendation_id: int,
+        recommendation_data: RecommendationUpdate,
+        analyst_id: Optional[int] = None
+    ) -> RecommendationResponse:
+        """Update a recommendation (only drafts can be updated)
+        
+        One UPDATE ... WHERE id = ? AND version = ? (plus the draft and
+        ownership conditions) both checks and writes, and RETURNING gives the
+        new row; the recommendation is neither refreshed nor reloaded. The
+        security and strategies, which an update cannot change, come from one
+        more statement: after the UPDATE, or with auditing on, before it
+        together with the old values of the changed fields. Either way a
+        successful update is two statements. When the UPDATE matches nothing,
+        the row is looked up to tell 404, 400, 403 and 409 (someone else saved
+        since the client read version) apart.
+        
+        Without version in the request the update is unconditional on it, as
+        before. With auditing on, the UPDATE is still pinned to the version
+        whose old values were read, so the audit trail records what was
+        replaced; if another save lands in between, the values are read again
+        and the update retried rather than refused.
+        """
+        update_data = recommendation_data.model_dump(exclude_unset=True, exclude={"version"})
+        client_version = recommendation_data.version
+        table = TradeRecommendation.__table__
+        base_conditions = [table.c.id == recommendation_id, table.c.is_draft == True]
+        if analyst_id:
+            base_conditions.append(table.c.analyst_id == analyst_id)
+        audited = settings.AUDIT_ENABLED
+        
         try:
-            # Update fields that were provided
-            update_data = recommendation_data.dict(exclude_unset=True)
-            for field, value in update_data.items():
-                setattr(recommendation, field, value)
+            for attempt in range(UPDATE_ATTEMPTS):
+                old, security, strategies = None, None, []
+                expected_version = client_version
+                if audited:
+                    old, security, strategies = RecommendationService._update_snapshot(
+                        db, recommendation_id, update_data
+                    )
+                    RecommendationService._check_updatable(old, analyst_id, client_version)
+                    if attempt < UPDATE_ATTEMPTS - 1:
+                        expected_version = old.version
+                    # else: still racing other saves; write unconditionally, as without auditing
+                
+                conditions = list(base_conditions)
+                if expected_version is not None:
+                    conditions.append(table.c.version == expected_version)
+                # Through the table, like app/services/bulk.py: ORM flush events do not see it
+                statement = update(table).where(*conditions).values(
+                    **update_data, updated_at=utcnow(), version=table.c.version + 1
+                )
+                if db.get_bind().dialect.update_returning:
+                    row = db.execute(statement.returning(*table.columns)).first()
+                else:
+                    row = None
+                    if db.execute(statement).rowcount:
+                        row = db.execute(select(*table.columns).where(table.c.id == recommendation_id)).first()
+                if row is not None:
+                    break
+                if audited and client_version is None and attempt < UPDATE_ATTEMPTS - 1:
+                    continue  # Another save moved the version the audit values were read at
+                # Deleted, submitted or reassigned since it was read, or (with version) saved by someone else
+                current, _, _ = RecommendationService._update_snapshot(db, recommendation_id)
+                RecommendationService._check_updatable(current, analyst_id, client_version)
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Recommendation was changed by someone else; reload it and retry"
+                )
             
+            if not audited:
+                _, security, strategies = RecommendationService._update_snapshot(db, recommendation_id)
+            response = RecommendationResponse.model_validate(
+                {**row._mapping, "security": security, "strategies": strategies}
+            )
             db.commit()
-            db.refresh(recommendation)
-            
-            return RecommendationService.get_recommendation_by_id(db, recommendation_id)
             
+        except HTTPException:
+            db.rollback()
+            raise
         except Exception as e:
             db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error updating recommendation: {str(e)}"
             )
+        
+        if old is not None:
+            audit_bulk_update(db, TradeRecommendation, [(recommendation_id, {
+                field: (old._mapping[field], value)
+                for field, value in update_data.items() if old._mapping[field] != value
+            })])
+        return response
     
     @staticmethod
     def delete_recommendation(
@@ -236,21 +736,106 @@ class RecommendationService:
     @staticmethod
     def get_recommendations_by_analyst(db: Session, analyst_id: int) -> List[TradeRecommendation]:
         """Get all recommendations for a specific analyst"""
-        return db.query(TradeRecommendation).options(
-            joinedload(TradeRecommendation.security),
-            joinedload(TradeRecommendation.strategies).joinedload(RecommendationStrategy.strategy),
-            joinedload(TradeRecommendation.funds).joinedload(RecommendationFund.fund)
-        ).filter(
+        return RecommendationService._response_query(db).filter(
             TradeRecommendation.analyst_id == analyst_id
         ).order_by(TradeRecommendation.created_at.desc()).all()
     
     @staticmethod
     def get_recommendations_by_security(db: Session, security_id: int) -> List[TradeRecommendation]:
         """Get all recommendations for a specific security"""
-        return db.query(TradeRecommendation).options(
-            joinedload(TradeRecommendation.analyst),
-            joinedload(TradeRecommendation.strategies).joinedload(RecommendationStrategy.strategy),
-            joinedload(TradeRecommendation.funds).joinedload(RecommendationFund.fund)
-        ).filter(
+        return RecommendationService._response_query(db).filter(
             TradeRecommendation.security_id == security_id
-        ).order_by(TradeRecommendation.created_at.desc()).all()
\ No newline at end of file
+        ).order_by(TradeRecommendation.created_at.desc()).all()
+
+class AsyncRecommendationService:
+    """Async variant of RecommendationService's read paths for async request handlers
+    
+    Writes stay on the sync RecommendationService, which owns the
+    transactional validation logic.
+    """
+    
+    @staticmethod
+    async def list_recommendations(
+        db: AsyncSession,
+        filters: RecommendationFilters,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[TradeRecommendation], Optional[str]]:
+        """Get one keyset page of recommendations, newest first"""
+        statement = RecommendationService.build_page_statement(filters, cursor, limit)
+        result = await db.scalars(statement)
+        return RecommendationService.split_page(result.all(), limit)
+    
+    @staticmethod
+    async def get_all_recommendations(db: AsyncSession) -> List[TradeRecommendation]:
+        """Get all recommendations with related data"""
+        result = await db.scalars(
+            RecommendationService._response_select().order_by(TradeRecommendation.created_at.desc())
+        )
+        return result.all()
+    
+    @staticmethod
+    async def get_draft_recommendations(
+        db: AsyncSession, analyst_id: Optional[int] = None
+    ) -> List[TradeRecommendation]:
+        """Get draft recommendations, optionally filtered by analyst"""
+        statement = RecommendationService.filter_drafts(
+            RecommendationService._response_select(), analyst_id
+        )
+        result = await db.scalars(statement.order_by(TradeRecommendation.created_at.desc()))
+        return result.all()
+    
+    @staticmethod
+    async def get_drafts_validators(db: AsyncSession, analyst_id: Optional[int] = None) -> List[Row]:
+        """Validator rows (validators_select) of the drafts, for conditional GETs"""
+        result = await db.execute(RecommendationService.drafts_validators_statement(analyst_id))
+        return result.all()
+    
+    @staticmethod
+    async def get_page_validators(
+        db: AsyncSession,
+        filters: RecommendationFilters,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Row]:
+        """Validator rows (validators_select) of the recommendations one list page covers"""
+        result = await db.execute(RecommendationService.page_validators_statement(filters, cursor, limit))
+        return result.all()
+    
+    @staticmethod
+    async def get_recommendation_validators(db: AsyncSession, recommendation_id: int) -> Optional[Row]:
+        """One recommendation's validator row, for conditional GETs (None if it does not exist)"""
+        result = await db.execute(
+            RecommendationService.validators_select().where(TradeRecommendation.id == recommendation_id)
+        )
+        return result.first()
+    
+    @staticmethod
+    async def get_recommendation_by_id(
+        db: AsyncSession, recommendation_id: int
+    ) -> Optional[TradeRecommendation]:
+        """Get a specific recommendation with all related data"""
+        result = await db.scalars(
+            RecommendationService._response_select().where(TradeRecommendation.id == recommendation_id)
+        )
+        return result.first()
+    
+    @staticmethod
+    async def get_recommendations_by_analyst(db: AsyncSession, analyst_id: int) -> List[TradeRecommendation]:
+        """Get all recommendations for a specific analyst"""
+        result = await db.scalars(
+            RecommendationService._response_select().where(
+                TradeRecommendation.analyst_id == analyst_id
+            ).order_by(TradeRecommendation.created_at.desc())
+        )
+        return result.all()
+    
+    @staticmethod
+    async def get_recommendations_by_security(db: AsyncSession, security_id: int) -> List[TradeRecommendation]:
+        """Get all recommendations for a specific security"""
+        result = await db.scalars(
+            RecommendationService._response_select().where(
+                TradeRecommendation.security_id == security_id
+            ).order_by(TradeRecommendation.created_at.desc())
+        )
+        return result.all()
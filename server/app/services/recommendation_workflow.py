@@ -0,0 +1,82 @@
+# app/services/recommendation_workflow.py
+"""
+Recommendation status workflow
+
+    Draft --submit--> Proposed --approve--> Approved
+                               --reject---> Rejected
+
+The status CHECK constraint only limits the values a recommendation can
+hold; the moves between them are defined here. A transition names the
+status a recommendation must be in, the status it moves to, the
+permission it needs and the columns it sets, so one transition can be
+applied to many recommendations with a single conditional UPDATE
+(RecommendationService.apply_transition). Approved and Rejected are final.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+RECOMMENDATION_STATUSES = ("Draft", "Proposed", "Approved", "Rejected")
+
+# Set by approve and reject: the PM's decision, whichever way it went
+DECISION_FIELDS = ("approved_by", "approved_at", "approval_notes")
+
+class Transition:
+    """One allowed move between recommendation statuses"""
+
+    __slots__ = ("action", "from_status", "to_status", "permission", "own_only")
+
+    def __init__(self, action: str, from_status: str, to_status: str, permission: str, own_only: bool = False):
+        self.action = action
+        self.from_status = from_status
+        self.to_status = to_status
+        self.permission = permission
+        self.own_only = own_only  # Only the analyst who wrote the recommendation may apply it
+
+    def values(self, user_id: int, now: datetime, notes: Optional[str] = None) -> Dict:
+        """Columns the transition sets, status included"""
+        values = {"status": self.to_status, "is_draft": self.to_status == "Draft"}
+        if self.to_status in ("Approved", "Rejected"):
+            values.update(approved_by=user_id, approved_at=now, approval_notes=notes)
+        return values
+
+    def changes(self, values: Dict) -> Dict[str, Tuple]:
+        """{field: (old, new)} for the audit trail
+
+        The old values follow from from_status: is_draft matches it, and the
+        decision fields are empty because nothing leaves Approved or Rejected.
+        """
+        changes = {"status": (self.from_status, self.to_status)}
+        was_draft = self.from_status == "Draft"
+        if values["is_draft"] != was_draft:
+            changes["is_draft"] = (was_draft, values["is_draft"])
+        for field in DECISION_FIELDS:
+            if values.get(field) is not None:
+                changes[field] = (None, values[field])
+        return changes
+
+TRANSITIONS: Dict[str, Transition] = {
+    transition.action: transition
+    for transition in (
+        Transition("submit", "Draft", "Proposed", "trade.create_recommendation", own_only=True),
+        Transition("approve", "Proposed", "Approved", "trade.approve_recommendations"),
+        Transition("reject", "Proposed", "Rejected", "trade.approve_recommendations"),
+    )
+}
+
+def allowed_actions(status: str) -> List[str]:
+    """Actions that can be applied to a recommendation in status"""
+    return [action for action, transition in TRANSITIONS.items() if transition.from_status == status]
+
+def get_transition(action: str) -> Transition:
+    """The transition for action; ValueError if there is none"""
+    try:
+        return TRANSITIONS[action]
+    except KeyError:
+        raise ValueError(f"Unknown recommendation transition: {action}") from None
+
+def conflict_reason(transition: Transition, status: str) -> str:
+    """Why transition cannot be applied to a recommendation in status"""
+    actions = allowed_actions(status)
+    allowed = f" (allowed: {', '.join(actions)})" if actions else ""
+    return f"Recommendation is {status}; {transition.action} applies to {transition.from_status} recommendations{allowed}"
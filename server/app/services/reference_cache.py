@@ -0,0 +1,145 @@
+# app/services/reference_cache.py
+"""
+Versioned in-process cache for reference data (funds, strategies)
+
+Funds and strategies change a few times a year but are read on every page
+load and validated on every recommendation write. Each ReferenceCache holds
+an immutable snapshot of the active rows:
+
+- items in display order, plus lookups by id and by natural key (fund code,
+  strategy name; case-insensitive)
+- a content-hash ETag, identical across workers for identical data, used for
+  If-None-Match / 304 responses
+- a version counter that increases whenever a reload changes the content
+
+Snapshots are dropped when fund/strategy rows are committed through the ORM
+in this process (app/core/model_events.py), when invalidate() is called, and
+after REFERENCE_CACHE_TTL_SECONDS so changes made by other processes are
+picked up. The next reader reloads.
+"""
+
+import time
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.core.model_events import track_commits
+from app.models.funds import Fund
+from app.models.strategies import Strategy
+from app.schemas.funds import FundResponse
+from app.schemas.strategies import StrategyResponse
+from app.services.fund_service import FundService, AsyncFundService
+from app.services.strategy_service import StrategyService, AsyncStrategyService
+
+logger = logging.getLogger(__name__)
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+class ReferenceSnapshot(Generic[SchemaT]):
+    """Immutable view of one reference table at a point in time"""
+
+    def __init__(self, items: List[SchemaT], key: Callable[[SchemaT], str], version: int):
+        self.items = items
+        self.by_id: Dict[int, SchemaT] = {item.id: item for item in items}
+        self.by_key: Dict[str, SchemaT] = {key(item).strip().upper(): item for item in items}
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+        digest = hashlib.sha256()
+        for item in items:
+            digest.update(item.model_dump_json().encode())
+            digest.update(b"\n")
+        self.etag = f'"{digest.hexdigest()[:32]}"'
+
+    def get_by_key(self, key: str) -> Optional[SchemaT]:
+        return self.by_key.get(key.strip().upper())
+
+class ReferenceCache(Generic[SchemaT]):
+    """Lazily loaded, invalidatable snapshot of one reference table"""
+
+    def __init__(
+        self,
+        name: str,
+        schema: Type[SchemaT],
+        key: Callable[[SchemaT], str],
+        load: Callable[[Session], list],
+        load_async: Callable[[AsyncSession], Awaitable[list]],
+        ttl_seconds: float = 0
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self._schema = schema
+        self._key = key
+        self._load = load
+        self._load_async = load_async
+        self._snapshot: Optional[ReferenceSnapshot[SchemaT]] = None
+        self._version = 0
+        self._last_etag: Optional[str] = None
+        self._generation = 0  # Bumped on invalidate(); loads that straddle one are not kept
+
+    def get(self, db: Session) -> ReferenceSnapshot[SchemaT]:
+        """Current snapshot, loading it with the sync session if needed"""
+        snapshot = self._current()
+        record_cache(self.name, hit=snapshot is not None)
+        if snapshot is None:
+            generation = self._generation
+            snapshot = self._store(self._load(db), generation)
+        return snapshot
+
+    async def get_async(self, db: AsyncSession) -> ReferenceSnapshot[SchemaT]:
+        """Current snapshot, loading it with the async session if needed"""
+        snapshot = self._current()
+        record_cache(self.name, hit=snapshot is not None)
+        if snapshot is None:
+            generation = self._generation
+            snapshot = self._store(await self._load_async(db), generation)
+        return snapshot
+
+    def invalidate(self):
+        """Drop the snapshot; the next reader reloads from the database"""
+        self._generation += 1
+        self._snapshot = None
+        logger.debug(f"Reference cache '{self.name}' invalidated")
+
+    def _current(self) -> Optional[ReferenceSnapshot[SchemaT]]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if self.ttl_seconds and time.monotonic() - snapshot.loaded_at >= self.ttl_seconds:
+            return None
+        return snapshot
+
+    def _store(self, rows: list, generation: int) -> ReferenceSnapshot[SchemaT]:
+        items = [self._schema.model_validate(row) for row in rows]
+        snapshot = ReferenceSnapshot(items, self._key, self._version)
+        if snapshot.etag != self._last_etag:
+            self._version += 1
+            self._last_etag = snapshot.etag
+        snapshot.version = self._version
+
+        # Rows read before an invalidation may already be stale: serve them once, don't keep them
+        if generation == self._generation:
+            self._snapshot = snapshot
+        return snapshot
+
+fund_cache: ReferenceCache[FundResponse] = ReferenceCache(
+    "funds", FundResponse, key=lambda fund: fund.code,
+    load=FundService.get_active_funds, load_async=AsyncFundService.get_active_funds,
+    ttl_seconds=settings.REFERENCE_CACHE_TTL_SECONDS
+)
+
+strategy_cache: ReferenceCache[StrategyResponse] = ReferenceCache(
+    "strategies", StrategyResponse, key=lambda strategy: strategy.name,
+    load=StrategyService.get_active_strategies, load_async=AsyncStrategyService.get_active_strategies,
+    ttl_seconds=settings.REFERENCE_CACHE_TTL_SECONDS
+)
+
+# Any committed fund/strategy write in this process drops the matching snapshot
+track_commits(Fund, lambda fund, action: True, lambda changes: fund_cache.invalidate())
+track_commits(Strategy, lambda strategy, action: True, lambda changes: strategy_cache.invalidate())
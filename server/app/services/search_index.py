@@ -0,0 +1,258 @@
+# app/services/search_index.py
+"""
+In-process search index for the securities autocomplete
+
+The SQL search path (ILIKE '%q%' on ticker and name) cannot use the ticker
+index and scans the securities table on every keystroke. This index holds the
+active securities in memory and answers the same queries without touching
+the database:
+
+- a sorted ticker array searched with bisect serves as the ticker prefix tree
+  (a prefix range is contiguous, and already in ticker order)
+- a sorted array of (name token, ticker, id) answers word-prefix name matches
+- a trigram -> ids map narrows arbitrary substring matches on ticker and name
+
+Results are ranked exact ticker > ticker prefix > name word prefix > any other
+substring match, and by ticker within each tier.
+
+The index is built at startup (see app/main.py) and follows inserts, updates
+and deactivations committed through the ORM in this process via
+app/core/model_events.py. Writes made by other processes are picked up by the
+periodic rebuild (SECURITY_SEARCH_INDEX_REFRESH_SECONDS).
+"""
+
+import re
+import asyncio
+import threading
+import logging
+import heapq
+from bisect import bisect_left, insort
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import inspect
+
+from app.core.database import ReadSessionLocal
+from app.core.model_events import track_commits
+from app.models.securities import Security
+from app.schemas.securities import SecurityResponse
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[A-Z0-9]+")
+
+# Sorts after any normalized ticker, to find the end of a token's run
+_MAX_KEY = "\uffff"
+
+# Above this many substring candidates it is cheaper to walk tickers in order
+_SORT_CANDIDATES_LIMIT = 2000
+
+def _normalize(text: Optional[str]) -> str:
+    return (text or "").strip().upper()
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _tokens(name: str) -> Set[str]:
+    return set(_TOKEN_PATTERN.findall(name))
+
+class SecuritySearchIndex:
+    """Ranked ticker/name search over active securities"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ready = False
+        self._clear()
+
+    def _clear(self):
+        self._entries: Dict[int, SecurityResponse] = {}
+        self._keys: Dict[int, Tuple[str, str]] = {}  # id -> (ticker, name), normalized
+        self._by_ticker: Dict[str, int] = {}
+        self._tickers: List[str] = []
+        self._tokens: List[Tuple[str, str, int]] = []
+        self._trigrams: Dict[str, Set[int]] = {}
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been built and can serve searches"""
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def rebuild(self, securities: Iterable):
+        """Replace the index contents with the given (active) securities
+
+        The new index is built aside and swapped in, so searches keep being
+        served from the old contents while a rebuild runs.
+        """
+        fresh = SecuritySearchIndex()
+        for security in securities:
+            fresh._add(SecurityResponse.model_validate(security), keep_sorted=False)
+        fresh._tickers.sort()
+        fresh._tokens.sort()
+
+        with self._lock:
+            for attribute in ("_entries", "_keys", "_by_ticker", "_tickers", "_tokens", "_trigrams"):
+                setattr(self, attribute, getattr(fresh, attribute))
+            self._ready = True
+        logger.info(f"Security search index built with {len(self._entries)} securities")
+
+    def upsert(self, security: SecurityResponse):
+        """Add or refresh one security; inactive securities are removed"""
+        with self._lock:
+            self._remove(security.id)
+            if security.is_active:
+                self._add(security)
+
+    def remove(self, security_id: int):
+        with self._lock:
+            self._remove(security_id)
+
+    def search(self, query: str, limit: int = 10) -> List[SecurityResponse]:
+        """Ranked search: exact ticker, ticker prefix, name word prefix, substring"""
+        q = _normalize(query)
+        if not q or limit <= 0:
+            return []
+
+        with self._lock:
+            found: List[int] = []
+            seen: Set[int] = set()
+
+            def take(ids: Iterable[int]) -> bool:
+                for security_id in ids:
+                    if security_id not in seen:
+                        seen.add(security_id)
+                        found.append(security_id)
+                        if len(found) >= limit:
+                            return True
+                return False
+
+            tiers = (
+                lambda: [self._by_ticker[q]] if q in self._by_ticker else [],
+                lambda: self._ticker_prefix(q),
+                lambda: self._name_prefix(q),
+                lambda: self._substring(q, seen),
+            )
+            for tier in tiers:
+                if take(tier()):
+                    break
+            return [self._entries[security_id] for security_id in found]
+
+    # ----- lookups (called with the lock held) -----
+
+    def _ticker_prefix(self, q: str):
+        tickers = self._tickers
+        for position in range(bisect_left(tickers, q), len(tickers)):
+            if not tickers[position].startswith(q):
+                break
+            yield self._by_ticker[tickers[position]]
+
+    def _name_prefix(self, q: str):
+        # Each distinct token's run is already in ticker order: merge the runs lazily
+        tokens = self._tokens
+        runs = []
+        position = bisect_left(tokens, (q,))
+        while position < len(tokens) and tokens[position][0].startswith(q):
+            end = bisect_left(tokens, (tokens[position][0], _MAX_KEY), position)
+            runs.append((tokens[i] for i in range(position, end)))
+            position = end
+        for _, _, security_id in heapq.merge(*runs, key=itemgetter(1)):
+            yield security_id
+
+    def _substring(self, q: str, exclude: Set[int]):
+        candidates = None
+        if len(q) >= 3:
+            postings = [self._trigrams.get(gram) for gram in _trigrams(q)]
+            if any(posting is None for posting in postings):
+                return []
+            candidates = min(postings, key=len)
+            if len(candidates) <= _SORT_CANDIDATES_LIMIT:
+                return sorted(
+                    (security_id for security_id in candidates - exclude if self._contains(security_id, q)),
+                    key=lambda security_id: self._keys[security_id][0]
+                )
+        # Many candidates: walk tickers in order and stop as soon as enough match
+        return (
+            security_id for security_id in map(self._by_ticker.__getitem__, self._tickers)
+            if security_id not in exclude
+            and (candidates is None or security_id in candidates)
+            and self._contains(security_id, q)
+        )
+
+    def _contains(self, security_id: int, q: str) -> bool:
+        ticker, name = self._keys[security_id]
+        return q in ticker or q in name
+
+    # ----- maintenance (called with the lock held) -----
+
+    def _add(self, security: SecurityResponse, keep_sorted: bool = True):
+        ticker, name = _normalize(security.ticker), _normalize(security.name)
+        add = insort if keep_sorted else list.append
+        self._entries[security.id] = security
+        self._keys[security.id] = (ticker, name)
+        self._by_ticker[ticker] = security.id
+        add(self._tickers, ticker)
+        for token in _tokens(name):
+            add(self._tokens, (token, ticker, security.id))
+        for gram in _trigrams(ticker) | _trigrams(name):
+            self._trigrams.setdefault(gram, set()).add(security.id)
+
+    def _remove(self, security_id: int):
+        keys = self._keys.pop(security_id, None)
+        if keys is None:
+            return
+        ticker, name = keys
+        del self._entries[security_id]
+        if self._by_ticker.get(ticker) == security_id:
+            del self._by_ticker[ticker]
+            self._tickers.pop(bisect_left(self._tickers, ticker))
+        for token in _tokens(name):
+            position = bisect_left(self._tokens, (token, ticker, security_id))
+            if position < len(self._tokens) and self._tokens[position] == (token, ticker, security_id):
+                self._tokens.pop(position)
+        for gram in _trigrams(ticker) | _trigrams(name):
+            postings = self._trigrams.get(gram)
+            if postings is not None:
+                postings.discard(security_id)
+                if not postings:
+                    del self._trigrams[gram]
+
+    # ----- ORM change tracking -----
+
+    def _snapshot(self, security: Security, action: str):
+        if not self._ready:
+            return None
+        if action == "delete":
+            return inspect(security).identity[0]
+        return SecurityResponse.model_validate(security)
+
+    def _apply(self, changes):
+        for action, value in changes:
+            if action == "delete":
+                self.remove(value)
+            else:
+                self.upsert(value)
+
+security_search_index = SecuritySearchIndex()
+track_commits(Security, security_search_index._snapshot, security_search_index._apply)
+
+def load_security_search_index():
+    """(Re)build the shared index from the active securities in the database"""
+    db = ReadSessionLocal()
+    try:
+        security_search_index.rebuild(
+            db.query(Security).filter(Security.is_active == True).all()
+        )
+    finally:
+        db.close()
+
+async def refresh_security_search_index(interval_seconds: float):
+    """Rebuild the shared index every interval_seconds (picks up other processes' writes)"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(load_security_search_index)
+        except Exception as e:
+            logger.error(f"Security search index refresh failed: {e}")
@@ -1,8 +1,11 @@
 # app/services/security_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, select
 from typing import List, Optional
+from app.core.metrics import record_cache
 from app.models.securities import Security
+from app.services.search_index import security_search_index
 
 class SecurityService:
     
@@ -40,4 +43,55 @@ class SecurityService:
         return db.query(Security).filter(
             Security.ticker.ilike(ticker.strip()),
             Security.is_active == True
-        ).first()
\ No newline at end of file
+        ).first()
+
+class AsyncSecurityService:
+    """Async variant of SecurityService for async request handlers"""
+    
+    @staticmethod
+    async def get_all_securities(db: AsyncSession) -> List[Security]:
+        """Get all active securities"""
+        result = await db.scalars(
+            select(Security).where(Security.is_active == True).order_by(Security.ticker)
+        )
+        return result.all()
+    
+    @staticmethod
+    async def get_security_by_id(db: AsyncSession, security_id: int) -> Optional[Security]:
+        """Get a specific security by ID"""
+        result = await db.scalars(
+            select(Security).where(Security.id == security_id, Security.is_active == True)
+        )
+        return result.first()
+    
+    @staticmethod
+    async def search_securities(db: AsyncSession, query: str, limit: int = 10) -> List[Security]:
+        """Search securities by ticker or name
+        
+        Served from the in-memory search index once it is built (ranked exact
+        ticker > ticker prefix > name match); falls back to SQL until then.
+        """
+        record_cache("security_search_index", hit=security_search_index.ready)
+        if security_search_index.ready:
+            return security_search_index.search(query, limit)
+        
+        search_term = f"%{query.upper()}%"
+        
+        result = await db.scalars(
+            select(Security).where(
+                Security.is_active == True,
+                or_(
+                    Security.ticker.ilike(search_term),
+                    Security.name.ilike(search_term)
+                )
+            ).order_by(Security.ticker).limit(limit)
+        )
+        return result.all()
+    
+    @staticmethod
+    async def get_security_by_ticker(db: AsyncSession, ticker: str) -> Optional[Security]:
+        """Get security by ticker symbol"""
+        result = await db.scalars(
+            select(Security).where(Security.ticker.ilike(ticker.strip()), Security.is_active == True)
+        )
+        return result.first()
@@ -1,6 +1,8 @@
 # app/services/strategy_service.py
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from app.models.strategies import Strategy
 
 class StrategyService:
@@ -27,3 +29,30 @@ class StrategyService:
             Strategy.id.in_(strategy_ids),
             Strategy.is_active == True
         ).all()
+
+class AsyncStrategyService:
+    """Async variant of StrategyService for async request handlers"""
+    
+    @staticmethod
+    async def get_active_strategies(db: AsyncSession) -> List[Strategy]:
+        """Get all active strategies ordered by name"""
+        result = await db.scalars(
+            select(Strategy).where(Strategy.is_active == True).order_by(Strategy.name)
+        )
+        return result.all()
+    
+    @staticmethod
+    async def get_strategy_by_id(db: AsyncSession, strategy_id: int) -> Optional[Strategy]:
+        """Get a specific strategy by ID"""
+        result = await db.scalars(
+            select(Strategy).where(Strategy.id == strategy_id, Strategy.is_active == True)
+        )
+        return result.first()
+    
+    @staticmethod
+    async def get_strategies_by_ids(db: AsyncSession, strategy_ids: List[int]) -> List[Strategy]:
+        """Get multiple strategies by their IDs"""
+        result = await db.scalars(
+            select(Strategy).where(Strategy.id.in_(strategy_ids), Strategy.is_active == True)
+        )
+        return result.all()
@@ -0,0 +1,357 @@
+# app/services/trade_ticket_service.py
+"""
+Trade ticket creation and submission to CRD
+
+Tickets are created from approved recommendations in bulk: one ticket per
+fund that trades, sized by app/services/allocation.py and inserted with one
+executemany per table.
+
+Submitting does not call CRD. The ticket's move to Submitted_to_CRD, its
+status history row and a crd_outbox row holding the order are committed in
+one transaction, and the request returns; app/services/crd_dispatcher.py
+delivers outbox rows to CRD in the background. An order is never lost to a
+crash between the status change and the CRD call, and never sent for a
+status change that rolled back.
+"""
+
+import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.audit import TradeTicketStatusHistory
+from app.models.recommendations import TradeRecommendation
+from app.models.relationships import RecommendationFund, RecommendationStrategy
+from app.models.strategies import Strategy
+from app.models.trade_tickets import CrdOutbox, TradeTicket
+from app.schemas.trade_tickets import (
+    AllocatedTicket,
+    TicketAllocationItemResult,
+    TicketAllocationRequest,
+    TicketAllocationResult
+)
+from app.services.allocation import AllocationBatch, allocate, from_ticks
+from app.services.audit_service import audit_bulk_insert
+from app.services.bulk import insert_returning_ids, insert_rows
+from app.services.event_hub import event_hub
+from app.services.reference_cache import fund_cache
+
+# Tickets in these statuses can be (re)submitted
+SUBMITTABLE_STATUSES = ("Draft", "CRD_Error")
+
+ZERO = Decimal("0.0000")
+
+def utcnow() -> datetime:
+    """Naive UTC now, as stored in timestamp columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def crd_idempotency_key(ticket_id: int, submission: int) -> str:
+    """CRD idempotency key: the ticket id (which is also the CRD order id) and
+    the submission number, so retries repeat a key and resubmissions do not"""
+    return f"ticket-{ticket_id}-{submission}"
+
+def _decimal(value: Optional[Decimal]) -> Optional[str]:
+    return str(value) if value is not None else None
+
+def build_crd_order(ticket: TradeTicket, idempotency_key: str, submitted_by: int) -> dict:
+    """CRD order payload for a ticket (security and fund loaded)"""
+    return {
+        "idempotency_key": idempotency_key,
+        "order_id": ticket.id,
+        "ticker": ticket.security.ticker,
+        "side": ticket.trade_direction,
+        "fund": ticket.fund.code if ticket.fund else None,
+        "account_code": ticket.account_code,
+        "target_price": _decimal(ticket.target_price),
+        "current_position": _decimal(ticket.current_position),
+        "benchmark_position": _decimal(ticket.benchmark_position),
+        "new_position": _decimal(ticket.new_position),
+        "allocation_percentage": _decimal(ticket.allocation_percentage),
+        "strategies": ticket.strategies_for_crd,
+        "notes": ticket.timing_notes,
+        "submitted_by": submitted_by,
+    }
+
+def _links_by_recommendation(db: Session, statement) -> Dict[int, list]:
+    links = defaultdict(list)
+    for recommendation_id, value in db.execute(statement):
+        links[recommendation_id].append(value)
+    return links
+
+class TradeTicketService:
+
+    @staticmethod
+    def allocate_tickets(db: Session, request: TicketAllocationRequest, user_id: int) -> TicketAllocationResult:
+        """Draft tickets for approved recommendations, sized per fund by the allocation engine
+
+        Recommendations, their funds and strategies and any existing tickets
+        are loaded with one IN query each; every valid recommendation is
+        allocated in one allocate() call, and the tickets and their status
+        history rows are inserted with one executemany each. Invalid
+        recommendations are reported per index; with atomic, nothing is
+        created if any is invalid. A dry run returns the allocations only.
+        """
+        items = request.recommendations
+        ids = list({item.recommendation_id for item in items})
+        recommendations = {
+            row.id: row for row in db.execute(
+                select(TradeRecommendation.id, TradeRecommendation.security_id, TradeRecommendation.trade_direction,
+                       TradeRecommendation.target_price, TradeRecommendation.status)
+                .where(TradeRecommendation.id.in_(ids))
+            )
+        }
+        funds = _links_by_recommendation(db, (
+            select(RecommendationFund.recommendation_id, RecommendationFund.fund_id)
+            .where(RecommendationFund.recommendation_id.in_(ids))
+            .order_by(RecommendationFund.recommendation_id, RecommendationFund.id)
+        ))
+        strategies = _links_by_recommendation(db, (
+            select(
+                RecommendationStrategy.recommendation_id,
+                # "Other" links carry free text instead of a strategy
+                func.coalesce(Strategy.name, RecommendationStrategy.custom_strategy_text)
+            )
+            .outerjoin(Strategy, Strategy.id == RecommendationStrategy.strategy_id)
+            .where(RecommendationStrategy.recommendation_id.in_(ids))
+            .order_by(RecommendationStrategy.recommendation_id, RecommendationStrategy.id)
+        ))
+        ticketed = set(db.scalars(
+            select(TradeTicket.recommendation_id).distinct()
+            .where(TradeTicket.recommendation_id.in_(ids), TradeTicket.status != 'Cancelled')
+        ))
+        active_funds = fund_cache.get(db).by_id
+
+        results = []
+        batch = AllocationBatch()
+        valid = []  # (index, fund ids in batch column order, their positions or None)
+        seen = set()
+        for index, item in enumerate(items):
+            errors = []
+            recommendation = recommendations.get(item.recommendation_id)
+            fund_ids = list(dict.fromkeys(funds.get(item.recommendation_id, [])))
+            positions = {position.fund_id: position for position in item.positions}
+            if recommendation is None:
+                errors.append(f"Recommendation with ID {item.recommendation_id} not found")
+            else:
+                if recommendation.status != 'Approved':
+                    errors.append("Only Approved recommendations can be allocated")
+                if item.recommendation_id in ticketed:
+                    errors.append("Recommendation already has trade tickets")
+                if item.recommendation_id in seen:
+                    errors.append("Recommendation appears more than once")
+                if not fund_ids:
+                    errors.append("Recommendation has no funds")
+                inactive = [fund_id for fund_id in fund_ids if fund_id not in active_funds]
+                if inactive:
+                    errors.append(f"Inactive fund IDs: {inactive}")
+                unknown = [fund_id for fund_id in positions if fund_id not in fund_ids]
+                if unknown:
+                    errors.append(f"Fund IDs not on the recommendation: {unknown}")
+                if request.method != "benchmark_relative":
+                    if item.quantity is None:
+                        errors.append(f"quantity is required for {request.method}")
+                    weights = [
+                        positions[fund_id].weight if fund_id in positions else None for fund_id in fund_ids
+                    ]
+                    if fund_ids and not any(weight is None or weight > 0 for weight in weights):
+                        errors.append("Fund weights must not all be zero")
+            seen.add(item.recommendation_id)
+
+            results.append(TicketAllocationItemResult(
+                index=index, recommendation_id=item.recommendation_id,
+                status="invalid" if errors else ("allocated" if request.dry_run else "created"), errors=errors
+            ))
+            if errors:
+                continue
+            fund_positions = [positions.get(fund_id) for fund_id in fund_ids]
+            batch.add(
+                recommendation.trade_direction,
+                [
+                    (position.current_position, position.benchmark_position, position.weight, position.cap)
+                    if position is not None else (None, None, None, None)
+                    for position in fund_positions
+                ],
+                quantity=item.quantity,
+                multiple=item.benchmark_multiple
+            )
+            valid.append((index, fund_ids, fund_positions))
+
+        if valid:
+            allocation = allocate(request.method, batch)
+            out_of_range = allocation.out_of_range().tolist()
+            for row, (index, fund_ids, fund_positions) in enumerate(valid):
+                result = results[index]
+                if out_of_range[row]:
+                    result.status = "invalid"
+                    result.errors.append("New positions exceed DECIMAL(18,4)")
+                    continue
+                result.unallocated_quantity = from_ticks(int(allocation.unallocated[row]))
+                result.tickets = [
+                    AllocatedTicket(
+                        fund_id=fund_ids[column],
+                        current_position=fund_positions[column].current_position if fund_positions[column] else ZERO,
+                        benchmark_position=fund_positions[column].benchmark_position if fund_positions[column] else ZERO,
+                        new_position=new_position, trade_quantity=trade, allocation_percentage=percentage
+                    )
+                    for column, new_position, trade, percentage in allocation.rows(row)
+                ]
+            valid = [entry for entry in valid if results[entry[0]].status != "invalid"]
+
+        failed = len(items) - len(valid)
+        if request.dry_run:
+            return TicketAllocationResult(created=0, failed=failed, results=results)
+        if not valid or (request.atomic and failed):
+            for index, _, _ in valid:
+                results[index].status = "skipped"
+            return TicketAllocationResult(created=0, failed=failed, results=results)
+
+        now = utcnow()
+        tickets = []  # (item, recommendation, allocated ticket) in insert order
+        for index, _, _ in valid:
+            item = items[index]
+            recommendation = recommendations[item.recommendation_id]
+            tickets.extend((item, recommendation, ticket) for ticket in results[index].tickets)
+
+        try:
+            created_ids = insert_returning_ids(db, TradeTicket, [
+                {
+                    "recommendation_id": recommendation.id,
+                    "created_by": user_id,
+                    "security_id": recommendation.security_id,
+                    "fund_id": ticket.fund_id,
+                    "trade_direction": recommendation.trade_direction,
+                    "target_price": recommendation.target_price,
+                    "current_position": ticket.current_position,
+                    "benchmark_position": ticket.benchmark_position,
+                    "new_position": ticket.new_position,
+                    "allocation_percentage": ticket.allocation_percentage,
+                    "strategies_for_crd": ",".join(strategies.get(recommendation.id, [])) or None,
+                    "timing_notes": item.timing_notes,
+                    "account_code": item.account_code,
+                    "status": "Draft",
+                }
+                for item, recommendation, ticket in tickets
+            ])
+            insert_rows(db, TradeTicketStatusHistory, [
+                {
+                    "trade_ticket_id": ticket_id,
+                    "old_status": None,
+                    "new_status": "Draft",
+                    "changed_by": user_id,
+                    "notes": f"Allocated from recommendation {recommendation.id} ({request.method})",
+                    "changed_at": now,
+                }
+                for ticket_id, (item, recommendation, ticket) in zip(created_ids, tickets)
+            ])
+            db.commit()
+
+        except IntegrityError as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Database constraint violation: {str(e)}"
+            )
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error creating trade tickets: {str(e)}"
+            )
+
+        for ticket_id, (item, recommendation, ticket) in zip(created_ids, tickets):
+            ticket.id = ticket_id
+        audit_bulk_insert(db, TradeTicket, created_ids)
+        event_hub.notify()  # Core inserts are invisible to the hub's commit hook
+        return TicketAllocationResult(created=len(created_ids), failed=failed, results=results)
+
+    @staticmethod
+    def get_ticket_by_id(db: Session, ticket_id: int) -> Optional[TradeTicket]:
+        """Get a ticket with what its CRD order needs"""
+        return db.query(TradeTicket).options(
+            joinedload(TradeTicket.security),
+            joinedload(TradeTicket.fund),
+            joinedload(TradeTicket.crd_outbox)
+        ).filter(TradeTicket.id == ticket_id).first()
+
+    @staticmethod
+    def submit_to_crd(db: Session, ticket_id: int, user_id: int) -> TradeTicket:
+        """Queue a ticket for CRD: status change, history row and outbox row in one commit
+
+        Submitting a ticket that is already Submitted_to_CRD returns it
+        unchanged, so a repeated click does not queue a second order. Two
+        submissions racing each other write the same outbox row (or the same
+        idempotency key); the loser's unique violation returns the winner's
+        result.
+        """
+        ticket = TradeTicketService.get_ticket_by_id(db, ticket_id)
+        if not ticket:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Trade ticket not found"
+            )
+
+        if ticket.status == 'Submitted_to_CRD':
+            return ticket
+
+        if ticket.status not in SUBMITTABLE_STATUSES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only {' or '.join(SUBMITTABLE_STATUSES)} tickets can be submitted to CRD"
+            )
+
+        try:
+            now = utcnow()
+            outbox = ticket.crd_outbox
+            if outbox is None:
+                outbox = CrdOutbox(trade_ticket_id=ticket.id, submission=1)
+                db.add(outbox)
+            else:
+                outbox.submission += 1
+            outbox.idempotency_key = crd_idempotency_key(ticket.id, outbox.submission)
+            outbox.payload = json.dumps(build_crd_order(ticket, outbox.idempotency_key, user_id))
+            outbox.status = 'Pending'
+            outbox.attempts = 0
+            outbox.next_attempt_at = now
+            outbox.claimed_until = None
+            outbox.claim_token = None
+            outbox.last_error = None
+            outbox.sent_at = None
+
+            db.add(TradeTicketStatusHistory(
+                trade_ticket_id=ticket.id,
+                old_status=ticket.status,
+                new_status='Submitted_to_CRD',
+                changed_by=user_id,
+                notes="Queued for CRD",
+                changed_at=now
+            ))
+            ticket.status = 'Submitted_to_CRD'
+            ticket.submitted_to_crd_at = now
+            ticket.crd_status = 'Pending'
+            ticket.crd_error_message = None
+
+            db.commit()
+            db.refresh(ticket)
+            return ticket
+
+        except IntegrityError:
+            db.rollback()
+            ticket = TradeTicketService.get_ticket_by_id(db, ticket_id)
+            if ticket is not None and ticket.status == 'Submitted_to_CRD':
+                return ticket
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Trade ticket was changed by another request; reload and try again"
+            )
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error submitting trade ticket: {str(e)}"
+            )
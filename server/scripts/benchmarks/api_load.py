@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Load test: mixed v1 API workload with JSON baselines
+
+Boots the real application (app.main:app, including its lifespan: search
+index, audit writer) in-process on a seeded scratch SQLite database and
+drives it through httpx's ASGI transport with closed-loop clients. Each
+client repeatedly picks an operation from the --mix weights:
+
+- search   GET    /api/v1/securities/search?q=<ticker prefix>  (autocomplete)
+- drafts   GET    /api/v1/recommendations/drafts?analyst_id=<n>
+- create   POST   /api/v1/recommendations/
+- update   PUT    /api/v1/recommendations/{id}   (a recommendation this run created)
+- delete   DELETE /api/v1/recommendations/{id}   (a recommendation this run created)
+
+update and delete fall back to create while the client has nothing of its
+own to change. Throughput, error count and p50/p95/p99 latency are reported
+per operation and overall.
+
+--save writes the results with the run's configuration and git commit as a
+JSON baseline; --compare diffs the run against such a file and exits with
+status 1 when any operation's p95 latency rose, or its throughput fell, by
+more than --threshold percent. Compare runs made with the same arguments on
+the same machine; the report warns when the configurations differ.
+
+Usage:
+    python scripts/benchmarks/api_load.py [--concurrency 20] [--duration 10]
+                                          [--mix search=50,drafts=20,create=10,update=15,delete=5]
+    python scripts/benchmarks/api_load.py --save baselines/main.json
+    python scripts/benchmarks/api_load.py --compare baselines/main.json [--threshold 10]
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+from datetime import datetime, timezone
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Point the app at a scratch database before any app module is imported
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations, percentile
+scratch_url = use_scratch_database()
+
+import httpx
+
+OPERATIONS = {
+    "search": "GET /api/v1/securities/search",
+    "drafts": "GET /api/v1/recommendations/drafts",
+    "create": "POST /api/v1/recommendations/",
+    "update": "PUT /api/v1/recommendations/{id}",
+    "delete": "DELETE /api/v1/recommendations/{id}",
+}
+DEFAULT_MIX = "search=50,drafts=20,create=10,update=15,delete=5"
+
+# Compared between runs; a regression is a rise in p95 or a fall in rps
+COMPARED_METRICS = (("p95", 1), ("rps", -1))
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}' (choose from {', '.join(OPERATIONS)})")
+        mix[name] = float(weight)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("At least one operation needs a positive weight")
+    return mix
+
+class Client:
+    """One closed-loop client with its own random stream and created recommendations"""
+
+    def __init__(self, http: httpx.AsyncClient, rng: random.Random, args):
+        self.http = http
+        self.rng = rng
+        self.args = args
+        self.owned = []
+
+    def recommendation_body(self) -> dict:
+        rng = self.rng
+        return {
+            "security_id": rng.randint(1, self.args.securities),
+            "trade_direction": rng.choice(["Buy", "Sell", "Sell Short", "Cover Short"]),
+            "current_price": "100.0000",
+            "target_price": f"{rng.uniform(50, 200):.4f}",
+            "time_horizon": rng.choice(["Trade", "Short Term", "Long Term"]),
+            "analyst_score": rng.randint(1, 10),
+            "notes": "API load benchmark",
+            "strategy_ids": rng.sample(range(1, 16), 2),
+            "fund_ids": rng.sample(range(1, 7), 1),
+        }
+
+    async def run(self, operation: str):
+        """Issue one request; returns (operation actually run, response)"""
+        rng = self.rng
+        if operation in ("update", "delete") and not self.owned:
+            operation = "create"
+
+        if operation == "search":
+            ticker = f"T{rng.randint(1, self.args.securities):05d}"
+            return operation, await self.http.get(
+                "/api/v1/securities/search", params={"q": ticker[:rng.randint(1, 4)]}
+            )
+        if operation == "drafts":
+            return operation, await self.http.get(
+                "/api/v1/recommendations/drafts", params={"analyst_id": rng.randint(1, self.args.analysts)}
+            )
+        if operation == "create":
+            response = await self.http.post("/api/v1/recommendations/", json=self.recommendation_body())
+            if response.status_code == 201:
+                self.owned.append(response.json()["id"])
+            return operation, response
+        if operation == "update":
+            recommendation_id = rng.choice(self.owned)
+            return operation, await self.http.put(
+                f"/api/v1/recommendations/{recommendation_id}",
+                json={"target_price": f"{rng.uniform(50, 200):.4f}", "analyst_score": rng.randint(1, 10)}
+            )
+        recommendation_id = self.owned.pop(rng.randrange(len(self.owned)))
+        return operation, await self.http.delete(f"/api/v1/recommendations/{recommendation_id}")
+
+async def drive(http: httpx.AsyncClient, args) -> dict:
+    """Run args.concurrency clients for args.duration seconds; per-operation samples"""
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    samples = {name: {"latencies": [], "errors": 0} for name in OPERATIONS}
+    deadline = time.perf_counter() + args.duration
+
+    async def worker(index: int):
+        client = Client(http, random.Random(f"{args.seed}:{index}"), args)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            operation, response = await client.run(client.rng.choices(names, weights=weights)[0])
+            if response.status_code >= 400:
+                samples[operation]["errors"] += 1
+                continue
+            samples[operation]["latencies"].append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    def summarize(latencies, errors):
+        latencies = sorted(latencies)
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 2),
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+        }
+
+    results = {
+        name: dict(endpoint=OPERATIONS[name], **summarize(sample["latencies"], sample["errors"]))
+        for name, sample in samples.items()
+        if sample["latencies"] or sample["errors"]
+    }
+    results["total"] = summarize(
+        [value for sample in samples.values() for value in sample["latencies"]],
+        sum(sample["errors"] for sample in samples.values())
+    )
+    return results
+
+async def run(args) -> dict:
+    from app.core.database import engine
+    seed_recommendations(engine, args.recommendations, args.seed, args.analysts, args.securities)
+
+    from app.main import app
+
+    # Pool timeouts and database errors surface as 500s and are counted, not raised
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as http:
+            # Warm up connection pools, statement caches and reference caches
+            warmup = Client(http, random.Random(f"{args.seed}:warmup"), args)
+            for operation in ("search", "drafts", "create", "update", "delete"):
+                await warmup.run(operation)
+            return await drive(http, args)
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run_config(args) -> dict:
+    return {
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "mix": args.mix,
+        "recommendations": args.recommendations,
+        "analysts": args.analysts,
+        "securities": args.securities,
+        "seed": args.seed,
+    }
+
+def print_results(results: dict):
+    print(f"\n{'operation':<9} {'endpoint':<36} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, stats in results.items():
+        print(f"{name:<9} {stats.get('endpoint', ''):<36} {stats['rps']:>8.1f} {stats['p50']:>8.1f} "
+              f"{stats['p95']:>8.1f} {stats['p99']:>8.1f} {stats['errors']:>7}")
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """Print per-operation deltas against a baseline; returns the regressions found"""
+    if baseline.get("config") != current["config"]:
+        print("\n⚠️  Baseline was recorded with a different configuration; deltas are not comparable:")
+        print(f"   baseline: {json.dumps(baseline.get('config'), sort_keys=True)}")
+        print(f"   current:  {json.dumps(current['config'], sort_keys=True)}")
+
+    print(f"\nCompared with baseline {baseline.get('commit', 'unknown')} ({baseline.get('created_at', '?')}):")
+    print(f"{'operation':<9} {'metric':<6} {'baseline':>10} {'current':>10} {'change':>9}")
+    regressions = []
+    for name, stats in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:<9} (not in baseline)")
+            continue
+        for metric, worse_direction in COMPARED_METRICS:
+            if not before[metric]:
+                continue
+            change = (stats[metric] - before[metric]) / before[metric] * 100
+            regressed = change * worse_direction > threshold
+            if regressed:
+                regressions.append(f"{name} {metric} {change:+.1f}%")
+            print(f"{name:<9} {metric:<6} {before[metric]:>10.1f} {stats[metric]:>10.1f} "
+                  f"{change:>+8.1f}%{'  ❌' if regressed else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed-workload load test for the v1 API")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help=f"Operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--recommendations", type=int, default=5000, help="Recommendations to seed")
+    parser.add_argument("--analysts", type=int, default=50, help="Analysts to seed")
+    parser.add_argument("--securities", type=int, default=2000, help="Securities to seed")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and workload")
+    parser.add_argument("--save", type=Path, help="Write the results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Diff the results against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent change in p95 or req/s counted as a regression")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
+    print("=" * 60)
+    print("📊 v1 API mixed-workload load test")
+    print("=" * 60)
+    print(f"   clients: {args.concurrency}, duration: {args.duration}s, "
+          f"seeded recommendations: {args.recommendations}")
+    print(f"   mix: {', '.join(f'{name}={weight:g}' for name, weight in args.mix.items())}")
+
+    current = {
+        "benchmark": "api_load",
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": run_config(args),
+        "results": asyncio.run(run(args)),
+    }
+    print_results(current["results"])
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"\n💾 Baseline written to {args.save}")
+
+    regressions = compare(baseline, current, args.threshold) if baseline else []
+    print("=" * 60)
+    if regressions:
+        print(f"❌ Regressions beyond {args.threshold:g}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
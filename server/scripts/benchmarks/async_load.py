@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Load test: sync (threadpool) vs async (AsyncSession) request handlers
+
+Serves the same recommendations page through two in-process routes:
+
+- /sync/recommendations   def handler, blocking Session, RecommendationService
+- /async/recommendations  async def handler, AsyncSession, AsyncRecommendationService
+
+and drives each with an increasing number of concurrent clients, reporting
+throughput and p50/p95/p99 latency. Both routes use connection pools of the
+same size; the sync route is additionally bounded by the anyio threadpool
+(40 tokens by default), which is the capacity ceiling the async path removes.
+
+A fixed per-statement latency is injected on the database side (via the
+SQLite trace callback, which runs on the driver's thread, not the event loop)
+to model a networked database round trip.
+
+Usage:
+    python scripts/benchmarks/async_load.py [--concurrency 25,50,100,200] [--duration 5]
+                                            [--db-latency-ms 100] [--pool-size 100] [--threadpool 40] [--page-size 5]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Point the app at a scratch database before any app module is imported
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations, percentile
+scratch_url = use_scratch_database()
+
+import anyio
+import httpx
+from fastapi import FastAPI, Depends
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker, Session
+
+from app.schemas.recommendations import RecommendationFilters, RecommendationPage
+from app.services.recommendation_service import RecommendationService, AsyncRecommendationService
+
+def build_app(pool_size: int, db_latency_ms: float, page_size: int) -> FastAPI:
+    """Mini app exposing the same page through a sync and an async handler"""
+    delay = db_latency_ms / 1000
+
+    def simulate_round_trip(statement):
+        time.sleep(delay)
+
+    sync_engine = create_engine(
+        scratch_url, pool_size=pool_size, max_overflow=0, pool_timeout=10,
+        connect_args={"check_same_thread": False}
+    )
+    async_engine = create_async_engine(
+        scratch_url.replace("sqlite://", "sqlite+aiosqlite://", 1),
+        pool_size=pool_size, max_overflow=0, pool_timeout=10
+    )
+
+    @event.listens_for(sync_engine, "connect")
+    def _sync_latency(dbapi_connection, connection_record):
+        dbapi_connection.set_trace_callback(simulate_round_trip)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _async_latency(dbapi_connection, connection_record):
+        # Runs on aiosqlite's worker thread, so the sleep never blocks the event loop
+        dbapi_connection.run_async(lambda conn: conn.set_trace_callback(simulate_round_trip))
+
+    SyncSession = sessionmaker(bind=sync_engine, autoflush=False)
+    AsyncSessionFactory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_session():
+        async with AsyncSessionFactory() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync/recommendations", response_model=RecommendationPage)
+    def sync_page(db: Session = Depends(get_sync_db)):
+        items, next_cursor = RecommendationService.list_recommendations(
+            db, RecommendationFilters(), None, page_size
+        )
+        return RecommendationPage(items=items, next_cursor=next_cursor, limit=page_size)
+
+    @app.get("/async/recommendations", response_model=RecommendationPage)
+    async def async_page(db: AsyncSession = Depends(get_async_session)):
+        items, next_cursor = await AsyncRecommendationService.list_recommendations(
+            db, RecommendationFilters(), None, page_size
+        )
+        return RecommendationPage(items=items, next_cursor=next_cursor, limit=page_size)
+
+    app.state.engines = (sync_engine, async_engine)
+    return app
+
+async def drive(client: httpx.AsyncClient, path: str, concurrency: int, duration: float):
+    """Run `concurrency` closed-loop clients against path for `duration` seconds"""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(path)
+            if response.status_code != 200:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+async def run(args):
+    from app.core.database import engine
+    seed_recommendations(engine, args.recommendations)
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threadpool
+    app = build_app(args.pool_size, args.db_latency_ms, args.page_size)
+
+    # Pool timeouts surface as 500s and are counted as errors rather than aborting the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        # Warm up connection pools and statement caches
+        await client.get("/sync/recommendations")
+        await client.get("/async/recommendations")
+
+        print(f"\n{'mode':<6} {'clients':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for concurrency in args.concurrency:
+            for mode in ("sync", "async"):
+                stats = await drive(client, f"/{mode}/recommendations", concurrency, args.duration)
+                print(f"{mode:<6} {concurrency:>7} {stats['rps']:>9.1f} {stats['p50']:>9.1f} "
+                      f"{stats['p95']:>9.1f} {stats['p99']:>9.1f} {stats['errors']:>7}")
+
+    for bench_engine in app.state.engines:
+        result = bench_engine.dispose()
+        if asyncio.iscoroutine(result):
+            await result
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test sync vs async recommendation handlers")
+    parser.add_argument("--concurrency", default="25,50,100,200",
+                        help="Comma-separated concurrent client counts")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run")
+    parser.add_argument("--db-latency-ms", type=float, default=100.0,
+                        help="Simulated database latency per statement")
+    parser.add_argument("--pool-size", type=int, default=100, help="Connection pool size for both modes")
+    parser.add_argument("--threadpool", type=int, default=40, help="anyio threadpool tokens (FastAPI default 40)")
+    parser.add_argument("--page-size", type=int, default=5, help="Recommendations per response")
+    parser.add_argument("--recommendations", type=int, default=1000, help="Recommendations to seed")
+    args = parser.parse_args()
+    args.concurrency = [int(value) for value in args.concurrency.split(",")]
+
+    print("=" * 60)
+    print("📊 Sync vs async handler load test")
+    print("=" * 60)
+    print(f"   DB latency: {args.db_latency_ms}ms/statement, pool: {args.pool_size}, "
+          f"threadpool: {args.threadpool}, duration: {args.duration}s")
+
+    asyncio.run(run(args))
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
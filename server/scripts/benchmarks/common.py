@@ -0,0 +1,117 @@
+# scripts/benchmarks/common.py
+"""
+Shared helpers for benchmark scripts
+
+Benchmarks run against a throw-away SQLite file, never against the
+configured DATABASE_URL. Call use_scratch_database() BEFORE importing any
+app module, since app.core.config reads the environment at import time.
+"""
+
+import os
+import random
+import tempfile
+from decimal import Decimal
+
+STRATEGIES_PER_RECOMMENDATION = 2
+FUNDS_PER_RECOMMENDATION = 2
+
+def use_scratch_database() -> str:
+    """Point DATABASE_URL at a fresh SQLite file and return the URL"""
+    scratch_dir = tempfile.mkdtemp(prefix="orbimed_bench_")
+    url = f"sqlite:///{scratch_dir}/bench.db"
+    os.environ["DATABASE_URL"] = url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["DEBUG"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    return url
+
+def seed_recommendations(engine, recommendation_count: int, seed_value: int = 42,
+                         analysts: int = 50, securities: int = 2000):
+    """Create the schema and bulk insert a synthetic recommendation dataset"""
+    from sqlalchemy import insert
+    from app.core.database import Base
+    from app.models import (
+        User, Role, Security, Strategy, Fund,
+        TradeRecommendation, RecommendationStrategy, RecommendationFund
+    )
+
+    rng = random.Random(seed_value)
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Role), [{"id": 1, "name": "Analyst"}])
+        conn.execute(insert(User), [
+            {"id": i, "okta_id": f"okta_{i}", "email": f"analyst{i}@orbimed.com",
+             "name": f"Analyst {i}", "role_id": 1}
+            for i in range(1, analysts + 1)
+        ])
+        conn.execute(insert(Security), [
+            {"id": i, "ticker": f"T{i:05d}", "name": f"Security {i}", "source_type": "IVP"}
+            for i in range(1, securities + 1)
+        ])
+        conn.execute(insert(Strategy), [
+            {"id": i, "name": f"Strategy {i}"} for i in range(1, 16)
+        ])
+        conn.execute(insert(Fund), [
+            {"id": i, "code": f"F{i}", "name": f"Fund {i}"} for i in range(1, 7)
+        ])
+
+        batch = 10000
+        for start in range(1, recommendation_count + 1, batch):
+            ids = range(start, min(start + batch, recommendation_count + 1))
+            conn.execute(insert(TradeRecommendation), [
+                {"id": rec_id, "analyst_id": rng.randint(1, analysts),
+                 "security_id": rng.randint(1, securities),
+                 "trade_direction": "Buy", "current_price": Decimal("100.0000"),
+                 "target_price": Decimal("120.0000"), "time_horizon": "Long Term",
+                 "analyst_score": rng.randint(1, 10), "notes": "Synthetic benchmark row",
+                 "status": "Draft", "is_draft": True}
+                for rec_id in ids
+            ])
+            conn.execute(insert(RecommendationStrategy), [
+                {"recommendation_id": rec_id, "strategy_id": strategy_id}
+                for rec_id in ids
+                for strategy_id in rng.sample(range(1, 16), STRATEGIES_PER_RECOMMENDATION)
+            ])
+            conn.execute(insert(RecommendationFund), [
+                {"recommendation_id": rec_id, "fund_id": fund_id}
+                for rec_id in ids
+                for fund_id in rng.sample(range(1, 7), FUNDS_PER_RECOMMENDATION)
+            ])
+
+NAME_WORDS = [
+    "Bio", "Thera", "Gen", "Pharma", "Medical", "Health", "Life", "Sciences",
+    "Onco", "Cardio", "Neuro", "Immuno", "Vax", "Cell", "Gene", "Diagnostics",
+    "Devices", "Capital", "Holdings", "Partners", "Global", "American", "Pacific",
+    "Atlantic", "Northern", "United", "Advanced", "Precision", "Molecular", "Clinical",
+]
+NAME_SUFFIXES = ["Inc", "Corp", "Ltd", "PLC", "AG", "SA", "Group", "Therapeutics"]
+
+def seed_securities(engine, count: int, seed_value: int = 42):
+    """Create the schema and bulk insert securities with unique random tickers and names"""
+    import string
+    from sqlalchemy import insert
+    from app.core.database import Base
+    from app.models import Security
+
+    rng = random.Random(seed_value)
+    Base.metadata.create_all(engine)
+
+    tickers = set()
+    while len(tickers) < count:
+        tickers.add("".join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5))))
+
+    rows = [
+        {"id": i, "ticker": ticker, "source_type": "IVP",
+         "name": " ".join(rng.sample(NAME_WORDS, rng.randint(1, 3)) + [rng.choice(NAME_SUFFIXES)])}
+        for i, ticker in enumerate(sorted(tickers), start=1)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Security), rows)
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
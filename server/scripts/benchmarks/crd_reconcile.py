@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batched CRD reconciliation vs polling each ticket on its own
+
+Books --tickets open trade tickets with the fake CRD server (--latency-ms
+per request) and moves --changed-pct of them on (fills, cancellations),
+then runs one reconciliation poll:
+
+- per-ticket   one status request per ticket (--concurrency in flight),
+               and each changed ticket is loaded, updated and committed
+               with its status history row through the ORM
+- batched      CrdReconciler.reconcile_once(): bulk status requests,
+               in-memory diff, one executemany UPDATE and INSERT
+
+Reports poll time, CRD requests and writer transactions, plus the
+interval the adaptive poller would wait before polling again. Audit
+writing is disabled so only reconciliation is measured.
+
+Usage:
+    python scripts/benchmarks/crd_reconcile.py [--tickets 2000] [--changed-pct 10] [--latency-ms 40]
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations
+use_scratch_database()
+os.environ["AUDIT_ENABLED"] = "false"
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.integrations.crd import FakeCrdServer
+from app.models import CrdOutbox, TradeTicket, TradeTicketStatusHistory
+from app.services.crd_reconciler import CrdReconciler, diff_ticket, history_note, reconciled_values
+from app.services.trade_ticket_service import utcnow
+
+def book_tickets(server: FakeCrdServer, count: int, changed_pct: float):
+    """count tickets accepted by CRD; changed_pct of them have moved on since"""
+    now = utcnow()
+    with engine.begin() as conn:
+        conn.execute(delete(TradeTicketStatusHistory))
+        conn.execute(delete(CrdOutbox))
+        conn.execute(delete(TradeTicket))
+        conn.execute(insert(TradeTicket), [
+            {"id": ticket_id, "created_by": 1, "security_id": ticket_id % 100 + 1, "fund_id": 1,
+             "trade_direction": "Buy", "target_price": Decimal("120.0000"), "new_position": Decimal("1000"),
+             "status": "Booked", "crd_status": "Booked"}
+            for ticket_id in range(1, count + 1)
+        ])
+        conn.execute(insert(CrdOutbox), [
+            {"trade_ticket_id": ticket_id, "idempotency_key": f"ticket-{ticket_id}-1", "payload": "{}",
+             "status": "Sent", "next_attempt_at": now, "sent_at": now}
+            for ticket_id in range(1, count + 1)
+        ])
+
+    server.executions.clear()
+    rng = random.Random(42)
+    for ticket_id in range(1, count + 1):
+        server.executions[ticket_id] = {"order_id": ticket_id, "status": "Booked"}
+    for ticket_id in rng.sample(range(1, count + 1), int(count * changed_pct / 100)):
+        if rng.random() < 0.8:
+            server.set_status(ticket_id, "Partially_Filled", fill_price="120.15", fill_quantity=rng.randint(1, 999))
+        else:
+            server.set_status(ticket_id, "Cancelled")
+
+def apply_one(status) -> bool:
+    with SessionLocal() as db:
+        ticket = db.get(TradeTicket, status.order_id)
+        values = reconciled_values(ticket, status)
+        changes = diff_ticket(ticket, values)
+        if not changes:
+            return False
+        for field, value in values.items():
+            setattr(ticket, field, value)
+        if "status" in changes:
+            db.add(TradeTicketStatusHistory(
+                trade_ticket_id=ticket.id, old_status=changes["status"][0], new_status=values["status"],
+                changed_by=settings.AUDIT_SYSTEM_USER_ID, notes=history_note(status)
+            ))
+        db.commit()
+        return True
+
+async def per_ticket(server: FakeCrdServer, args) -> dict:
+    gateway = server.client()
+    limit = asyncio.Semaphore(args.concurrency)
+    commits = 0
+
+    async def poll(ticket_id: int):
+        nonlocal commits
+        async with limit:
+            statuses = await gateway.get_order_statuses([ticket_id])
+        for status in statuses.values():
+            if await run_in_threadpool(apply_one, status):
+                commits += 1
+
+    await asyncio.gather(*(poll(ticket_id) for ticket_id in range(1, args.tickets + 1)))
+    await gateway.close()
+    return {"commits": commits, "interval": None}
+
+async def batched(server: FakeCrdServer, args) -> dict:
+    reconciler = CrdReconciler(server.client(), concurrency=args.concurrency)
+    _, changed = await reconciler.reconcile_once()
+    await reconciler.gateway.close()
+    return {"commits": 1 if changed else 0, "interval": reconciler.next_interval()}
+
+def main():
+    parser = argparse.ArgumentParser(description="CRD reconciliation: batched vs per ticket")
+    parser.add_argument("--tickets", type=int, default=2000, help="Open tickets")
+    parser.add_argument("--changed-pct", type=float, default=10.0, help="Percent of tickets CRD has moved on")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="CRD latency per request")
+    parser.add_argument("--batch-size", type=int, default=50, help="Orders per status request")
+    parser.add_argument("--concurrency", type=int, default=4, help="Status requests in flight")
+    args = parser.parse_args()
+
+    seed_recommendations(engine, 0, securities=100)
+
+    print("=" * 60)
+    print("🔄 CRD reconciliation benchmark")
+    print("=" * 60)
+    print(f"   {args.tickets} open tickets, {args.changed_pct:.0f}% changed, {args.latency_ms:.0f} ms CRD latency")
+    print(f"\n{'mode':<11} {'poll':>9} {'requests':>9} {'commits':>8} {'next poll':>10}")
+    for mode, run in (("per-ticket", per_ticket), ("batched", batched)):
+        server = FakeCrdServer(latency_seconds=args.latency_ms / 1000, max_batch_size=args.batch_size)
+        book_tickets(server, args.tickets, args.changed_pct)
+        started = time.perf_counter()
+        stats = asyncio.run(run(server, args))
+        elapsed = time.perf_counter() - started
+        interval = f"{stats['interval']:.1f}s" if stats["interval"] is not None else "-"
+        print(f"{mode:<11} {elapsed:>8.2f}s {len(server.status_requests):>9} {stats['commits']:>8} {interval:>10}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
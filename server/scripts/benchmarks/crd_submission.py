@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: trade ticket submission through the CRD outbox vs calling CRD inline
+
+Simulates --clients portfolio managers submitting --tickets trade tickets
+between them (pausing up to --think-ms between submits) against the fake
+CRD server with --latency-ms per request:
+
+- inline   each submit sends its own order to CRD and, once CRD answered,
+           commits the same status change (the click waits for CRD)
+- outbox   each submit commits the status change and outbox row
+           (TradeTicketService.submit_to_crd); the CrdDispatcher sends the
+           orders in bulk in the background
+
+Reports submit p50/p95, time until every order was accepted by CRD, and
+CRD requests made. Audit writing is disabled so only submission is
+measured. With --think-ms 0 submitters queue on the database writer and
+both modes measure its throughput instead.
+
+Usage:
+    python scripts/benchmarks/crd_submission.py [--tickets 2000] [--clients 50] [--latency-ms 80] [--think-ms 500]
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations, percentile
+use_scratch_database()
+os.environ["AUDIT_ENABLED"] = "false"
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert
+
+from app.core.database import SessionLocal, engine
+from app.integrations.crd import FakeCrdServer
+from app.models import CrdOutbox, TradeTicket, TradeTicketStatusHistory
+from app.services.crd_dispatcher import CrdDispatcher
+from app.services.trade_ticket_service import TradeTicketService, build_crd_order, crd_idempotency_key
+
+def reset_tickets(count: int):
+    with engine.begin() as conn:
+        conn.execute(delete(TradeTicketStatusHistory))
+        conn.execute(delete(CrdOutbox))
+        conn.execute(delete(TradeTicket))
+        conn.execute(insert(TradeTicket), [
+            {"id": ticket_id, "created_by": 1, "security_id": ticket_id % 100 + 1, "fund_id": 1,
+             "trade_direction": "Buy", "target_price": Decimal("120.0000"), "new_position": Decimal("1000"),
+             "status": "Draft"}
+            for ticket_id in range(1, count + 1)
+        ])
+
+def load_order(ticket_id: int) -> dict:
+    with SessionLocal() as db:
+        ticket = TradeTicketService.get_ticket_by_id(db, ticket_id)
+        return build_crd_order(ticket, crd_idempotency_key(ticket_id, 1), 1)
+
+def submit_outbox(ticket_id: int):
+    with SessionLocal() as db:
+        TradeTicketService.submit_to_crd(db, ticket_id, 1)
+
+async def run(mode: str, args) -> dict:
+    reset_tickets(args.tickets)
+    server = FakeCrdServer(latency_seconds=args.latency_ms / 1000, max_batch_size=args.batch_size)
+    gateway = server.client()
+    dispatcher = CrdDispatcher(gateway, concurrency=args.concurrency, poll_seconds=1.0)
+    if mode == "outbox":
+        dispatcher.start()
+
+    queue = list(range(1, args.tickets + 1))
+    latencies = []
+
+    async def client(index: int):
+        rng = random.Random(index)
+        while queue:
+            ticket_id = queue.pop()
+            started = time.perf_counter()
+            if mode == "inline":
+                order = await run_in_threadpool(load_order, ticket_id)
+                await gateway.submit_orders([order])
+            # The same commit in both modes; inline, the dispatcher is not running to send it again
+            await run_in_threadpool(submit_outbox, ticket_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(rng.uniform(0, args.think_ms / 1000))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(args.clients)))
+    while len(server.booked) < args.tickets:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    await dispatcher.stop()
+
+    latencies.sort()
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "seconds": elapsed,
+        "requests": len(server.requests),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="CRD submission: outbox vs inline")
+    parser.add_argument("--tickets", type=int, default=2000, help="Tickets submitted")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent submitters")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="CRD latency per request")
+    parser.add_argument("--think-ms", type=float, default=500.0, help="Max pause between a user's submits")
+    parser.add_argument("--batch-size", type=int, default=50, help="Orders per bulk request")
+    parser.add_argument("--concurrency", type=int, default=4, help="Bulk requests in flight")
+    args = parser.parse_args()
+
+    seed_recommendations(engine, 0, securities=100)
+
+    print("=" * 60)
+    print("📨 CRD submission benchmark")
+    print("=" * 60)
+    print(f"   {args.tickets} tickets, {args.clients} submitters, {args.latency_ms:.0f} ms CRD latency")
+    print(f"\n{'mode':<8} {'submit p50':>11} {'submit p95':>11} {'all booked':>11} {'requests':>9}")
+    for mode in ("inline", "outbox"):
+        stats = asyncio.run(run(mode, args))
+        print(f"{mode:<8} {stats['p50']:>9.1f}ms {stats['p95']:>9.1f}ms {stats['seconds']:>10.2f}s {stats['requests']:>9}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SSE status event fan-out to many idle clients
+
+Opens --clients event streams on one event loop (app.services.event_hub,
+the same generators GET /api/v1/events/stream serves), one consumer task
+per client, then commits --events recommendation status history rows one
+at a time and measures, per event, the time from commit to the last client
+receiving it. --watchers is the share of clients that see every
+recommendation event (PMs); the rest are analysts who see only their own.
+
+Reports memory per idle client (tracemalloc) and commit-to-delivery
+p50/p95/max.
+
+The benchmark runs against its own throw-away SQLite file, never against
+the configured DATABASE_URL.
+
+Usage:
+    python scripts/benchmarks/event_stream.py [--clients 5000] [--events 50] [--watchers 0.2]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Point the app at a scratch database before any app module is imported
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations, percentile
+scratch_url = use_scratch_database()
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.database import engine, async_engine, SessionLocal
+from app.models import RecommendationStatusHistory, TradeRecommendation
+from app.services.event_hub import event_hub as hub
+
+def analyst_of(recommendation_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.get(TradeRecommendation, recommendation_id).analyst_id
+    finally:
+        db.close()
+
+def commit_status_change(recommendation_id: int):
+    db = SessionLocal()
+    try:
+        db.add(RecommendationStatusHistory(
+            recommendation_id=recommendation_id, old_status="Draft", new_status="Proposed", changed_by=1
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+async def run(args):
+    # The app's hub, so commits wake it through the same hook as in the server
+    hub.poll_seconds = args.poll_seconds
+    hub.keepalive_seconds = 3600
+    hub.start()
+
+    received = {}  # history id -> number of clients that got it
+    last_received = {}  # history id -> perf_counter when the last expected client got it
+    expected = {}
+
+    async def client(user_id: int, streams):
+        async for chunk in hub.stream(user_id, streams):
+            if chunk.startswith("id: "):
+                history_id = int(chunk.split("\n", 1)[0][4:].split("-")[0])
+                received[history_id] = received.get(history_id, 0) + 1
+                if received[history_id] == expected.get(history_id):
+                    last_received[history_id] = time.perf_counter()
+
+    def connect(index: int):
+        streams = ("recommendation",) if index < watchers else ()
+        return asyncio.create_task(client(index % args.analysts + 1, streams))
+
+    async def connected(count: int):
+        while hub.subscriber_count < count:
+            await asyncio.sleep(0.01)
+
+    # The first client loads the hub's cursor (database connection, statement
+    # compilation); measure memory over the rest
+    watchers = int(args.clients * args.watchers)
+    tasks = [connect(0)]
+    await connected(1)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks.extend(connect(index) for index in range(1, args.clients))
+    await connected(args.clients)
+    per_client = (tracemalloc.get_traced_memory()[0] - before) / max(args.clients - 1, 1)
+    tracemalloc.stop()
+
+    # Every event goes to all watchers and to the owning analyst's clients
+    analyst_clients = (args.clients - watchers) // args.analysts
+    latencies = []
+    for index in range(args.events):
+        recommendation_id = index % args.recommendations + 1
+        history_id = index + 1
+        owner = await run_in_threadpool(analyst_of, recommendation_id)
+        expected[history_id] = watchers + sum(
+            1 for client_index in range(watchers, args.clients) if client_index % args.analysts + 1 == owner
+        )
+        started = time.perf_counter()
+        await run_in_threadpool(commit_status_change, recommendation_id)
+        while history_id not in last_received:
+            await asyncio.sleep(0.0005)
+        latencies.append((last_received[history_id] - started) * 1000)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await hub.stop()
+    await async_engine.dispose()
+    latencies.sort()
+    return per_client, analyst_clients, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="SSE status event fan-out to idle clients")
+    parser.add_argument("--clients", type=int, default=5000, help="Connected clients")
+    parser.add_argument("--events", type=int, default=50, help="Status changes to commit")
+    parser.add_argument("--watchers", type=float, default=0.2, help="Share of clients that see every event")
+    parser.add_argument("--analysts", type=int, default=50, help="Distinct analysts among the other clients")
+    parser.add_argument("--recommendations", type=int, default=1000, help="Recommendations to seed")
+    parser.add_argument("--poll-seconds", type=float, default=2.0, help="Hub poll interval")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📡 Status event stream fan-out benchmark")
+    print("=" * 60)
+    seed_recommendations(engine, args.recommendations, analysts=args.analysts)
+
+    per_client, analyst_clients, latencies = asyncio.run(run(args))
+    print(f"   {args.clients} clients ({int(args.clients * args.watchers)} see every event, "
+          f"~{analyst_clients} per analyst), {args.events} events")
+    print(f"   Memory per idle client: {per_client / 1024:.1f} KiB")
+    print(f"   Commit -> last client: p50 {percentile(latencies, 50):.1f} ms, "
+          f"p95 {percentile(latencies, 95):.1f} ms, max {latencies[-1]:.1f} ms")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
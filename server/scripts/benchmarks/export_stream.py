@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full recommendation export, materialized vs streamed
+
+Compares loading every recommendation the way the trade-history screen used
+to (RecommendationService.get_all_recommendations + RecommendationResponse,
+all in memory, then one JSON document) with the streamed NDJSON export
+(ExportService.stream_recommendations). Reports wall time and peak Python
+heap (tracemalloc) for each; the streamed peak should stay flat as
+--recommendations grows.
+
+The benchmark runs against its own throw-away SQLite file, never against
+the configured DATABASE_URL.
+
+Usage:
+    python scripts/benchmarks/export_stream.py [--recommendations 50000] [--batch-size 1000]
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Point the app at a scratch database before any app module is imported
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations
+scratch_url = use_scratch_database()
+
+from pydantic import TypeAdapter
+from typing import List
+
+from app.core.config import settings
+from app.core.database import engine, SessionLocal
+from app.schemas.recommendations import RecommendationFilters, RecommendationResponse
+from app.services.export_service import ExportService
+from app.services.recommendation_service import RecommendationService
+
+def materialized_export() -> int:
+    db = SessionLocal()
+    try:
+        recommendations = RecommendationService.get_all_recommendations(db)
+        adapter = TypeAdapter(List[RecommendationResponse])
+        return len(adapter.dump_json(adapter.validate_python(recommendations)))
+    finally:
+        db.close()
+
+def streamed_export() -> int:
+    return sum(len(chunk) for chunk in ExportService.stream_recommendations(RecommendationFilters(), "ndjson"))
+
+def measure(label: str, export):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = export()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"   {label:<14} {elapsed:>7.2f} s  peak heap {peak / 1024 / 1024:>8.1f} MB  "
+          f"output {size / 1024 / 1024:>7.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recommendation export paths")
+    parser.add_argument("--recommendations", type=int, default=50000, help="Recommendations to generate")
+    parser.add_argument("--batch-size", type=int, default=settings.EXPORT_BATCH_SIZE, help="Export batch size")
+    args = parser.parse_args()
+    settings.EXPORT_BATCH_SIZE = args.batch_size
+
+    print("=" * 60)
+    print("📊 Recommendation export benchmark")
+    print("=" * 60)
+    print(f"🧪 Seeding {args.recommendations:,} recommendations...")
+    seed_recommendations(engine, args.recommendations)
+
+    print(f"\n📦 Exporting (batch size {args.batch_size:,}):")
+    measure("materialized", materialized_export)
+    measure("streamed", streamed_export)
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: price lookups through the price cache vs straight to the provider
+
+Simulates --clients concurrent users each looking up --lookups prices
+(1-5 tickers per lookup, tickers drawn with Zipf-skewed popularity from
+--tickers) against a mock provider with --latency-ms upstream latency:
+
+- direct   every lookup calls the provider
+- cached   app.services.price_service.PriceService (TTL cache, coalescing,
+           batching)
+
+Reports lookup p50/p95, upstream requests and tickers requested upstream.
+No database is involved.
+
+Usage:
+    python scripts/benchmarks/price_service.py [--clients 200] [--lookups 20] [--latency-ms 50]
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmarks.common import use_scratch_database, percentile
+use_scratch_database()  # app.core.config needs a DATABASE_URL
+
+from app.integrations.bloomberg import MockPriceProvider
+from app.services.price_service import PriceService
+
+def ticker_sampler(count: int, seed: int):
+    rng = random.Random(seed)
+    tickers = [f"T{index:04d}" for index in range(count)]
+    weights = [1 / (rank + 1) for rank in range(count)]  # Zipf, s=1
+    return lambda: rng.choices(tickers, weights, k=rng.randint(1, 5))
+
+async def run(mode: str, args) -> dict:
+    provider = MockPriceProvider(latency_seconds=args.latency_ms / 1000)
+    service = PriceService(provider, ttl_seconds=args.ttl_seconds, batch_window_seconds=args.window_ms / 1000)
+    sample = ticker_sampler(args.tickers, args.seed)
+    latencies = []
+
+    async def client(index: int):
+        rng = random.Random(index)
+        for _ in range(args.lookups):
+            tickers = sample()
+            started = time.perf_counter()
+            if mode == "direct":
+                await provider.get_prices(tickers)
+            else:
+                await service.get_prices(tickers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(rng.uniform(0, args.think_ms / 1000))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(args.clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "lookups_per_second": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "requests": len(provider.calls),
+        "tickers": provider.tickers_requested,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Price lookups: cached vs direct to the provider")
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent users")
+    parser.add_argument("--lookups", type=int, default=20, help="Lookups per user")
+    parser.add_argument("--tickers", type=int, default=500, help="Distinct tickers")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Upstream latency per request")
+    parser.add_argument("--think-ms", type=float, default=100.0, help="Max pause between a user's lookups")
+    parser.add_argument("--ttl-seconds", type=float, default=30.0, help="Price cache TTL")
+    parser.add_argument("--window-ms", type=float, default=10.0, help="Batch window")
+    parser.add_argument("--seed", type=int, default=42, help="Ticker sampling seed")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("💹 Price lookup benchmark")
+    print("=" * 60)
+    print(f"   {args.clients} users x {args.lookups} lookups, {args.tickers} tickers, "
+          f"{args.latency_ms:.0f} ms upstream latency")
+    print(f"\n{'mode':<8} {'lookups/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'upstream':>9} {'tickers':>8}")
+    for mode in ("direct", "cached"):
+        stats = asyncio.run(run(mode, args))
+        print(f"{mode:<8} {stats['lookups_per_second']:>10.1f} {stats['p50']:>8.1f} {stats['p95']:>8.1f} "
+              f"{stats['requests']:>9} {stats['tickers']:>8}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
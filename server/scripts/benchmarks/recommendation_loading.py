@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: recommendation eager-loading strategies
+
+Compares the legacy four-way joinedload query (security, strategies->strategy,
+funds->fund, analyst) with the schema-derived plan from app/services/loading.py
+on a synthetic dataset. For each strategy it reports statements executed,
+raw rows fetched from the database and wall time to load the ORM graph and
+serialize it as RecommendationResponse.
+
+The benchmark runs against its own throw-away SQLite file, never against
+the configured DATABASE_URL.
+
+Usage:
+    python scripts/benchmarks/recommendation_loading.py [--recommendations 100000] [--page-size 200]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Point the app at a scratch database before any app module is imported
+from scripts.benchmarks.common import use_scratch_database
+scratch_url = use_scratch_database()
+
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload
+from app.core.database import engine, SessionLocal
+from app.models import TradeRecommendation, RecommendationStrategy, RecommendationFund
+from app.schemas.recommendations import RecommendationResponse
+from app.services.loading import load_options_for
+from scripts.benchmarks.common import (
+    seed_recommendations, STRATEGIES_PER_RECOMMENDATION, FUNDS_PER_RECOMMENDATION
+)
+
+def legacy_options():
+    """Eager-load options used by recommendation_service.py before the loading layer"""
+    return (
+        joinedload(TradeRecommendation.security),
+        joinedload(TradeRecommendation.strategies).joinedload(RecommendationStrategy.strategy),
+        joinedload(TradeRecommendation.funds).joinedload(RecommendationFund.fund),
+        joinedload(TradeRecommendation.analyst)
+    )
+
+def planned_options():
+    return load_options_for(TradeRecommendation, RecommendationResponse)
+
+class StatementRecorder:
+    """Collects every statement executed on the engine while active"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def rows_fetched(self) -> int:
+        """Re-count the rows each recorded SELECT returned"""
+        total = 0
+        with engine.connect() as conn:
+            for statement, parameters in self.statements:
+                if statement.lstrip().upper().startswith("SELECT"):
+                    total += conn.exec_driver_sql(
+                        f"SELECT COUNT(*) FROM ({statement})", parameters
+                    ).scalar()
+        return total
+
+def run_case(label: str, options, limit=None):
+    session = SessionLocal()
+    try:
+        with StatementRecorder() as recorder:
+            started = time.perf_counter()
+            query = session.query(TradeRecommendation).options(*options).order_by(
+                TradeRecommendation.created_at.desc(), TradeRecommendation.id.desc()
+            )
+            if limit:
+                query = query.limit(limit)
+            rows = query.all()
+            payload = [RecommendationResponse.model_validate(row) for row in rows]
+            elapsed = time.perf_counter() - started
+
+        print(f"   {label:<28} {len(payload):>9,} recs  {len(recorder.statements):>5} stmts  "
+              f"{recorder.rows_fetched():>10,} rows  {elapsed * 1000:>10.1f} ms")
+    finally:
+        session.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recommendation eager-loading strategies")
+    parser.add_argument("--recommendations", type=int, default=100000, help="Recommendations to generate")
+    parser.add_argument("--page-size", type=int, default=200, help="Rows per page for the paginated case")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📊 Recommendation loading benchmark")
+    print("=" * 60)
+    print(f"🧪 Seeding {args.recommendations:,} recommendations "
+          f"({STRATEGIES_PER_RECOMMENDATION} strategies x {FUNDS_PER_RECOMMENDATION} funds each)...")
+    started = time.perf_counter()
+    seed_recommendations(engine, args.recommendations)
+    print(f"   ✅ Seeded in {time.perf_counter() - started:.1f}s ({scratch_url})")
+
+    print(f"\n📄 Page of {args.page_size}:")
+    run_case("joinedload x4 (before)", legacy_options(), args.page_size)
+    run_case("schema plan (after)", planned_options(), args.page_size)
+
+    print(f"\n📚 Full table:")
+    run_case("joinedload x4 (before)", legacy_options())
+    run_case("schema plan (after)", planned_options())
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bulk recommendation approval vs approving one at a time
+
+Proposes --recommendations recommendations, of which --conflict-pct were
+already decided by someone else, then approves all of them:
+
+- one at a time   per recommendation: load it through the ORM, check its
+                  status, set the decision fields, add a status history
+                  row and commit
+- transition      RecommendationService.apply_transition(): one
+                  conditional UPDATE ... RETURNING, one lookup of the ids
+                  that did not move, one executemany INSERT, one commit
+
+Audit writing is disabled so only the workflow writes are measured.
+
+Usage:
+    python scripts/benchmarks/recommendation_transitions.py [--recommendations 1000] [--conflict-pct 5] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations
+use_scratch_database()
+os.environ["AUDIT_ENABLED"] = "false"
+
+from sqlalchemy import delete, update
+
+from app.core.database import SessionLocal, engine
+from app.models import RecommendationStatusHistory, TradeRecommendation
+from app.schemas.recommendations import RecommendationTransitionRequest
+from app.services.recommendation_service import RecommendationService
+from app.services.trade_ticket_service import utcnow
+
+APPROVER_ID = 1
+
+def propose(count: int, conflict_pct: float):
+    """Every recommendation Proposed; conflict_pct of them already Approved"""
+    with engine.begin() as conn:
+        conn.execute(delete(RecommendationStatusHistory))
+        conn.execute(update(TradeRecommendation).values(
+            status="Proposed", is_draft=False, approved_by=None, approved_at=None, approval_notes=None
+        ))
+        decided = random.Random(42).sample(range(1, count + 1), int(count * conflict_pct / 100))
+        if decided:
+            conn.execute(
+                update(TradeRecommendation).where(TradeRecommendation.id.in_(decided)).values(status="Approved")
+            )
+
+def one_at_a_time(ids: list) -> int:
+    applied = 0
+    for recommendation_id in ids:
+        with SessionLocal() as db:
+            recommendation = db.get(TradeRecommendation, recommendation_id)
+            if recommendation is None or recommendation.status != "Proposed":
+                continue
+            now = utcnow()
+            recommendation.status = "Approved"
+            recommendation.approved_by = APPROVER_ID
+            recommendation.approved_at = now
+            recommendation.approval_notes = "Benchmark"
+            db.add(RecommendationStatusHistory(
+                recommendation_id=recommendation_id, old_status="Proposed", new_status="Approved",
+                changed_by=APPROVER_ID, notes="Benchmark", changed_at=now
+            ))
+            db.commit()
+            applied += 1
+    return applied
+
+def transition(ids: list) -> int:
+    request = RecommendationTransitionRequest(action="approve", ids=ids, notes="Benchmark")
+    with SessionLocal() as db:
+        return RecommendationService.apply_transition(db, request, APPROVER_ID).applied
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommendation approval: bulk transition vs one at a time")
+    parser.add_argument("--recommendations", type=int, default=1000, help="Recommendations to approve")
+    parser.add_argument("--conflict-pct", type=float, default=5.0, help="Percent already decided")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per mode (median)")
+    args = parser.parse_args()
+
+    seed_recommendations(engine, args.recommendations, securities=100)
+    ids = list(range(1, args.recommendations + 1))
+
+    print("=" * 60)
+    print("✅ Recommendation transition benchmark")
+    print("=" * 60)
+    print(f"   approve {args.recommendations} recommendations, {args.conflict_pct:.0f}% already decided")
+    print(f"\n{'mode':<14} {'median':>10} {'applied':>8}")
+    for mode, run in (("one at a time", one_at_a_time), ("transition", transition)):
+        times = []
+        for _ in range(args.repeat):
+            propose(args.recommendations, args.conflict_pct)
+            started = time.perf_counter()
+            applied = run(ids)
+            times.append(time.perf_counter() - started)
+        median_ms = sorted(times)[len(times) // 2] * 1000
+        print(f"{mode:<14} {median_ms:>8.1f}ms {applied:>8}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
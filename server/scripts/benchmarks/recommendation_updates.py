@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: conditional single-statement updates vs load / setattr / refresh / re-query
+
+Edits --updates draft recommendations one request at a time:
+
+- orm         the previous update path: load the recommendation with its
+              related data, setattr each field, commit, refresh, then load
+              the full response graph again
+- versioned   RecommendationService.update_recommendation(): one
+              UPDATE ... WHERE id = ? AND version = ? RETURNING plus one
+              read of the security and strategies (with auditing on, made
+              before the UPDATE together with the old values)
+
+Reports time per update and SQL statements per update, with auditing off
+and on (the default). Audit rows go to their own writer thread and
+connection, so their inserts are not counted.
+
+Usage:
+    python scripts/benchmarks/recommendation_updates.py [--updates 500]
+"""
+
+import os
+import sys
+import time
+import argparse
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations, percentile
+use_scratch_database()
+
+from sqlalchemy import event, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.models import TradeRecommendation
+from app.schemas.recommendations import RecommendationResponse, RecommendationUpdate
+from app.services.recommendation_service import RecommendationService
+
+statements = 0
+
+def count_statement(*args):
+    global statements
+    statements += 1
+
+def orm_update(db, recommendation_id: int, data: RecommendationUpdate, analyst_id: int):
+    recommendation = RecommendationService.get_recommendation_by_id(db, recommendation_id)
+    for field, value in data.model_dump(exclude_unset=True, exclude={"version"}).items():
+        setattr(recommendation, field, value)
+    db.commit()
+    db.refresh(recommendation)
+    return RecommendationResponse.model_validate(RecommendationService.get_recommendation_by_id(db, recommendation_id))
+
+def run(update, targets: list) -> tuple:
+    global statements
+    statements = 0
+    times = []
+    for round_number, (recommendation_id, analyst_id, version) in enumerate(targets):
+        data = RecommendationUpdate(target_price=Decimal(130 + round_number % 10), notes="Edited", version=version)
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            update(db, recommendation_id, data, analyst_id)
+        times.append((time.perf_counter() - started) * 1000)
+    return sorted(times), statements / len(targets)
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommendation updates: versioned vs ORM round trips")
+    parser.add_argument("--updates", type=int, default=500, help="Recommendations edited")
+    args = parser.parse_args()
+
+    seed_recommendations(engine, args.updates, securities=100)
+    event.listen(engine, "before_cursor_execute", count_statement)
+
+    print("=" * 60)
+    print("✏️  Recommendation update benchmark")
+    print("=" * 60)
+    print(f"   {args.updates} drafts, one update each")
+    print(f"\n{'mode':<10} {'audit':<6} {'p50':>8} {'p95':>8} {'statements':>11}")
+    modes = (("orm", orm_update), ("versioned", RecommendationService.update_recommendation))
+    for audit, (mode, update) in ((audit, mode) for audit in (False, True) for mode in modes):
+        settings.AUDIT_ENABLED = audit
+        with engine.connect() as conn:
+            targets = conn.execute(
+                select(TradeRecommendation.id, TradeRecommendation.analyst_id, TradeRecommendation.version)
+                .order_by(TradeRecommendation.id)
+            ).all()
+        times, per_update = run(update, [tuple(target) for target in targets])
+        print(f"{mode:<10} {'on' if audit else 'off':<6} {percentile(times, 50):>6.2f}ms {percentile(times, 95):>6.2f}ms {per_update:>11.1f}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
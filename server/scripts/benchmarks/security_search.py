@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: securities search, SQL ILIKE vs in-memory index
+
+Replays autocomplete keystrokes (every prefix of a sample of tickers and
+name words) against SecurityService.search_securities (ILIKE '%q%') and
+against the in-memory SecuritySearchIndex, and reports the index build time
+and p50/p95/p99 lookup latency for both paths.
+
+The benchmark runs against its own throw-away SQLite file, never against
+the configured DATABASE_URL.
+
+Usage:
+    python scripts/benchmarks/security_search.py [--securities 50000] [--queries 2000]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Point the app at a scratch database before any app module is imported
+from scripts.benchmarks.common import use_scratch_database, seed_securities, percentile
+scratch_url = use_scratch_database()
+
+from app.core.database import engine, SessionLocal
+from app.models import Security
+from app.services.search_index import SecuritySearchIndex
+from app.services.security_service import SecurityService
+
+def keystrokes(securities, count: int, seed_value: int = 7):
+    """Every prefix of randomly chosen tickers and name words, like a user typing"""
+    rng = random.Random(seed_value)
+    queries = []
+    while len(queries) < count:
+        security = rng.choice(securities)
+        word = security.ticker if rng.random() < 0.6 else rng.choice(security.name.split())
+        queries.extend(word[:length] for length in range(1, len(word) + 1))
+    return queries[:count]
+
+def time_lookups(search, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return latencies
+
+def report(label: str, latencies):
+    print(f"   {label:<16} p50 {percentile(latencies, 50):>9.3f} ms  "
+          f"p95 {percentile(latencies, 95):>9.3f} ms  p99 {percentile(latencies, 99):>9.3f} ms  "
+          f"total {sum(latencies) / 1000:>7.2f} s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark securities search paths")
+    parser.add_argument("--securities", type=int, default=50000, help="Securities to generate")
+    parser.add_argument("--queries", type=int, default=2000, help="Keystrokes to replay")
+    parser.add_argument("--limit", type=int, default=10, help="Results per search")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📊 Securities search benchmark")
+    print("=" * 60)
+    print(f"🧪 Seeding {args.securities:,} securities...")
+    seed_securities(engine, args.securities)
+
+    db = SessionLocal()
+    try:
+        securities = db.query(Security).filter(Security.is_active == True).all()
+
+        index = SecuritySearchIndex()
+        started = time.perf_counter()
+        index.rebuild(securities)
+        print(f"   ✅ Index built in {(time.perf_counter() - started) * 1000:.0f} ms ({len(index):,} securities)")
+
+        queries = keystrokes(securities, args.queries)
+        print(f"\n⌨️  Replaying {len(queries):,} keystrokes (limit {args.limit}):")
+        report("SQL ILIKE", time_lookups(lambda q: SecurityService.search_securities(db, q, args.limit), queries))
+        report("in-memory index", time_lookups(lambda q: index.search(q, args.limit), queries))
+    finally:
+        db.close()
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: response serialization of a large recommendation list
+
+Loads --recommendations recommendations with everything
+RecommendationResponse serializes (security, strategies) and times turning
+them into a JSON body, best of --repeat runs:
+
+- fastapi + JSONResponse      FastAPI's response_model path: validate,
+                              dump to JSON-compatible Python, json.dumps
+- fastapi + FastJSONResponse  the same, rendered by orjson
+- serialized_response         cached TypeAdapter: validate, dump_json in
+                              pydantic-core (app/core/responses.py)
+
+Database time is excluded; every variant starts from the same loaded ORM
+objects and must produce the same JSON document.
+
+The benchmark runs against its own throw-away SQLite file, never against
+the configured DATABASE_URL.
+
+Usage:
+    python scripts/benchmarks/serialization.py [--recommendations 10000] [--repeat 5]
+"""
+
+import gc
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import List
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Point the app at a scratch database before any app module is imported
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations
+scratch_url = use_scratch_database()
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.database import engine, SessionLocal
+from app.core.responses import FastJSONResponse, orjson, serialized_response
+from app.schemas.recommendations import RecommendationResponse
+from app.services.recommendation_service import RecommendationService
+
+RESPONSE_TYPE = List[RecommendationResponse]
+response_field = create_model_field(name="Response", type_=RESPONSE_TYPE, mode="serialization")
+
+def fastapi_body(recommendations, response_class) -> bytes:
+    """What a route with response_model=List[RecommendationResponse] does with its return value"""
+    content = asyncio.run(serialize_response(field=response_field, response_content=recommendations))
+    return response_class(content).body
+
+VARIANTS = {
+    "fastapi + JSONResponse": lambda items: fastapi_body(items, JSONResponse),
+    "fastapi + FastJSONResponse": lambda items: fastapi_body(items, FastJSONResponse),
+    "serialized_response": lambda items: serialized_response(RESPONSE_TYPE, items).body,
+}
+
+def best_of(repeat: int, serialize, items):
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        body = serialize(items)
+        timings.append(time.perf_counter() - started)
+    return min(timings), body
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recommendation list serialization")
+    parser.add_argument("--recommendations", type=int, default=10000, help="Recommendations to serialize")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant (best is reported)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📊 Response serialization benchmark")
+    print("=" * 60)
+    print(f"   {args.recommendations} recommendations, best of {args.repeat}, "
+          f"orjson {'installed' if orjson is not None else 'NOT installed (stdlib json fallback)'}")
+
+    seed_recommendations(engine, args.recommendations)
+    db = SessionLocal()
+    try:
+        recommendations = RecommendationService.get_all_recommendations(db)
+    finally:
+        db.close()
+
+    print(f"\n{'variant':<28} {'ms':>9} {'rec/ms':>8} {'speedup':>8}")
+    baseline = None
+    reference = None
+    for name, serialize in VARIANTS.items():
+        seconds, body = best_of(args.repeat, serialize, recommendations)
+        document = json.loads(body)
+        if reference is None:
+            reference = document
+        elif document != reference:
+            raise SystemExit(f"❌ {name} produced a different document")
+        baseline = baseline or seconds
+        print(f"{name:<28} {seconds * 1000:>9.1f} {len(recommendations) / (seconds * 1000):>8.1f} "
+              f"{baseline / seconds:>7.2f}x")
+
+    print(f"\n   Body size: {len(body) / 1024:.0f} KiB, identical JSON across variants")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent reads on SQLite, legacy vs tuned engine profile
+
+Runs reader threads (--read summary: a per-fund aggregate over the table;
+--read page: RecommendationService.list_recommendations) alongside one
+writer thread (update + commit in a loop) against two copies of the same
+seeded database:
+
+- legacy  rollback journal, one StaticPool connection shared by every thread
+          (the SQLITE_TUNED=false configuration)
+- tuned   WAL + pragmas (app.core.database.sqlite_pragmas), a pool of
+          read-only connections and a single writer connection
+
+and reports read throughput, read p50/p95, writes committed and errors for
+each reader count. Readers only run in parallel inside SQLite, so the read
+throughput gain needs several cores; the writer lane shows on any machine.
+
+The benchmark runs against its own throw-away SQLite files, never against
+the configured DATABASE_URL.
+
+Usage:
+    python scripts/benchmarks/sqlite_profile.py [--readers 1,4,8,16] [--duration 5]
+                                                [--read summary|page] [--recommendations 20000]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import threading
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Point the app at a scratch database before any app module is imported; seed
+# it in rollback-journal mode so the legacy copy starts out untouched
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations, percentile
+scratch_url = use_scratch_database()
+os.environ["SQLITE_TUNED"] = "false"
+
+from sqlalchemy import create_engine, event, func, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app.core.database import engine, make_read_only, tune_sqlite_connection
+from app.models import TradeRecommendation, RecommendationFund
+from app.schemas.recommendations import RecommendationFilters
+from app.services.recommendation_service import RecommendationService
+
+def legacy_profile(url: str, readers: int):
+    shared = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    return shared, shared
+
+def tuned_profile(url: str, readers: int):
+    writer = create_engine(
+        url, connect_args={"check_same_thread": False},
+        poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=30
+    )
+    reader = create_engine(
+        url, connect_args={"check_same_thread": False},
+        poolclass=QueuePool, pool_size=readers, max_overflow=0
+    )
+    event.listen(writer, "connect", tune_sqlite_connection)
+    event.listen(reader, "connect", tune_sqlite_connection)
+    event.listen(reader, "connect", make_read_only)
+    return reader, writer
+
+PROFILES = {"legacy": legacy_profile, "tuned": tuned_profile}
+
+def read_page(db, rng: random.Random, args):
+    """One analyst's newest recommendations, as the list endpoint loads them"""
+    filters = RecommendationFilters(analyst_id=rng.randint(1, 50))
+    RecommendationService.list_recommendations(db, filters, None, args.page_size)
+
+def read_summary(db, rng: random.Random, args):
+    """Per-fund recommendation count and average target price above a score (SQL-bound)"""
+    db.execute(
+        select(RecommendationFund.fund_id, func.count(), func.avg(TradeRecommendation.target_price))
+        .join(TradeRecommendation, TradeRecommendation.id == RecommendationFund.recommendation_id)
+        .where(TradeRecommendation.analyst_score >= rng.randint(1, 10))
+        .group_by(RecommendationFund.fund_id)
+    ).all()
+
+# ORM page reads spend most of their time building objects (holding the GIL);
+# summary reads spend it inside SQLite, where connections do run in parallel
+READS = {"page": read_page, "summary": read_summary}
+
+def run(url: str, profile: str, readers: int, args) -> dict:
+    read_engine, write_engine = PROFILES[profile](url, readers)
+    ReadSession = sessionmaker(bind=read_engine, autoflush=False)
+    WriteSession = sessionmaker(bind=write_engine, autoflush=False)
+
+    deadline = time.perf_counter() + args.duration
+    latencies = []
+    counts = {"writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def reader(index: int):
+        rng = random.Random(index)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                with ReadSession() as db:
+                    READS[args.read](db, rng, args)
+            except Exception:
+                with lock:
+                    counts["errors"] += 1
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    def writer():
+        rng = random.Random("writer")
+        while time.perf_counter() < deadline:
+            try:
+                with WriteSession() as db:
+                    db.execute(
+                        update(TradeRecommendation)
+                        .where(TradeRecommendation.id == rng.randint(1, args.recommendations))
+                        .values(notes=f"Benchmark write {rng.random():.6f}")
+                    )
+                    db.commit()
+                counts["writes"] += 1
+            except Exception:
+                with lock:
+                    counts["errors"] += 1
+            time.sleep(args.write_interval_ms / 1000)
+
+    threads = [threading.Thread(target=reader, args=(index,)) for index in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    read_engine.dispose()
+    write_engine.dispose()
+    latencies.sort()
+    return {
+        "reads_per_second": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "writes": counts["writes"],
+        "errors": counts["errors"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent SQLite reads: legacy vs tuned engine profile")
+    parser.add_argument("--readers", default="1,4,8,16", help="Comma-separated reader thread counts")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run")
+    parser.add_argument("--recommendations", type=int, default=20000, help="Recommendations to seed")
+    parser.add_argument("--page-size", type=int, default=50, help="Recommendations per read")
+    parser.add_argument("--read", choices=list(READS), default="summary",
+                        help="Read workload: ORM recommendation page or SQL summary")
+    parser.add_argument("--write-interval-ms", type=float, default=5.0, help="Pause between writes")
+    args = parser.parse_args()
+    reader_counts = [int(value) for value in args.readers.split(",")]
+
+    print("=" * 60)
+    print("📊 SQLite engine profile: concurrent reads with one writer")
+    print("=" * 60)
+    print(f"   {args.recommendations} recommendations, {args.read} reads, {args.duration}s per run")
+
+    seed_recommendations(engine, args.recommendations)
+    engine.dispose()
+    seeded = Path(scratch_url.replace("sqlite:///", "", 1))
+
+    print(f"\n{'profile':<8} {'readers':>7} {'reads/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'writes':>7} {'errors':>7}")
+    for readers in reader_counts:
+        for profile in PROFILES:
+            # A fresh copy per run: WAL mode persists in the file
+            copy = seeded.with_name(f"{profile}_{readers}.db")
+            shutil.copyfile(seeded, copy)
+            stats = run(f"sqlite:///{copy}", profile, readers, args)
+            print(f"{profile:<8} {readers:>7} {stats['reads_per_second']:>9.1f} {stats['p50']:>9.1f} "
+                  f"{stats['p95']:>9.1f} {stats['writes']:>7} {stats['errors']:>7}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
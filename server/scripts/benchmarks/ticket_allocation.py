@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized ticket allocation vs a per-fund Decimal loop
+
+Allocates --recommendations approved recommendations across --funds funds
+each:
+
+- engine      AllocationBatch + allocate() (NumPy, integer ticks) against
+              the same pro-rata split computed fund by fund with Decimal
+              (quantize, then hand out the rounding remainder)
+- end to end  TradeTicketService.allocate_tickets() for each method, as
+              a dry run (loading, validation, allocation) and creating the
+              tickets (plus one executemany per table and the commit)
+
+Audit writing is disabled so only allocation and inserts are measured.
+
+Usage:
+    python scripts/benchmarks/ticket_allocation.py [--recommendations 500] [--funds 20] [--repeat 20]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from decimal import ROUND_DOWN, Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmarks.common import use_scratch_database, seed_recommendations
+use_scratch_database()
+os.environ["AUDIT_ENABLED"] = "false"
+
+from sqlalchemy import delete, insert, update
+
+from app.core.database import SessionLocal, engine
+from app.models import Fund, RecommendationFund, TradeRecommendation, TradeTicket, TradeTicketStatusHistory
+from app.schemas.trade_tickets import TicketAllocationRequest
+from app.services.allocation import ALLOCATION_METHODS, AllocationBatch, allocate
+from app.services.trade_ticket_service import TradeTicketService
+
+TICK = Decimal("0.0001")
+PERCENT_TICK = Decimal("0.01")
+HUNDRED = Decimal(100)
+
+def seed(recommendations: int, funds: int):
+    seed_recommendations(engine, recommendations, securities=100)
+    with engine.begin() as conn:
+        conn.execute(insert(Fund), [{"id": i, "code": f"F{i}", "name": f"Fund {i}"} for i in range(7, funds + 1)])
+        conn.execute(update(TradeRecommendation).values(status="Approved", is_draft=False))
+        conn.execute(delete(RecommendationFund))
+        conn.execute(insert(RecommendationFund), [
+            {"recommendation_id": rec_id, "fund_id": fund_id}
+            for rec_id in range(1, recommendations + 1) for fund_id in range(1, funds + 1)
+        ])
+
+def make_items(recommendations: int, funds: int) -> list:
+    rng = random.Random(42)
+    return [
+        {
+            "recommendation_id": rec_id,
+            "quantity": Decimal(rng.randint(1000, 500000)),
+            "benchmark_multiple": Decimal("1.1000"),
+            "positions": [
+                {"fund_id": fund_id, "current_position": Decimal(rng.randint(0, 50000)),
+                 "benchmark_position": Decimal(rng.randint(0, 100000)),
+                 "weight": Decimal(rng.randint(1, 1000)), "cap": Decimal(rng.randint(20000, 200000))}
+                for fund_id in range(1, funds + 1)
+            ],
+        }
+        for rec_id in range(1, recommendations + 1)
+    ]
+
+def largest_remainder(total: Decimal, shares: list, tick: Decimal) -> list:
+    rounded = [share.quantize(tick, rounding=ROUND_DOWN) for share in shares]
+    missing = int((total - sum(rounded)) / tick)
+    by_remainder = sorted(range(len(shares)), key=lambda i: shares[i] - rounded[i], reverse=True)
+    for i in by_remainder[:missing]:
+        rounded[i] += tick
+    return rounded
+
+def decimal_pro_rata(items: list) -> list:
+    """The same pro-rata split, percentages included, one fund at a time"""
+    allocations = []
+    for item in items:
+        positions = item["positions"]
+        quantity = item["quantity"]
+        total_weight = sum(position["weight"] for position in positions)
+        trades = largest_remainder(quantity, [quantity * position["weight"] / total_weight for position in positions], TICK)
+        percentages = largest_remainder(HUNDRED, [trade * HUNDRED / quantity for trade in trades], PERCENT_TICK)
+        allocations.append([
+            (position["current_position"] + trade, trade, percentage)
+            for position, trade, percentage in zip(positions, trades, percentages)
+        ])
+    return allocations
+
+def vectorized_pro_rata(items: list) -> list:
+    batch = AllocationBatch()
+    for item in items:
+        batch.add("Buy", [
+            (position["current_position"], position["benchmark_position"], position["weight"], position["cap"])
+            for position in item["positions"]
+        ], quantity=item["quantity"])
+    allocation = allocate("pro_rata", batch)
+    return [list(allocation.rows(row)) for row in range(len(batch))]
+
+def timed(function, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return sorted(times)[len(times) // 2] * 1000
+
+def run_once(request: TicketAllocationRequest):
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        result = TradeTicketService.allocate_tickets(db, request, user_id=1)
+    return (time.perf_counter() - started) * 1000, result
+
+def reset_tickets():
+    with engine.begin() as conn:
+        conn.execute(delete(TradeTicketStatusHistory))
+        conn.execute(delete(TradeTicket))
+
+def main():
+    parser = argparse.ArgumentParser(description="Ticket allocation: vectorized vs per fund")
+    parser.add_argument("--recommendations", type=int, default=500, help="Approved recommendations")
+    parser.add_argument("--funds", type=int, default=20, help="Funds per recommendation")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per engine measurement (median)")
+    args = parser.parse_args()
+
+    seed(args.recommendations, args.funds)
+    items = make_items(args.recommendations, args.funds)
+    cells = args.recommendations * args.funds
+
+    print("=" * 60)
+    print("🧮 Ticket allocation benchmark")
+    print("=" * 60)
+    print(f"   {args.recommendations} recommendations × {args.funds} funds = {cells} allocations")
+
+    decimal_ms = timed(lambda: decimal_pro_rata(items), args.repeat)
+    numpy_ms = timed(lambda: vectorized_pro_rata(items), args.repeat)
+    print(f"\nEngine (pro_rata, median of {args.repeat})")
+    print(f"   Decimal loop   {decimal_ms:>8.1f} ms")
+    print(f"   NumPy          {numpy_ms:>8.1f} ms   ({decimal_ms / numpy_ms:.1f}x)")
+
+    print(f"\nEnd to end (allocate_tickets)")
+    print(f"   {'method':<20} {'dry run':>9} {'create':>9} {'tickets':>8}")
+    run_once(TicketAllocationRequest(recommendations=items, dry_run=True))  # Warm up statement caches
+    for method in ALLOCATION_METHODS:
+        dry_run_ms, _ = run_once(TicketAllocationRequest(method=method, recommendations=items, dry_run=True))
+        reset_tickets()
+        create_ms, result = run_once(TicketAllocationRequest(method=method, recommendations=items))
+        print(f"   {method:<20} {dry_run_ms:>7.1f}ms {create_ms:>7.1f}ms {result.created:>8}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
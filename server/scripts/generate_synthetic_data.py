@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Generate a Production-Scale Synthetic Dataset for Benchmarking
+
+Creates (or reuses) analysts, portfolio managers, securities, strategies and
+funds, then generates recommendations with their strategy/fund links,
+status histories, trade tickets (with their status histories) and audit
+rows.
+
+- Distributions are skewed like the real book: a few analysts write most
+  recommendations and a few tickers get most of the attention (Zipf
+  weights); statuses, directions, horizons and scores follow fixed weights;
+  creation dates spread over the trading hours of the --years up to
+  --end-date (a fixed date, not today, so reruns match).
+- Rows are written with bulk Core inserts (executemany; INSERT ... RETURNING
+  for the ids that child rows need), one transaction per chunk.
+- Chunks are generated and inserted by --workers processes. Each chunk draws
+  from its own random stream seeded by (--seed, chunk number), so the same
+  arguments always produce the same rows whatever the number of workers or
+  the order chunks finish in (database ids follow insertion order).
+
+SQLite serializes writers, so extra workers only parallelize generation
+there; SQL Server inserts in parallel.
+
+Usage:
+    python scripts/generate_synthetic_data.py --recommendations 1000000 [--workers 8] [--seed 42]
+    python scripts/generate_synthetic_data.py --recommendations 50000 --database-url sqlite:///./bench.db
+"""
+
+import sys
+import time
+import random
+import string
+import argparse
+import itertools
+import multiprocessing
+from pathlib import Path
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Sequence
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import (
+    User, Role, Security, Strategy, Fund,
+    TradeRecommendation, RecommendationStrategy, RecommendationFund,
+    TradeTicket, RecommendationStatusHistory, TradeTicketStatusHistory, AuditTrail
+)
+from app.services.bulk import insert_rows, insert_returning_ids
+
+# (value, weight) tables for categorical columns
+TRADE_DIRECTIONS = [("Buy", 55), ("Sell", 25), ("Sell Short", 12), ("Cover Short", 8)]
+TIME_HORIZONS = [("Trade", 15), ("Short Term", 35), ("Long Term", 40), ("Custom Date", 10)]
+RECOMMENDATION_STATUSES = [("Draft", 15), ("Proposed", 15), ("Approved", 50), ("Rejected", 20)]
+ANALYST_SCORES = [(1, 1), (2, 2), (3, 4), (4, 7), (5, 10), (6, 12), (7, 11), (8, 8), (9, 5), (10, 3)]
+LINKS_PER_RECOMMENDATION = [(1, 50), (2, 35), (3, 15)]
+TICKET_STATUSES = [
+    ("Filled", 60), ("Partially_Filled", 8), ("Working", 7), ("Booked", 5),
+    ("Submitted_to_CRD", 5), ("Cancelled", 10), ("CRD_Error", 5),
+]
+
+# Status sequence each final status was reached through
+RECOMMENDATION_PATHS = {
+    "Draft": ["Draft"],
+    "Proposed": ["Draft", "Proposed"],
+    "Approved": ["Draft", "Proposed", "Approved"],
+    "Rejected": ["Draft", "Proposed", "Rejected"],
+}
+TICKET_PATHS = {
+    "Submitted_to_CRD": ["Draft", "Submitted_to_CRD"],
+    "CRD_Error": ["Draft", "Submitted_to_CRD", "CRD_Error"],
+    "Booked": ["Draft", "Submitted_to_CRD", "Booked"],
+    "Working": ["Draft", "Submitted_to_CRD", "Booked", "Working"],
+    "Partially_Filled": ["Draft", "Submitted_to_CRD", "Booked", "Working", "Partially_Filled"],
+    "Filled": ["Draft", "Submitted_to_CRD", "Booked", "Working", "Filled"],
+    "Cancelled": ["Draft", "Submitted_to_CRD", "Cancelled"],
+}
+
+TICKETS_PER_APPROVED_FUND = 0.9  # Share of an approved recommendation's funds that get a ticket
+
+# Last day of generated history unless --end-date is given; fixed so the data does not depend on the run date
+END_DATE = "2025-12-31"
+
+DEFAULT_STRATEGIES = [
+    "M&A Speculation", "Valuation", "Macro", "Commercial Outlook", "Political Trade",
+    "Drug/Product Launch", "Technical Analysis", "Earnings Beat/Miss", "Clinical Catalyst",
+    "Thematic Baskets", "PM Rebalance",
+]
+DEFAULT_FUNDS = [
+    ("OPM", "OrbiMed Private Investments"), ("GEN", "OrbiMed Genesis Fund"),
+    ("WWH", "OrbiMed Worldwide Healthcare"), ("ROF", "OrbiMed Royalty Opportunities"),
+]
+
+NAME_WORDS = [
+    "Bio", "Thera", "Gen", "Pharma", "Medical", "Health", "Life", "Sciences", "Onco",
+    "Cardio", "Neuro", "Immuno", "Vax", "Cell", "Gene", "Diagnostics", "Devices",
+    "Capital", "Holdings", "Global", "Advanced", "Precision", "Molecular", "Clinical",
+]
+NAME_SUFFIXES = ["Inc", "Corp", "Ltd", "PLC", "AG", "SA", "Group", "Therapeutics"]
+
+def cumulative(weights: Sequence[float]) -> List[float]:
+    return list(itertools.accumulate(weights))
+
+def zipf_weights(count: int, exponent: float) -> List[float]:
+    """Cumulative weights where rank r is picked in proportion to 1 / r**exponent"""
+    return cumulative([1 / rank ** exponent for rank in range(1, count + 1)])
+
+class Categorical:
+    """Weighted choice over a (value, weight) table"""
+
+    def __init__(self, table):
+        self.values = [value for value, _ in table]
+        self.cum_weights = cumulative([weight for _, weight in table])
+
+    def pick(self, rng: random.Random, k: int = 1) -> list:
+        return rng.choices(self.values, cum_weights=self.cum_weights, k=k)
+
+DIRECTION = Categorical(TRADE_DIRECTIONS)
+HORIZON = Categorical(TIME_HORIZONS)
+RECOMMENDATION_STATUS = Categorical(RECOMMENDATION_STATUSES)
+SCORE = Categorical(ANALYST_SCORES)
+LINK_COUNT = Categorical(LINKS_PER_RECOMMENDATION)
+TICKET_STATUS = Categorical(TICKET_STATUSES)
+
+def money(value: float) -> Decimal:
+    return Decimal(f"{max(value, 0.01):.4f}")
+
+# ---------------------------------------------------------------------------
+# Reference data (main process)
+# ---------------------------------------------------------------------------
+
+def synthetic_tickers(count: int, seed: int) -> List[str]:
+    """count distinct 2-5 letter tickers, in popularity order"""
+    rng = random.Random(f"{seed}:tickers")
+    tickers: Dict[str, None] = {}
+    while len(tickers) < count:
+        tickers.setdefault("".join(rng.choices(string.ascii_uppercase, k=rng.randint(2, 5))))
+    return list(tickers)
+
+def ensure_rows(conn, model, key_column, rows: List[dict]) -> List[int]:
+    """Insert rows whose key is not present yet; ids of all rows in the given order"""
+    key = key_column.key
+    existing: Dict[str, int] = {}
+    keys = [row[key] for row in rows]
+    for start in range(0, len(keys), 1000):
+        existing.update(conn.execute(
+            select(key_column, model.id).where(key_column.in_(keys[start:start + 1000]))
+        ).all())
+
+    missing = [row for row in rows if row[key] not in existing]
+    for start in range(0, len(missing), 5000):
+        conn.execute(insert(model), missing[start:start + 5000])
+    if missing:
+        for start in range(0, len(keys), 1000):
+            existing.update(conn.execute(
+                select(key_column, model.id).where(key_column.in_(keys[start:start + 1000]))
+            ).all())
+    return [existing[row_key] for row_key in keys]
+
+def prepare_reference_data(engine, args) -> dict:
+    """Create or reuse the users, securities, strategies and funds rows the facts point at"""
+    rng = random.Random(f"{args.seed}:reference")
+
+    with engine.begin() as conn:
+        analyst_role, pm_role = ensure_rows(conn, Role, Role.name, [
+            {"name": "Analyst", "description": "Research analysts who create trade recommendations"},
+            {"name": "Portfolio_Manager", "description": "Portfolio managers who approve trades"},
+        ])
+        analyst_ids = ensure_rows(conn, User, User.okta_id, [
+            {"okta_id": f"synthetic_analyst_{i}", "email": f"synthetic.analyst{i}@orbimed.com",
+             "name": f"Synthetic Analyst {i}", "role_id": analyst_role}
+            for i in range(1, args.analysts + 1)
+        ])
+        pm_ids = ensure_rows(conn, User, User.okta_id, [
+            {"okta_id": f"synthetic_pm_{i}", "email": f"synthetic.pm{i}@orbimed.com",
+             "name": f"Synthetic PM {i}", "role_id": pm_role}
+            for i in range(1, args.pms + 1)
+        ])
+        tickers = synthetic_tickers(args.securities, args.seed)
+        security_ids = ensure_rows(conn, Security, Security.ticker, [
+            {"ticker": ticker, "source_type": "IVP",
+             "name": " ".join(rng.sample(NAME_WORDS, rng.randint(1, 3)) + [rng.choice(NAME_SUFFIXES)])}
+            for ticker in tickers
+        ])
+
+        strategies = conn.execute(
+            select(Strategy.id, Strategy.name).where(Strategy.is_active == True).order_by(Strategy.id)
+        ).all()
+        if not strategies:
+            ensure_rows(conn, Strategy, Strategy.name, [
+                {"name": name, "is_system_default": True} for name in DEFAULT_STRATEGIES
+            ])
+            strategies = conn.execute(select(Strategy.id, Strategy.name).order_by(Strategy.id)).all()
+        fund_ids = [row.id for row in conn.execute(
+            select(Fund.id).where(Fund.is_active == True).order_by(Fund.id)
+        )]
+        if not fund_ids:
+            fund_ids = ensure_rows(conn, Fund, Fund.code, [
+                {"code": code, "name": name} for code, name in DEFAULT_FUNDS
+            ])
+
+    # Per-security reference price, lognormal around $40
+    base_prices = [round(rng.lognormvariate(3.7, 1.0), 2) for _ in security_ids]
+    end = datetime.strptime(args.end_date, "%Y-%m-%d")
+    days = (end - timedelta(days=offset) for offset in range(int(365 * args.years)))
+    return {
+        "seed": args.seed,
+        "years": args.years,
+        "end": end,
+        "trading_days": [day for day in days if day.weekday() < 5],
+        "analyst_ids": analyst_ids,
+        "analyst_weights": zipf_weights(len(analyst_ids), 1.1),
+        "pm_ids": pm_ids,
+        "security_ids": security_ids,
+        "security_weights": zipf_weights(len(security_ids), 1.2),
+        "base_prices": dict(zip(security_ids, base_prices)),
+        "strategy_ids": [row.id for row in strategies],
+        "strategy_names": {row.id: row.name for row in strategies},
+        "strategy_weights": zipf_weights(len(strategies), 0.8),
+        "fund_ids": fund_ids,
+    }
+
+# ---------------------------------------------------------------------------
+# Fact rows (worker processes)
+# ---------------------------------------------------------------------------
+
+def trading_time(rng: random.Random, plan: dict) -> datetime:
+    """Random weekday timestamp between 07:00 and 19:00 within the plan's trading days
+
+    Exactly one draw picks the day (random.choice may redraw, depending on
+    the number of days), so the rest of the stream does not depend on which
+    weekdays the span happens to cover.
+    """
+    days = plan["trading_days"]
+    day = days[int(rng.random() * len(days))]
+    return day.replace(hour=7) + timedelta(seconds=rng.randrange(12 * 3600))
+
+def distinct_picks(rng: random.Random, population: list, cum_weights: list, k: int) -> List[int]:
+    """k distinct weighted picks (fewer if the population is smaller)"""
+    k = min(k, len(population))
+    picked: Dict[int, None] = {}
+    while len(picked) < k:
+        picked.setdefault(rng.choices(population, cum_weights=cum_weights)[0])
+    return list(picked)
+
+def build_recommendations(rng: random.Random, count: int, plan: dict) -> List[dict]:
+    """Recommendation rows plus the extra keys child rows need (prefixed with _)"""
+    analysts = rng.choices(plan["analyst_ids"], cum_weights=plan["analyst_weights"], k=count)
+    securities = rng.choices(plan["security_ids"], cum_weights=plan["security_weights"], k=count)
+    directions = DIRECTION.pick(rng, count)
+    horizons = HORIZON.pick(rng, count)
+    statuses = RECOMMENDATION_STATUS.pick(rng, count)
+    scores = SCORE.pick(rng, count)
+
+    rows = []
+    for analyst_id, security_id, direction, horizon, status, score in zip(
+        analysts, securities, directions, horizons, statuses, scores
+    ):
+        created_at = trading_time(rng, plan)
+        current = plan["base_prices"][security_id] * rng.lognormvariate(0, 0.25)
+        move = abs(rng.gauss(0.15, 0.1))
+        target = current * (1 + move if direction in ("Buy", "Cover Short") else 1 - min(move, 0.9))
+
+        # Timestamps of each step of the status path
+        path = RECOMMENDATION_PATHS[status]
+        steps = [created_at]
+        for _ in path[1:]:
+            steps.append(steps[-1] + timedelta(minutes=rng.randint(5, 3 * 24 * 60)))
+        decided = status in ("Approved", "Rejected")
+
+        rows.append({
+            "analyst_id": analyst_id,
+            "security_id": security_id,
+            "trade_direction": direction,
+            "current_price": money(current),
+            "target_price": money(target),
+            "time_horizon": horizon,
+            "expected_exit_date": (created_at + timedelta(days=rng.randint(14, 365))).date()
+            if horizon == "Custom Date" else None,
+            "analyst_score": score,
+            "notes": f"Synthetic {direction.lower()} thesis" if rng.random() < 0.7 else None,
+            "status": status,
+            "is_draft": status == "Draft",
+            "approved_by": rng.choice(plan["pm_ids"]) if decided else None,
+            "approved_at": steps[-1] if decided else None,
+            "created_at": created_at,
+            "updated_at": steps[-1],
+            "_strategies": distinct_picks(
+                rng, plan["strategy_ids"], plan["strategy_weights"], LINK_COUNT.pick(rng)[0]
+            ),
+            "_funds": rng.sample(plan["fund_ids"], min(LINK_COUNT.pick(rng)[0], len(plan["fund_ids"]))),
+            "_path": list(zip(path, steps)),
+        })
+    return rows
+
+def status_history(path, changed_by: int, key: str, record_id: int) -> List[dict]:
+    return [
+        {key: record_id, "old_status": old_status, "new_status": new_status,
+         "changed_by": changed_by, "changed_at": changed_at, "created_at": changed_at,
+         "updated_at": changed_at}
+        for (old_status, _), (new_status, changed_at) in zip([(None, None)] + path[:-1], path)
+    ]
+
+def audit_rows(table: str, record_id: int, path, insert_by: int, update_by: int) -> List[dict]:
+    rows = [{"table_name": table, "record_id": record_id, "action_type": "INSERT",
+             "field_name": None, "old_value": None, "new_value": None,
+             "changed_by": insert_by, "changed_at": path[0][1]}]
+    rows.extend(
+        {"table_name": table, "record_id": record_id, "action_type": "UPDATE",
+         "field_name": "status", "old_value": old_status, "new_value": new_status,
+         "changed_by": update_by, "changed_at": changed_at}
+        for (old_status, _), (new_status, changed_at) in zip(path[:-1], path[1:])
+    )
+    return rows
+
+def build_tickets(rng: random.Random, recommendations: List[dict], ids: List[int], plan: dict) -> List[dict]:
+    """Ticket rows for approved recommendations, one per (most) linked funds"""
+    tickets = []
+    for recommendation_id, recommendation in zip(ids, recommendations):
+        if recommendation["status"] != "Approved":
+            continue
+        approved_at = recommendation["approved_at"]
+        for fund_id in recommendation["_funds"]:
+            if rng.random() >= TICKETS_PER_APPROVED_FUND:
+                continue
+            status = TICKET_STATUS.pick(rng)[0]
+            path = TICKET_PATHS[status]
+            steps = [approved_at + timedelta(minutes=rng.randint(1, 120))]
+            for _ in path[1:]:
+                steps.append(steps[-1] + timedelta(minutes=rng.randint(1, 240)))
+            target = recommendation["target_price"]
+            quantity = Decimal(rng.randrange(100, 100000, 100))
+            filled = status in ("Filled", "Partially_Filled")
+            tickets.append({
+                "recommendation_id": recommendation_id,
+                "created_by": recommendation["approved_by"],
+                "security_id": recommendation["security_id"],
+                "fund_id": fund_id,
+                "trade_direction": recommendation["trade_direction"],
+                "target_price": target,
+                "current_position": Decimal(0),
+                "benchmark_position": Decimal(0),
+                "new_position": quantity,
+                "allocation_percentage": Decimal(f"{rng.uniform(0.5, 5):.2f}"),
+                "strategies_for_crd": ",".join(plan["strategy_names"][i] for i in recommendation["_strategies"]),
+                "status": status,
+                "crd_status": status if status != "Draft" else None,
+                "fill_price": money(float(recommendation["current_price"]) * rng.gauss(1, 0.01)) if filled else None,
+                "fill_quantity": (quantity if status == "Filled" else quantity / 2) if filled else None,
+                "crd_error_message": "Synthetic CRD rejection" if status == "CRD_Error" else None,
+                "submitted_to_crd_at": steps[1],
+                "filled_at": steps[-1] if filled else None,
+                "created_at": steps[0],
+                "updated_at": steps[-1],
+                "_path": list(zip(path, steps)),
+            })
+    return tickets
+
+def columns_only(rows: List[dict]) -> List[dict]:
+    return [{key: value for key, value in row.items() if not key.startswith("_")} for row in rows]
+
+_worker_engine = None
+_worker_plan = None
+
+def _init_worker(database_url: str, plan: dict):
+    global _worker_engine, _worker_plan
+    connect_args = {"timeout": 120} if database_url.startswith("sqlite") else {}
+    _worker_engine = create_engine(database_url, poolclass=NullPool, connect_args=connect_args)
+    _worker_plan = plan
+
+def generate_chunk(task) -> Dict[str, int]:
+    """Generate and insert one chunk of recommendations and everything hanging off them"""
+    chunk_index, count = task
+    plan = _worker_plan
+    rng = random.Random(f"{plan['seed']}:{chunk_index}")
+
+    recommendations = build_recommendations(rng, count, plan)
+    with Session(_worker_engine) as db, db.begin():
+        ids = insert_returning_ids(db, TradeRecommendation, columns_only(recommendations))
+        tickets = build_tickets(rng, recommendations, ids, plan)
+        ticket_ids = insert_returning_ids(db, TradeTicket, columns_only(tickets))
+
+        strategy_links = [
+            {"recommendation_id": recommendation_id, "strategy_id": strategy_id}
+            for recommendation_id, row in zip(ids, recommendations) for strategy_id in row["_strategies"]
+        ]
+        fund_links = [
+            {"recommendation_id": recommendation_id, "fund_id": fund_id}
+            for recommendation_id, row in zip(ids, recommendations) for fund_id in row["_funds"]
+        ]
+        recommendation_history = [
+            history
+            for recommendation_id, row in zip(ids, recommendations)
+            for history in status_history(
+                row["_path"], row["approved_by"] or row["analyst_id"], "recommendation_id", recommendation_id
+            )
+        ]
+        ticket_history = [
+            history
+            for ticket_id, ticket in zip(ticket_ids, tickets)
+            for history in status_history(ticket["_path"], ticket["created_by"], "trade_ticket_id", ticket_id)
+        ]
+        audit = [
+            row
+            for recommendation_id, recommendation in zip(ids, recommendations)
+            for row in audit_rows(
+                TradeRecommendation.__tablename__, recommendation_id, recommendation["_path"],
+                recommendation["analyst_id"], recommendation["approved_by"] or recommendation["analyst_id"]
+            )
+        ] + [
+            row
+            for ticket_id, ticket in zip(ticket_ids, tickets)
+            for row in audit_rows(
+                TradeTicket.__tablename__, ticket_id, ticket["_path"], ticket["created_by"], ticket["created_by"]
+            )
+        ]
+
+        for model, rows in (
+            (RecommendationStrategy, strategy_links),
+            (RecommendationFund, fund_links),
+            (RecommendationStatusHistory, recommendation_history),
+            (TradeTicketStatusHistory, ticket_history),
+            (AuditTrail, audit),
+        ):
+            insert_rows(db, model, rows)
+
+    return {
+        "recommendations": len(ids),
+        "strategy links": len(strategy_links),
+        "fund links": len(fund_links),
+        "recommendation history": len(recommendation_history),
+        "tickets": len(ticket_ids),
+        "ticket history": len(ticket_history),
+        "audit rows": len(audit),
+    }
+
+def chunk_tasks(total: int, chunk_size: int):
+    return [
+        (index, min(chunk_size, total - start))
+        for index, start in enumerate(range(0, total, chunk_size))
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic benchmark dataset")
+    parser.add_argument("--recommendations", type=int, default=1_000_000, help="Recommendations to generate")
+    parser.add_argument("--analysts", type=int, default=200, help="Synthetic analysts")
+    parser.add_argument("--pms", type=int, default=15, help="Synthetic portfolio managers")
+    parser.add_argument("--securities", type=int, default=5000, help="Synthetic securities")
+    parser.add_argument("--years", type=float, default=3, help="History span for created_at")
+    parser.add_argument("--end-date", default=END_DATE, help="Last day of that history (YYYY-MM-DD)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Recommendations per transaction")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="Worker processes")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed, same data)")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="Target database")
+    args = parser.parse_args()
+
+    if settings.is_production and args.database_url == settings.DATABASE_URL:
+        print("❌ Refusing to generate synthetic data in a production environment")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("🧪 Synthetic data generator")
+    print("=" * 60)
+    print(f"🗃️  Database: {args.database_url.split('://')[0]}")
+    print(f"🎲 Seed {args.seed}, {args.recommendations:,} recommendations, {args.workers} workers")
+    print(f"📅 {args.years:g} years of history up to {args.end_date}")
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    plan = prepare_reference_data(engine, args)
+    engine.dispose()
+    print(f"   ✅ Reference data: {len(plan['analyst_ids'])} analysts, {len(plan['pm_ids'])} PMs, "
+          f"{len(plan['security_ids']):,} securities, {len(plan['strategy_ids'])} strategies, "
+          f"{len(plan['fund_ids'])} funds")
+
+    tasks = chunk_tasks(args.recommendations, args.chunk_size)
+    totals: Dict[str, int] = {}
+    started = time.perf_counter()
+
+    def report(done: int, counts: Dict[str, int]):
+        for name, count in counts.items():
+            totals[name] = totals.get(name, 0) + count
+        elapsed = time.perf_counter() - started
+        print(f"   📦 {done}/{len(tasks)} chunks, {totals['recommendations']:,} recommendations "
+              f"({totals['recommendations'] / elapsed:,.0f}/s)")
+
+    if args.workers > 1:
+        with multiprocessing.Pool(args.workers, _init_worker, (args.database_url, plan)) as pool:
+            for done, counts in enumerate(pool.imap_unordered(generate_chunk, tasks), start=1):
+                report(done, counts)
+    else:
+        _init_worker(args.database_url, plan)
+        for done, task in enumerate(tasks, start=1):
+            report(done, generate_chunk(task))
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Generated in {elapsed:.1f} s:")
+    for name, count in totals.items():
+        print(f"   • {name}: {count:,}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# tests/conftest.py
+"""
+Shared fixtures: a scratch SQLite database with the full schema
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import Role, Security, User
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """Temp-file SQLite database with every table, two users and one security
+
+    Modules seed their own rows on top (see their session_factory fixtures).
+    A file rather than :memory:, so every connection sees the same data.
+    """
+    monkeypatch.setattr(settings, "AUDIT_ENABLED", False)  # Audit rows would go to the app database
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Role), [{"id": 1, "name": "Portfolio_Manager"}])
+        conn.execute(insert(User), [
+            {"id": user_id, "okta_id": f"okta_{user_id}", "email": f"user{user_id}@orbimed.com",
+             "name": f"User {user_id}", "role_id": 1}
+            for user_id in (1, 2)
+        ])
+        conn.execute(insert(Security), [
+            {"id": 1, "ticker": "AAPL", "name": "Apple", "source_type": "IVP", "is_active": True}
+        ])
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
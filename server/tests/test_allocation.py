@@ -0,0 +1,189 @@
+# tests/test_allocation.py
+"""
+Tests for the allocation engine and bulk ticket creation from approved
+recommendations
+"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.models import (
+    Fund, RecommendationFund, RecommendationStrategy, Strategy, TradeRecommendation,
+    TradeTicket, TradeTicketStatusHistory
+)
+from app.schemas.trade_tickets import MAX_POSITION, FundPositionInput, RecommendationAllocationInput, TicketAllocationRequest
+from app.services.allocation import AllocationBatch, allocate, ticks_array
+from app.services.reference_cache import fund_cache
+from app.services.trade_ticket_service import TradeTicketService
+
+def allocated(allocation, row):
+    """{fund column: (new position, trade, percentage)} as strings"""
+    return {
+        column: (str(new_position), str(trade), str(percentage))
+        for column, new_position, trade, percentage in allocation.rows(row)
+    }
+
+def test_pro_rata_trades_add_up_exactly_with_largest_remainder_rounding():
+    batch = AllocationBatch()
+    batch.add("Buy", [(None, None, None, None)] * 3, quantity=Decimal("100"))
+    batch.add("Sell", [(Decimal("500"), None, Decimal("2"), None), (Decimal("100"), None, Decimal("1"), None)],
+              quantity=Decimal("1000.0001"))
+
+    allocation = allocate("pro_rata", batch)
+
+    assert allocated(allocation, 0) == {
+        0: ("33.3334", "33.3334", "33.34"), 1: ("33.3333", "33.3333", "33.33"), 2: ("33.3333", "33.3333", "33.33")
+    }
+    assert allocated(allocation, 1) == {
+        0: ("-166.6667", "-666.6667", "66.67"), 1: ("-233.3334", "-333.3334", "33.33")
+    }
+
+def test_benchmark_relative_moves_to_target_but_never_against_the_direction():
+    batch = AllocationBatch()
+    funds = [(Decimal("0"), Decimal("-1000"), None, None), (Decimal("-900"), Decimal("-1000"), None, None),
+             (Decimal("-1200"), Decimal("-1000"), None, None)]
+    batch.add("Sell Short", funds, multiple=Decimal("1.05"))
+
+    allocation = allocate("benchmark_relative", batch)
+
+    # The third fund is already shorter than its target: no ticket
+    assert allocated(allocation, 0) == {
+        0: ("-1050.0000", "-1050.0000", "87.50"), 1: ("-1050.0000", "-150.0000", "12.50")
+    }
+
+def test_capped_redistributes_to_funds_with_room_and_reports_the_rest():
+    batch = AllocationBatch()
+    batch.add("Buy", [(None, None, None, Decimal("10")), (Decimal("5"), None, None, Decimal("20")),
+                      (None, None, None, None)], quantity=Decimal("100"))
+    batch.add("Buy", [(None, None, None, Decimal("10")), (Decimal("5"), None, None, Decimal("20"))],
+              quantity=Decimal("100"))
+
+    allocation = allocate("capped", batch)
+
+    assert allocated(allocation, 0) == {
+        0: ("10.0000", "10.0000", "10.00"), 1: ("20.0000", "15.0000", "15.00"), 2: ("75.0000", "75.0000", "75.00")
+    }
+    assert allocation.unallocated.tolist() == [0, 75 * 10 ** 4]
+
+def test_benchmark_relative_stays_exact_past_int64_products_and_flags_positions_too_large():
+    batch = AllocationBatch()
+    batch.add("Buy", [(None, Decimal("1000000"), None, None)], multiple=Decimal("1000000"))
+    batch.add("Buy", [(None, MAX_POSITION, None, None)], multiple=Decimal("2"))
+    # The target is far above the fund, so a sell leaves it alone
+    batch.add("Sell", [(None, MAX_POSITION, None, None)], multiple=MAX_POSITION)
+    # Five trades of almost 2e14 shares each: their total does not fit int64 ticks
+    batch.add("Buy", [(-MAX_POSITION, MAX_POSITION, None, None)] * 5)
+
+    allocation = allocate("benchmark_relative", batch)
+
+    assert allocated(allocation, 0) == {0: ("1000000000000.0000", "1000000000000.0000", "100.00")}
+    assert allocation.out_of_range().tolist() == [False, True, False, False]
+    assert allocated(allocation, 2) == {}
+    assert allocated(allocation, 3) == {
+        column: (str(MAX_POSITION), str(2 * MAX_POSITION), "20.00") for column in range(5)
+    }
+
+@pytest.mark.parametrize("model, field", [
+    (RecommendationAllocationInput, "quantity"), (RecommendationAllocationInput, "benchmark_multiple"),
+    (FundPositionInput, "current_position"), (FundPositionInput, "benchmark_position"), (FundPositionInput, "cap"),
+])
+def test_allocation_inputs_are_bounded_to_decimal_18_4(model, field):
+    required = {"recommendation_id": 1} if model is RecommendationAllocationInput else {"fund_id": 1}
+
+    assert getattr(model(**required, **{field: str(MAX_POSITION)}), field) == MAX_POSITION
+    for value in (MAX_POSITION + Decimal("0.0001"), Decimal("1E+16"), Decimal("1.00001")):
+        with pytest.raises(ValidationError):
+            model(**required, **{field: str(value)})
+
+def test_ticks_array_refuses_values_too_large_for_decimal_18_4():
+    assert ticks_array([MAX_POSITION, -MAX_POSITION]).tolist() == [10 ** 18 - 1, -(10 ** 18 - 1)]
+    with pytest.raises(ValueError):
+        ticks_array([Decimal("1E+16")])
+
+@pytest.fixture
+def session_factory(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(Fund), [
+            {"id": fund_id, "code": f"F{fund_id}", "name": f"Fund {fund_id}"} for fund_id in (1, 2, 3)
+        ])
+        conn.execute(insert(Strategy), [{"id": 1, "name": "Long/Short"}])
+        conn.execute(insert(TradeRecommendation), [
+            {"id": 1, "analyst_id": 1, "security_id": 1, "trade_direction": "Buy", "target_price": Decimal("190"),
+             "time_horizon": "Trade", "analyst_score": 8, "status": "Approved", "is_draft": False},
+            {"id": 2, "analyst_id": 1, "security_id": 1, "trade_direction": "Buy", "target_price": Decimal("190"),
+             "time_horizon": "Trade", "analyst_score": 8, "status": "Proposed", "is_draft": False},
+        ])
+        conn.execute(insert(RecommendationFund), [
+            {"recommendation_id": recommendation_id, "fund_id": fund_id}
+            for recommendation_id in (1, 2) for fund_id in (1, 2, 3)
+        ])
+        conn.execute(insert(RecommendationStrategy), [
+            {"recommendation_id": 1, "strategy_id": 1, "custom_strategy_text": None},
+            {"recommendation_id": 1, "strategy_id": None, "custom_strategy_text": "Event"},
+        ])
+    fund_cache.invalidate()
+    yield sessionmaker(bind=engine)
+    fund_cache.invalidate()
+
+def test_allocate_tickets_creates_one_draft_ticket_per_trading_fund(session_factory):
+    request = TicketAllocationRequest(method="pro_rata", recommendations=[
+        {"recommendation_id": 1, "quantity": "3000", "positions": [
+            {"fund_id": 1, "current_position": "100", "weight": "2"},
+            {"fund_id": 2, "weight": "1"},
+            {"fund_id": 3, "weight": "0"},  # Takes no share: no ticket
+        ]},
+        {"recommendation_id": 2, "quantity": "100"},
+    ])
+
+    with session_factory() as db:
+        result = TradeTicketService.allocate_tickets(db, request, user_id=1)
+
+    assert (result.created, result.failed) == (2, 1)
+    created, rejected = result.results
+    assert created.status == "created"
+    assert [(ticket.fund_id, ticket.new_position, ticket.allocation_percentage) for ticket in created.tickets] == [
+        (1, Decimal("2100.0000"), Decimal("66.67")), (2, Decimal("1000.0000"), Decimal("33.33"))
+    ]
+    assert (rejected.status, rejected.errors) == ("invalid", ["Only Approved recommendations can be allocated"])
+
+    with session_factory() as db:
+        tickets = db.scalars(select(TradeTicket).order_by(TradeTicket.id)).all()
+        assert [ticket.id for ticket in tickets] == [ticket.id for ticket in created.tickets]
+        assert [(ticket.fund_id, ticket.current_position, ticket.new_position, ticket.status) for ticket in tickets] == [
+            (1, Decimal("100.0000"), Decimal("2100.0000"), "Draft"), (2, Decimal("0.0000"), Decimal("1000.0000"), "Draft")
+        ]
+        assert {ticket.strategies_for_crd for ticket in tickets} == {"Long/Short,Event"}
+        history = db.scalars(select(TradeTicketStatusHistory)).all()
+        assert [(row.old_status, row.new_status) for row in history] == [(None, "Draft")] * 2
+
+    # Allocating the same recommendation again is refused
+    with session_factory() as db:
+        again = TradeTicketService.allocate_tickets(db, request, user_id=1)
+    assert again.results[0].errors == ["Recommendation already has trade tickets"]
+
+def test_dry_run_and_atomic_create_nothing(session_factory):
+    recommendations = [{"recommendation_id": 1, "quantity": "90"}, {"recommendation_id": 99, "quantity": "1"}]
+
+    with session_factory() as db:
+        preview = TradeTicketService.allocate_tickets(
+            db, TicketAllocationRequest(recommendations=recommendations[:1], dry_run=True), user_id=1
+        )
+        atomic = TradeTicketService.allocate_tickets(
+            db, TicketAllocationRequest(recommendations=recommendations, atomic=True), user_id=1
+        )
+
+    assert preview.results[0].status == "allocated"
+    assert [ticket.trade_quantity for ticket in preview.results[0].tickets] == [Decimal("30.0000")] * 3
+    assert [item.status for item in atomic.results] == ["skipped", "invalid"]
+    with session_factory() as db:
+        assert db.scalars(select(TradeTicket)).all() == []
@@ -0,0 +1,114 @@
+# tests/test_async_reads.py
+"""
+Tests for the async read path: AsyncRecommendationService and the async session dependencies
+"""
+
+import sys
+import time
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.api import deps
+from app.core import database
+from app.core.database import to_async_url
+from app.core.replicas import READ_PRIMARY_COOKIE, Replica, ReplicaRouter
+from app.models import RecommendationStrategy, Strategy, TradeRecommendation
+from app.schemas.recommendations import RecommendationFilters, RecommendationResponse
+from app.services.recommendation_service import AsyncRecommendationService, RecommendationService
+
+@pytest.fixture
+def session_factory(engine):
+    created = datetime(2026, 1, 5)
+    with engine.begin() as conn:
+        conn.execute(insert(Strategy), [{"id": 1, "name": "Long/Short"}])
+        conn.execute(insert(TradeRecommendation), [
+            {"id": recommendation_id, "analyst_id": 1, "security_id": 1, "trade_direction": "Buy",
+             "target_price": 190, "time_horizon": "Trade", "analyst_score": 8, "status": "Draft", "is_draft": True,
+             "created_at": created + timedelta(minutes=recommendation_id % 3)}  # Ties on created_at
+            for recommendation_id in range(1, 6)
+        ])
+        conn.execute(insert(RecommendationStrategy), [{"recommendation_id": 3, "strategy_id": 1}])
+    return sessionmaker(bind=engine)
+
+@pytest.fixture
+def async_engine(engine):
+    async_engine = create_async_engine(to_async_url(engine.url.render_as_string(hide_password=False)))
+    yield async_engine
+    asyncio.run(async_engine.dispose())
+
+@pytest.fixture
+def async_session_factory(async_engine, session_factory):
+    return async_sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+
+def test_async_pages_match_the_sync_pages(session_factory, async_session_factory):
+    filters = RecommendationFilters()
+
+    async def pages():
+        ids, cursor = [], None
+        async with async_session_factory() as db:
+            while True:
+                page, cursor = await AsyncRecommendationService.list_recommendations(db, filters, cursor, limit=2)
+                # Serializing touches every relationship: a lazy load would fail outside the greenlet
+                ids.append([RecommendationResponse.model_validate(row).id for row in page])
+                if cursor is None:
+                    return ids
+
+    with session_factory() as db:
+        first, cursor = RecommendationService.list_recommendations(db, filters, limit=2)
+        second, _ = RecommendationService.list_recommendations(db, filters, cursor, limit=2)
+
+    ids = asyncio.run(pages())
+    assert ids == [[5, 2], [4, 1], [3]]  # created_at, then id, descending
+    assert ids[:2] == [[row.id for row in first], [row.id for row in second]]
+
+def test_async_get_loads_the_response_graph(session_factory, async_session_factory):
+    async def get(recommendation_id):
+        async with async_session_factory() as db:
+            recommendation = await AsyncRecommendationService.get_recommendation_by_id(db, recommendation_id)
+            return recommendation and RecommendationResponse.model_validate(recommendation)
+
+    response = asyncio.run(get(3))
+    assert (response.id, response.security.ticker, [s.name for s in response.strategies]) == (3, "AAPL", ["Long/Short"])
+    assert asyncio.run(get(99)) is None
+
+def test_get_async_db_yields_a_session_and_closes_it(monkeypatch, async_session_factory):
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_session_factory)
+
+    async def use_dependency():
+        dependency = database.get_async_db()
+        db = await dependency.__anext__()
+        count = await db.scalar(select(func.count()).select_from(TradeRecommendation))
+        with pytest.raises(StopAsyncIteration):
+            await dependency.__anext__()
+        return count, db.in_transaction()
+
+    assert asyncio.run(use_dependency()) == (5, False)
+
+def test_get_async_read_db_routes_to_a_replica_unless_the_client_just_wrote(monkeypatch, engine, async_engine,
+                                                                            async_session_factory):
+    router = ReplicaRouter([Replica("replica1", engine, async_engine)],
+                           primary_async_session_factory=async_session_factory)
+    monkeypatch.setattr(deps, "replica_router", router)
+    app = FastAPI()
+
+    @app.get("/count")
+    async def count(db: AsyncSession = Depends(deps.get_async_read_db)):
+        total = await db.scalar(select(func.count()).select_from(TradeRecommendation))
+        return {"replica": db.info["replica"], "count": total}
+
+    client = TestClient(app)
+    assert client.get("/count").json() == {"replica": "replica1", "count": 5}
+    client.cookies.set(READ_PRIMARY_COOKIE, f"{time.time() + 60:.3f}")
+    assert client.get("/count").json() == {"replica": None, "count": 5}
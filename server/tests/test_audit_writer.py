@@ -0,0 +1,112 @@
+# tests/test_audit_writer.py
+"""
+Tests for the batched, back-pressured audit writer
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.audit_service import AuditWriter
+
+class RecordingSink:
+    """Collects written batches; can hold the worker thread or fail writes"""
+
+    def __init__(self):
+        self.batches = []
+        self.threads = []
+        self.release = threading.Event()
+        self.release.set()
+        self.failures = 0
+
+    def __call__(self, rows):
+        if threading.current_thread().name == "audit-writer":
+            self.release.wait(5)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append(list(rows))
+        self.threads.append(threading.current_thread().name)
+
+    @property
+    def rows(self):
+        return [row for batch in self.batches for row in batch]
+
+def rows(count, start=0):
+    return [{"record_id": i} for i in range(start, start + count)]
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_not_started_writes_synchronously():
+    sink = RecordingSink()
+    writer = AuditWriter(sink)
+
+    writer.submit(rows(3))
+
+    assert sink.rows == rows(3)
+    assert sink.threads == [threading.current_thread().name]
+    assert writer.stats["written_sync"] == 3
+
+def test_background_worker_batches_rows():
+    sink = RecordingSink()
+    writer = AuditWriter(sink, batch_size=10, flush_interval_seconds=0.2)
+    writer.start()
+    try:
+        for start in range(0, 25, 5):
+            writer.submit(rows(5, start))
+        assert wait_for(lambda: len(sink.rows) == 25)
+    finally:
+        writer.stop()
+
+    assert sink.rows == rows(25)
+    assert all(len(batch) <= 10 for batch in sink.batches)
+    assert len(sink.batches) < 5
+    assert set(sink.threads) == {"audit-writer"}
+
+def test_full_queue_falls_back_to_synchronous_write():
+    sink = RecordingSink()
+    writer = AuditWriter(sink, max_queue_size=1, batch_size=1, enqueue_timeout_seconds=0.01)
+    sink.release.clear()  # hold the worker inside its first write
+    writer.start()
+    try:
+        writer.submit(rows(1, 0))  # taken by the worker
+        assert wait_for(lambda: writer._queue.empty())
+        writer.submit(rows(1, 1))  # fills the queue
+        writer.submit(rows(1, 2))  # no room: written by this thread
+        assert sink.rows == rows(1, 2)
+        assert writer.stats["written_sync"] == 1
+    finally:
+        sink.release.set()
+        writer.stop()
+
+    assert sorted(row["record_id"] for row in sink.rows) == [0, 1, 2]
+
+def test_stop_drains_queue():
+    sink = RecordingSink()
+    writer = AuditWriter(sink, batch_size=2, flush_interval_seconds=0.05)
+    writer.start()
+    for start in range(0, 10, 2):
+        writer.submit(rows(2, start))
+    writer.stop()
+
+    assert sorted(row["record_id"] for row in sink.rows) == list(range(10))
+    assert not writer.running
+
+def test_failed_write_is_retried():
+    sink = RecordingSink()
+    sink.failures = 2
+    writer = AuditWriter(sink, max_retries=3)
+
+    writer.submit(rows(2))
+
+    assert sink.rows == rows(2)
+    assert writer.stats["failed"] == 0
@@ -0,0 +1,214 @@
+# tests/test_crd_dispatcher.py
+"""
+Tests for CRD submission: the transactional outbox, batched dispatch,
+retries with backoff, idempotent resends and the CRD client
+"""
+
+import sys
+import json
+import random
+import asyncio
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings
+from app.integrations.crd import CrdResponseError, CrdUnavailableError, FakeCrdServer
+from app.models import CrdOutbox, Fund, TradeTicket, TradeTicketStatusHistory
+from app.services.crd_dispatcher import CrdDispatcher, backoff_seconds, build_crd_gateway
+from app.services.trade_ticket_service import TradeTicketService, utcnow
+
+class FakeClock:
+    def __init__(self):
+        self.now = utcnow()
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def session_factory(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(Fund), [{"id": 1, "code": "OPM", "name": "OrbiMed Partners"}])
+    return sessionmaker(bind=engine)
+
+def add_tickets(session_factory, count: int, status: str = "Draft") -> list:
+    with session_factory() as db:
+        tickets = [
+            TradeTicket(created_by=1, security_id=1, fund_id=1, trade_direction="Buy",
+                        target_price=Decimal("187.5000"), new_position=Decimal("1000"), status=status)
+            for _ in range(count)
+        ]
+        db.add_all(tickets)
+        db.commit()
+        return [ticket.id for ticket in tickets]
+
+def submit_all(session_factory, ticket_ids):
+    for ticket_id in ticket_ids:
+        with session_factory() as db:
+            TradeTicketService.submit_to_crd(db, ticket_id, user_id=1)
+
+def load(session_factory, model, **filters):
+    with session_factory() as db:
+        return db.scalars(select(model).filter_by(**filters).order_by(model.id)).all()
+
+def make_dispatcher(session_factory, server, **options):
+    options.setdefault("clock", FakeClock())
+    options.setdefault("rng", random.Random(7))
+    return CrdDispatcher(server.client(), session_factory=session_factory, **options)
+
+def test_submit_writes_status_history_and_outbox_together_and_repeats_are_no_ops(session_factory):
+    [ticket_id] = add_tickets(session_factory, 1)
+
+    with session_factory() as db:
+        ticket = TradeTicketService.submit_to_crd(db, ticket_id, user_id=1)
+        assert (ticket.status, ticket.crd_status) == ("Submitted_to_CRD", "Pending")
+    with session_factory() as db:
+        TradeTicketService.submit_to_crd(db, ticket_id, user_id=1)
+
+    [outbox] = load(session_factory, CrdOutbox)
+    assert (outbox.trade_ticket_id, outbox.status, outbox.idempotency_key) == (ticket_id, "Pending", f"ticket-{ticket_id}-1")
+    order = json.loads(outbox.payload)
+    assert (order["order_id"], order["ticker"], order["fund"], order["target_price"]) == (ticket_id, "AAPL", "OPM", "187.5000")
+    [history] = load(session_factory, TradeTicketStatusHistory)
+    assert (history.old_status, history.new_status) == ("Draft", "Submitted_to_CRD")
+
+def test_only_draft_or_errored_tickets_can_be_submitted(session_factory):
+    [ticket_id] = add_tickets(session_factory, 1, status="Filled")
+
+    with session_factory() as db, pytest.raises(HTTPException) as error:
+        TradeTicketService.submit_to_crd(db, ticket_id, user_id=1)
+    assert error.value.status_code == 400
+    assert load(session_factory, CrdOutbox) == []
+
+def test_dispatch_sends_bulk_requests_with_bounded_concurrency(session_factory):
+    ticket_ids = add_tickets(session_factory, 7)
+    submit_all(session_factory, ticket_ids)
+    server = FakeCrdServer(latency_seconds=0.02, max_batch_size=3)
+    dispatcher = make_dispatcher(session_factory, server, concurrency=2)
+
+    async def scenario():
+        claimed = [await dispatcher.dispatch_once() for _ in range(3)]
+        await dispatcher.gateway.close()
+        return claimed
+
+    assert asyncio.run(scenario()) == [6, 1, 0]
+    assert [len(keys) for keys in server.requests] == [3, 3, 1]
+    assert server.max_in_flight == 2
+    assert sorted(server.booked) == ticket_ids
+    assert {outbox.status for outbox in load(session_factory, CrdOutbox)} == {"Sent"}
+    assert {ticket.crd_status for ticket in load(session_factory, TradeTicket)} == {"Booked"}
+    assert dispatcher.stats["accepted"] == 7
+
+def test_rejected_order_moves_ticket_to_crd_error_and_can_be_resubmitted(session_factory):
+    ticket_ids = add_tickets(session_factory, 2)
+    submit_all(session_factory, ticket_ids)
+    server = FakeCrdServer()
+    server.reject([ticket_ids[0]], "Unknown account")
+    dispatcher = make_dispatcher(session_factory, server)
+
+    asyncio.run(dispatcher.dispatch_once())
+    rejected, accepted = load(session_factory, TradeTicket)
+    assert (rejected.status, rejected.crd_error_message) == ("CRD_Error", "Rejected by CRD: Unknown account")
+    assert (accepted.status, accepted.crd_status) == ("Submitted_to_CRD", "Booked")
+    assert load(session_factory, TradeTicketStatusHistory, trade_ticket_id=rejected.id)[-1].new_status == "CRD_Error"
+
+    server.rejections.clear()
+    submit_all(session_factory, [rejected.id])
+    asyncio.run(dispatcher.dispatch_once())
+    outbox = load(session_factory, CrdOutbox, trade_ticket_id=rejected.id)[0]
+    assert (outbox.submission, outbox.idempotency_key, outbox.status) == (2, f"ticket-{rejected.id}-2", "Sent")
+    assert rejected.id in server.booked
+
+def test_failed_requests_back_off_then_give_up(session_factory):
+    [ticket_id] = add_tickets(session_factory, 1)
+    submit_all(session_factory, [ticket_id])
+    server = FakeCrdServer()
+    server.fail_next(5)
+    clock = FakeClock()
+    dispatcher = make_dispatcher(session_factory, server, clock=clock, max_attempts=2, retry_base_seconds=10)
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 1
+    [outbox] = load(session_factory, CrdOutbox)
+    assert (outbox.status, outbox.attempts, outbox.last_error) == ("Pending", 1, "CRD returned 503")
+    wait = (outbox.next_attempt_at - clock.now).total_seconds()
+    assert 4 <= wait <= 10  # Half the first backoff step is jitter
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 0  # Not due yet
+    clock.now += timedelta(seconds=11)
+    assert asyncio.run(dispatcher.dispatch_once()) == 1
+
+    [outbox] = load(session_factory, CrdOutbox)
+    [ticket] = load(session_factory, TradeTicket)
+    assert (outbox.status, outbox.attempts) == ("Failed", 2)
+    assert ticket.status == "CRD_Error"
+    assert ticket.crd_error_message == "Not delivered to CRD after 2 attempts: CRD returned 503"
+    assert dispatcher.stats == {"requests": 2, "accepted": 0, "rejected": 0, "retried": 1, "failed": 1}
+
+def test_resend_after_an_expired_claim_is_not_booked_twice(session_factory):
+    [ticket_id] = add_tickets(session_factory, 1)
+    submit_all(session_factory, [ticket_id])
+    server = FakeCrdServer()
+    clock = FakeClock()
+    first = make_dispatcher(session_factory, server, clock=clock, claim_seconds=60)
+    second = make_dispatcher(session_factory, server, clock=clock, claim_seconds=60)
+
+    async def scenario():
+        token, orders = first.claim(10)
+        await first.gateway.submit_orders([claimed.order for claimed in orders])  # Answer lost
+        assert second.claim(10)[1] == []  # Still leased
+        clock.now += timedelta(seconds=61)
+        assert await second.dispatch_once() == 1
+        counts, _ = first.record(token, orders, None, "timed out")  # Late: the lease was taken over
+        assert sum(counts.values()) == 0
+
+    asyncio.run(scenario())
+    assert len(server.requests) == 2 and list(server.booked) == [ticket_id]
+    assert load(session_factory, CrdOutbox)[0].status == "Sent"
+
+def test_backoff_doubles_up_to_the_cap_with_jitter():
+    rng = random.Random(1)
+    for attempt, ceiling in [(1, 2), (2, 4), (3, 8), (10, 300)]:
+        delay = backoff_seconds(attempt, 2, 300, rng)
+        assert ceiling / 2 <= delay <= ceiling
+
+def test_fake_crd_is_only_used_when_opted_in(monkeypatch):
+    monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+    monkeypatch.setattr(settings, "CRD_ENABLED", False)
+
+    monkeypatch.setattr(settings, "CRD_USE_FAKE", False)
+    assert build_crd_gateway() is None  # Submissions wait in the outbox
+
+    monkeypatch.setattr(settings, "CRD_USE_FAKE", True)
+    gateway = build_crd_gateway()
+    assert gateway.name == "fake"
+    asyncio.run(gateway.close())
+
+def test_crd_client_maps_failures_to_crd_errors():
+    server = FakeCrdServer(api_key="secret")
+    order = {"idempotency_key": "ticket-1-1", "order_id": 1}
+
+    async def scenario():
+        authorized, anonymous = server.client(api_key="secret"), server.client()
+        try:
+            results = await authorized.submit_orders([order])
+            assert results["ticket-1-1"].accepted and results["ticket-1-1"].crd_status == "Booked"
+            assert (await authorized.submit_orders([order]))["ticket-1-1"].duplicate
+            with pytest.raises(CrdResponseError):
+                await anonymous.submit_orders([order])
+            server.fail_next(1, status_code=429)
+            with pytest.raises(CrdUnavailableError):
+                await authorized.submit_orders([order])
+        finally:
+            await authorized.close()
+            await anonymous.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,157 @@
+# tests/test_crd_reconciler.py
+"""
+Tests for CRD reconciliation: batched status requests, in-memory diffs,
+bulk updates with history only for status changes, and the adaptive
+poll interval
+"""
+
+import sys
+import asyncio
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings
+from app.integrations.crd import FakeCrdServer
+from app.models import Fund, TradeTicket, TradeTicketStatusHistory
+from app.services.crd_dispatcher import CrdDispatcher
+from app.services.crd_reconciler import CrdReconciler, poll_interval
+from app.services.trade_ticket_service import TradeTicketService
+
+@pytest.fixture
+def session_factory(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(Fund), [{"id": 1, "code": "OPM", "name": "OrbiMed Partners"}])
+    return sessionmaker(bind=engine)
+
+def book_tickets(session_factory, server, count: int) -> list:
+    """count tickets submitted and accepted by the fake CRD"""
+    with session_factory() as db:
+        tickets = [
+            TradeTicket(created_by=1, security_id=1, fund_id=1, trade_direction="Buy",
+                        target_price=Decimal("187.5000"), new_position=Decimal("1000"), status="Draft")
+            for _ in range(count)
+        ]
+        db.add_all(tickets)
+        db.commit()
+        ticket_ids = [ticket.id for ticket in tickets]
+    for ticket_id in ticket_ids:
+        with session_factory() as db:
+            TradeTicketService.submit_to_crd(db, ticket_id, user_id=1)
+
+    async def dispatch():
+        dispatcher = CrdDispatcher(server.client(), session_factory=session_factory)
+        await dispatcher.dispatch_once()
+        await dispatcher.gateway.close()
+
+    asyncio.run(dispatch())
+    return ticket_ids
+
+def reconcile(session_factory, server, **options):
+    reconciler = CrdReconciler(server.client(), session_factory=session_factory,
+                               read_session_factory=session_factory, **options)
+
+    async def scenario():
+        result = await reconciler.reconcile_once()
+        await reconciler.gateway.close()
+        return result
+
+    return asyncio.run(scenario()), reconciler
+
+def load(session_factory, model, **filters):
+    with session_factory() as db:
+        return db.scalars(select(model).filter_by(**filters).order_by(model.id)).all()
+
+def test_changed_tickets_are_updated_and_status_changes_get_history(session_factory):
+    server = FakeCrdServer()
+    ticket_ids = book_tickets(session_factory, server, 4)
+    filled_at = datetime(2026, 3, 2, 15, 30, tzinfo=timezone.utc)
+    server.set_status(ticket_ids[1], "Partially_Filled", fill_price="187.10", fill_quantity=500)
+    server.set_status(ticket_ids[2], "Filled", fill_price="187.20", fill_quantity=1000, filled_at=filled_at)
+    server.set_status(ticket_ids[3], "Held")  # Not a ticket status: only crd_status follows it
+
+    (open_orders, changed), reconciler = reconcile(session_factory, server)
+
+    assert (open_orders, changed) == (4, 4)
+    booked, partial, filled, held = load(session_factory, TradeTicket)
+    assert (booked.status, booked.crd_status) == ("Booked", "Booked")
+    assert (partial.status, partial.fill_price, partial.fill_quantity) == ("Partially_Filled", Decimal("187.1000"), Decimal("500"))
+    assert (filled.status, filled.filled_at) == ("Filled", datetime(2026, 3, 2, 15, 30))
+    assert (held.status, held.crd_status) == ("Submitted_to_CRD", "Held")
+
+    history = [row for row in load(session_factory, TradeTicketStatusHistory) if row.old_status == "Submitted_to_CRD"]
+    assert [(row.trade_ticket_id, row.new_status) for row in history] == [
+        (ticket_ids[0], "Booked"), (ticket_ids[1], "Partially_Filled"), (ticket_ids[2], "Filled")
+    ]
+    assert history[1].notes == "CRD: Partially_Filled, 500 filled @ 187.10"
+    assert history[1].changed_by == settings.AUDIT_SYSTEM_USER_ID
+    assert reconciler.stats["history"] == 3
+
+def test_unchanged_tickets_are_not_written_and_closed_tickets_are_not_polled(session_factory):
+    server = FakeCrdServer()
+    ticket_ids = book_tickets(session_factory, server, 3)
+    server.set_status(ticket_ids[0], "Filled", fill_price="187.20", fill_quantity=1000)
+    reconcile(session_factory, server)
+    history_before = len(load(session_factory, TradeTicketStatusHistory))
+    updated_before = [ticket.updated_at for ticket in load(session_factory, TradeTicket)]
+
+    (open_orders, changed), _ = reconcile(session_factory, server)
+
+    assert (open_orders, changed) == (2, 0)  # The filled ticket is no longer open
+    assert server.status_requests[-1] == ticket_ids[1:]
+    assert len(load(session_factory, TradeTicketStatusHistory)) == history_before
+    assert [ticket.updated_at for ticket in load(session_factory, TradeTicket)] == updated_before
+
+def test_ticket_cancelled_locally_during_a_poll_keeps_its_status(session_factory, monkeypatch):
+    server = FakeCrdServer()
+    ticket_ids = book_tickets(session_factory, server, 2)
+    for ticket_id in ticket_ids:
+        server.set_status(ticket_id, "Working")
+    changes, reads = CrdReconciler._changes, []
+
+    def changes_then_cancel(reconciler, db, statuses, now):
+        found = changes(reconciler, db, statuses, now)
+        reads.append(len(found[0]))
+        if len(reads) == 1:  # Cancelled by a user between the read and the UPDATE
+            with session_factory() as other:
+                other.execute(update(TradeTicket).where(TradeTicket.id == ticket_ids[0]).values(status="Cancelled"))
+                other.commit()
+        return found
+
+    monkeypatch.setattr(CrdReconciler, "_changes", changes_then_cancel)
+    (open_orders, changed), _ = reconcile(session_factory, server)
+
+    assert (open_orders, changed, reads) == (2, 1, [2, 1])  # Rolled back and read again
+    assert [ticket.status for ticket in load(session_factory, TradeTicket)] == ["Cancelled", "Working"]
+    history = load(session_factory, TradeTicketStatusHistory, new_status="Working")
+    assert [row.trade_ticket_id for row in history] == [ticket_ids[1]]
+
+def test_status_requests_are_batched_and_failed_batches_skipped(session_factory):
+    server = FakeCrdServer(max_batch_size=3)
+    ticket_ids = book_tickets(session_factory, server, 7)
+    for ticket_id in ticket_ids:
+        server.set_status(ticket_id, "Working")
+    server.fail_next(1)
+
+    (open_orders, changed), reconciler = reconcile(session_factory, server, concurrency=1)
+
+    assert [len(ids) for ids in server.status_requests] == [3, 3, 1]
+    assert (open_orders, changed) == (7, 4)
+    assert reconciler.stats["failed_requests"] == 1
+    assert [ticket.status for ticket in load(session_factory, TradeTicket)] == ["Submitted_to_CRD"] * 3 + ["Working"] * 4
+
+def test_poll_interval_adapts_to_open_orders():
+    options = {"batch_size": 50, "min_seconds": 2.0, "max_seconds": 60.0, "idle_seconds": 300.0,
+               "requests_per_second": 5.0}
+    assert poll_interval(0, **options) == 300.0
+    assert poll_interval(10, **options) == 2.0
+    assert poll_interval(2000, **options) == 8.0  # 40 requests at 5 per second
+    assert poll_interval(100000, **options) == 60.0
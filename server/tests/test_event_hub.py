@@ -0,0 +1,101 @@
+# tests/test_event_hub.py
+"""
+Tests for status event routing and SSE formatting
+"""
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.event_hub import (
+    EventHub, StatusEvent, format_event_id, format_sse, parse_event_id
+)
+
+def event(kind: str, history_id: int, *owners: int) -> StatusEvent:
+    return StatusEvent(kind, history_id, frozenset(owners), {"history_id": history_id, "new_status": "Proposed"})
+
+def make_hub(**options) -> EventHub:
+    hub = EventHub(**options)
+    hub._cursor = {"recommendation": 10, "ticket": 20}  # As if loaded from the database
+    return hub
+
+def drain(subscriber):
+    items = []
+    while not subscriber.queue.empty():
+        items.append(subscriber.queue.get_nowait())
+    return items
+
+def test_event_ids_round_trip_and_reject_garbage():
+    cursor = {"recommendation": 12, "ticket": 7}
+    assert format_event_id(cursor) == "12-7"
+    assert parse_event_id("12-7") == cursor
+    assert parse_event_id(None) is None
+    assert parse_event_id("12") is None
+    assert parse_event_id("12-x") is None
+
+def test_format_sse():
+    text = format_sse("3-4", "ticket.status", {"new_status": "Filled"})
+    assert text == 'id: 3-4\nevent: ticket.status\ndata: {"new_status":"Filled"}\n\n'
+
+def test_events_go_to_stream_watchers_and_owners_only():
+    async def scenario():
+        hub = make_hub()
+        pm = await hub.subscribe(1, ["recommendation"])
+        analyst = await hub.subscribe(2)
+        other = await hub.subscribe(3)
+        second_tab = await hub.subscribe(2)
+
+        hub.publish(event("recommendation", 11, 2))
+        hub.publish(event("ticket", 21, 2, 4))
+        hub.publish(event("recommendation", 12, 5))
+
+        assert [item.history_id for item in drain(pm)] == [11, 12]
+        assert [item.history_id for item in drain(analyst)] == [11, 21]
+        assert [item.history_id for item in drain(second_tab)] == [11, 21]
+        assert drain(other) == []
+
+        hub.unsubscribe(analyst)
+        hub.publish(event("recommendation", 13, 2))
+        assert [item.history_id for item in drain(second_tab)] == [13]
+        assert hub.subscriber_count == 3
+
+    asyncio.run(scenario())
+
+def test_slow_client_gets_resync_instead_of_unbounded_backlog():
+    async def scenario():
+        hub = make_hub(queue_size=3)
+        subscriber = await hub.subscribe(1, ["recommendation"])
+        for history_id in range(11, 16):
+            hub.publish(event("recommendation", history_id))
+
+        items = drain(subscriber)
+        assert [getattr(item, "history_id", "resync") for item in items] == ["resync", 15]
+        assert subscriber.dropped == 4
+
+    asyncio.run(scenario())
+
+def test_stream_sends_events_with_cursor_ids_and_unsubscribes_on_close():
+    async def scenario():
+        hub = make_hub(keepalive_seconds=0.05)
+        chunks = hub.stream(2)
+        assert (await chunks.__anext__()).startswith("retry: ")
+        assert hub.subscriber_count == 1
+
+        assert await chunks.__anext__() == ": keepalive\n\n"
+        hub.publish(event("ticket", 25, 2))
+        text = await chunks.__anext__()
+        lines = text.splitlines()
+        assert lines[0] == "id: 10-25"
+        assert lines[1] == "event: ticket.status"
+        assert json.loads(lines[2][len("data: "):])["history_id"] == 25
+
+        await chunks.aclose()
+        assert hub.subscriber_count == 0
+        assert hub.cursor() == {"recommendation": 0, "ticket": 0}  # Reloaded by the next subscriber
+
+    asyncio.run(scenario())
@@ -0,0 +1,58 @@
+# tests/test_export_service.py
+"""
+Tests for recommendation export serialization
+"""
+
+import sys
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.export_service import EXPORT_COLUMNS, ExportService
+
+def row(recommendation_id, **overrides):
+    values = {column: None for column in EXPORT_COLUMNS}
+    values.update(
+        id=recommendation_id,
+        ticker="AAPL",
+        target_price=Decimal("150.2500"),
+        expected_exit_date=date(2025, 6, 30),
+        is_draft=True,
+        strategies=["Valuation", "Macro"],
+        funds=["OPM"],
+        created_at=datetime(2025, 1, 2, 3, 4, 5),
+    )
+    values.update(overrides)
+    return values
+
+def test_ndjson_writes_one_object_per_row():
+    chunks = list(ExportService.ndjson_chunks(iter([[row(2), row(1)], [row(0, notes="a\nb")]])))
+
+    assert len(chunks) == 2
+    lines = "".join(chunks).splitlines()
+    assert len(lines) == 3
+    first = json.loads(lines[0])
+    assert list(first) == EXPORT_COLUMNS
+    assert first["target_price"] == "150.2500"
+    assert first["created_at"] == "2025-01-02T03:04:05"
+    assert first["strategies"] == ["Valuation", "Macro"]
+    assert json.loads(lines[2])["notes"] == "a\nb"
+
+def test_csv_writes_header_then_one_chunk_per_batch():
+    chunks = list(ExportService.csv_chunks(iter([[row(2)], [row(1, notes='say "hi", twice')]])))
+
+    assert len(chunks) == 3
+    records = list(csv.DictReader("".join(chunks).splitlines(keepends=True)))
+    assert [record["id"] for record in records] == ["2", "1"]
+    assert records[0]["strategies"] == "Valuation;Macro"
+    assert records[0]["expected_exit_date"] == "2025-06-30"
+    assert records[1]["notes"] == 'say "hi", twice'
+
+def test_empty_export_still_has_csv_header():
+    assert list(ExportService.csv_chunks(iter([]))) == [",".join(EXPORT_COLUMNS) + "\r\n"]
@@ -0,0 +1,109 @@
+# tests/test_health.py
+"""
+Tests for the cached, rate-limited health checks
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app import main
+from app.core import health
+from app.core.health import CachedCheck
+
+class FakeTime:
+    """Stands in for the time module inside app.core.health"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+class CountingCheck:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+def test_result_is_cached_for_the_interval(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(health, "time", clock)
+    check = CountingCheck((True, None))
+    cached = CachedCheck("database", check, interval_seconds=10)
+
+    assert cached.result is None and cached.is_stale()
+    first = cached.get()
+    clock.now += 9.9
+    assert cached.get() is first and check.calls == 1
+
+    clock.now += 0.1
+    assert cached.is_stale()
+    assert cached.get() is not first and check.calls == 2
+
+def test_failures_are_cached_like_successes(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(health, "time", clock)
+    check = CountingCheck(RuntimeError("connection refused"), (True, None))
+    cached = CachedCheck("database", check, interval_seconds=10)
+
+    failed = cached.get()
+    assert (failed.ok, failed.detail) == (False, "connection refused")
+    # A failing database is not hammered with a check per request
+    assert all(cached.get() is failed for _ in range(5)) and check.calls == 1
+
+    clock.now += 10
+    assert cached.get().ok and check.calls == 2
+
+def test_concurrent_callers_get_the_previous_result_while_one_refreshes(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(health, "time", clock)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_check():
+        calls.append(True)
+        if len(calls) == 2:
+            started.set()
+            release.wait(5)
+        return True, f"run {len(calls)}"
+
+    cached = CachedCheck("database", slow_check, interval_seconds=10)
+    previous = cached.get()
+    clock.now += 10
+    refresher = threading.Thread(target=cached.get)
+    refresher.start()
+    assert started.wait(5)
+
+    # The check is stale and running in another thread: no second run, no waiting
+    assert cached.get() is previous and len(calls) == 2
+    release.set()
+    refresher.join(5)
+    assert cached.get().detail == "run 2"
+
+def test_readiness_probe_answers_503_while_the_database_is_down(monkeypatch):
+    down = CachedCheck("database", lambda: (False, "Database connection failed"), interval_seconds=10)
+    monkeypatch.setattr(main, "readiness_check", down)
+
+    response = TestClient(main.app).get("/health/ready")
+
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "not_ready"
+    assert (body["database"]["ok"], body["database"]["detail"]) == (False, "Database connection failed")
+    assert TestClient(main.app).get("/health/live").status_code == 200
@@ -0,0 +1,66 @@
+# tests/test_http_cache.py
+"""
+Tests for conditional GET helpers (weak ETags, Last-Modified)
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.http_cache import conditional_response, http_date, not_modified_since, weak_etag
+
+LAST_MODIFIED = datetime(2025, 3, 14, 15, 9, 26, 535000)
+
+def test_weak_etag_is_stable_and_sensitive_to_every_validator():
+    assert weak_etag("drafts", 3, LAST_MODIFIED).startswith('W/"')
+    assert weak_etag("drafts", 3, LAST_MODIFIED) == weak_etag("drafts", 3, LAST_MODIFIED)
+    assert weak_etag("drafts", 3, LAST_MODIFIED) != weak_etag("drafts", 4, LAST_MODIFIED)
+
+def test_http_date_treats_naive_timestamps_as_utc():
+    assert http_date(LAST_MODIFIED) == "Fri, 14 Mar 2025 15:09:26 GMT"
+    assert http_date(LAST_MODIFIED.replace(tzinfo=timezone.utc)) == "Fri, 14 Mar 2025 15:09:26 GMT"
+
+def test_not_modified_since_uses_whole_seconds():
+    assert not_modified_since("Fri, 14 Mar 2025 15:09:26 GMT", LAST_MODIFIED)
+    assert not not_modified_since("Fri, 14 Mar 2025 15:09:25 GMT", LAST_MODIFIED)
+    assert not not_modified_since("not a date", LAST_MODIFIED)
+    assert not not_modified_since(None, LAST_MODIFIED)
+
+def make_client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/item")
+    def item(request: Request, response: Response):
+        not_modified = conditional_response(request, response, weak_etag("item", 1), LAST_MODIFIED)
+        if not_modified:
+            return not_modified
+        return {"id": 1}
+
+    return TestClient(app)
+
+def test_conditional_response_headers_and_304s():
+    client = make_client()
+
+    response = client.get("/item")
+    assert response.status_code == 200
+    assert response.headers["last-modified"] == "Fri, 14 Mar 2025 15:09:26 GMT"
+    etag = response.headers["etag"]
+
+    assert client.get("/item", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/item", headers={"If-Modified-Since": response.headers["last-modified"]}).status_code == 304
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    client = make_client()
+
+    response = client.get("/item", headers={
+        "If-None-Match": 'W/"something-else"',
+        "If-Modified-Since": "Fri, 14 Mar 2025 15:09:26 GMT",
+    })
+    assert response.status_code == 200
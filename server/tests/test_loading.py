@@ -0,0 +1,89 @@
+# tests/test_loading.py
+"""
+Tests for eager-load plans derived from response schemas
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.models import RecommendationStrategy, Strategy, TradeRecommendation
+from app.schemas.recommendations import RecommendationFilters, RecommendationResponse
+from app.services.loading import load_options_for
+from app.services.recommendation_service import RecommendationService
+
+def describe(options) -> dict:
+    """{relationship path: loader} plus {relationship path: loaded columns} for loader options"""
+    loaders, columns = {}, {}
+    for option in options:
+        for load in option.context:
+            # Paths alternate mapper, property, mapper, ...; the last key may be a wildcard token
+            keys = [getattr(element, "key", element) for element in load.path.path[1::2]]
+            strategy = dict(load.strategy)
+            if "lazy" in strategy:
+                loaders[".".join(keys)] = strategy["lazy"]
+            elif strategy["deferred"] is False:
+                columns.setdefault(".".join(keys[:-1]), set()).add(keys[-1])
+            else:
+                assert keys[-1] == "column:*"  # load_only defers everything it does not name
+    return loaders, columns
+
+def test_recommendation_response_plan_joins_to_one_and_selects_collections():
+    loaders, columns = describe(load_options_for(TradeRecommendation, RecommendationResponse))
+
+    assert loaders == {"security": "joined", "strategies": "selectin", "strategies.strategy": "joined"}
+    assert columns[""] == {
+        "id", "analyst_id", "security_id", "trade_direction", "current_price", "target_price", "time_horizon",
+        "expected_exit_date", "analyst_score", "notes", "status", "is_draft", "version", "created_at", "updated_at"
+    }
+    assert "approval_notes" not in columns[""]  # Not serialized, so not selected
+    assert columns["security"] == {"id", "ticker", "name", "source_type", "is_active"}
+    # Junction rows only carry the keys of both sides; the strategy row carries the data
+    assert columns["strategies"] == {"id", "recommendation_id", "strategy_id"}
+    assert columns["strategies.strategy"] == {"id", "name", "description", "is_active", "is_system_default"}
+
+def test_plans_are_computed_once_per_model_and_schema():
+    assert load_options_for(TradeRecommendation, RecommendationResponse) is load_options_for(
+        TradeRecommendation, RecommendationResponse
+    )
+
+@pytest.fixture
+def session_factory(engine):
+    created = datetime(2026, 1, 5)
+    with engine.begin() as conn:
+        conn.execute(insert(Strategy), [{"id": 1, "name": "Long/Short"}, {"id": 2, "name": "Event"}])
+        conn.execute(insert(TradeRecommendation), [
+            {"id": recommendation_id, "analyst_id": 1 + recommendation_id % 2, "security_id": 1,
+             "trade_direction": "Buy", "target_price": 190, "time_horizon": "Trade", "analyst_score": 8,
+             "status": "Draft", "is_draft": True, "created_at": created + timedelta(minutes=recommendation_id)}
+            for recommendation_id in range(1, 121)
+        ])
+        conn.execute(insert(RecommendationStrategy), [
+            {"recommendation_id": recommendation_id, "strategy_id": strategy_id}
+            for recommendation_id in range(1, 121) for strategy_id in (1, 2)
+        ])
+    return sessionmaker(bind=engine)
+
+@pytest.mark.parametrize("limit", [10, 100])
+def test_listing_a_page_takes_the_same_statements_whatever_its_size(session_factory, limit):
+    statements = []
+    with session_factory() as db:
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+        page, cursor = RecommendationService.list_recommendations(db, RecommendationFilters(), limit=limit)
+        responses = [RecommendationResponse.model_validate(recommendation) for recommendation in page]
+
+    assert len(responses) == limit and cursor is not None
+    assert all([strategy.name for strategy in response.strategies] == ["Long/Short", "Event"] for response in responses)
+    assert responses[0].security.ticker == "AAPL"
+    # The page (security joined in) and one IN query for the strategies; serializing loads nothing lazily
+    assert len(statements) == 2
+    assert "JOIN securities" in statements[0]
+    assert "recommendation_strategies" in statements[1] and "JOIN strategies" in statements[1]
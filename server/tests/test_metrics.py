@@ -0,0 +1,69 @@
+# tests/test_metrics.py
+"""
+Tests for request latency, connection pool and cache metrics
+"""
+
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.metrics import instrument_engine, instrumented_pool, record_cache
+from app.middleware.metrics import RequestMetricsMiddleware
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def test_request_latency_is_labelled_by_route_template():
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/test-metrics/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/test-metrics/items/1")
+    client.get("/test-metrics/items/2")
+    client.get("/test-metrics/missing")
+
+    assert sample(
+        "http_request_duration_seconds_count",
+        method="GET", route="/test-metrics/items/{item_id}", status="200"
+    ) == 2
+    assert sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
+
+def test_pool_checkouts_occupancy_and_overflow():
+    engine = create_engine(
+        "sqlite://", poolclass=instrumented_pool(QueuePool, "test"), pool_size=1, max_overflow=2
+    )
+    instrument_engine(engine, "test")
+
+    first = engine.connect()
+    second = engine.connect()
+    first.execute(text("SELECT 1"))
+    assert sample("db_pool_checked_out", engine="test") == 2
+    assert sample("db_pool_overflow", engine="test") == 1
+
+    first.close()
+    second.close()
+    assert sample("db_pool_checked_out", engine="test") == 0
+    assert sample("db_pool_overflow", engine="test") == 0
+    assert sample("db_pool_checkouts_total", engine="test") == 2
+    assert sample("db_pool_checkout_wait_seconds_count", engine="test") == 2
+
+def test_cache_hits_and_misses_are_counted():
+    before = sample("cache_requests_total", cache="test", result="hit")
+    record_cache("test", hit=True)
+    record_cache("test", hit=False)
+
+    assert sample("cache_requests_total", cache="test", result="hit") == before + 1
+    assert sample("cache_requests_total", cache="test", result="miss") >= 1
@@ -0,0 +1,33 @@
+# tests/test_pagination.py
+"""
+Tests for keyset cursor encoding used by the recommendations list endpoint
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.pagination import encode_cursor, decode_cursor
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 14, 9, 26, 53)
+    cursor = encode_cursor(created_at, 42)
+    
+    assert decode_cursor(cursor) == (created_at, 42)
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime(2025, 1, 1, 12, 0, 0, 123456), 10 ** 9)
+    
+    assert "=" not in cursor
+    assert "+" not in cursor and "/" not in cursor
+
+@pytest.mark.parametrize("cursor", ["", "zzz", "bm90LWpzb24", "eyJjIjoxfQ"])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,83 @@
+# tests/test_permission_service.py
+"""
+Tests for permission bitset resolution and cache expiry
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.permission_service import PermissionResolver, fold_permissions
+
+NOW = datetime(2025, 1, 15, 12, 0, 0)
+
+def role(permission_id, is_granted=True):
+    return (permission_id, is_granted, None, False)
+
+def override(permission_id, is_granted, expires_at=None):
+    return (permission_id, is_granted, expires_at, True)
+
+def test_role_grants_set_bits():
+    bits, refresh_at = fold_permissions([role(1), role(4), role(5, is_granted=False)], NOW)
+
+    assert bits == 0b10010
+    assert refresh_at is None
+
+def test_overrides_grant_and_revoke_regardless_of_order():
+    rows = [override(4, False), role(1), role(4), override(7, True)]
+    bits, _ = fold_permissions(rows, NOW)
+
+    assert bits == (1 << 1) | (1 << 7)
+
+def test_expired_overrides_are_ignored_and_earliest_expiry_is_kept():
+    rows = [
+        role(2),
+        override(2, False, expires_at=NOW - timedelta(minutes=1)),
+        override(3, True, expires_at=NOW + timedelta(hours=2)),
+        override(9, True, expires_at=NOW + timedelta(hours=1)),
+    ]
+    bits, refresh_at = fold_permissions(rows, NOW)
+
+    assert bits == (1 << 2) | (1 << 3) | (1 << 9)
+    assert refresh_at == NOW + timedelta(hours=1)
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def cached_resolver(clock, entries):
+    resolver = PermissionResolver(clock=clock)
+    for user_id, rows in entries.items():
+        resolver._store(user_id, rows, clock(), resolver._generation)
+    return resolver
+
+def test_entry_is_refreshed_at_next_expiry():
+    clock = FakeClock(NOW)
+    resolver = cached_resolver(clock, {1: [override(3, True, expires_at=NOW + timedelta(hours=1))]})
+
+    assert resolver._current(1).has(3)
+    clock.now = NOW + timedelta(hours=1)
+    assert resolver._current(1) is None
+
+def test_invalidate_user_keeps_other_users():
+    resolver = cached_resolver(FakeClock(NOW), {1: [role(1)], 2: [role(2)]})
+    resolver.invalidate_user(1)
+
+    assert resolver._current(1) is None
+    assert resolver._current(2).permission_ids() == [2]
+
+def test_load_straddling_invalidation_is_not_kept():
+    resolver = PermissionResolver(clock=FakeClock(NOW))
+    generation = resolver._generation
+    resolver.invalidate_user(2)
+    entry = resolver._store(1, [role(1)], NOW, generation)
+
+    assert entry.has(1)
+    assert resolver._current(1) is None
@@ -0,0 +1,175 @@
+# tests/test_price_service.py
+"""
+Tests for the price cache: coalescing, batching, TTL, stale fallback, and
+the Bloomberg client's payload handling
+"""
+
+import sys
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.integrations.bloomberg import (
+    BloombergClient, BloombergResponseError, BloombergUnavailableError, MockPriceProvider, PriceProviderError
+)
+from app.api.v1 import prices as prices_api
+from app.core.config import settings
+from app.services.price_service import PriceService, build_price_provider
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def make_service(provider=None, **options):
+    clock = FakeClock()
+    service = PriceService(provider or MockPriceProvider(), clock=clock, **options)
+    return service, clock
+
+def test_concurrent_requests_for_one_ticker_make_one_upstream_call():
+    async def scenario():
+        provider = MockPriceProvider(latency_seconds=0.02)
+        service, _ = make_service(provider)
+        results = await asyncio.gather(*(service.get_price("aapl") for _ in range(50)))
+        assert provider.calls == [["AAPL"]]
+        assert {entry.quote.price for entry in results} == {MockPriceProvider.default_price("AAPL")}
+
+    asyncio.run(scenario())
+
+def test_misses_within_the_window_share_a_batch_split_at_provider_limit():
+    async def scenario():
+        provider = MockPriceProvider(max_batch_size=3)
+        service, _ = make_service(provider, batch_window_seconds=0.05)
+        tickers = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+        await asyncio.gather(service.get_prices(tickers[:2]), service.get_price("CCC"), service.get_prices(tickers[3:]))
+        assert provider.calls == [["AAA", "BBB", "CCC"], ["DDD", "EEE"]]
+
+    asyncio.run(scenario())
+
+def test_cached_until_ttl_then_fetched_again():
+    async def scenario():
+        provider = MockPriceProvider()
+        service, clock = make_service(provider, ttl_seconds=30)
+        await service.get_price("AAPL")
+        clock.now += 29
+        await service.get_price("AAPL")
+        assert len(provider.calls) == 1
+
+        provider.set_price("AAPL", "101.5")
+        clock.now += 2
+        entry = await service.get_price("AAPL")
+        assert len(provider.calls) == 2
+        assert entry.quote.price == Decimal("101.5")
+
+    asyncio.run(scenario())
+
+def test_provider_failure_serves_last_price_as_stale_or_raises_without_one():
+    async def scenario():
+        provider = MockPriceProvider()
+        service, clock = make_service(provider, ttl_seconds=30)
+        await service.get_price("AAPL")
+        clock.now += 60
+        provider.fail_next(2)
+
+        entry = await service.get_price("AAPL")
+        assert entry is not None and not service.is_fresh(entry)
+        assert service.age_seconds(entry) == 60
+        with pytest.raises(PriceProviderError):
+            await service.get_price("MSFT")
+
+    asyncio.run(scenario())
+
+def test_unknown_tickers_are_left_out():
+    async def scenario():
+        service, _ = make_service(MockPriceProvider(unknown=["NOPE"]))
+        prices = await service.get_prices(["AAPL", "nope", " "])
+        assert list(prices) == ["AAPL"]
+
+    asyncio.run(scenario())
+
+def test_refresh_updates_tickers_in_use_in_one_batch_and_drops_idle_ones():
+    async def scenario():
+        provider = MockPriceProvider()
+        service, clock = make_service(provider, idle_seconds=600)
+        await service.get_prices(["AAPL", "MSFT"])
+        clock.now += 500
+        await service.get_price("MSFT")  # Past the TTL: fetched again, and marked in use
+        clock.now += 200
+        provider.calls.clear()
+
+        await service.refresh()
+        assert provider.calls == [["MSFT"]]
+        assert service.cached_tickers() == ["MSFT"]
+
+    asyncio.run(scenario())
+
+def bloomberg(handler) -> BloombergClient:
+    return BloombergClient("https://bbg.test/api/", "secret", transport=httpx.MockTransport(handler))
+
+def test_bloomberg_client_parses_prices_and_sends_credentials():
+    seen = {}
+
+    def handler(request: httpx.Request):
+        seen["url"] = str(request.url)
+        seen["auth"] = request.headers["authorization"]
+        return httpx.Response(200, json={"prices": [
+            {"ticker": "aapl", "price": "187.4400", "currency": "USD", "as_of": "2025-03-14T15:09:26Z"},
+        ]})
+
+    async def scenario():
+        client = bloomberg(handler)
+        quotes = await client.get_prices(["AAPL", "ZZZZ"])
+        await client.close()
+        return quotes
+
+    quotes = asyncio.run(scenario())
+    assert seen["url"] == "https://bbg.test/api/prices?tickers=AAPL%2CZZZZ"
+    assert seen["auth"] == "Bearer secret"
+    assert list(quotes) == ["AAPL"]
+    assert quotes["AAPL"].price == Decimal("187.4400")
+    assert quotes["AAPL"].as_of.isoformat() == "2025-03-14T15:09:26+00:00"
+
+@pytest.mark.parametrize("response, error", [
+    (httpx.Response(503), BloombergUnavailableError),
+    (httpx.Response(401, text="bad key"), BloombergResponseError),
+    (httpx.Response(200, json={"unexpected": []}), BloombergResponseError),
+])
+def test_bloomberg_client_errors_are_price_provider_errors(response, error):
+    async def scenario():
+        client = bloomberg(lambda request: response)
+        try:
+            await client.get_prices(["AAPL"])
+        finally:
+            await client.close()
+
+    with pytest.raises(error):
+        asyncio.run(scenario())
+
+def test_mock_prices_are_only_served_when_opted_in(monkeypatch):
+    monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+    monkeypatch.setattr(settings, "BLOOMBERG_ENABLED", False)
+
+    monkeypatch.setattr(settings, "PRICE_USE_MOCK", False)
+    assert build_price_provider() is None  # The endpoints answer 503
+
+    monkeypatch.setattr(settings, "PRICE_USE_MOCK", True)
+    assert build_price_provider().name == "mock"
+
+def test_price_response_names_its_source(monkeypatch):
+    service, _ = make_service()
+    monkeypatch.setattr(prices_api, "price_service", service)
+
+    async def scenario():
+        entry = (await service.get_prices(["AAPL"]))["AAPL"]
+        return prices_api.price_response(entry)
+
+    assert asyncio.run(scenario()).source == "mock"
@@ -0,0 +1,137 @@
+# tests/test_recommendation_bulk.py
+"""
+Tests for creating recommendations in bulk (POST /recommendations/bulk)
+"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.api.deps import get_audited_db
+from app.api.v1 import recommendations
+from app.models import Fund, RecommendationFund, RecommendationStrategy, Security, Strategy, TradeRecommendation
+from app.schemas.recommendations import RecommendationCreate
+from app.services.recommendation_service import RecommendationService
+
+@pytest.fixture
+def session_factory(engine):
+    with engine.begin() as conn:
+        # Every row names is_active: an executemany takes its columns from the first row
+        conn.execute(insert(Security), [
+            {"id": 2, "ticker": "MSFT", "name": "Microsoft", "source_type": "IVP", "is_active": True},
+            {"id": 3, "ticker": "OLD", "name": "Delisted", "source_type": "IVP", "is_active": False},
+        ])
+        conn.execute(insert(Strategy), [
+            {"id": 1, "name": "Long/Short", "is_active": True}, {"id": 2, "name": "Event", "is_active": True},
+            {"id": 3, "name": "Retired", "is_active": False}
+        ])
+        conn.execute(insert(Fund), [
+            {"id": 1, "code": "OMF", "name": "Main Fund", "is_active": True},
+            {"id": 2, "code": "OLD", "name": "Closed", "is_active": False}
+        ])
+        # Existing rows, so new ids do not start at 1
+        conn.execute(insert(TradeRecommendation), [
+            {"id": 40, "analyst_id": 1, "security_id": 1, "trade_direction": "Buy", "target_price": 100,
+             "time_horizon": "Trade", "analyst_score": 5, "status": "Draft", "is_draft": True}
+        ])
+    return sessionmaker(bind=engine)
+
+def item(security_id: int, target_price: str, strategy_ids=(), fund_ids=()) -> dict:
+    return {"security_id": security_id, "trade_direction": "Buy", "target_price": target_price,
+            "time_horizon": "Trade", "analyst_score": 7, "strategy_ids": list(strategy_ids), "fund_ids": list(fund_ids)}
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(recommendations.router, prefix="/recommendations")
+
+    def db():
+        with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_audited_db] = db
+    return TestClient(app)
+
+def test_bulk_endpoint_creates_every_item_and_maps_ids_back_to_rows(client, session_factory):
+    response = client.post("/recommendations/bulk", json={"recommendations": [
+        item(2, "310", strategy_ids=[1, 2, 1], fund_ids=[1, 1]), item(1, "195"), item(2, "320", strategy_ids=[2])
+    ]})
+
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["created"], body["failed"]) == (3, 0)
+    assert [(result["index"], result["status"]) for result in body["results"]] == [
+        (0, "created"), (1, "created"), (2, "created")
+    ]
+    ids = [result["id"] for result in body["results"]]
+    assert ids == [41, 42, 43]
+
+    with session_factory() as db:
+        rows = db.execute(select(TradeRecommendation.id, TradeRecommendation.security_id, TradeRecommendation.target_price,
+                                 TradeRecommendation.status, TradeRecommendation.analyst_id)
+                          .where(TradeRecommendation.id.in_(ids))).all()
+        assert {row.id: (row.security_id, row.target_price, row.status, row.analyst_id) for row in rows} == {
+            41: (2, Decimal("310.0000"), "Draft", 1), 42: (1, Decimal("195.0000"), "Draft", 1),
+            43: (2, Decimal("320.0000"), "Draft", 1)
+        }
+        # Duplicate strategy and fund ids in one item are linked once
+        strategies = db.execute(select(RecommendationStrategy.recommendation_id, RecommendationStrategy.strategy_id)
+                                .order_by(RecommendationStrategy.id)).all()
+        assert [tuple(row) for row in strategies] == [(41, 1), (41, 2), (43, 2)]
+        funds = db.execute(select(RecommendationFund.recommendation_id, RecommendationFund.fund_id)).all()
+        assert [tuple(row) for row in funds] == [(41, 1)]
+
+def test_bulk_endpoint_reports_invalid_items_and_creates_the_rest(client, session_factory):
+    response = client.post("/recommendations/bulk", json={"recommendations": [
+        item(3, "10"), item(1, "200", strategy_ids=[1]), item(9, "10", strategy_ids=[3, 8], fund_ids=[2]),
+        item(2, "330", fund_ids=[1])
+    ]})
+
+    assert response.status_code == 207
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 2)
+    assert [(result["status"], result["id"]) for result in body["results"]] == [
+        ("invalid", None), ("created", 41), ("invalid", None), ("created", 42)
+    ]
+    assert body["results"][0]["errors"] == ["Security with ID 3 not found"]
+    assert body["results"][2]["errors"] == [
+        "Security with ID 9 not found", "Invalid strategy IDs: [3, 8]", "Invalid fund IDs: [2]"
+    ]
+
+    with session_factory() as db:
+        created = db.execute(select(TradeRecommendation.id, TradeRecommendation.security_id)
+                             .where(TradeRecommendation.id > 40).order_by(TradeRecommendation.id)).all()
+        assert [tuple(row) for row in created] == [(41, 1), (42, 2)]
+
+def test_atomic_bulk_create_skips_valid_items_when_any_is_invalid(client, session_factory):
+    response = client.post("/recommendations/bulk", json={"atomic": True, "recommendations": [
+        item(1, "200", strategy_ids=[1]), item(1, "210", strategy_ids=[3])
+    ]})
+
+    assert response.status_code == 207
+    body = response.json()
+    assert (body["created"], body["failed"]) == (0, 1)
+    assert [result["status"] for result in body["results"]] == ["skipped", "invalid"]
+    with session_factory() as db:
+        assert db.scalars(select(TradeRecommendation.id)).all() == [40]
+        assert db.scalars(select(RecommendationStrategy.id)).all() == []
+
+def test_bulk_create_validates_against_the_rows_active_now(session_factory):
+    items = [RecommendationCreate(**item(1, "200", strategy_ids=[1, 2], fund_ids=[1]))]
+    with session_factory() as db:
+        db.execute(update(Strategy).where(Strategy.id == 2).values(is_active=False))
+        db.commit()
+        result = RecommendationService.bulk_create_recommendations(db, items, analyst_id=1)
+
+    # A strategy deactivated a moment ago is refused, whatever a cache may still hold
+    assert result.results[0].errors == ["Invalid strategy IDs: [2]"]
@@ -0,0 +1,188 @@
+# tests/test_recommendation_updates.py
+"""
+Tests for optimistic concurrency control on recommendation updates
+"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings
+from app.models import RecommendationStrategy, Strategy, TradeRecommendation
+from app.schemas.recommendations import RecommendationUpdate
+from app.services import audit_service
+from app.services.recommendation_service import UPDATE_ATTEMPTS, RecommendationService
+
+@pytest.fixture
+def session_factory(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(Strategy), [{"id": 1, "name": "Long/Short"}])
+        conn.execute(insert(TradeRecommendation), [
+            {"id": recommendation_id, "analyst_id": 1, "security_id": 1, "trade_direction": "Buy",
+             "target_price": Decimal("190"), "time_horizon": "Trade", "analyst_score": 8, "status": status,
+             "is_draft": status == "Draft"}
+            for recommendation_id, status in ((1, "Draft"), (2, "Proposed"))
+        ])
+        conn.execute(insert(RecommendationStrategy), [{"recommendation_id": 1, "strategy_id": 1}])
+    return sessionmaker(bind=engine)
+
+def test_update_checks_the_version_and_returns_the_new_representation(session_factory):
+    with session_factory() as db:
+        updated = RecommendationService.update_recommendation(
+            db, 1, RecommendationUpdate(target_price=Decimal("200"), notes="Raised", version=1), analyst_id=1
+        )
+
+    assert (updated.version, updated.target_price, updated.notes) == (2, Decimal("200.0000"), "Raised")
+    assert updated.security.ticker == "AAPL"
+    assert [strategy.name for strategy in updated.strategies] == ["Long/Short"]
+
+    # A second editor still holding version 1 loses instead of overwriting
+    with session_factory() as db:
+        with pytest.raises(HTTPException) as conflict:
+            RecommendationService.update_recommendation(
+                db, 1, RecommendationUpdate(notes="Stale", version=1), analyst_id=1
+            )
+    assert conflict.value.status_code == 409
+
+    with session_factory() as db:
+        row = db.execute(select(TradeRecommendation.notes, TradeRecommendation.version)).first()
+        assert tuple(row) == ("Raised", 2)
+
+@pytest.mark.parametrize("recommendation_id, analyst_id, status_code", [(99, 1, 404), (2, 1, 400), (1, 2, 403)])
+def test_update_reports_why_nothing_was_written(session_factory, recommendation_id, analyst_id, status_code):
+    with session_factory() as db:
+        with pytest.raises(HTTPException) as error:
+            RecommendationService.update_recommendation(
+                db, recommendation_id, RecommendationUpdate(notes="x", version=1), analyst_id=analyst_id
+            )
+    assert error.value.status_code == status_code
+
+class StatementCounter:
+    def __init__(self, session):
+        self.engine = session.get_bind()
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self)
+
+    def __call__(self, *args):
+        self.count += 1
+
+@pytest.fixture
+def audited(monkeypatch):
+    """Audit on (the default configuration); returns the audit rows submitted"""
+    monkeypatch.setattr(settings, "AUDIT_ENABLED", True)
+    submitted = []
+    monkeypatch.setattr(audit_service.audit_writer, "submit", submitted.extend)
+    return submitted
+
+def audit_rows(submitted):
+    return [(row["record_id"], row["field_name"], row["old_value"], row["new_value"]) for row in submitted]
+
+@pytest.mark.parametrize("audit", [False, True])
+def test_update_takes_two_statements_with_or_without_auditing(session_factory, monkeypatch, audit):
+    monkeypatch.setattr(settings, "AUDIT_ENABLED", audit)
+    monkeypatch.setattr(audit_service.audit_writer, "submit", lambda rows: None)
+
+    with session_factory() as db, StatementCounter(db) as statements:
+        updated = RecommendationService.update_recommendation(
+            db, 1, RecommendationUpdate(notes="Counted", version=1), analyst_id=1
+        )
+
+    assert statements.count == 2
+    assert (updated.version, updated.security.ticker, [s.name for s in updated.strategies]) == (2, "AAPL", ["Long/Short"])
+
+def test_update_audits_the_fields_it_changed(session_factory, audited):
+    with session_factory() as db:
+        RecommendationService.update_recommendation(
+            db, 1, RecommendationUpdate(target_price=Decimal("190"), analyst_score=9), analyst_id=1
+        )
+        # ORM flushes bump the version as well (not audited)
+        recommendation = db.get(TradeRecommendation, 1)
+        recommendation.notes = "Through the ORM"
+        db.commit()
+        assert recommendation.version == 3
+
+    assert audit_rows(audited) == [(1, "analyst_score", "8", "9"), (1, "notes", None, "Through the ORM")]
+
+def test_audited_update_with_a_stale_version_is_refused(session_factory, audited):
+    with session_factory() as db:
+        RecommendationService.update_recommendation(db, 1, RecommendationUpdate(notes="First", version=1), analyst_id=1)
+        with pytest.raises(HTTPException) as conflict:
+            RecommendationService.update_recommendation(db, 1, RecommendationUpdate(notes="Stale", version=1), analyst_id=1)
+
+    assert conflict.value.status_code == 409
+    assert audit_rows(audited) == [(1, "notes", None, "First")]
+
+def test_audited_update_without_version_retries_a_race_instead_of_refusing(session_factory, audited, monkeypatch):
+    snapshot = RecommendationService._update_snapshot
+    raced = []
+
+    def snapshot_then_concurrent_save(db, recommendation_id, fields=()):
+        result = snapshot(db, recommendation_id, fields)
+        if not raced:  # Another editor saves between the read of old values and the UPDATE
+            raced.append(True)
+            with session_factory() as other:
+                other.execute(update(TradeRecommendation).where(TradeRecommendation.id == 1)
+                              .values(notes="Theirs", version=TradeRecommendation.version + 1))
+                other.commit()
+        return result
+
+    monkeypatch.setattr(RecommendationService, "_update_snapshot", staticmethod(snapshot_then_concurrent_save))
+    with session_factory() as db:
+        updated = RecommendationService.update_recommendation(db, 1, RecommendationUpdate(notes="Mine"), analyst_id=1)
+
+    assert (updated.notes, updated.version) == ("Mine", 3)
+    # The old value is the one actually replaced, read again after the race
+    assert audit_rows(audited) == [(1, "notes", "Theirs", "Mine")]
+
+@pytest.mark.parametrize("last_change, status_code", [
+    ([delete(RecommendationStrategy).where(RecommendationStrategy.recommendation_id == 1),
+      delete(TradeRecommendation).where(TradeRecommendation.id == 1)], 404),
+    ([update(TradeRecommendation).where(TradeRecommendation.id == 1).values(status="Proposed", is_draft=False)], 400),
+])
+def test_audited_update_that_loses_every_race_explains_why(session_factory, audited, monkeypatch, last_change,
+                                                          status_code):
+    snapshot = RecommendationService._update_snapshot
+    reads = []
+
+    def snapshot_then_concurrent_change(db, recommendation_id, fields=()):
+        result = snapshot(db, recommendation_id, fields)
+        if fields:  # Old values read before an UPDATE; another editor gets in every time
+            reads.append(True)
+            changes = [update(TradeRecommendation).where(TradeRecommendation.id == 1)
+                       .values(version=TradeRecommendation.version + 1)]
+            # Through db itself: SQLite keeps the lock of the UPDATE that matched nothing, so no
+            # other connection could commit here, and what the next UPDATE sees is the same
+            for change in changes if len(reads) < UPDATE_ATTEMPTS else last_change:
+                db.execute(change)
+        return result
+
+    monkeypatch.setattr(RecommendationService, "_update_snapshot", staticmethod(snapshot_then_concurrent_change))
+    with session_factory() as db:
+        with pytest.raises(HTTPException) as refused:
+            RecommendationService.update_recommendation(db, 1, RecommendationUpdate(notes="Mine"), analyst_id=1)
+
+    assert refused.value.status_code == status_code
+    assert len(reads) == UPDATE_ATTEMPTS and audit_rows(audited) == []
+
+def test_update_without_version_is_unconditional(session_factory, audited):
+    with session_factory() as db:
+        RecommendationService.update_recommendation(db, 1, RecommendationUpdate(notes="One", version=1), analyst_id=1)
+        updated = RecommendationService.update_recommendation(db, 1, RecommendationUpdate(notes="Two"), analyst_id=1)
+
+    assert (updated.notes, updated.version) == ("Two", 3)
+    assert audit_rows(audited) == [(1, "notes", None, "One"), (1, "notes", "One", "Two")]
@@ -0,0 +1,82 @@
+# tests/test_recommendation_validators.py
+"""
+Tests for the conditional GET validators of recommendation responses
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import insert, update
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.api.v1.recommendations import row_validators
+from app.models import RecommendationStrategy, Security, Strategy, TradeRecommendation
+from app.schemas.recommendations import RecommendationFilters
+from app.services.recommendation_service import RecommendationService
+
+SEEDED = datetime(2026, 1, 5, 9, 30)
+
+@pytest.fixture
+def session_factory(engine):
+    with engine.begin() as conn:
+        conn.execute(update(Security).values(updated_at=SEEDED))
+        conn.execute(insert(Strategy), [
+            {"id": strategy_id, "name": name, "updated_at": SEEDED} for strategy_id, name in ((1, "Long/Short"), (2, "Event"))
+        ])
+        conn.execute(insert(TradeRecommendation), [
+            {"id": recommendation_id, "analyst_id": 1, "security_id": 1, "trade_direction": "Buy",
+             "target_price": 190, "time_horizon": "Trade", "analyst_score": 8, "status": "Draft", "is_draft": True,
+             "updated_at": SEEDED}
+            for recommendation_id in (1, 2)
+        ])
+        conn.execute(insert(RecommendationStrategy), [{"recommendation_id": 1, "strategy_id": 1}])
+    return sessionmaker(bind=engine)
+
+def validators(session_factory):
+    with session_factory() as db:
+        rows = db.execute(RecommendationService.page_validators_statement(RecommendationFilters())).all()
+    return row_validators("page", rows)
+
+def test_validators_are_read_from_a_few_columns(session_factory):
+    statement = RecommendationService.validators_select()
+
+    assert [column.name for column in statement.selected_columns] == [
+        "id", "version", "updated_at", "security_updated_at", "strategies_updated_at"
+    ]
+    with session_factory() as db:
+        rows = db.execute(statement.order_by(TradeRecommendation.id)).all()
+    assert [tuple(row) for row in rows] == [(1, 1, SEEDED, SEEDED, SEEDED), (2, 1, SEEDED, SEEDED, None)]
+
+@pytest.mark.parametrize("change, last_modified", [
+    # A second write within the resolution of updated_at
+    (update(TradeRecommendation).where(TradeRecommendation.id == 2).values(version=2, updated_at=SEEDED), SEEDED),
+    (update(Security).values(name="Apple Inc.", updated_at=datetime(2026, 1, 6)), datetime(2026, 1, 6)),
+    (update(Strategy).where(Strategy.id == 1).values(name="Long-Short", updated_at=datetime(2026, 1, 6)),
+     datetime(2026, 1, 6)),
+])
+def test_validators_change_with_the_recommendation_and_its_related_rows(session_factory, change, last_modified):
+    etag, seeded_last_modified = validators(session_factory)
+    assert seeded_last_modified == SEEDED
+
+    with session_factory() as db:
+        db.execute(change)
+        db.commit()
+
+    new_etag, new_last_modified = validators(session_factory)
+    assert new_etag != etag
+    assert new_last_modified == last_modified
+
+def test_validators_ignore_strategies_the_recommendations_do_not_use(session_factory):
+    before = validators(session_factory)
+
+    with session_factory() as db:
+        db.execute(update(Strategy).where(Strategy.id == 2).values(name="Merger Arb", updated_at=datetime(2026, 1, 6)))
+        db.commit()
+
+    assert validators(session_factory) == before
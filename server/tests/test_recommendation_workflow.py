@@ -0,0 +1,102 @@
+# tests/test_recommendation_workflow.py
+"""
+Tests for the recommendation status workflow and bulk transitions
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.models import RecommendationStatusHistory, TradeRecommendation
+from app.schemas.recommendations import RecommendationTransitionRequest
+from app.services.recommendation_service import RecommendationService
+from app.services.recommendation_workflow import allowed_actions, get_transition
+
+def test_transitions_follow_the_workflow():
+    assert allowed_actions("Draft") == ["submit"]
+    assert allowed_actions("Proposed") == ["approve", "reject"]
+    assert allowed_actions("Approved") == allowed_actions("Rejected") == []
+
+    reject = get_transition("reject")
+    values = reject.values(user_id=2, now=None, notes="Too crowded")
+    assert values == {"status": "Rejected", "is_draft": False, "approved_by": 2, "approved_at": None,
+                      "approval_notes": "Too crowded"}
+    assert reject.changes(values) == {"status": ("Proposed", "Rejected"), "approved_by": (None, 2),
+                                      "approval_notes": (None, "Too crowded")}
+    assert get_transition("submit").changes(get_transition("submit").values(1, None)) == {
+        "status": ("Draft", "Proposed"), "is_draft": (True, False)
+    }
+    with pytest.raises(ValueError):
+        get_transition("reopen")
+
+@pytest.fixture
+def session_factory(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(TradeRecommendation), [
+            {"id": recommendation_id, "analyst_id": analyst_id, "security_id": 1, "trade_direction": "Buy",
+             "target_price": 190, "time_horizon": "Trade", "analyst_score": 8, "status": status,
+             "is_draft": status == "Draft"}
+            for recommendation_id, analyst_id, status in (
+                (1, 1, "Proposed"), (2, 1, "Proposed"), (3, 1, "Approved"), (4, 1, "Draft"), (5, 2, "Draft")
+            )
+        ])
+    return sessionmaker(bind=engine)
+
+def test_approve_moves_proposed_recommendations_and_reports_the_rest(session_factory):
+    request = RecommendationTransitionRequest(action="approve", ids=[2, 3, 99, 1, 2], notes="Go")
+
+    with session_factory() as db:
+        result = RecommendationService.apply_transition(db, request, user_id=2)
+
+    assert (result.applied, result.failed) == (2, 2)
+    assert [(item.id, item.status, item.current_status) for item in result.results] == [
+        (2, "applied", "Approved"), (3, "conflict", "Approved"), (99, "not_found", None), (1, "applied", "Approved")
+    ]
+    assert result.results[1].errors == ["Recommendation is Approved; approve applies to Proposed recommendations"]
+
+    with session_factory() as db:
+        approved = db.scalars(select(TradeRecommendation).where(TradeRecommendation.id.in_([1, 2]))).all()
+        assert {(row.status, row.approved_by, row.approval_notes, row.version) for row in approved} == {
+            ("Approved", 2, "Go", 2)
+        }
+        assert all(row.approved_at is not None for row in approved)
+        history = db.scalars(select(RecommendationStatusHistory).order_by(RecommendationStatusHistory.id)).all()
+        assert [(row.recommendation_id, row.old_status, row.new_status, row.changed_by) for row in history] == [
+            (2, "Proposed", "Approved", 2), (1, "Proposed", "Approved", 2)
+        ]
+
+    # The second decision on the same recommendations loses
+    with session_factory() as db:
+        again = RecommendationService.apply_transition(
+            db, RecommendationTransitionRequest(action="reject", ids=[1, 2]), user_id=1
+        )
+    assert [item.status for item in again.results] == ["conflict", "conflict"]
+
+def test_submit_moves_only_own_drafts_and_atomic_moves_nothing(session_factory):
+    with session_factory() as db:
+        atomic = RecommendationService.apply_transition(
+            db, RecommendationTransitionRequest(action="submit", ids=[4, 5], atomic=True), user_id=1
+        )
+        submitted = RecommendationService.apply_transition(
+            db, RecommendationTransitionRequest(action="submit", ids=[4, 5]), user_id=1
+        )
+
+    assert [(item.status, item.current_status) for item in atomic.results] == [("skipped", "Draft"), ("conflict", "Draft")]
+    assert atomic.results[1].errors == ["You can only submit your own recommendations"]
+    assert [item.status for item in submitted.results] == ["applied", "conflict"]
+    with session_factory() as db:
+        rows = db.execute(select(TradeRecommendation.id, TradeRecommendation.status, TradeRecommendation.is_draft)
+                          .where(TradeRecommendation.id.in_([4, 5])).order_by(TradeRecommendation.id)).all()
+        assert [tuple(row) for row in rows] == [(4, "Proposed", False), (5, "Draft", True)]
+        assert len(db.scalars(select(RecommendationStatusHistory)).all()) == 1
+
+def test_transition_request_rejects_unknown_actions():
+    with pytest.raises(ValueError):
+        RecommendationTransitionRequest(action="reopen", ids=[1])
@@ -0,0 +1,103 @@
+# tests/test_reference_cache.py
+"""
+Tests for the reference data cache and If-None-Match matching
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.http_cache import etag_matches
+from app.schemas.funds import FundResponse
+from app.services.reference_cache import ReferenceCache
+
+class FakeTable:
+    """Stands in for the database: a list of rows and a load counter"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.loads = 0
+
+    def load(self, db):
+        self.loads += 1
+        return list(self.rows)
+
+    async def load_async(self, db):
+        return self.load(db)
+
+def fund(fund_id, code, name="Fund"):
+    return FundResponse(id=fund_id, code=code, name=name, is_active=True)
+
+@pytest.fixture
+def table():
+    return FakeTable([fund(1, "OPM"), fund(2, "GEN")])
+
+@pytest.fixture
+def cache(table):
+    return ReferenceCache("funds", FundResponse, lambda item: item.code, table.load, table.load_async)
+
+def test_snapshot_is_loaded_once(cache, table):
+    first = cache.get(db=None)
+    second = cache.get(db=None)
+
+    assert first is second
+    assert table.loads == 1
+    assert first.by_id[2].code == "GEN"
+    assert first.get_by_key(" opm ").id == 1
+
+def test_invalidate_reloads_and_bumps_version_only_on_change(cache, table):
+    first = cache.get(db=None)
+
+    cache.invalidate()
+    unchanged = cache.get(db=None)
+    assert table.loads == 2
+    assert unchanged.etag == first.etag
+    assert unchanged.version == first.version
+
+    table.rows.append(fund(3, "WWH"))
+    cache.invalidate()
+    changed = cache.get(db=None)
+    assert changed.etag != first.etag
+    assert changed.version == first.version + 1
+
+def test_ttl_expires_snapshot(table):
+    cache = ReferenceCache(
+        "funds", FundResponse, lambda item: item.code, table.load, table.load_async, ttl_seconds=-1
+    )
+    cache.get(db=None)
+    cache.get(db=None)
+
+    assert table.loads == 2
+
+def test_load_straddling_invalidation_is_not_kept(cache, table):
+    def load_then_invalidate(db):
+        rows = list(table.rows)
+        cache.invalidate()
+        return rows
+    cache._load = load_then_invalidate
+
+    cache.get(db=None)
+    assert cache._current() is None
+
+def test_async_get_shares_snapshot(cache, table):
+    first = asyncio.run(cache.get_async(db=None))
+
+    assert cache.get(db=None) is first
+    assert table.loads == 1
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('"xyz"', False),
+    ("*", True),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
@@ -0,0 +1,76 @@
+# tests/test_responses.py
+"""
+Tests for the fast JSON response paths
+"""
+
+import sys
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+from fastapi import FastAPI, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.responses import FastJSONResponse, serialized_response
+
+class Position(BaseModel):
+    ticker: str
+    target_price: Decimal
+    as_of: date
+    updated_at: datetime
+
+class PositionRow:
+    """Stands in for an ORM object: attributes, not a dict"""
+
+    def __init__(self, ticker: str, target_price: str):
+        self.ticker = ticker
+        self.target_price = Decimal(target_price)
+        self.as_of = date(2025, 3, 14)
+        self.updated_at = datetime(2025, 3, 14, 15, 9, 26, 535000)
+
+ROWS = [PositionRow("AAPL", "187.50"), PositionRow("MSFT", "412.10")]
+
+def test_fast_json_response_encodes_decimals_and_dates_like_pydantic():
+    content = {"price": Decimal("187.50"), "as_of": date(2025, 3, 14), "ids": {1: "a"}}
+    assert json.loads(FastJSONResponse(content).body) == {"price": "187.50", "as_of": "2025-03-14", "ids": {"1": "a"}}
+
+def test_serialized_response_matches_the_response_model_path():
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/default", response_model=List[Position])
+    def default_path():
+        return [Position.model_validate(row, from_attributes=True) for row in ROWS]
+
+    @app.get("/fast", response_model=List[Position])
+    def fast_path():
+        return serialized_response(List[Position], ROWS)
+
+    client = TestClient(app)
+    fast = client.get("/fast")
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == client.get("/default").json()
+    assert fast.json() == jsonable_encoder([Position.model_validate(row, from_attributes=True) for row in ROWS])
+
+def test_serialized_response_keeps_status_and_headers_of_injected_response():
+    app = FastAPI()
+
+    @app.get("/positions", response_model=List[Position])
+    def positions(response: Response):
+        response.status_code = 203
+        response.headers["ETag"] = 'W/"positions"'
+        response.set_cookie("seen", "1")
+        return serialized_response(List[Position], ROWS, response)
+
+    response = TestClient(app).get("/positions")
+    assert response.status_code == 203
+    assert response.headers["etag"] == 'W/"positions"'
+    assert response.cookies["seen"] == "1"
+    assert int(response.headers["content-length"]) == len(response.content)
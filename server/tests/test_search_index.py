@@ -0,0 +1,74 @@
+# tests/test_search_index.py
+"""
+Tests for the in-memory securities search index
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.schemas.securities import SecurityResponse
+from app.services.search_index import SecuritySearchIndex
+
+def make_security(security_id, ticker, name, is_active=True):
+    return SecurityResponse(
+        id=security_id, ticker=ticker, name=name, source_type="IVP", is_active=is_active
+    )
+
+@pytest.fixture
+def index():
+    search_index = SecuritySearchIndex()
+    search_index.rebuild([
+        make_security(1, "AMGN", "Amgen Inc"),
+        make_security(2, "AMG", "Affiliated Managers Group"),
+        make_security(3, "ABBV", "AbbVie Inc"),
+        make_security(4, "GILD", "Gilead Sciences"),
+        make_security(5, "REGN", "Regeneron Pharmaceuticals"),
+        make_security(6, "VRTX", "Vertex Pharmaceuticals"),
+        make_security(7, "XAMG", "Example Amgen Spinoff"),
+    ])
+    return search_index
+
+def tickers(results):
+    return [security.ticker for security in results]
+
+def test_exact_ticker_ranks_before_prefix_matches(index):
+    assert tickers(index.search("amg")) == ["AMG", "AMGN", "XAMG"]
+
+def test_name_word_prefix_ranks_before_substring(index):
+    # "PHARMA" starts a word in both names; "ARMA" only appears inside one
+    assert tickers(index.search("pharma")) == ["REGN", "VRTX"]
+    assert tickers(index.search("arma")) == ["REGN", "VRTX"]
+
+def test_name_token_matches_follow_ticker_matches(index):
+    assert tickers(index.search("gil")) == ["GILD"]
+    assert tickers(index.search("inc")) == ["ABBV", "AMGN"]
+
+def test_short_query_substring_fallback(index):
+    assert tickers(index.search("x", limit=10)) == ["XAMG", "VRTX"]
+
+def test_limit_is_respected(index):
+    assert len(index.search("a", limit=2)) == 2
+
+def test_blank_query_returns_nothing(index):
+    assert index.search("   ") == []
+
+def test_upsert_reindexes_changed_ticker_and_name(index):
+    index.upsert(make_security(4, "GILD2", "Renamed Biotech"))
+
+    assert tickers(index.search("gilead")) == []
+    assert tickers(index.search("renamed")) == ["GILD2"]
+    assert tickers(index.search("gild")) == ["GILD2"]
+
+def test_deactivated_and_removed_securities_drop_out(index):
+    index.upsert(make_security(1, "AMGN", "Amgen Inc", is_active=False))
+    index.remove(3)
+
+    assert tickers(index.search("amgn")) == []
+    assert tickers(index.search("abbv")) == []
+    assert len(index) == 5
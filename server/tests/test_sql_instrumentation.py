@@ -0,0 +1,63 @@
+# tests/test_sql_instrumentation.py
+"""
+Tests for per-request SQL instrumentation and N+1 detection
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.middleware.sql_instrumentation import (
+    SqlInstrumentationMiddleware,
+    current_sql_stats,
+    statement_shape,
+)
+
+def test_statement_shape_collapses_placeholder_lists_and_whitespace():
+    assert statement_shape("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (?)"
+    assert statement_shape("SELECT * FROM t WHERE id IN (?)") == "SELECT * FROM t WHERE id IN (?)"
+    assert statement_shape("INSERT INTO t (a, b) VALUES (:a, :b)") == "INSERT INTO t (a, b) VALUES (?)"
+
+def make_app(queries: int):
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(SqlInstrumentationMiddleware, n_plus_one_threshold=3)
+
+    @app.get("/items")
+    def items():
+        with engine.connect() as connection:
+            for item_id in range(queries):
+                connection.execute(text("SELECT :id"), {"id": item_id})
+        return {"statements": current_sql_stats().statements}
+
+    return app
+
+def test_statements_are_counted_per_request_and_reported_in_server_timing():
+    client = TestClient(make_app(queries=2))
+
+    response = client.get("/items")
+
+    assert response.json() == {"statements": 2}
+    assert response.headers["server-timing"].startswith('db;dur=')
+    assert 'desc="2 statements"' in response.headers["server-timing"]
+    assert "total;dur=" in response.headers["server-timing"]
+    assert current_sql_stats() is None
+
+def test_repeated_statement_shape_is_logged_as_n_plus_one(caplog):
+    client = TestClient(make_app(queries=3))
+
+    with caplog.at_level(logging.INFO, logger="app.middleware.sql_instrumentation"):
+        client.get("/items")
+
+    warnings = [record for record in caplog.records if record.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "ran 3x" in warnings[0].getMessage()
+    assert any("statements=3" in record.getMessage() for record in caplog.records)
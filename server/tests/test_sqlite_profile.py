@@ -0,0 +1,48 @@
+# tests/test_sqlite_profile.py
+"""
+Tests for the tuned SQLite engine profile (WAL, pragmas, read-only readers)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.pool import NullPool
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings
+from app.core.database import make_read_only, tune_sqlite_connection
+
+def sqlite_engine(path, *listeners):
+    engine = create_engine(f"sqlite:///{path}", poolclass=NullPool)
+    for listener in listeners:
+        event.listen(engine, "connect", listener)
+    return engine
+
+def test_connections_are_tuned(tmp_path):
+    engine = sqlite_engine(tmp_path / "tuned.db", tune_sqlite_connection)
+
+    with engine.connect() as connection:
+        pragma = lambda name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert pragma("cache_size") == -settings.SQLITE_CACHE_SIZE_KB
+
+def test_readers_see_commits_and_cannot_write(tmp_path):
+    path = tmp_path / "shared.db"
+    writer = sqlite_engine(path, tune_sqlite_connection)
+    reader = sqlite_engine(path, tune_sqlite_connection, make_read_only)
+
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO items (id) VALUES (1)"))
+
+    with reader.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM items")).scalar() == 1
+        with pytest.raises(exc.OperationalError, match="readonly"):
+            connection.execute(text("INSERT INTO items (id) VALUES (2)"))